@@ -0,0 +1,14 @@
+"""
+Benchmarks Package
+Performance metingen voor het F1 25 Telemetry System
+
+Draai een benchmark vanuit de python map:
+    python -m benchmarks.bench_zero_copy
+    python -m benchmarks.bench_reuseport
+    python -m benchmarks.bench_parsers
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_header
+    python -m benchmarks.bench_car_state
+"""
+
+__all__ = ['bench_zero_copy', 'bench_reuseport', 'bench_parsers', 'bench_memory', 'bench_header', 'bench_car_state']
@@ -0,0 +1,107 @@
+"""
+F1 25 Telemetry System - Benchmark: Car Status en Car Damage
+Beide packets komen voor 22 auto's met hoge frequentie binnen, dus parse
+plus state update moet ruim onder 1 ms per packet blijven. Meet per packet:
+- parse: CarStatusParser / CarDamageParser (alle 22 auto's)
+- parse + update: daarna CarStateTable.update() met de gewijzigde velden
+- ongewijzigd: hetzelfde packet nogmaals (alleen de record vergelijking)
+
+De DataProcessor geeft deze parsers geen car mask: de tabel houdt de
+state van alle 22 auto's bij.
+
+De packets komen uit de SimulatedRig (opeenvolgende frames, dus echte
+wijzigingen in brandstof, ERS en slijtage).
+
+Gebruik:
+    python -m benchmarks.bench_car_state [aantal_packets]
+"""
+
+# --- SYSTEEM IMPORT FIX ---
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- EINDE SYSTEEM IMPORT FIX ---
+
+import time
+
+from packet_parsers.packet_header import PacketHeader
+from packet_parsers.packet_types import PacketID
+from packet_parsers.schemas import CAR_STATUS, CAR_DAMAGE
+from packet_parsers.status_parser import CarStatusParser, CarDamageParser
+from services.car_state import CarStateTable
+from services.packet_generator import SimulatedRig
+
+FRAMES = 64
+
+
+def build_packets(packet_id: int):
+    """(header, payload) van FRAMES opeenvolgende frames"""
+    rig = SimulatedRig(num_cars=22)
+    packets = []
+    for _ in range(FRAMES):
+        rig.step()
+        data = rig.build_packet(packet_id)
+        packets.append((PacketHeader.from_bytes(data), memoryview(data)[PacketHeader.HEADER_SIZE:]))
+    return packets
+
+
+def measure(function, count: int) -> float:
+    """Microseconden per packet (beste van 3 rondes)"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        function(count)
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e6
+
+
+def cases(parser_class, schema, packets):
+    """Benchmark functies voor één packet type"""
+    parser = parser_class()
+    table = CarStateTable(schema)
+    same_header, same_payload = packets[0]
+    table.update(parser.parse(same_header, same_payload)[1])
+
+    def parse(count):
+        for i in range(count):
+            header, payload = packets[i % FRAMES]
+            parser.parse(header, payload)
+
+    def parse_update(count):
+        fresh = CarStateTable(schema)
+        for i in range(count):
+            header, payload = packets[i % FRAMES]
+            fresh.update(parser.parse(header, payload)[1])
+
+    def unchanged(count):
+        for _ in range(count):
+            table.update(parser.parse(same_header, same_payload)[1])
+
+    return [
+        ("parse", parse),
+        ("parse + update", parse_update),
+        ("ongewijzigd packet", unchanged),
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    print(f"Car Status / Car Damage benchmark - {count} packets, 22 auto's")
+    print("-" * 64)
+    print(f"  {'Packet':<12} {'Pad':<22} {'us/packet':>10} {'budget 1 ms':>12}")
+    for name, packet_id, parser_class, schema in (
+        ("Car Status", PacketID.CAR_STATUS, CarStatusParser, CAR_STATUS),
+        ("Car Damage", PacketID.CAR_DAMAGE, CarDamageParser, CAR_DAMAGE),
+    ):
+        packets = build_packets(packet_id)
+        for case, function in cases(parser_class, schema, packets):
+            micros = measure(function, count)
+            print(f"  {name:<12} {case:<22} {micros:>10.1f} {micros / 10:>11.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+F1 25 Telemetry System - Benchmark: header decodering
+De header wordt voor elk datagram geparst, dus dit is de vaakst uitgevoerde
+code van het systeem. Vergelijkt:
+- oud: data[:29] slice, struct.unpack met format string, dataclass met
+  12 keyword argumenten, daarna is_valid() op de attributen
+- nieuw: HEADER_STRUCT.unpack_from op de originele buffer, NamedTuple
+  direct uit het tuple, is_valid()
+- nieuw met validate=True: controle op het ruwe tuple, object alleen als
+  de header geldig is
+- peek: HEADER_PEEK (alleen format en packet id), ter referentie
+
+Gemeten voor geldige headers en voor pakketten met een verkeerd format
+(bijv. F1 24 verkeer op dezelfde poort).
+
+Gebruik:
+    python -m benchmarks.bench_header [aantal_headers]
+"""
+
+# --- SYSTEEM IMPORT FIX ---
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- EINDE SYSTEEM IMPORT FIX ---
+
+import struct
+import time
+from dataclasses import dataclass
+
+from packet_parsers.packet_header import PacketHeader, HEADER_PEEK
+from packet_parsers.packet_types import PacketID, PACKET_FORMAT_2025, GAME_YEAR
+
+
+@dataclass
+class LegacyPacketHeader:
+    """De oude PacketHeader: dataclass, keyword argumenten, slice + unpack"""
+    packet_format: int
+    game_year: int
+    game_major_version: int
+    game_minor_version: int
+    packet_version: int
+    packet_id: int
+    session_uid: int
+    session_time: float
+    frame_identifier: int
+    overall_frame_identifier: int
+    player_car_index: int
+    secondary_player_car_index: int
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < 29:
+            return None
+        try:
+            unpacked = struct.unpack("<HBBBBBQfIIBB", data[:29])
+            return cls(
+                packet_format=unpacked[0], game_year=unpacked[1],
+                game_major_version=unpacked[2], game_minor_version=unpacked[3],
+                packet_version=unpacked[4], packet_id=unpacked[5],
+                session_uid=unpacked[6], session_time=unpacked[7],
+                frame_identifier=unpacked[8], overall_frame_identifier=unpacked[9],
+                player_car_index=unpacked[10], secondary_player_car_index=unpacked[11]
+            )
+        except struct.error:
+            return None
+
+    def is_valid(self):
+        return (
+            self.packet_format == PACKET_FORMAT_2025 and
+            self.game_year == GAME_YEAR and
+            0 <= self.packet_id <= 15 and
+            0 <= self.player_car_index <= 21
+        )
+
+
+def build_packet(packet_format: int) -> bytes:
+    """Lap Data datagram (29 + 1256 bytes)"""
+    header = struct.pack("<HBBBBBQfIIBB", packet_format, GAME_YEAR, 1, 0, 1, PacketID.LAP_DATA,
+                         0x1234567890ABCDEF, 100.5, 6000, 6000, 0, 255)
+    return header + bytes(1256)
+
+
+def legacy(data):
+    header = LegacyPacketHeader.from_bytes(data)
+    return header if header is not None and header.is_valid() else None
+
+
+def current(data):
+    header = PacketHeader.from_bytes(data)
+    return header if header is not None and header.is_valid() else None
+
+
+def current_validate(data):
+    return PacketHeader.from_bytes(data, validate=True)
+
+
+def peek(data):
+    return HEADER_PEEK.unpack_from(data)
+
+
+CASES = [
+    ("oud (dataclass)", legacy),
+    ("nieuw", current),
+    ("nieuw validate=True", current_validate),
+    ("HEADER_PEEK", peek),
+]
+
+
+def measure(function, data, count: int) -> float:
+    """Headers per seconde (beste van 3 rondes)"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(count):
+            function(data)
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    valid = memoryview(build_packet(PACKET_FORMAT_2025))
+    invalid = memoryview(build_packet(2024))
+
+    print(f"Header benchmark - {count} headers, memoryview van een Lap Data datagram")
+    print("-" * 72)
+    print(f"  {'Pad':<22} {'geldig hdr/s':>14} {'ongeldig hdr/s':>16} {'ns/header':>10}")
+    base = None
+    for name, function in CASES:
+        valid_rate = measure(function, valid, count)
+        invalid_rate = measure(function, invalid, count)
+        base = base or valid_rate
+        print(f"  {name:<22} {valid_rate:>14,.0f} {invalid_rate:>16,.0f} {1e9 / valid_rate:>10.0f}"
+              f"  ({valid_rate / base:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+F1 25 Telemetry System - Benchmark: geheugen en GC druk van de records
+Vergelijkt de oude record types (dataclass met __dict__ per auto, vier
+lists per auto in CarTelemetryData) met de huidige NamedTuple records
+voor de packets met records per auto: Motion, Lap Data, Car Telemetry
+(60 Hz) en Session History (20 Hz).
+
+Beide paden pakken de payload op dezelfde manier uit (iter_unpack), alleen
+het record type verschilt. Meet:
+- bytes per pakket dat bewaard blijft (tracemalloc)
+- GC druk tijdens een replay van een uur sessie op 60 Hz: aantal
+  collecties per generatie en de totale GC pauze. De replay houdt, net als
+  de dashboards, de laatste seconde pakketten per type vast.
+
+De pakketten komen uit de synthetische generator (één minuut race, daarna
+herhaald tot de gevraagde duur).
+
+Gebruik:
+    python -m benchmarks.bench_memory [minuten]
+"""
+
+# --- SYSTEEM IMPORT FIX ---
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- EINDE SYSTEEM IMPORT FIX ---
+
+import gc
+import struct
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import make_dataclass
+
+from packet_parsers.packet_header import PacketHeader
+from packet_parsers.packet_types import PacketID, MAX_CARS, get_packet_name
+from packet_parsers.motion_parser import MotionParser, MotionPacket, CarMotionData, MOTION_CAR_STRUCT
+from packet_parsers.lap_parser import LapDataParser, LapDataPacket, LapData, LAP_DATA_STRUCT, LAP_TAIL_STRUCT
+from packet_parsers.car_parser import (
+    CarTelemetryParser, CarTelemetryPacket, CarTelemetryData, TELEMETRY_CAR_STRUCT, TELEMETRY_TAIL_STRUCT
+)
+from packet_parsers.history_parser import (
+    SessionHistoryParser, SessionHistoryData, LapHistoryData, TyreStintHistoryData
+)
+from services.packet_generator import SimulatedRig
+
+RATE = 60            # Hz, zoals de game standaard stuurt
+SAMPLE_SECONDS = 60  # Zo veel seconden unieke pakketten, daarna herhaald
+KEEP = RATE          # Pakketten per type die de replay vasthoudt (1 seconde)
+RETAINED = 200       # Pakketten per type voor de bytes per pakket meting
+
+PACKET_IDS = (PacketID.MOTION, PacketID.LAP_DATA, PacketID.CAR_TELEMETRY, PacketID.SESSION_HISTORY)
+
+# De oude records: zelfde velden, gewone dataclass (met __dict__ per instantie)
+LegacyCarMotionData = make_dataclass('CarMotionData', CarMotionData._fields)
+LegacyLapData = make_dataclass('LapData', LapData._fields)
+LegacyCarTelemetryData = make_dataclass('CarTelemetryData', CarTelemetryData._fields)
+LegacyLapHistoryData = make_dataclass('LapHistoryData', LapHistoryData._fields)
+
+_MOTION_SIZE = MOTION_CAR_STRUCT.size * MAX_CARS
+_LAP_SIZE = LAP_DATA_STRUCT.size * MAX_CARS
+_TELEMETRY_SIZE = TELEMETRY_CAR_STRUCT.size * MAX_CARS
+_HISTORY_HEAD = struct.Struct("<7B")
+_HISTORY_LAP = struct.Struct(SessionHistoryParser.LAP_HISTORY_FORMAT)
+_HISTORY_STINT = struct.Struct(SessionHistoryParser.TYRE_STINT_FORMAT)
+
+
+def legacy_motion(header, payload):
+    view = memoryview(payload)
+    return MotionPacket(header, [LegacyCarMotionData(*u) for u in MOTION_CAR_STRUCT.iter_unpack(view[:_MOTION_SIZE])])
+
+
+def legacy_lap_data(header, payload):
+    view = memoryview(payload)
+    # LapDataPacket parst zichzelf in __init__, dus hier de velden direct zetten
+    packet = LapDataPacket.__new__(LapDataPacket)
+    packet.header = header
+    packet.lap_data = [LegacyLapData(*u) for u in LAP_DATA_STRUCT.iter_unpack(view[:_LAP_SIZE])]
+    packet.time_trial_pb_car_idx, packet.time_trial_rival_car_idx = LAP_TAIL_STRUCT.unpack_from(view, _LAP_SIZE)
+    return packet
+
+
+def legacy_car_telemetry(header, payload):
+    view = memoryview(payload)
+    cars = [
+        LegacyCarTelemetryData(
+            u[0], u[1], u[2], u[3], u[4], u[5], u[6], bool(u[7]), u[8], u[9],
+            list(u[10:14]), list(u[14:18]), list(u[18:22]), u[22],
+            list(u[23:27]), list(u[27:31])
+        )
+        for u in TELEMETRY_CAR_STRUCT.iter_unpack(view[:_TELEMETRY_SIZE])
+    ]
+    return CarTelemetryPacket(header, cars, *TELEMETRY_TAIL_STRUCT.unpack_from(view, _TELEMETRY_SIZE))
+
+
+def legacy_history(header, payload):
+    head = _HISTORY_HEAD.unpack_from(payload, 0)
+    num_laps, num_stints = head[1], head[2]
+    offset = _HISTORY_HEAD.size
+    laps = [LegacyLapHistoryData(*_HISTORY_LAP.unpack_from(payload, offset + i * _HISTORY_LAP.size))
+            for i in range(min(num_laps, 100))]
+    offset += _HISTORY_LAP.size * 100
+    stints = [TyreStintHistoryData(*_HISTORY_STINT.unpack_from(payload, offset + i * _HISTORY_STINT.size))
+              for i in range(min(num_stints, 8))]
+    return SessionHistoryData(header, *head, laps, stints)
+
+
+def current_parsers():
+    parsers = {
+        PacketID.MOTION: MotionParser(),
+        PacketID.LAP_DATA: LapDataParser(),
+        PacketID.CAR_TELEMETRY: CarTelemetryParser(),
+        PacketID.SESSION_HISTORY: SessionHistoryParser(),
+    }
+    return {packet_id: parser.parse for packet_id, parser in parsers.items()}
+
+
+LEGACY = {
+    PacketID.MOTION: legacy_motion,
+    PacketID.LAP_DATA: legacy_lap_data,
+    PacketID.CAR_TELEMETRY: legacy_car_telemetry,
+    PacketID.SESSION_HISTORY: legacy_history,
+}
+
+
+def record_sample():
+    """Eén minuut race op 60 Hz, per frame de datagrammen van PACKET_IDS"""
+    rig = SimulatedRig(num_cars=MAX_CARS, rate=RATE, flashback_interval=0)
+    for _ in range(RATE * 120):  # Eerst wat ronden rijden, zodat de history gevuld is
+        rig.step()
+    frames = []
+    for _ in range(RATE * SAMPLE_SECONDS):
+        frame = []
+        for data in rig.step():
+            header = PacketHeader.from_bytes(data)
+            if header is not None and header.packet_id in PACKET_IDS:
+                frame.append(data)
+        frames.append(frame)
+    return frames
+
+
+def bytes_per_packet(frames, parsers):
+    """Bewaarde bytes per pakket, per packet type (tracemalloc)"""
+    samples = {packet_id: [] for packet_id in PACKET_IDS}
+    for frame in frames:
+        for data in frame:
+            header = PacketHeader.from_bytes(data)
+            bucket = samples[header.packet_id]
+            if len(bucket) < RETAINED:
+                bucket.append((header, header.get_payload(data)))
+
+    result = {}
+    for packet_id, bucket in samples.items():
+        parse = parsers[packet_id]
+        gc.collect()
+        tracemalloc.start()
+        kept = [parse(header, payload) for header, payload in bucket]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result[packet_id] = current / len(kept)
+        del kept
+    return result
+
+
+def replay(frames, parsers, total_frames: int):
+    """Speel total_frames frames af; geeft (seconden, collecties per generatie, GC pauze)"""
+    kept = {packet_id: deque(maxlen=KEEP) for packet_id in PACKET_IDS}
+    collections = [0, 0, 0]
+    pause = [0.0, 0.0]  # totaal, start van de huidige collectie
+
+    def on_gc(phase, info):
+        if phase == 'start':
+            pause[1] = time.perf_counter()
+        else:
+            collections[info['generation']] += 1
+            pause[0] += time.perf_counter() - pause[1]
+
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    try:
+        start = time.perf_counter()
+        for index in range(total_frames):
+            for data in frames[index % len(frames)]:
+                header = PacketHeader.from_bytes(data)
+                kept[header.packet_id].append(parsers[header.packet_id](header, header.get_payload(data)))
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(on_gc)
+    return elapsed, collections, pause[0]
+
+
+def main():
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    total_frames = int(minutes * 60 * RATE)
+
+    frames = record_sample()
+    packets = sum(len(frames[index % len(frames)]) for index in range(total_frames))
+    paths = [("dataclass (oud)", LEGACY), ("NamedTuple", current_parsers())]
+
+    print(f"Geheugen benchmark - records per auto, {RATE} Hz, 22 auto's")
+    print("-" * 72)
+    print(f"  {'Bytes per pakket':<20} {'dataclass':>14} {'NamedTuple':>14} {'factor':>8}")
+    sizes = [bytes_per_packet(frames, parsers) for _, parsers in paths]
+    for packet_id in PACKET_IDS:
+        old, new = sizes[0][packet_id], sizes[1][packet_id]
+        print(f"  {get_packet_name(packet_id):<20} {old:>14,.0f} {new:>14,.0f} {old / new:>7.1f}x")
+
+    print()
+    print(f"Replay: {minutes:g} minuten = {total_frames:,} frames, {packets:,} pakketten")
+    print(f"  {'Pad':<18} {'seconden':>9} {'gen0':>8} {'gen1':>7} {'gen2':>6} {'GC pauze':>10}")
+    for name, parsers in paths:
+        elapsed, collections, pause = replay(frames, parsers, total_frames)
+        print(f"  {name:<18} {elapsed:>9.1f} {collections[0]:>8,} {collections[1]:>7,} "
+              f"{collections[2]:>6,} {pause * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
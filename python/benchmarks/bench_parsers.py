@@ -0,0 +1,230 @@
+"""
+F1 25 Telemetry System - Benchmark: parser microbenchmark
+Vergelijkt per packet type het oude parse pad (format string per auto of
+array element via unpack_safely, dataclass met keyword argumenten) met
+de huidige parsers (module-level struct.Struct, iter_unpack over de
+payload view).
+
+De pakketten komen uit de synthetische generator, dus alle velden zijn
+gevuld en spec-correct. Het oude pad is hier nagebouwd met de correcte
+F1 25 formats, zodat alleen de manier van uitpakken verschilt.
+
+Daarnaast: Lap Data eager vs. lazy (LazyLapDataPacket) voor de toegangs-
+patronen van de TelemetryController (alleen de speler, of 4 velden per
+auto voor de timing tabel).
+
+En: de 22-auto packets met een car mask van alleen de speler, tegen alle
+auto's decoderen (parse + de speler auto lezen).
+
+Gebruik:
+    python -m benchmarks.bench_parsers [aantal_pakketten]
+"""
+
+# --- SYSTEEM IMPORT FIX ---
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- EINDE SYSTEEM IMPORT FIX ---
+
+import struct
+import time
+
+from packet_parsers.packet_header import PacketHeader
+from packet_parsers.packet_types import PacketID, get_packet_name
+from packet_parsers.motion_parser import MotionParser, MotionExParser, CarMotionData
+from packet_parsers.lap_parser import LapDataParser, LapData
+from packet_parsers.car_parser import CarTelemetryParser, CarTelemetryData
+from packet_parsers.session_parser import SessionParser, MarshalZone, WeatherForecastSample
+from services.packet_generator import SimulatedRig
+
+
+def unpack_safely(format_string: str, data, offset: int = 0):
+    """Oude BaseParser.unpack_safely: calcsize + unpack_from met een format string"""
+    size = struct.calcsize(format_string)
+    if offset + size > len(data):
+        return None
+    return struct.unpack_from(format_string, data, offset)
+
+
+def legacy_motion(payload):
+    cars = []
+    offset = 0
+    for _ in range(22):
+        u = unpack_safely("<ffffffhhhhhh fff fff", payload, offset)
+        cars.append(CarMotionData(
+            world_position_x=u[0], world_position_y=u[1], world_position_z=u[2],
+            world_velocity_x=u[3], world_velocity_y=u[4], world_velocity_z=u[5],
+            world_forward_dir_x=u[6], world_forward_dir_y=u[7], world_forward_dir_z=u[8],
+            world_right_dir_x=u[9], world_right_dir_y=u[10], world_right_dir_z=u[11],
+            g_force_lateral=u[12], g_force_longitudinal=u[13], g_force_vertical=u[14],
+            yaw=u[15], pitch=u[16], roll=u[17]
+        ))
+        offset += 60
+    return cars
+
+
+def legacy_lap_data(payload):
+    cars = [LapData(*struct.unpack_from(LapData.STRUCT_FORMAT, payload, i * 57)) for i in range(22)]
+    struct.unpack_from('<B', payload, 1254)
+    struct.unpack_from('<B', payload, 1255)
+    return cars
+
+
+def legacy_car_telemetry(payload):
+    cars = []
+    offset = 0
+    for _ in range(22):
+        u = unpack_safely("<HfffBbHBBH4H4B4BH4f4B", payload, offset)
+        cars.append(CarTelemetryData(
+            speed=u[0], throttle=u[1], steer=u[2], brake=u[3], clutch=u[4], gear=u[5],
+            engine_rpm=u[6], drs=bool(u[7]), rev_lights_percent=u[8], rev_lights_bit_value=u[9],
+            brakes_temperature=[u[10], u[11], u[12], u[13]],
+            tyres_surface_temperature=[u[14], u[15], u[16], u[17]],
+            tyres_inner_temperature=[u[18], u[19], u[20], u[21]],
+            engine_temperature=u[22],
+            tyres_pressure=[u[23], u[24], u[25], u[26]],
+            surface_type=[u[27], u[28], u[29], u[30]]
+        ))
+        offset += 60
+    unpack_safely("<BBb", payload, offset)
+    return cars
+
+
+def legacy_session(payload):
+    head = unpack_safely("<BbbBHBbBHHBBBBBB", payload, 0)
+    offset = struct.calcsize("<BbbBHBbBHHBBBBBB")
+    zones = []
+    for _ in range(21):
+        z = unpack_safely("<fb", payload, offset)
+        zones.append(MarshalZone(zone_start=z[0], zone_flag=z[1]))
+        offset += struct.calcsize("<fb")
+    mid = unpack_safely("<BBB", payload, offset)
+    offset += struct.calcsize("<BBB")
+    samples = []
+    for _ in range(64):
+        s = unpack_safely("<BBBbbbbB", payload, offset)
+        samples.append(WeatherForecastSample(
+            session_type=s[0], time_offset=s[1], weather=s[2], track_temperature=s[3],
+            air_temperature=s[5], rain_percentage=s[7]
+        ))
+        offset += struct.calcsize("<BBBbbbbB")
+    footer = unpack_safely("<BBIIIBBBBBBBBBBBBBBIBBBBBBBB", payload, offset)
+    return head, zones, mid, samples, footer
+
+
+def legacy_motion_ex(payload):
+    values = []
+    for offset in range(0, 244, 4):
+        val = unpack_safely("<f", payload, offset)
+        values.append(val[0] if val else 0.0)
+    return values
+
+
+CASES = [
+    (PacketID.MOTION, legacy_motion, MotionParser()),
+    (PacketID.LAP_DATA, legacy_lap_data, LapDataParser()),
+    (PacketID.CAR_TELEMETRY, legacy_car_telemetry, CarTelemetryParser()),
+    (PacketID.SESSION, legacy_session, SessionParser()),
+    (PacketID.MOTION_EX, legacy_motion_ex, MotionExParser()),
+]
+
+
+def measure(function, count: int) -> float:
+    """Pakketten per seconde voor 'count' aanroepen (beste van 3 rondes)"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(count):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def read_player(packet, index: int = 0):
+    """Update_lap_data_packet + live timing: alle velden van één auto"""
+    car = packet.lap_data[index]
+    return (car.last_lap_time_ms, car.current_lap_time_ms, car.sector1_time_ms, car.sector2_time_ms,
+            car.lap_distance, car.car_position, car.current_lap_num, car.sector, car.pit_status)
+
+
+def read_timing(packet):
+    """get_combined_timing_data: 4 velden per auto"""
+    return [(car.car_position, car.last_lap_time_ms, car.current_lap_time_ms, car.result_status)
+            for car in packet.lap_data]
+
+
+def bench_lazy(rig: SimulatedRig, count: int):
+    """Lap Data eager vs. lazy, per toegangspatroon"""
+    data = rig.build_packet(PacketID.LAP_DATA)
+    header = PacketHeader.from_bytes(data)
+    payload = header.get_payload(data)
+    eager, lazy = LapDataParser(), LapDataParser(lazy=True)
+    patterns = [
+        ("alleen parse", lambda packet: packet),
+        ("speler (9 velden)", read_player),
+        ("timing (22 x 4)", read_timing),
+    ]
+
+    print()
+    print(f"  {'Lap Data':<16} {'eager pkt/s':>14} {'lazy pkt/s':>14} {'factor':>8}")
+    for name, read in patterns:
+        eager_rate = measure(lambda: read(eager.parse(header, payload)), count)
+        lazy_rate = measure(lambda: read(lazy.parse(header, payload)), count)
+        print(f"  {name:<16} {eager_rate:>14,.0f} {lazy_rate:>14,.0f} {lazy_rate / eager_rate:>7.1f}x")
+
+
+def bench_car_mask(rig: SimulatedRig, count: int):
+    """22-auto packets: alle auto's vs. car mask met alleen de speler"""
+    cases = [
+        (PacketID.MOTION, MotionParser, 'car_motion_data'),
+        (PacketID.LAP_DATA, LapDataParser, 'lap_data'),
+        (PacketID.CAR_TELEMETRY, CarTelemetryParser, 'car_telemetry_data'),
+    ]
+
+    print()
+    print(f"  {'Car mask':<16} {'22 auto pkt/s':>14} {'speler pkt/s':>14} {'factor':>8}")
+    for packet_id, parser_class, attribute in cases:
+        data = rig.build_packet(packet_id)
+        header = PacketHeader.from_bytes(data)
+        payload = header.get_payload(data)
+        player = header.player_car_index
+        full, masked = parser_class(), parser_class(car_mask=[player])
+        full_rate = measure(lambda: getattr(full.parse(header, payload), attribute)[player], count)
+        masked_rate = measure(lambda: getattr(masked.parse(header, payload), attribute)[player], count)
+        print(f"  {get_packet_name(packet_id):<16} {full_rate:>14,.0f} {masked_rate:>14,.0f} "
+              f"{masked_rate / full_rate:>7.1f}x")
+
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    rig = SimulatedRig(num_cars=22)
+    for _ in range(600):
+        rig.step()
+
+    print(f"Parser benchmark - {count} pakketten per type, header + payload view")
+    print("-" * 72)
+    print(f"  {'Packet':<16} {'oud pkt/s':>14} {'nieuw pkt/s':>14} {'factor':>8}")
+    for packet_id, legacy, parser in CASES:
+        data = rig.build_packet(packet_id)
+        header = PacketHeader.from_bytes(data)
+        payload = header.get_payload(data)
+        if parser.parse(header, payload) is None:
+            print(f"  {get_packet_name(packet_id):<16} parse fout, overgeslagen")
+            continue
+
+        old_rate = measure(lambda: legacy(PacketHeader.from_bytes(data).get_payload(data)), count)
+        new_rate = measure(lambda: parser.parse(header, PacketHeader.from_bytes(data).get_payload(data)), count)
+        print(f"  {get_packet_name(packet_id):<16} {old_rate:>14,.0f} {new_rate:>14,.0f} "
+              f"{new_rate / old_rate:>7.1f}x")
+
+    bench_lazy(rig, count)
+    bench_car_mask(rig, count)
+
+
+if __name__ == "__main__":
+    main()
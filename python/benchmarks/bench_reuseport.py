@@ -0,0 +1,149 @@
+"""
+F1 25 Telemetry System - Benchmark: SO_REUSEPORT fan-out
+Vergelijkt de doorvoer van 1 worker proces met N worker processen die
+dezelfde UDP poort delen (SO_REUSEPORT, alleen Linux).
+
+Een lokale generator (meerdere zend-processen, elk met een eigen bron
+poort zodat de kernel ze over de workers verdeelt) stuurt Lap Data
+pakketten. Elke worker parst header + Lap Data volledig, zoals de
+DataProcessor dat doet.
+
+Gebruik:
+    python -m benchmarks.bench_reuseport [workers] [seconden]
+"""
+
+# --- SYSTEEM IMPORT FIX ---
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- EINDE SYSTEEM IMPORT FIX ---
+
+import multiprocessing
+import socket
+import struct
+import time
+
+from packet_parsers.packet_header import PacketHeader
+from packet_parsers.packet_types import PacketID, PACKET_FORMAT_2025, GAME_YEAR
+from packet_parsers.lap_parser import LapData, LapDataParser
+from services.reuseport_supervisor import ReusePortSupervisor
+
+SENDERS = 4  # Aantal gesimuleerde rigs (zend-processen)
+HOST = '127.0.0.1'
+
+
+class LapDataBenchProcessor:
+    """Processor zonder controllers: parst alleen header + Lap Data"""
+
+    def __init__(self):
+        self.parser = LapDataParser()
+
+    def process_packet(self, data):
+        header = PacketHeader.from_bytes(data)
+        self.parser.parse(header, header.get_payload(data))
+
+    def process_batch(self, packets):
+        for data, _addr in packets:
+            self.process_packet(data)
+
+
+def create_bench_processor() -> LapDataBenchProcessor:
+    """Processor factory voor de worker processen"""
+    return LapDataBenchProcessor()
+
+
+def build_lap_packet(session_uid: int) -> bytes:
+    """Bouw één Lap Data datagram (29 + 1256 bytes)"""
+    header = struct.pack(
+        PacketHeader.HEADER_FORMAT, PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1,
+        PacketID.LAP_DATA, session_uid, 100.5, 1000, 1000, 0, 255
+    )
+    return header + bytes(LapData.PACKET_LEN * 22 + 2)
+
+
+def sender_main(port: int, session_uid: int, stop_event):
+    """Generator proces: stuur zo snel mogelijk pakketten van één 'rig'"""
+    packet = build_lap_packet(session_uid)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        while not stop_event.is_set():
+            for _ in range(100):
+                sock.sendto(packet, (HOST, port))
+            # Kort ademhalen zodat de ontvangers niet alleen maar droppen
+            time.sleep(0.0005)
+    finally:
+        sock.close()
+
+
+def find_free_port() -> int:
+    """Zoek een vrije UDP poort"""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        probe.bind((HOST, 0))
+        return probe.getsockname()[1]
+    finally:
+        probe.close()
+
+
+def run(num_workers: int, seconds: float) -> dict:
+    """Meet de doorvoer met num_workers worker processen"""
+    port = find_free_port()
+    supervisor = ReusePortSupervisor(num_workers, create_bench_processor, HOST, port, stats_interval=0.2)
+    supervisor.start()
+
+    stop_event = multiprocessing.Event()
+    senders = [
+        multiprocessing.Process(target=sender_main, args=(port, 1000 + i, stop_event), daemon=True)
+        for i in range(SENDERS)
+    ]
+    try:
+        for sender in senders:
+            sender.start()
+        # Opwarmen, dan meten over een vast venster
+        time.sleep(0.5)
+        before = supervisor.get_stats()
+        start = time.perf_counter()
+        time.sleep(seconds)
+        after = supervisor.get_stats()
+        elapsed = time.perf_counter() - start
+    finally:
+        stop_event.set()
+        for sender in senders:
+            sender.join(timeout=2.0)
+        supervisor.stop()
+
+    return {
+        "processed_per_s": (after['packets_processed'] - before['packets_processed']) / elapsed,
+        "received_per_worker": after['packets_received_per_worker'],
+        "dropped": after['packets_dropped'],
+    }
+
+
+def main():
+    if not hasattr(socket, 'SO_REUSEPORT'):
+        print("SO_REUSEPORT wordt niet ondersteund op dit platform")
+        return
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else max(2, os.cpu_count() or 2)
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+
+    print(f"SO_REUSEPORT benchmark - {SENDERS} rigs, {seconds:.0f}s per meting, {os.cpu_count()} cores")
+    print("-" * 72)
+    results = {}
+    for num_workers in (1, workers):
+        result = run(num_workers, seconds)
+        results[num_workers] = result['processed_per_s']
+        distribution = "/".join(str(count) for count in result['received_per_worker'])
+        print(f"  {num_workers:>2} worker(s) {result['processed_per_s']:>12,.0f} pkt/s verwerkt   "
+              f"verdeling: {distribution}   queue drops: {result['dropped']}")
+
+    if results[1] > 0:
+        print("-" * 72)
+        print(f"  Schaalfactor: {results[workers] / results[1]:.2f}x met {workers} workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+F1 25 Telemetry System - Benchmark: zero-copy receive pad
+Vergelijkt het oude pad (recvfrom -> bytes, payload slice, slice per auto)
+met het zero-copy pad (recvfrom_into in een pool buffer, memoryview,
+unpack_from met offsets) voor Lap Data pakketten over loopback UDP.
+
+Meet per pakket:
+- extra piekgeheugen (tracemalloc) tijdens ontvangen + header + payload
+- doorvoer in pakketten per seconde
+
+Gebruik (Python 3.9+ voor tracemalloc.reset_peak):
+    python -m benchmarks.bench_zero_copy [aantal_pakketten]
+"""
+
+# --- SYSTEEM IMPORT FIX ---
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- EINDE SYSTEEM IMPORT FIX ---
+
+import socket
+import struct
+import time
+import tracemalloc
+
+from packet_parsers.packet_header import PacketHeader
+from packet_parsers.packet_types import PacketID, PACKET_FORMAT_2025, GAME_YEAR
+from packet_parsers.lap_parser import LapData
+from services.buffer_pool import BufferPool
+
+BATCH = 200  # Zo veel datagrammen tegelijk in de socket buffer
+LAP_FORMAT = struct.Struct(LapData.STRUCT_FORMAT)
+CAR_STRIDE = LapData.PACKET_LEN
+
+
+def build_lap_packet() -> bytes:
+    """Bouw één Lap Data datagram (29 + 1256 bytes)"""
+    header = struct.pack(
+        PacketHeader.HEADER_FORMAT, PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1,
+        PacketID.LAP_DATA, 12345678, 100.5, 1000, 1000, 0, 255
+    )
+    return header + bytes(CAR_STRIDE * 22 + 2)
+
+
+def handle_copy(data: bytes):
+    """Oude pad: payload slice + slice per auto"""
+    header = PacketHeader.from_bytes(data)
+    payload = data[PacketHeader.HEADER_SIZE:]
+    for i in range(22):
+        car = payload[i * CAR_STRIDE:(i + 1) * CAR_STRIDE]
+        LAP_FORMAT.unpack_from(car)
+    return header
+
+
+def handle_view(view: memoryview):
+    """Zero-copy pad: payload view + unpack_from met offsets"""
+    header = PacketHeader.from_bytes(view)
+    payload = header.get_payload(view)
+    for i in range(22):
+        LAP_FORMAT.unpack_from(payload, i * CAR_STRIDE)
+    return header
+
+
+def run(mode: str, count: int, trace: bool) -> tuple:
+    """
+    Verstuur en verwerk 'count' pakketten
+
+    Returns:
+        (seconden, gemiddeld extra piekgeheugen per pakket in bytes)
+    """
+    packet = build_lap_packet()
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    receiver.bind(('127.0.0.1', 0))
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    addr = receiver.getsockname()
+    pool = BufferPool(4, 2048)
+
+    peak_total = 0
+    elapsed = 0.0
+    remaining = count
+    try:
+        while remaining > 0:
+            batch = min(BATCH, remaining)
+            for _ in range(batch):
+                sender.sendto(packet, addr)
+
+            start = time.perf_counter()
+            for _ in range(batch):
+                if trace:
+                    baseline = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.reset_peak()
+
+                if mode == 'copy':
+                    data, _ = receiver.recvfrom(2048)
+                    handle_copy(data)
+                    del data
+                else:
+                    buffer = pool.acquire()
+                    nbytes, _ = receiver.recvfrom_into(buffer)
+                    handle_view(memoryview(buffer)[:nbytes])
+                    pool.release(buffer)
+
+                if trace:
+                    peak_total += tracemalloc.get_traced_memory()[1] - baseline
+            elapsed += time.perf_counter() - start
+            remaining -= batch
+    finally:
+        sender.close()
+        receiver.close()
+
+    return elapsed, peak_total / count if trace else 0.0
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"Zero-copy benchmark - {count} Lap Data pakketten ({len(build_lap_packet())} bytes)")
+    print("-" * 72)
+    results = {}
+    for mode in ('copy', 'zero-copy'):
+        tracemalloc.start()
+        _, peak_per_packet = run(mode, min(count, 5000), trace=True)
+        tracemalloc.stop()
+        elapsed, _ = run(mode, count, trace=False)
+        results[mode] = peak_per_packet
+        print(f"  {mode:<10} {count / elapsed:>12,.0f} pkt/s   "
+              f"extra piekgeheugen per pakket: {peak_per_packet:>8,.0f} bytes")
+
+    if results['zero-copy'] > 0:
+        factor = results['copy'] / results['zero-copy']
+        print("-" * 72)
+        print(f"  Allocatie-reductie: {factor:.1f}x minder piekgeheugen per pakket")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,8 +27,79 @@ DATABASE = {
 UDP_CONFIG = {
     'host': '127.0.0.1',
     'port': 20777,
+    'ports': [],  # Extra poorten (meerdere rigs), alleen voor de 'asyncio' engine. Leeg = alleen 'port'
+    'engine': 'thread',  # 'thread' (UDPListener) of 'asyncio' (AsyncUDPListener)
     'buffer_size': 2048,
-    'timeout': 1.0
+    'timeout': 1.0,
+    'recv_buffer_size': 4 * 1024 * 1024,  # SO_RCVBUF in bytes (0 = OS default), Linux: max net.core.rmem_max
+    'zero_copy': True,  # recvfrom_into in herbruikbare buffers, handler krijgt een memoryview
+    'reuse_port': False,  # SO_REUSEPORT (Linux), wordt door 'main.py --workers N' aangezet
+    'max_batch': 64,  # Max. aantal datagrammen dat per wakeup leeggelezen wordt
+    'queue_size': 4096,  # Aantal pakketten in de ring buffer tussen ontvangst en verwerking
+    'worker_threads': 1,  # Meer dan 1 worker verwerkt pakketten niet meer in volgorde
+    'overflow_policy': 'drop_oldest',  # 'drop_oldest' of 'priority'
+    # Prioriteit per packet ID bij een volle queue (hoger = belangrijker, default 1)
+    'packet_priorities': {
+        0: 0,   # Motion
+        6: 0,   # Car Telemetry
+        13: 0,  # Motion Ex
+        2: 1,   # Lap Data
+        15: 1,  # Lap Positions
+        1: 2,   # Session
+        3: 2,   # Event
+        4: 2,   # Participants
+        8: 2,   # Final Classification
+        11: 2,  # Session History
+    }
+}
+
+# Frame assembly: per-frame pakketten (lap data, motion, car telemetry/status)
+# van één frame worden gebundeld en in één update naar de controllers gestuurd
+FRAME_ASSEMBLY = {
+    'enabled': True,
+    'timeout': 0.05  # Seconden dat een onvolledig frame op ontbrekende pakketten wacht
+}
+
+# Payload dedup: Session, Participants en Lap Positions worden niet opnieuw
+# geparst als de payload gelijk is aan die van het vorige pakket
+PAYLOAD_CACHE = {
+    'enabled': True,
+    'packet_ids': [1, 4, 15],  # Session, Participants, Lap Positions
+    'max_entries': 64  # (session_uid, packet_id) entries per DataProcessor
+}
+
+# Car mask (opt-in, voor speler-dashboards): de 22-auto packets (Lap Data,
+# Motion, Car Telemetry) decoderen alleen deze auto's direct; de andere
+# auto's pas als een view ze leest. Een actief masker gaat vóór de lazy Lap
+# Data parse. Zolang het masker leeg is (geen vaste auto's en nog geen P4)
+# worden alle auto's gewoon gedecodeerd.
+CAR_MASK = {
+    'cars': None,  # Vaste auto indices (bijv. [0, 5] voor een broadcast view)
+    'follow_player': False  # Speler auto('s) uit Participants (P4) erbij; zonder beide: alle auto's
+}
+
+# Multi-rig configuratie (meerdere simulators op één LAN)
+MULTI_RIG = {
+    'enabled': False,  # Per (bron adres, session_uid) een eigen controller state
+    'primary_host': '127.0.0.1',  # Rig van deze host gebruikt de controllers van de schermen
+    'idle_timeout': 30.0,  # Seconden zonder pakketten waarna een rig vervalt
+    'max_rigs': 32
+}
+
+# Capture configuratie (opname van alle rauwe datagrammen voor replay/analyse)
+CAPTURE_CONFIG = {
+    'enabled': False,
+    'directory': BASE_DIR / 'captures',
+    'max_file_mb': 512,  # Nieuw bestand na deze grootte (en bij elke nieuwe sessie)
+    'max_open_files': 8,  # Eén open bestand per sessie (meerdere rigs); daarboven sluit de oudste
+    'idle_close': 30.0,  # Seconden zonder pakketten waarna het bestand van een sessie sluit
+    'index_interval': 256,  # Eén index entry per N records
+    'flush_interval': 0.25,  # Seconden tussen schrijf-batches
+    'max_queue': 65536,  # Wachtende records; daarboven worden ze gedropt (nooit blokkeren)
+    'archive': False,  # Afgesloten captures op de achtergrond comprimeren (.f1arc)
+    'archive_codec': 'zlib',  # 'zlib' (snel) of 'lzma' (kleiner)
+    'archive_chunk_kb': 1024,  # Ruwe KB per onafhankelijk te decomprimeren chunk
+    'archive_delete_raw': False  # Ruwe capture verwijderen na een geslaagde controle
 }
 
 # Logging configuratie
@@ -7,5 +7,6 @@ from .telemetry_controller import TelemetryController
 from .menu_controller import MenuController
 from .session_controller import SessionController
 from .data_processor import DataProcessor
+from .session_router import SessionRouter
 
-__all__ = ['TelemetryController', 'MenuController', 'SessionController', 'DataProcessor']
\ No newline at end of file
+__all__ = ['TelemetryController', 'MenuController', 'SessionController', 'DataProcessor', 'SessionRouter']
\ No newline at end of file
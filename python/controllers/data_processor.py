@@ -2,7 +2,7 @@
 F1 25 Telemetry System - Data Processor
 (Versie 9: Gebaseerd op V7 (werkend) + P1/SessionController-injectie)
 """
-from typing import Set
+from typing import Any, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 # --- SYSTEEM IMPORT FIX ---
 import sys
@@ -14,6 +14,10 @@ if project_root not in sys.path:
 # --- EINDE SYSTEEM IMPORT FIX ---
 
 from services import logger_service
+from services.sequence_tracker import FrameSequenceTracker
+from services.frame_assembler import FrameAssembler, FrameBundle
+from services.payload_cache import PayloadCache
+from services.event_stream import EventStream
 
 # Importeer de controllers (Type Hinting)
 from controllers.telemetry_controller import TelemetryController
@@ -23,14 +27,16 @@ from controllers.session_controller import SessionController
 # --- EINDE AANPASSING ---
 
 try:
-    from packet_parsers.packet_header import PacketHeader
-    from packet_parsers.packet_types import PacketID
+    from packet_parsers.packet_header import PacketHeader, HEADER_PEEK
+    from packet_parsers.packet_types import PacketID, PACKET_FORMAT_2025
 
     # --- AANGEPAST: Importeer ALLE parsers die we nodig hebben ---
     from packet_parsers.session_parser import SessionParser
     from packet_parsers.lap_parser import LapDataParser
     from packet_parsers.participant_parser import ParticipantsParser
     from packet_parsers.history_parser import SessionHistoryParser
+    from packet_parsers.event_parser import EventParser, EVENT_CODE_PEEK
+    from packet_parsers.status_parser import CarStatusParser, CarDamageParser
 
     try:
         from packet_parsers.position_parser import LapPositionsParser
@@ -45,6 +51,17 @@ except ImportError as e:
     sys.exit(1)
 
 
+# Packet types die elk frame (met dezelfde overall_frame_identifier) verstuurd worden
+FRAME_PACKET_IDS = frozenset({
+    PacketID.MOTION, PacketID.LAP_DATA, PacketID.CAR_TELEMETRY,
+    PacketID.CAR_STATUS, PacketID.MOTION_EX,
+})
+
+# Packet types waarvan de controller live state van alle 22 auto's bijhoudt:
+# deze parsers krijgen geen car mask en decoderen altijd alle auto's
+UNMASKED_PACKET_IDS = frozenset({PacketID.CAR_STATUS, PacketID.CAR_DAMAGE})
+
+
 class DataProcessor:
     """
     Verwerkt rauwe UDP-pakketten en delegeert naar controllers.
@@ -52,7 +69,13 @@ class DataProcessor:
     """
 
     # --- AANGEPAST: __init__ accepteert nu SessionController ---
-    def __init__(self, telemetry_controller: TelemetryController, session_controller: SessionController):
+    def __init__(self, telemetry_controller: TelemetryController, session_controller: SessionController,
+                 sequence_tracker: Optional[FrameSequenceTracker] = None,
+                 frame_timeout: Optional[float] = None,
+                 payload_cache: Optional[PayloadCache] = None,
+                 car_mask: Optional[Iterable[int]] = None,
+                 follow_player_car: bool = False,
+                 event_stream: Optional[EventStream] = None):
         self.logger = logger_service.get_logger('DataProcessor')
         self.telemetry_controller = telemetry_controller
         # --- NIEUWE INJECTIE ---
@@ -62,9 +85,12 @@ class DataProcessor:
         # --- Registreer de parsers (V7 logica + P1) ---
         self.parsers = {
             PacketID.SESSION: SessionParser(),  # Nodig voor DB
-            PacketID.LAP_DATA: LapDataParser(),
+            PacketID.LAP_DATA: LapDataParser(lazy=True),  # Views lezen maar een paar velden
             PacketID.PARTICIPANTS: ParticipantsParser(),
             PacketID.SESSION_HISTORY: SessionHistoryParser(),
+            PacketID.EVENT: EventParser(),
+            PacketID.CAR_STATUS: CarStatusParser(),  # Fuel & ERS, banden
+            PacketID.CAR_DAMAGE: CarDamageParser(),
         }
         if LapPositionsParser:
             self.parsers[PacketID.LAP_POSITIONS] = LapPositionsParser()
@@ -72,12 +98,52 @@ class DataProcessor:
             self.logger.warning("LapPositionsParser (P15) niet geladen. P15 wordt genegeerd.")
         # --- EINDE PARSER REGISTRATIE ---
 
+        # --- SUBSCRIPTIONS ---
+        # Packet IDs die gedecodeerd worden. Frozenset die bij elke wijziging
+        # vervangen wordt, zodat de workers hem zonder lock kunnen lezen.
+        self._subscribed: FrozenSet[int] = frozenset(self.parsers)
+        # --- EINDE SUBSCRIPTIONS ---
+
+        # Optioneel: volgt frame volgorde van álle pakketten (ook ongeabonneerde)
+        self.sequence_tracker = sequence_tracker
+
+        # Optioneel: bundelt per-frame pakketten (frame_timeout in seconden, None = uit)
+        self.frame_assembler: Optional[FrameAssembler] = None
+        if frame_timeout is not None:
+            self.frame_assembler = FrameAssembler(
+                on_frame=self.process_frame,
+                expected_ids=FRAME_PACKET_IDS & self._subscribed,
+                timeout=frame_timeout
+            )
+
+        # Optioneel: hergebruikt het geparste object bij een ongewijzigde
+        # payload (P1, P4, P15); zie _route voor de overgeslagen updates
+        self.payload_cache = payload_cache
+
+        # --- EVENTS (P3) ---
+        # Events gaan niet via _route naar één controller maar naar de
+        # EventStream; controllers abonneren zich op de codes die ze gebruiken
+        self.event_stream = event_stream if event_stream is not None else EventStream()
+        self.event_stream.subscribe(self.session_controller.process_event, SessionController.EVENT_CODES)
+        self.event_stream.subscribe(self.telemetry_controller.process_event, TelemetryController.EVENT_CODES)
+        # --- EINDE EVENTS ---
+
         # --- STATE (uit V7/V8) ---
         self.player_car_index = 0
         self.history_packets_sent: Set[int] = set()
         # --- EINDE STATE ---
 
-        self.logger.info("Data Processor V9 (V7+DB) geïnitialiseerd (P1, P2, P4, P11, P15)")
+        # --- CAR MASK ---
+        # 22-auto packets decoderen alleen deze auto's direct (None = alle).
+        # Met follow_player_car komen de speler auto's (uit P4) erbij; een
+        # leeg masker (bijv. vóór de eerste P4) betekent alle auto's.
+        self._base_car_mask: Optional[FrozenSet[int]] = None if car_mask is None else frozenset(car_mask)
+        self.follow_player_car = follow_player_car
+        self._player_cars: FrozenSet[int] = frozenset()
+        self._apply_car_mask()
+        # --- EINDE CAR MASK ---
+
+        self.logger.info("Data Processor V9 (V7+DB) geïnitialiseerd (P1, P2, P3, P4, P7, P10, P11, P15)")
 
     # --- EINDE AANPASSING ---
 
@@ -85,65 +151,252 @@ class DataProcessor:
         """
         Callback functie die door de UDPListener wordt aangeroepen.
         (Logica 1:1 overgenomen uit jouw werkende V7)
+
+        data mag bytes of een memoryview zijn (zero-copy mode). De payload
+        wordt als memoryview doorgegeven aan de parsers, zonder kopie.
+        Parsers mogen de view niet bewaren: de buffer wordt hergebruikt.
+
+        Vóór de volledige header parse leest een voorgecompileerde Struct
+        alleen packet_format en packet_id. Pakketten zonder subscription
+        (bijv. motion, car telemetry) vallen daar meteen af.
+
+        Per-frame pakketten (FRAME_PACKET_IDS) gaan via de FrameAssembler
+        en komen per frame gebundeld terug in process_frame().
+
+        Events (P3) met een code zonder subscribers in de EventStream
+        vallen na een peek van de event code af, zonder parse.
         """
-        if not data: return
+        if len(data) < PacketHeader.HEADER_SIZE: return
+        if self.sequence_tracker is not None:
+            self.sequence_tracker.observe_packet(data)
+        packet_format, packet_id = HEADER_PEEK.unpack_from(data)
+        if packet_id not in self._subscribed or packet_format != PACKET_FORMAT_2025:
+            return
+        if packet_id == PacketID.EVENT and len(data) >= EVENT_CODE_PEEK.size:
+            if not self.event_stream.wants(EVENT_CODE_PEEK.unpack_from(data)[0].decode('ascii', 'replace')):
+                return
+
         header = None
         try:
-            header = PacketHeader.from_bytes(data)
-            if not header or not header.is_valid():
+            decoded = self._decode(data)
+            if decoded is None:
                 return
+            header, parsed_packet_object, unchanged = decoded
 
-            packet_id = header.packet_id
-
-            if packet_id in self.parsers:
-                parser = self.parsers[packet_id]
-
-                # --- DIT IS DE KERNLOGICA (uit V7) ---
-                # ALLE parsers (inclusief LapDataParser) krijgen (header, payload)
-                # Mijn eerdere 'if/else' was de fout.
-                payload = header.get_payload(data)
-                parsed_packet_object = parser.parse(header, payload)
-                # --- EINDE KERNLOGICA ---
-
-                # --- DE CRASH-FIX (uit V7) ---
-                # Als de parser faalt (bv. size check), retourneert het None.
-                if not parsed_packet_object:
-                    # De parser heeft zelf al gelogd (bv. "payload size incorrect")
-                    self.logger.warning(
-                        f"Parser voor PacketID {packet_id} retourneerde None (corrupt/invalid size). Stoppen met routering.")
-                    return
-                # --- EINDE CRASH-FIX ---
-
-                # --- ROUTING LOGICA (V7 + P1) ---
-
-                # NIEUWE ROUTE (DATABASE)
-                if packet_id == PacketID.SESSION:
-                    self.session_controller.process_session_packet(parsed_packet_object, header)
-
-                # OUDE ROUTES (LIVE VIEW)
-                elif packet_id == PacketID.LAP_DATA:
-                    self.telemetry_controller.update_lap_data_packet(parsed_packet_object, header)
-
-                elif packet_id == PacketID.PARTICIPANTS:
-                    self.telemetry_controller.update_participant_data(parsed_packet_object)
-                    # Update de state voor P11 filtering
-                    self.player_car_index = header.player_car_index
-
-                elif packet_id == PacketID.LAP_POSITIONS:
-                    self.telemetry_controller.update_position_data(parsed_packet_object)
-
-                elif packet_id == PacketID.SESSION_HISTORY:
-                    # Filter: Stuur alleen de historie van de speler naar de controller
-                    if parsed_packet_object.car_idx == self.player_car_index:
-                        if parsed_packet_object.car_idx not in self.history_packets_sent:
-                            self.logger.info(
-                                f"Eerste P1J (History) ontvangen voor speler (idx {self.player_car_index})")
-                            self.history_packets_sent.add(parsed_packet_object.car_idx)
-                        self.telemetry_controller.update_session_history(parsed_packet_object, header)
-                # --- EINDE ROUTING ---
-
-            # (else: debug log voor 'Nog geen parser' is niet nodig)
+            if self.frame_assembler is not None and header.packet_id in FRAME_PACKET_IDS:
+                self.frame_assembler.add(header, header.packet_id, parsed_packet_object)
+            else:
+                self._route(header.packet_id, parsed_packet_object, header, unchanged)
 
         except Exception as e:
             packet_id_str = header.packet_id if header else 'N/A'
-            self.logger.error(f"Fout bij verwerken pakket (ID: {packet_id_str}): {e}", exc_info=True)
\ No newline at end of file
+            self.logger.error(f"Fout bij verwerken pakket (ID: {packet_id_str}): {e}", exc_info=True)
+
+    def process_frame(self, bundle: FrameBundle):
+        """
+        Callback van de FrameAssembler: alle per-frame pakketten van één
+        frame in één update (en één lock) naar de TelemetryController.
+        """
+        try:
+            self.telemetry_controller.update_frame(bundle)
+        except Exception as e:
+            self.logger.error(f"Fout bij verwerken frame {bundle.overall_frame_identifier}: {e}", exc_info=True)
+
+    def poll_frames(self):
+        """Geef frames vrij waarvan de assembler timeout verlopen is"""
+        if self.frame_assembler is not None:
+            self.frame_assembler.poll()
+
+    def _decode(self, data) -> Optional[Tuple[PacketHeader, Any, bool]]:
+        """
+        Parse header en payload van één pakket
+
+        Returns:
+            (header, geparsed packet object, unchanged), of None bij een
+            ongeldig pakket. unchanged is True als de payload cache het object
+            van een identieke vorige payload teruggaf.
+        """
+        # Validatie op het ruwe tuple: voor een ongeldige header geen object
+        header = PacketHeader.from_bytes(data, validate=True)
+        if header is None:
+            return None
+
+        packet_id = header.packet_id
+        parser = self.parsers.get(packet_id)
+        if parser is None:
+            return None
+
+        # --- DIT IS DE KERNLOGICA (uit V7) ---
+        # ALLE parsers (inclusief LapDataParser) krijgen (header, payload)
+        payload = header.get_payload(data)
+        unchanged = False
+        if self.payload_cache is not None:
+            parsed_packet_object, unchanged = self.payload_cache.parse(header, payload, parser.parse)
+        else:
+            parsed_packet_object = parser.parse(header, payload)
+        # --- EINDE KERNLOGICA ---
+
+        # --- DE CRASH-FIX (uit V7) ---
+        # Als de parser faalt (bv. size check), retourneert het None.
+        if not parsed_packet_object:
+            # De parser heeft zelf al gelogd (bv. "payload size incorrect")
+            self.logger.warning(
+                f"Parser voor PacketID {packet_id} retourneerde None (corrupt/invalid size). Stoppen met routering.")
+            return None
+        # --- EINDE CRASH-FIX ---
+
+        return header, parsed_packet_object, unchanged
+
+    def _route(self, packet_id: int, parsed_packet_object: Any, header: PacketHeader,
+               unchanged: bool = False):
+        """
+        Stuur een geparsed pakket naar de juiste controller
+
+        Bij unchanged (zelfde payload als het vorige pakket van dit type)
+        slaan Participants en Lap Positions de controller update over.
+        Session gaat altijd door: de SessionController probeert de sessie
+        bij elk P1 pakket opnieuw te starten tot dat gelukt is.
+        """
+        # --- ROUTING LOGICA (V7 + P1) ---
+
+        # NIEUWE ROUTE (DATABASE)
+        if packet_id == PacketID.SESSION:
+            self.session_controller.process_session_packet(parsed_packet_object, header)
+
+        # OUDE ROUTES (LIVE VIEW)
+        elif packet_id == PacketID.LAP_DATA:
+            self.telemetry_controller.update_lap_data_packet(parsed_packet_object, header)
+
+        elif packet_id == PacketID.PARTICIPANTS:
+            if not unchanged:
+                self.telemetry_controller.update_participant_data(parsed_packet_object)
+            # Update de state voor P11 filtering
+            self.player_car_index = header.player_car_index
+            if self.follow_player_car:
+                self._update_player_cars(header)
+
+        elif packet_id == PacketID.LAP_POSITIONS:
+            if not unchanged:
+                self.telemetry_controller.update_position_data(parsed_packet_object)
+
+        elif packet_id == PacketID.EVENT:
+            self.event_stream.publish(parsed_packet_object)
+
+        elif packet_id == PacketID.CAR_STATUS:
+            self.telemetry_controller.update_car_status_packet(parsed_packet_object, header)
+
+        elif packet_id == PacketID.CAR_DAMAGE:
+            self.telemetry_controller.update_car_damage_packet(parsed_packet_object, header)
+
+        elif packet_id == PacketID.SESSION_HISTORY:
+            # Filter: Stuur alleen de historie van de speler naar de controller
+            if parsed_packet_object.car_idx == self.player_car_index:
+                if parsed_packet_object.car_idx not in self.history_packets_sent:
+                    self.logger.info(
+                        f"Eerste P1J (History) ontvangen voor speler (idx {self.player_car_index})")
+                    self.history_packets_sent.add(parsed_packet_object.car_idx)
+                self.telemetry_controller.update_session_history(parsed_packet_object, header)
+        # --- EINDE ROUTING ---
+
+    # --- SUBSCRIPTION API ---
+
+    def subscribe(self, packet_id: int) -> bool:
+        """
+        Zet decoderen van een packet type aan
+
+        Returns:
+            False als er geen parser voor dit packet ID is
+        """
+        if packet_id not in self.parsers:
+            self.logger.warning(f"Geen parser voor PacketID {packet_id}, subscription genegeerd")
+            return False
+        self._set_subscribed(self._subscribed | {packet_id})
+        return True
+
+    def unsubscribe(self, packet_id: int):
+        """Zet decoderen van een packet type uit"""
+        self._set_subscribed(self._subscribed - {packet_id})
+
+    def is_subscribed(self, packet_id: int) -> bool:
+        """Check of een packet type gedecodeerd wordt"""
+        return packet_id in self._subscribed
+
+    def set_subscriptions(self, packet_ids: Iterable[int]):
+        """Vervang alle subscriptions (IDs zonder parser worden genegeerd)"""
+        packet_ids = set(packet_ids)
+        unknown = packet_ids - set(self.parsers)
+        if unknown:
+            self.logger.warning(f"Geen parser voor PacketID(s) {sorted(unknown)}, genegeerd")
+        self._set_subscribed(frozenset(packet_ids - unknown))
+
+    def get_subscriptions(self) -> Set[int]:
+        """Verkrijg de packet IDs die gedecodeerd worden"""
+        return set(self._subscribed)
+
+    def _set_subscribed(self, packet_ids: FrozenSet[int]):
+        """Vervang de subscriptions; een frame is compleet met alle geabonneerde per-frame types"""
+        self._subscribed = packet_ids
+        if self.frame_assembler is not None:
+            self.frame_assembler.expected_ids = FRAME_PACKET_IDS & packet_ids
+
+    # --- EINDE SUBSCRIPTION API ---
+
+    # --- CAR MASK API ---
+
+    def set_car_mask(self, car_indices: Optional[Iterable[int]]):
+        """
+        Zet de auto's die de 22-auto parsers direct decoderen
+
+        De andere auto's blijven via dezelfde lijst bereikbaar, maar worden
+        pas bij toegang gedecodeerd. Met follow_player_car komen de speler
+        auto's er altijd bij. Een leeg masker decodeert alle auto's direct.
+        Een actief masker gaat bij Lap Data vóór de lazy parse.
+
+        Args:
+            car_indices: Auto indices (0-21), of None voor alle auto's
+        """
+        self._base_car_mask = None if car_indices is None else frozenset(car_indices)
+        self._apply_car_mask()
+
+    def get_car_mask(self) -> Optional[Set[int]]:
+        """Verkrijg het actieve masker (None = alle auto's direct)"""
+        mask = self._effective_car_mask()
+        return None if mask is None else set(mask)
+
+    def _update_player_cars(self, header: PacketHeader):
+        """Speler (en splitscreen speler) uit de header in het masker"""
+        player_cars = frozenset(
+            index for index in (header.player_car_index, header.secondary_player_car_index) if index < 22
+        )
+        if player_cars != self._player_cars:
+            self._player_cars = player_cars
+            self._apply_car_mask()
+            self.logger.info(f"Car mask volgt speler auto's: {sorted(player_cars)}")
+
+    def _effective_car_mask(self) -> Optional[FrozenSet[int]]:
+        """Vast masker plus speler auto's; leeg wordt None (alle auto's)"""
+        mask = self._base_car_mask
+        if self.follow_player_car:
+            mask = (mask or frozenset()) | self._player_cars
+        return mask or None
+
+    def _apply_car_mask(self):
+        """Geef het masker door aan alle parsers die het ondersteunen (behalve UNMASKED_PACKET_IDS)"""
+        mask = self._effective_car_mask()
+        for packet_id, parser in self.parsers.items():
+            if packet_id not in UNMASKED_PACKET_IDS and hasattr(parser, 'set_car_mask'):
+                parser.set_car_mask(mask)
+
+    # --- EINDE CAR MASK API ---
+
+    def process_batch(self, packets: List[Tuple[Any, Any]]):
+        """
+        Batch callback voor de UDPListener: alle datagrammen van één wakeup.
+
+        Args:
+            packets: Lijst met (data, addr) tuples, oudste eerst
+        """
+        process_packet = self.process_packet
+        for data, _addr in packets:
+            process_packet(data)
+        self.poll_frames()
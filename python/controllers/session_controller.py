@@ -9,7 +9,7 @@ from models import SessionModel, DriverModel, LapModel
 from services import logger_service
 
 # --- AANGEPAST: Imports uitgebreid ---
-from packet_parsers import SessionData
+from packet_parsers import SessionData, EventCode
 
 # We hebben de Header nodig voor de UID
 try:
@@ -31,6 +31,9 @@ class SessionController:
     Beheert sessie lifecycle en state
     """
 
+    # Events (Packet 3) waarop de DataProcessor deze controller abonneert
+    EVENT_CODES = (EventCode.SESSION_STARTED, EventCode.SESSION_ENDED)
+
     def __init__(self):
         """Initialiseer session controller"""
         self.logger = logger_service.get_logger('SessionController')
@@ -78,6 +81,22 @@ class SessionController:
 
     # --- EINDE NIEUWE METHODE ---
 
+    def process_event(self, event):
+        """
+        Entry point voor de EventStream (SSTA/SEND uit Packet 3).
+        SEND sluit de sessie direct af; SSTA met een nieuwe UID sluit een
+        nog actieve oude sessie af, het volgende P1 pakket start de nieuwe.
+        """
+        session_uid = event.header.session_uid
+        if event.code == EventCode.SESSION_ENDED:
+            if self.session_active and session_uid == self.current_session_uid:
+                self.logger.info(f"Sessie einde event (SEND) voor UID {session_uid}")
+                self.end_session()
+        elif event.code == EventCode.SESSION_STARTED:
+            self.logger.info(f"Sessie start event (SSTA) voor UID {session_uid}")
+            if self.session_active and session_uid != self.current_session_uid:
+                self.end_session()
+
     def start_session(self, session_uid: int, session_data: SessionData) -> Optional[int]:
         """
         Start nieuwe sessie of heractiveer bestaande
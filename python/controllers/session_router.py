@@ -0,0 +1,259 @@
+"""
+F1 25 Telemetry System - Session Router
+Verdeelt pakketten van meerdere simulators (rigs) over geïsoleerde
+controller states, per (bron adres, session_uid).
+"""
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services import logger_service
+
+# (bron host, session_uid)
+RigKey = Tuple[Optional[str], int]
+
+# session_uid staat in de header direct na packet_id (offset 7, uint64)
+SESSION_UID_OFFSET = 7
+_SESSION_UID = struct.Struct('<Q')
+
+
+class RigState:
+    """
+    State van één rig: DataProcessor (met controllers) en lock
+
+    Rigs die dezelfde processor delen (bijv. meerdere sessies van de
+    primaire rig) krijgen ook dezelfde lock mee.
+    """
+
+    def __init__(self, key: RigKey, processor: Any, now: float,
+                 lock: Optional[threading.Lock] = None):
+        self.key = key
+        self.processor = processor
+        self.lock = lock if lock is not None else threading.Lock()
+        self.created_at = now
+        self.last_seen = now
+        self.packets = 0
+
+    def get_info(self) -> Dict[str, Any]:
+        """Verkrijg rig informatie voor de status weergave"""
+        return {
+            "host": self.key[0],
+            "session_uid": self.key[1],
+            "packets": self.packets,
+            "last_seen": self.last_seen,
+        }
+
+
+class SessionRouter:
+    """
+    Router voor meerdere game instances op één LAN.
+
+    Elke combinatie van bron adres en session_uid krijgt een eigen RigState,
+    lazy aangemaakt via processor_factory(key). De router lock wordt alleen
+    kort vastgehouden voor de lookup; de verwerking gebeurt onder de lock van
+    de rig zelf, zodat een drukke rig de andere niet ophoudt. Geeft de
+    factory voor een nieuwe key een processor terug die al bij een andere
+    rig hoort, dan delen die rigs één lock. Rigs die idle_timeout seconden
+    niets gestuurd hebben worden verwijderd.
+
+    Heeft dezelfde process_packet/process_batch interface als DataProcessor,
+    dus de router kan direct als handler van de UDP listener dienen.
+    """
+
+    def __init__(self, processor_factory: Callable[[RigKey], Any],
+                 idle_timeout: float = 30.0, max_rigs: int = 32,
+                 on_evict: Optional[Callable[[RigState], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialiseer de router
+
+        Args:
+            processor_factory: Maakt een processor (bijv. DataProcessor) voor een nieuwe rig
+            idle_timeout: Seconden zonder pakketten waarna een rig vervalt
+            max_rigs: Maximaal aantal gelijktijdige rigs (nieuwe worden daarna genegeerd)
+            on_evict: Callback voor elke verwijderde rig (bijv. sessie afsluiten)
+            clock: Tijdsbron (monotonic), instelbaar voor tests
+        """
+        self.logger = logger_service.get_logger('SessionRouter')
+        self.processor_factory = processor_factory
+        self.idle_timeout = idle_timeout
+        self.max_rigs = max_rigs
+        self.on_evict = on_evict
+        self.clock = clock
+
+        self._rigs: Dict[RigKey, RigState] = {}
+        self._lock = threading.Lock()
+        # Idle rigs worden hooguit eens per seconde opgeruimd
+        self._sweep_interval = min(1.0, idle_timeout)
+        self._next_sweep = clock() + self._sweep_interval
+
+        # Stats
+        self.rigs_created = 0
+        self.rigs_evicted = 0
+        self.packets_rejected = 0
+
+    def process_packet(self, data: bytes, addr: Optional[Tuple[str, int]] = None):
+        """
+        Verwerk één pakket via de state van de juiste rig
+
+        Args:
+            data: Rauwe bytes of memoryview van het datagram
+            addr: (host, port) van de afzender
+        """
+        self._route(data, addr)
+
+    def process_batch(self, packets: List[Tuple[Any, Any]]):
+        """
+        Batch callback voor de UDP listener
+
+        Net als DataProcessor.process_batch worden na de batch de verlopen
+        frames vrijgegeven, per betrokken processor.
+
+        Args:
+            packets: Lijst met (data, addr) tuples, oudste eerst
+        """
+        route = self._route
+        touched: Dict[int, RigState] = {}
+        for data, addr in packets:
+            state = route(data, addr)
+            if state is not None:
+                touched[id(state.processor)] = state
+
+        self._poll_states(touched.values())
+
+    def poll_frames(self):
+        """Geef de verlopen frames van alle rigs vrij, elk onder de lock van zijn rig"""
+        unique: Dict[int, RigState] = {}
+        for state in self.get_rigs():
+            unique.setdefault(id(state.processor), state)
+        self._poll_states(unique.values())
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Verwijder rigs die langer dan idle_timeout niets gestuurd hebben
+
+        Returns:
+            Aantal verwijderde rigs
+        """
+        if now is None:
+            now = self.clock()
+        with self._lock:
+            self._next_sweep = now + self._sweep_interval
+            expired = [state for state in self._rigs.values()
+                       if now - state.last_seen > self.idle_timeout]
+            for state in expired:
+                del self._rigs[state.key]
+            self.rigs_evicted += len(expired)
+
+        for state in expired:
+            self.logger.info(f"Rig {state.key[0]} (sessie {state.key[1]}) verwijderd na "
+                             f"{self.idle_timeout:.0f}s inactiviteit")
+            if self.on_evict is not None:
+                try:
+                    with state.lock:
+                        self.on_evict(state)
+                except Exception as e:
+                    self.logger.error(f"Fout bij opruimen rig {state.key}: {e}", exc_info=True)
+        return len(expired)
+
+    def get_rig(self, key: RigKey) -> Optional[RigState]:
+        """Verkrijg de state van een rig (of None)"""
+        with self._lock:
+            return self._rigs.get(key)
+
+    def get_rigs(self) -> List[RigState]:
+        """Verkrijg alle actieve rigs"""
+        with self._lock:
+            return list(self._rigs.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg router statistieken"""
+        with self._lock:
+            rigs = [state.get_info() for state in self._rigs.values()]
+        return {
+            "rigs_active": len(rigs),
+            "rigs_created": self.rigs_created,
+            "rigs_evicted": self.rigs_evicted,
+            "rigs_rejected_packets": self.packets_rejected,
+            "rigs": rigs,
+        }
+
+    # --- Interne helpers ---
+
+    @staticmethod
+    def _poll_states(states: Iterable[RigState]):
+        """poll_frames() van elke processor (één keer per processor) onder de rig lock"""
+        for state in states:
+            poll_frames = getattr(state.processor, 'poll_frames', None)
+            if poll_frames is not None:
+                with state.lock:
+                    poll_frames()
+
+    def _route(self, data, addr: Optional[Tuple[str, int]]) -> Optional[RigState]:
+        """Verwerk één pakket onder de lock van zijn rig; geeft de rig terug"""
+        if len(data) < SESSION_UID_OFFSET + _SESSION_UID.size:
+            return None
+        now = self.clock()
+        state = self._get_or_create(self._make_key(data, addr), now)
+        if state is None:
+            return None
+
+        with state.lock:
+            state.last_seen = now
+            state.packets += 1
+            state.processor.process_packet(data)
+
+        if now >= self._next_sweep:
+            self.evict_idle(now)
+        return state
+
+    @staticmethod
+    def _make_key(data, addr: Optional[Tuple[str, int]]) -> RigKey:
+        """Bouw de rig key uit het bron adres en de session_uid uit de header"""
+        session_uid = _SESSION_UID.unpack_from(data, SESSION_UID_OFFSET)[0]
+        return (addr[0] if addr else None, session_uid)
+
+    def _get_or_create(self, key: RigKey, now: float) -> Optional[RigState]:
+        """
+        Zoek de state van een rig op, of maak hem lazy aan
+
+        De factory draait buiten de router lock (hij maakt controllers en
+        kan database werk doen), zodat de andere rigs intussen doorlopen.
+        Maken twee threads tegelijk dezelfde rig aan, dan wint de eerste en
+        wordt de processor van de tweede weggegooid.
+        """
+        state = self._rigs.get(key)
+        if state is not None:
+            return state
+
+        with self._lock:
+            state = self._rigs.get(key)
+            if state is not None:
+                return state
+            if len(self._rigs) >= self.max_rigs:
+                self.packets_rejected += 1
+                return None
+
+        try:
+            processor = self.processor_factory(key)
+        except Exception as e:
+            self.logger.error(f"Kon geen processor maken voor rig {key}: {e}", exc_info=True)
+            with self._lock:
+                self.packets_rejected += 1
+            return None
+
+        with self._lock:
+            state = self._rigs.get(key)
+            if state is not None:
+                return state
+            if len(self._rigs) >= self.max_rigs:
+                self.packets_rejected += 1
+                return None
+            shared = next((other for other in self._rigs.values() if other.processor is processor), None)
+            state = RigState(key, processor, now, lock=shared.lock if shared is not None else None)
+            self._rigs[key] = state
+            self.rigs_created += 1
+
+        self.logger.info(f"Nieuwe rig: {key[0]} (sessie {key[1]})")
+        return state
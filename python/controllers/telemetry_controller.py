@@ -3,9 +3,12 @@ F1 25 Telemetry System - Telemetry Controller
 (Versie 9.5: Correctie AttributeError 'lap_time_in_ms' -> 'lap_time_ms')
 """
 import threading
+from collections import deque
 from services import logger_service
 from models import SessionModel, DriverModel, LapModel
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Dict, Any, Set, Deque, Tuple
+from services.frame_assembler import FrameBundle
+from services.car_state import CarStateTable
 
 # --- AANPASSING V9.2: Import voor Injectie ---
 try:
@@ -22,6 +25,10 @@ except ImportError:
 
 try:
     from packet_parsers.packet_header import PacketHeader
+    from packet_parsers.packet_types import PacketID, EventCode
+    from packet_parsers.event_parser import EventPacket
+    from packet_parsers.schemas import CAR_STATUS, CAR_DAMAGE
+    from packet_parsers.status_parser import CarStatusData, CarStatusPacket, CarDamageData, CarDamagePacket
     from packet_parsers.lap_parser import LapData, LapDataPacket
     from packet_parsers.participant_parser import ParticipantData, ParticipantsPacket
     from packet_parsers.position_parser import LapPositionsData, LapPositionsPacket
@@ -63,8 +70,34 @@ except ImportError:
         pass
 
 
+    class EventPacket:
+        pass
+
+
+    class CarStatusData:
+        pass
+
+
+    class CarStatusPacket:
+        pass
+
+
+    class CarDamageData:
+        pass
+
+
+    class CarDamagePacket:
+        pass
+
+
 class TelemetryController:
 
+    # Events (Packet 3) waarop de DataProcessor deze controller abonneert
+    EVENT_CODES = (EventCode.SESSION_STARTED, EventCode.FASTEST_LAP, EventCode.PENALTY_ISSUED)
+
+    # Aantal recente straffen dat bewaard wordt
+    MAX_PENALTIES = 20
+
     # --- AANPASSING V9.2: Injectie in __init__ ---
     def __init__(self, session_controller: SessionController):
         self.logger = logger_service.get_logger('TelemetryController')
@@ -86,6 +119,21 @@ class TelemetryController:
         self.position_data: Optional[LapPositionsData] = None
         self.player_laps_saved_state: Dict[int, Set[int]] = {}
         self.current_session_uid: Optional[int] = None
+        self.current_frame_identifier: Optional[int] = None
+        self._frame_session_uid: Optional[int] = None
+        self.frames_skipped = 0  # Bundles die ouder waren dan het toegepaste frame
+        self.player_car_index: Optional[int] = None
+        # Car Status (P7) en Car Damage (P10): compacte kolommen per veld voor alle auto's
+        self.car_status = CarStateTable(CAR_STATUS)
+        self.car_damage = CarStateTable(CAR_DAMAGE)
+        self.fastest_lap: Optional[EventPacket] = None
+        self.penalties: Deque[EventPacket] = deque(maxlen=self.MAX_PENALTIES)
+
+        # Per-frame packet types en hun verwerking (aangeroepen onder self.lock)
+        self._frame_appliers = {
+            PacketID.LAP_DATA: self._apply_lap_data,
+            PacketID.CAR_STATUS: self._apply_car_status,
+        }
 
         self.logger.info("Telemetry Controller (V9.5 - Robuust P11) geïnitialiseerd")
 
@@ -96,12 +144,55 @@ class TelemetryController:
     def update_lap_data_packet(self, packet: LapDataPacket, header: PacketHeader):
         """ Update de LIVE data van Packet 2 """
         with self.lock:
-            self.current_session_uid = header.session_uid
-            self.all_lap_data = packet.lap_data
-            player_index = header.player_car_index
-            if not (0 <= player_index < 22):
+            self._apply_lap_data(packet, header)
+
+    def update_frame(self, bundle: FrameBundle):
+        """
+        Update alle per-frame data van één frame (Bron: FrameAssembler).
+        Eén lock voor het hele frame, dus de views zien nooit een mix van
+        velden uit verschillende frames. Een bundle die niet nieuwer is dan
+        het al toegepaste frame van dezelfde sessie wordt overgeslagen, zodat
+        de state nooit terug in de tijd gaat.
+        """
+        with self.lock:
+            if (bundle.session_uid == self._frame_session_uid and self.current_frame_identifier is not None
+                    and bundle.overall_frame_identifier <= self.current_frame_identifier):
+                self.frames_skipped += 1
                 return
-            self.player_lap_data = packet.lap_data[player_index]
+            self._frame_session_uid = bundle.session_uid
+            self.current_frame_identifier = bundle.overall_frame_identifier
+            for packet_id, frame_packet in bundle.packets.items():
+                apply = self._frame_appliers.get(packet_id)
+                if apply is not None:
+                    apply(frame_packet.packet, frame_packet.header)
+
+    def _apply_lap_data(self, packet: LapDataPacket, header: PacketHeader):
+        """Verwerk Packet 2 (lock wordt al vastgehouden)"""
+        self.current_session_uid = header.session_uid
+        self.all_lap_data = packet.lap_data
+        player_index = header.player_car_index
+        if not (0 <= player_index < 22):
+            return
+        self.player_car_index = player_index
+        self.player_lap_data = packet.lap_data[player_index]
+
+    def update_car_status_packet(self, packet: CarStatusPacket, header: PacketHeader):
+        """ Update de LIVE data van Packet 7 (zonder frame assembly) """
+        with self.lock:
+            self._apply_car_status(packet, header)
+
+    def _apply_car_status(self, packet: CarStatusPacket, header: PacketHeader):
+        """Verwerk Packet 7 (lock wordt al vastgehouden): alleen gewijzigde velden"""
+        self.current_session_uid = header.session_uid
+        if 0 <= header.player_car_index < 22:
+            self.player_car_index = header.player_car_index
+        self.car_status.update(packet.car_status_data)
+
+    def update_car_damage_packet(self, packet: CarDamagePacket, header: PacketHeader):
+        """ Update de LIVE data van Packet 10: alleen gewijzigde velden """
+        with self.lock:
+            self.current_session_uid = header.session_uid
+            self.car_damage.update(packet.car_damage_data)
 
     # --- AANPASSING V9.5: Correctie 'lap_time_ms' ---
     def update_session_history(self, packet: SessionHistoryData, header: PacketHeader):
@@ -199,6 +290,24 @@ class TelemetryController:
                 # 6. Markeer de ronde als 'opgeslagen' in onze state
                 self.player_laps_saved_state[car_index].add(lap_num)
 
+    def process_event(self, event: EventPacket):
+        """
+        Verwerk een event uit de EventStream (Bron: DataProcessor).
+        SSTA wist de event state van de vorige sessie.
+        """
+        with self.lock:
+            if event.code == EventCode.FASTEST_LAP:
+                self.fastest_lap = event
+                self.logger.info(f"Snelste ronde: auto {event.details.vehicle_idx}, "
+                                 f"{event.details.lap_time:.3f}s")
+            elif event.code == EventCode.PENALTY_ISSUED:
+                self.penalties.append(event)
+            elif event.code == EventCode.SESSION_STARTED:
+                self.fastest_lap = None
+                self.penalties.clear()
+                self.car_status.clear()
+                self.car_damage.clear()
+
     def update_participant_data(self, packet: ParticipantsPacket):
         with self.lock:
             self.participants = packet.participants
@@ -217,6 +326,28 @@ class TelemetryController:
         with self.lock:
             return self.player_session_history
 
+    def get_player_car_state(self) -> Tuple[Optional[CarStatusData], Optional[CarDamageData]]:
+        """Laatste Car Status en Car Damage record van de speler (None als nog niet ontvangen)"""
+        with self.lock:
+            if self.player_car_index is None:
+                return None, None
+            return self.car_status.get(self.player_car_index), self.car_damage.get(self.player_car_index)
+
+    def get_car_status_version(self) -> int:
+        """Version van de car status/damage state; verandert alleen als er een veld gewijzigd is"""
+        with self.lock:
+            return self.car_status.version + self.car_damage.version
+
+    def get_fastest_lap(self) -> Optional[EventPacket]:
+        """Laatste FTLP event van deze sessie (details: vehicle_idx, lap_time)"""
+        with self.lock:
+            return self.fastest_lap
+
+    def get_recent_penalties(self) -> List[EventPacket]:
+        """Recente PENA events, oudste eerst"""
+        with self.lock:
+            return list(self.penalties)
+
     def get_combined_timing_data(self) -> List[Dict[str, Any]]:
         combined_data = []
         with self.lock:
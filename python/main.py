@@ -7,6 +7,7 @@ F1 25 Telemetry System - Main Application
 import sys
 import os
 import time
+import argparse
 
 # Voeg de 'python' map (project root) toe aan het pad
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -49,8 +50,11 @@ except ImportError:
     msvcrt = None
 
 # NU pas importeren we de logger_service, die het (nu lege) bestand zal gebruiken
-from services import logger_service, UDPListener
-from controllers import TelemetryController, MenuController, DataProcessor, SessionController
+from services import (logger_service, UDPListener, AsyncUDPListener, ReusePortSupervisor, FrameSequenceTracker,
+                      merge_sequence_stats)
+from services import CaptureRecorder, CaptureCompactor, ReplaySource, PayloadCache
+from config import UDP_CONFIG, MULTI_RIG, FRAME_ASSEMBLY, CAPTURE_CONFIG, PAYLOAD_CACHE, CAR_MASK
+from controllers import TelemetryController, MenuController, DataProcessor, SessionController, SessionRouter
 
 from views import MenuView, Screen1Overview, Screen2Timing, Screen3Telemetry
 from views import Screen4Standings, Screen5Comparison, Screen6History
@@ -61,6 +65,7 @@ from views.screen1_features.practice_view import PracticeView
 from views.screen1_features.race_view import RaceView
 from views.screen1_features.tournament_view import TournamentView
 from views.screen1_features.position_chart_view import PositionChartView
+from views.screen3_features.fuel_ers_view import FuelErsView
 
 # --- DATABASE INITIALISATIE ---
 try:
@@ -88,10 +93,23 @@ except Exception as db_init_e:
 # --- EINDE DATABASE INITIALISATIE ---
 
 
+def get_frame_timeout() -> Optional[float]:
+    """Frame assembler timeout uit de config (None = frame assembly uit)"""
+    return FRAME_ASSEMBLY.get('timeout', 0.05) if FRAME_ASSEMBLY.get('enabled') else None
+
+
+def create_payload_cache() -> Optional[PayloadCache]:
+    """Payload cache uit de config (None = dedup uit); één per DataProcessor"""
+    if not PAYLOAD_CACHE.get('enabled'):
+        return None
+    return PayloadCache(PAYLOAD_CACHE.get('packet_ids', (1, 4, 15)), PAYLOAD_CACHE.get('max_entries', 64))
+
+
 class F1TelemetryApp:
     """Hoofd applicatie klasse met submenu ondersteuning"""
 
-    def __init__(self):
+    def __init__(self, replay_path: Optional[str] = None, replay_speed: Optional[float] = 1.0,
+                 replay_loop: bool = False):
         self.logger = logger_service.get_logger('MainApp')
         self.logger.info("F1 25 Telemetry System wordt gestart...")
         self.logger.info("Logbestand succesvol geleegd (V9.3 init)")
@@ -101,16 +119,74 @@ class F1TelemetryApp:
         self.telemetry_controller = TelemetryController(session_controller=self.session_controller)
         self.menu_controller = MenuController()
 
+        # Frame volgorde (verlies, out-of-order, flashbacks) van de primaire
+        # processor; andere rigs krijgen een eigen tracker (zie _sequence_stats)
+        self.sequence_tracker = FrameSequenceTracker()
+
         # Nu de DataProcessor, en *injecteer* beide controllers
         self.data_processor = DataProcessor(
             telemetry_controller=self.telemetry_controller,
-            session_controller=self.session_controller
+            session_controller=self.session_controller,
+            sequence_tracker=self.sequence_tracker,
+            frame_timeout=get_frame_timeout(),
+            payload_cache=create_payload_cache(),
+            car_mask=CAR_MASK.get('cars'),
+            follow_player_car=CAR_MASK.get('follow_player', False)
         )
         # --- EINDE AANGEPAST ---
 
-        self.udp_listener = UDPListener(
-            packet_handler=self.data_processor.process_packet
-        )
+        # Multi-rig: per (bron adres, session_uid) een eigen, geïsoleerde state
+        packet_target = self.data_processor
+        self.session_router = None
+        if MULTI_RIG.get('enabled'):
+            self.session_router = SessionRouter(
+                processor_factory=self._create_rig_processor,
+                idle_timeout=MULTI_RIG.get('idle_timeout', 30.0),
+                max_rigs=MULTI_RIG.get('max_rigs', 32),
+                on_evict=self._close_rig
+            )
+            packet_target = self.session_router
+
+        if replay_path:
+            # Replay van een capture in plaats van live UDP (zelfde interface)
+            self.udp_listener = ReplaySource(
+                packet_handler=packet_target.process_packet,
+                batch_handler=packet_target.process_batch,
+                path=replay_path,
+                speed=replay_speed,
+                loop=replay_loop,
+                max_batch=UDP_CONFIG.get('max_batch', 64)
+            )
+        else:
+            # Engine keuze: thread listener (default) of asyncio (meerdere poorten, één loop)
+            listener_class = AsyncUDPListener if UDP_CONFIG.get('engine') == 'asyncio' else UDPListener
+            self.udp_listener = listener_class(
+                packet_handler=packet_target.process_packet,
+                batch_handler=packet_target.process_batch
+            )
+
+        # Optioneel: alle rauwe datagrammen opnemen (replay / analyse achteraf)
+        self.capture_recorder = None
+        self.capture_compactor = None
+        if CAPTURE_CONFIG.get('enabled') and not replay_path:
+            if CAPTURE_CONFIG.get('archive'):
+                # Afgesloten captures op de achtergrond comprimeren
+                self.capture_compactor = CaptureCompactor(
+                    codec=CAPTURE_CONFIG.get('archive_codec', 'zlib'),
+                    chunk_size=CAPTURE_CONFIG.get('archive_chunk_kb', 1024) * 1024,
+                    delete_raw=CAPTURE_CONFIG.get('archive_delete_raw', False)
+                )
+            self.capture_recorder = CaptureRecorder(
+                directory=CAPTURE_CONFIG['directory'],
+                max_file_bytes=CAPTURE_CONFIG.get('max_file_mb', 512) * 1024 * 1024,
+                index_interval=CAPTURE_CONFIG.get('index_interval', 256),
+                flush_interval=CAPTURE_CONFIG.get('flush_interval', 0.25),
+                max_queue=CAPTURE_CONFIG.get('max_queue', 65536),
+                max_open_files=CAPTURE_CONFIG.get('max_open_files', 8),
+                idle_close=CAPTURE_CONFIG.get('idle_close', 30.0),
+                on_file_closed=self.capture_compactor.submit if self.capture_compactor else None
+            )
+            self.udp_listener.recorder = self.capture_recorder
         self.menu_view = MenuView(self.menu_controller)
 
         # Hoofdschermen
@@ -128,6 +204,9 @@ class F1TelemetryApp:
         self.tournament_view = TournamentView(self.telemetry_controller)
         self.position_chart_view = PositionChartView(self.telemetry_controller)
 
+        # Views voor Scherm 3
+        self.fuel_ers_view = FuelErsView(self.telemetry_controller)
+
         self.menu_controller.register_screen(1, self.screen1.render)
         self.menu_controller.register_screen(2, self.screen2.render)
         self.menu_controller.register_screen(3, self.screen3.render)
@@ -147,15 +226,45 @@ class F1TelemetryApp:
         self.menu_controller.register_submenu_function(1, 5, self.live_timing_view.render, is_live=True)
 
         self.menu_controller.register_submenu_function(3, 1, self.demo_dashboard, is_live=False)
-        self.menu_controller.register_submenu_function(3, 2, self.demo_fuel_ers, is_live=False)
+        self.menu_controller.register_submenu_function(3, 2, self.fuel_ers_view.render, is_live=True)
 
     def demo_dashboard(self):
         os.system('cls' if os.name == 'nt' else 'clear')
         print("\n[DEMO] Scherm 3.1 - Dashboard")
 
-    def demo_fuel_ers(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("\n[DEMO] Scherm 3.2 - Fuel & ERS")
+    def _create_rig_processor(self, key) -> DataProcessor:
+        """Maak de processor voor een nieuwe rig (SessionRouter factory)"""
+        host, _session_uid = key
+        if host == MULTI_RIG.get('primary_host'):
+            # De primaire rig voedt de controllers van de schermen. Elke sessie
+            # van deze host krijgt dezelfde processor; de router geeft die
+            # rigs daarom ook één gedeelde lock.
+            return self.data_processor
+        session_controller = SessionController()
+        return DataProcessor(
+            telemetry_controller=TelemetryController(session_controller=session_controller),
+            session_controller=session_controller,
+            sequence_tracker=FrameSequenceTracker(),
+            frame_timeout=get_frame_timeout(),
+            payload_cache=create_payload_cache(),
+            car_mask=CAR_MASK.get('cars'),
+            follow_player_car=CAR_MASK.get('follow_player', False)
+        )
+
+    def _sequence_stats(self):
+        """Frame volgorde stats van de primaire processor plus die van de actieve rigs"""
+        trackers = [self.sequence_tracker]
+        if self.session_router is not None:
+            for state in self.session_router.get_rigs():
+                tracker = getattr(state.processor, 'sequence_tracker', None)
+                if tracker is not None and all(tracker is not known for known in trackers):
+                    trackers.append(tracker)
+        return merge_sequence_stats(tracker.get_stats() for tracker in trackers)
+
+    def _close_rig(self, state):
+        """Sluit de sessie van een verwijderde rig af (SessionRouter on_evict)"""
+        if state.processor is not self.data_processor:
+            state.processor.session_controller.end_session()
 
     def get_non_blocking_input(self) -> Optional[str]:
         if not msvcrt: return None
@@ -171,6 +280,10 @@ class F1TelemetryApp:
     def start(self):
         try:
             self.menu_view.show_welcome()
+            if self.capture_compactor:
+                self.capture_compactor.start()
+            if self.capture_recorder:
+                self.capture_recorder.start()
             self.udp_listener.start()
             time.sleep(0.5)
             if not self.udp_listener.is_running():
@@ -205,13 +318,18 @@ class F1TelemetryApp:
                             time.sleep(0.05)
                             continue
                     last_refresh_time = current_time
+                    # Frames die door stilte in de stroom nog openstaan vrijgeven; bij
+                    # multi-rig via de router, onder de lock van elke rig
+                    (self.session_router or self.data_processor).poll_frames()
                     self.menu_controller.render_current_screen()
-                    self.menu_view.show_status(self.udp_listener)
+                    self.menu_view.show_status(self.udp_listener, self.session_router, self._sequence_stats(),
+                                               self.data_processor.payload_cache)
                     self.menu_view.show_menu()
                     print(f"  AUTO-REFRESH AAN. Druk 'B' (terug) of '0' (afsluiten)...")
                 else:
                     self.menu_controller.render_current_screen()
-                    self.menu_view.show_status(self.udp_listener)
+                    self.menu_view.show_status(self.udp_listener, self.session_router, self._sequence_stats(),
+                                               self.data_processor.payload_cache)
                     self.menu_view.show_menu()
                     choice = self.menu_view.get_user_input()
                 if not choice:
@@ -241,14 +359,92 @@ class F1TelemetryApp:
         """Stop de applicatie"""
         if hasattr(self, 'udp_listener'):
             self.udp_listener.stop()
+        if getattr(self, 'capture_recorder', None):
+            self.capture_recorder.stop()
+        if getattr(self, 'capture_compactor', None):
+            # Na de recorder: het laatst afgesloten bestand wordt nog gearchiveerd
+            self.capture_compactor.stop()
         if hasattr(self, 'menu_controller'):
             self.menu_controller.stop()
         self.running = False
         self.logger.info("F1 25 Telemetry System gestopt")
 
 
+def create_worker_processor() -> DataProcessor:
+    """Maak de processor voor één worker proces (supervisor mode)"""
+    session_controller = SessionController()
+    return DataProcessor(
+        telemetry_controller=TelemetryController(session_controller=session_controller),
+        session_controller=session_controller,
+        frame_timeout=get_frame_timeout(),
+        payload_cache=create_payload_cache(),
+        car_mask=CAR_MASK.get('cars'),
+        follow_player_car=CAR_MASK.get('follow_player', False)
+    )
+
+
+def run_supervisor(num_workers: int):
+    """
+    Supervisor mode: N worker processen op dezelfde poort (SO_REUSEPORT).
+    Zonder schermen; de workers schrijven naar de database en de
+    supervisor toont de opgetelde stats.
+    """
+    logger = logger_service.get_logger('MainApp')
+    supervisor = ReusePortSupervisor(
+        num_workers=num_workers,
+        processor_factory=create_worker_processor,
+        host=UDP_CONFIG['host'],
+        port=UDP_CONFIG['port']
+    )
+    try:
+        supervisor.start()
+    except OSError as e:
+        logger.error(f"Supervisor kon niet starten: {e}", exc_info=True)
+        print(f"\n[ERROR] Kon workers niet starten: {e}\n", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"\n{num_workers} workers luisteren op {UDP_CONFIG['host']}:{UDP_CONFIG['port']}. Ctrl+C om te stoppen.")
+    try:
+        while supervisor.is_running():
+            time.sleep(1.0)
+            stats = supervisor.get_stats()
+            per_worker = "/".join(str(count) for count in stats['packets_received_per_worker'])
+            print(f"\r  Workers: {stats['workers_alive']}/{stats['workers']}  "
+                  f"Ontvangen: {stats['packets_received']} ({per_worker})  "
+                  f"Verwerkt: {stats['packets_processed']}  Gedropt: {stats['packets_dropped']}",
+                  end='', flush=True)
+    except KeyboardInterrupt:
+        logger.info("Supervisor onderbroken door gebruiker (Ctrl+C)")
+    finally:
+        supervisor.stop()
+        print()
+
+
+def parse_replay_speed(value: str) -> Optional[float]:
+    """Replay tempo van de command line: een factor (1, 4, 0.5) of 'max'"""
+    if value.lower() == 'max':
+        return None
+    try:
+        speed = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ongeldig replay tempo: {value!r}")
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("replay tempo moet positief zijn")
+    return speed
+
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="F1 25 Telemetry System")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Aantal worker processen op dezelfde UDP poort (SO_REUSEPORT, Linux)")
+    parser.add_argument('--replay', metavar='PAD',
+                        help="Speel een capture bestand (of map met captures) af in plaats van live UDP")
+    parser.add_argument('--speed', type=parse_replay_speed, default=1.0,
+                        help="Replay tempo: 1 = real-time, N = N keer sneller, 'max' = zo snel mogelijk")
+    parser.add_argument('--loop', action='store_true',
+                        help="Replay opnieuw starten na het laatste pakket")
+    args = parser.parse_args()
 
     # --- MAIN FUNCTIE DB CHECK ---
     if not database._pool:
@@ -256,7 +452,11 @@ def main():
         sys.exit(1)
     # --- EINDE CHECK ---
 
-    app = F1TelemetryApp()
+    if args.workers > 1:
+        run_supervisor(args.workers)
+        return
+
+    app = F1TelemetryApp(replay_path=args.replay, replay_speed=args.speed, replay_loop=args.loop)
     app.start()
 
 
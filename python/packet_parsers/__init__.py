@@ -9,20 +9,31 @@ from .packet_types import (
 )
 from .packet_header import PacketHeader
 from .base_parser import BaseParser
+from .schema import RecordSchema, RecordArray, PacketSchema, Section, SchemaParser, SCHEMAS, get_schema
+from . import schemas
 from .motion_parser import MotionParser, MotionExParser, MotionPacket, MotionExPacket
 from .session_parser import SessionParser, SessionData
-from .lap_parser import LapDataParser, LapDataPacket, LapData
+from .lap_parser import LapDataParser, LapDataPacket, LapData, LazyLapDataPacket, LazyLapData
 from .history_parser import SessionHistoryParser, SessionHistoryData, LapHistoryData
 from .participant_parser import ParticipantsParser, ParticipantsPacket, ParticipantData
 from .car_parser import CarTelemetryParser, CarTelemetryPacket, CarTelemetryData
+from .event_parser import EventParser, EventPacket, EVENT_DETAILS
+from .status_parser import (
+    CarStatusParser, CarStatusPacket, CarStatusData, CarDamageParser, CarDamagePacket, CarDamageData
+)
+from .numpy_decoder import NUMPY_AVAILABLE, CarArrayPacket, decode_car_arrays
 
 __all__ = [
     'PacketID', 'SessionType', 'Weather', 'DriverStatus', 'ResultStatus', 'EventCode',
     'get_packet_name', 'PacketHeader', 'BaseParser',
+    'RecordSchema', 'RecordArray', 'PacketSchema', 'Section', 'SchemaParser', 'SCHEMAS', 'get_schema',
     'MotionParser', 'MotionExParser', 'MotionPacket', 'MotionExPacket',
     'SessionParser', 'SessionData',
-    'LapDataParser', 'LapDataPacket', 'LapData',
+    'LapDataParser', 'LapDataPacket', 'LapData', 'LazyLapDataPacket', 'LazyLapData',
     'SessionHistoryParser', 'SessionHistoryData', 'LapHistoryData',
     'ParticipantsParser', 'ParticipantsPacket', 'ParticipantData',
-    'CarTelemetryParser', 'CarTelemetryPacket', 'CarTelemetryData'
+    'CarTelemetryParser', 'CarTelemetryPacket', 'CarTelemetryData',
+    'EventParser', 'EventPacket', 'EVENT_DETAILS',
+    'CarStatusParser', 'CarStatusPacket', 'CarStatusData', 'CarDamageParser', 'CarDamagePacket', 'CarDamageData',
+    'NUMPY_AVAILABLE', 'CarArrayPacket', 'decode_car_arrays'
 ]
\ No newline at end of file
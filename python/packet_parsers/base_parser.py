@@ -5,7 +5,7 @@ Basis klasse voor alle packet parsers met gemeenschappelijke functionaliteit
 
 import struct
 from abc import ABC, abstractmethod
-from typing import Optional, Any
+from typing import Optional, Any, FrozenSet, Iterable
 from .packet_header import PacketHeader
 import logging
 
@@ -15,9 +15,34 @@ class BaseParser(ABC):
     Bevat gemeenschappelijke parsing functionaliteit
     """
     
-    def __init__(self):
-        """Initialiseer parser"""
+    # Auto's die parsers van 22-auto packets direct decoderen (None = alle)
+    car_mask: Optional[FrozenSet[int]] = None
+
+    def __init__(self, car_mask: Optional[Iterable[int]] = None):
+        """
+        Initialiseer parser
+
+        Args:
+            car_mask: Optioneel, zie set_car_mask()
+        """
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.set_car_mask(car_mask)
+
+    def set_car_mask(self, car_indices: Optional[Iterable[int]]):
+        """
+        Zet de auto's die direct gedecodeerd worden (alleen 22-auto packets)
+
+        De andere auto's blijven bereikbaar, maar worden pas bij toegang
+        gedecodeerd. Het masker wordt in één keer vervangen, dus een parse
+        in een andere thread ziet het oude of het nieuwe masker.
+
+        Args:
+            car_indices: Auto indices (0-21), of None voor alle auto's
+        """
+        if car_indices is None:
+            self.car_mask = None
+            return
+        self.car_mask = frozenset(index for index in car_indices if self.validate_car_index(index))
     
     @abstractmethod
     def parse(self, header: PacketHeader, payload: bytes) -> Optional[Any]:
@@ -64,7 +89,7 @@ class BaseParser(ABC):
         Parse string van binary data (null-terminated)
         
         Args:
-            data: Binary data
+            data: Binary data (bytes of memoryview)
             offset: Start offset
             length: Maximum lengte van string
             
@@ -72,7 +97,7 @@ class BaseParser(ABC):
             Decoded string
         """
         try:
-            string_bytes = data[offset:offset + length]
+            string_bytes = bytes(data[offset:offset + length])
             # Zoek null terminator
             null_pos = string_bytes.find(b'\x00')
             if null_pos >= 0:
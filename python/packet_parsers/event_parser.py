@@ -0,0 +1,122 @@
+"""
+F1 25 Telemetry - Event Parser
+Parse Event packet (ID 3): 4-letter event code plus een union van 12 bytes
+met de details van dat event (EventDataDetails in de F1 25 spec)
+"""
+
+import struct
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+from .base_parser import BaseParser
+from .packet_header import PacketHeader
+from .packet_types import EventCode, PacketID, PACKET_SIZES
+from .schema import RecordSchema
+
+# Event code direct uit het datagram (na de 29-byte header), voor filteren
+# vóór de volledige parse: EVENT_CODE_PEEK.unpack_from(data) -> (b'FTLP',)
+EVENT_CODE_PEEK = struct.Struct('<29x4s')
+
+_PAYLOAD_SIZE = PACKET_SIZES[PacketID.EVENT] - PacketHeader.HEADER_SIZE  # 16 = 4 + 12
+_DETAILS_OFFSET = 4
+
+# --- Union leden per event code (velden 1:1 met de spec, snake_case) ---
+FASTEST_LAP = RecordSchema('FastestLap', [('vehicle_idx', 'uint8'), ('lap_time', 'float')])
+RETIREMENT = RecordSchema('Retirement', [('vehicle_idx', 'uint8'), ('reason', 'uint8')])
+DRS_DISABLED = RecordSchema('DRSDisabled', [('reason', 'uint8')])
+TEAM_MATE_IN_PITS = RecordSchema('TeamMateInPits', [('vehicle_idx', 'uint8')])
+RACE_WINNER = RecordSchema('RaceWinner', [('vehicle_idx', 'uint8')])
+PENALTY = RecordSchema('Penalty', [
+    ('penalty_type', 'uint8'), ('infringement_type', 'uint8'), ('vehicle_idx', 'uint8'),
+    ('other_vehicle_idx', 'uint8'), ('time', 'uint8'), ('lap_num', 'uint8'), ('places_gained', 'uint8'),
+])
+SPEED_TRAP = RecordSchema('SpeedTrap', [
+    ('vehicle_idx', 'uint8'), ('speed', 'float'), ('is_overall_fastest_in_session', 'uint8'),
+    ('is_driver_fastest_in_session', 'uint8'), ('fastest_vehicle_idx_in_session', 'uint8'),
+    ('fastest_speed_in_session', 'float'),
+])
+START_LIGHTS = RecordSchema('StartLights', [('num_lights', 'uint8')])
+DRIVE_THROUGH_SERVED = RecordSchema('DriveThroughPenaltyServed', [('vehicle_idx', 'uint8')])
+STOP_GO_SERVED = RecordSchema('StopGoPenaltyServed', [('vehicle_idx', 'uint8'), ('stop_time', 'float')])
+FLASHBACK = RecordSchema('Flashback', [('flashback_frame_identifier', 'uint32'),
+                                       ('flashback_session_time', 'float')])
+BUTTONS = RecordSchema('Buttons', [('button_status', 'uint32')])
+OVERTAKE = RecordSchema('Overtake', [('overtaking_vehicle_idx', 'uint8'),
+                                     ('being_overtaken_vehicle_idx', 'uint8')])
+SAFETY_CAR = RecordSchema('SafetyCar', [('safety_car_type', 'uint8'), ('event_type', 'uint8')])
+COLLISION = RecordSchema('Collision', [('vehicle1_idx', 'uint8'), ('vehicle2_idx', 'uint8')])
+
+# Event code -> schema van de details (None: event zonder details)
+EVENT_DETAILS: Dict[str, Optional[RecordSchema]] = {
+    EventCode.SESSION_STARTED: None,
+    EventCode.SESSION_ENDED: None,
+    EventCode.FASTEST_LAP: FASTEST_LAP,
+    EventCode.RETIREMENT: RETIREMENT,
+    EventCode.DRS_ENABLED: None,
+    EventCode.DRS_DISABLED: DRS_DISABLED,
+    EventCode.TEAM_MATE_IN_PITS: TEAM_MATE_IN_PITS,
+    EventCode.CHEQUERED_FLAG: None,
+    EventCode.RACE_WINNER: RACE_WINNER,
+    EventCode.PENALTY_ISSUED: PENALTY,
+    EventCode.SPEED_TRAP_TRIGGERED: SPEED_TRAP,
+    EventCode.START_LIGHTS: START_LIGHTS,
+    EventCode.LIGHTS_OUT: None,
+    EventCode.DRIVE_THROUGH_SERVED: DRIVE_THROUGH_SERVED,
+    EventCode.STOP_GO_SERVED: STOP_GO_SERVED,
+    EventCode.FLASHBACK: FLASHBACK,
+    EventCode.BUTTON_STATUS: BUTTONS,
+    EventCode.RED_FLAG: None,
+    EventCode.OVERTAKE: OVERTAKE,
+    EventCode.SAFETY_CAR: SAFETY_CAR,
+    EventCode.COLLISION: COLLISION,
+}
+
+# Ruwe code (bytes) -> (code als str, decode_from van de details of None)
+_DECODERS: Dict[bytes, Tuple[str, Optional[Callable[..., Any]]]] = {
+    code.encode('ascii'): (code, schema.decode_from if schema is not None else None)
+    for code, schema in EVENT_DETAILS.items()
+}
+
+_tuple_new = tuple.__new__
+
+
+class EventPacket(NamedTuple):
+    """
+    Eén event: code (EventCode string) en details (record van het union
+    lid, bijv. FastestLap, of None voor events zonder details)
+    """
+    header: PacketHeader
+    code: str
+    details: Any = None
+
+
+class EventParser(BaseParser):
+    """Parser voor Event packets (ID 3)"""
+
+    def parse(self, header: PacketHeader, payload: bytes) -> Optional[EventPacket]:
+        """
+        Parse event packet
+
+        Args:
+            header: Packet header
+            payload: Packet payload (16 bytes)
+
+        Returns:
+            EventPacket object of None
+        """
+        if not self.validate_payload_size(payload, _PAYLOAD_SIZE):
+            return None
+
+        raw_code = bytes(payload[:_DETAILS_OFFSET])
+        decoder = _DECODERS.get(raw_code)
+        if decoder is None:
+            # Onbekende (nieuwere) code: wel doorgeven, zonder details
+            code = raw_code.decode('ascii', 'replace')
+            self.logger.debug(f"Onbekende event code: {code}")
+            return _tuple_new(EventPacket, (header, code, None))
+
+        code, decode_from = decoder
+        try:
+            details = decode_from(payload, _DETAILS_OFFSET) if decode_from is not None else None
+        except struct.error as e:
+            self.logger.error(f"Event {code} unpack fout: {e}")
+            return None
+        return _tuple_new(EventPacket, (header, code, details))
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from typing import Optional, List
 from .base_parser import BaseParser
 from .packet_header import PacketHeader
+from .schemas import LAP_HISTORY, TYRE_STINT_HISTORY, SESSION_HISTORY
 import struct # Nodig voor unpack
 
 # Importeer de correcte logger
@@ -19,24 +20,17 @@ except ImportError:
 history_parser_logger = logger_service.get_logger('HistoryParser')
 
 
-@dataclass
-class LapHistoryData:
+@LAP_HISTORY.bind
+class LapHistoryData(LAP_HISTORY.record):
     """
-    Historische lap data met sector validatie.
+    Historische lap data met sector validatie (velden uit schemas.LAP_HISTORY).
     Validatie flags:
     0x01 = Lap Valid
     0x02 = Sector 1 Valid
     0x04 = Sector 2 Valid
     0x08 = Sector 3 Valid
     """
-    lap_time_ms: int
-    sector1_time_ms: int
-    sector1_time_minutes: int
-    sector2_time_ms: int
-    sector2_time_minutes: int
-    sector3_time_ms: int
-    sector3_time_minutes: int
-    lap_valid_bit_flags: int
+    __slots__ = ()
 
     # --- GECORRIGEERDE VALIDATIE FUNCTIES ---
 
@@ -70,12 +64,8 @@ class LapHistoryData:
         """Totale sector 3 tijd in ms"""
         return (self.sector3_time_minutes * 60000) + self.sector3_time_ms
 
-@dataclass
-class TyreStintHistoryData:
-    """Tyre stint history"""
-    end_lap: int
-    tyre_actual_compound: int
-    tyre_visual_compound: int
+# Tyre stint history (NamedTuple uit het schema)
+TyreStintHistoryData = TYRE_STINT_HISTORY.record
 
 @dataclass
 class SessionHistoryData:
@@ -94,17 +84,14 @@ class SessionHistoryData:
 class SessionHistoryParser(BaseParser):
     """Parser voor Session History packets (ID 11)"""
 
-    # Format voor één LapHistoryData (14 bytes) [cite: 4455-4462]
-    LAP_HISTORY_FORMAT = "<IHBHBHBB"
-    LAP_HISTORY_SIZE = struct.calcsize(LAP_HISTORY_FORMAT) # 14 bytes
-
-    # Format voor één TyreStintHistoryData (3 bytes) [cite: 4464-4466]
-    TYRE_STINT_FORMAT = "<BBB"
-    TYRE_STINT_SIZE = struct.calcsize(TYRE_STINT_FORMAT) # 3 bytes
+    # Formats uit schemas.SESSION_HISTORY: LapHistoryData (14 bytes), TyreStintHistoryData (3 bytes)
+    LAP_HISTORY_FORMAT = LAP_HISTORY.struct.format
+    LAP_HISTORY_SIZE = LAP_HISTORY.size
+    TYRE_STINT_FORMAT = TYRE_STINT_HISTORY.struct.format
+    TYRE_STINT_SIZE = TYRE_STINT_HISTORY.size
 
-    # Totale grootte [cite: 4467-4475]
-    # Header (7) + Laps (100 * 14) + Stints (8 * 3) = 7 + 1400 + 24 = 1431 bytes
-    TOTAL_PAYLOAD_SIZE = 1431
+    # Header (7) + Laps (100 * 14) + Stints (8 * 3) = 1431 bytes
+    TOTAL_PAYLOAD_SIZE = SESSION_HISTORY.payload_size
 
     def __init__(self):
         """Initialiseer de logger voor deze parser."""
@@ -122,54 +109,20 @@ class SessionHistoryParser(BaseParser):
              return None
 
         try:
-            # Parse header info (7 bytes) [cite: 4468-4474]
-            offset = 0
-            header_data = struct.unpack_from("<BBBBBBB", payload, offset)
-            offset += 7
-
-            car_idx, num_laps, num_tyre_stints, best_lap_time_lap_num, \
-            best_sector1_lap_num, best_sector2_lap_num, best_sector3_lap_num = header_data
+            # Header (7 bytes), 100 lap slots en 8 stint slots; het schema
+            # knipt de lijsten af op num_laps en num_tyre_stints
+            head, lap_history, tyre_stints = SESSION_HISTORY.unpack(payload)
 
             # Valideer car index (0-21)
-            if not (0 <= car_idx <= 21):
-                self.logger.warning(f"Ongeldige car_idx: {car_idx}")
+            if not (0 <= head.car_idx <= 21):
+                self.logger.warning(f"Ongeldige car_idx: {head.car_idx}")
                 return None
 
-            # Parse lap history (altijd 100 slots lezen) [cite: 4475]
-            lap_history = []
-            for lap_num in range(100):
-                lap_data = struct.unpack_from(self.LAP_HISTORY_FORMAT, payload, offset)
-                offset += self.LAP_HISTORY_SIZE
-
-                # Voeg alleen toe als het binnen de gerapporteerde num_laps valt
-                if lap_num < num_laps:
-                    lap_history.append(LapHistoryData(*lap_data))
-
-            # Parse tyre stints (altijd 8 slots lezen) [cite: 4475]
-            tyre_stints = []
-            for stint_num in range(8):
-                stint_data = struct.unpack_from(self.TYRE_STINT_FORMAT, payload, offset)
-                offset += self.TYRE_STINT_SIZE
-
-                if stint_num < num_tyre_stints:
-                    tyre_stints.append(TyreStintHistoryData(*stint_data))
-
-            return SessionHistoryData(
-                header=header,
-                car_idx=car_idx,
-                num_laps=num_laps,
-                num_tyre_stints=num_tyre_stints,
-                best_lap_time_lap_num=best_lap_time_lap_num,
-                best_sector1_lap_num=best_sector1_lap_num,
-                best_sector2_lap_num=best_sector2_lap_num,
-                best_sector3_lap_num=best_sector3_lap_num,
-                lap_history_data=lap_history,
-                tyre_stints_history_data=tyre_stints
-            )
+            return SessionHistoryData(header, *head, lap_history, tyre_stints)
 
         except struct.error as e:
-            self.logger.error(f"Session history unpack fout: {e}. Offset: {offset}")
+            self.logger.error(f"Session history unpack fout: {e}")
             return None
         except Exception as e:
             self.logger.error(f"Onverwachte session history parse fout: {e}")
-            return None
\ No newline at end of file
+            return None
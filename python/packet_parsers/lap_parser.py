@@ -6,7 +6,9 @@ import struct
 from dataclasses import dataclass
 from .base_parser import BaseParser
 from .packet_header import PacketHeader
-from typing import List, Optional
+from .packet_types import MAX_CARS
+from .schemas import LAP_DATA, LAP_DATA_TAIL, LAP_DATA_PACKET
+from typing import Iterable, Iterator, List, Optional
 
 # Importeer de correcte logger
 try:
@@ -17,62 +19,24 @@ except ImportError:
 
 lap_parser_logger = logger_service.get_logger('LapParser')
 
+# Uit het schema: één LapData (57 bytes) en de PB/Rival indices na de 22 auto's
+LAP_DATA_STRUCT = LAP_DATA.struct
+LAP_TAIL_STRUCT = LAP_DATA_TAIL.struct
+_TAIL_OFFSET = LAP_DATA_PACKET.offsets['tail']   # 1254 = 22 x 57
+_PAYLOAD_SIZE = LAP_DATA_PACKET.payload_size     # 1256
 
-@dataclass
-class LapData:
+
+@LAP_DATA.bind
+class LapData(LAP_DATA.record):
     """
-    Dataclass for the lap data of one car.
+    Record for the lap data of one car.
     (F1 25 structuur, 57 bytes, 1:1 met C++ spec)
-
+    Velden en defaults komen uit schemas.LAP_DATA (NamedTuple, geen __dict__).
     """
-    # Het C-struct format (o.b.v. F1 25 Telemetry Output Structures.txt)
-    # II (2*4=8)
-    # HBHBHBHB ( (2+1)*4 = 12 )
-    # fff (3*4=12)
-    # BBBBBBBBBBBBBBB (15*1=15)
-    # HH (2*2=4)
-    # B (1)
-    # f (4)
-    # B (1)
-    # Totaal: 8 + 12 + 12 + 15 + 4 + 1 + 4 + 1 = 57 bytes.
-    STRUCT_FORMAT = '<IIHBHBHBHBfffBBBBBBBBBBBBBBBHHBfB'
-    PACKET_LEN = struct.calcsize(STRUCT_FORMAT) # = 57 bytes
-
-    last_lap_time_ms: int = 0             # uint32 [cite: 8230]
-    current_lap_time_ms: int = 0          # uint32 [cite: 8231]
-    sector1_time_ms: int = 0              # uint16 [cite: 8232]
-    sector1_time_minutes: int = 0         # uint8 [cite: 8233]
-    sector2_time_ms: int = 0              # uint16 [cite: 8234]
-    sector2_time_minutes: int = 0         # uint8 [cite: 8235]
-    delta_to_car_in_front_ms: int = 0     # uint16 [cite: 8236]
-    delta_to_car_in_front_minutes: int = 0 # uint8 [cite: 8237]
-    delta_to_race_leader_ms: int = 0      # uint16 [cite: 8238]
-    delta_to_race_leader_minutes: int = 0  # uint8 [cite: 8239]
-    lap_distance: float = 0.0             # float [cite: 8240]
-    total_distance: float = 0.0           # float [cite: 8241]
-    safety_car_delta: float = 0.0         # float [cite: 8242]
-    car_position: int = 0                 # uint8 [cite: 8243]
-    current_lap_num: int = 0              # uint8 [cite: 8244]
-    pit_status: int = 0                   # uint8 [cite: 8245]
-    num_pit_stops: int = 0                # uint8 [cite: 8246]
-    sector: int = 0                       # uint8 [cite: 8247]
-    current_lap_invalid: int = 0          # uint8 [cite: 8248]
-    penalties: int = 0                    # uint8 [cite: 8249]
-    total_warnings: int = 0               # uint8 [cite: 8250]
-    corner_cutting_warnings: int = 0      # uint8 [cite: 8251]
-    num_unserved_drive_through_pens: int = 0 # uint8 [cite: 8252]
-    num_unserved_stop_go_pens: int = 0    # uint8 [cite: 8253]
-    grid_position: int = 0                # uint8 [cite: 8254]
-    driver_status: int = 0                # uint8 [cite: 8255]
-    result_status: int = 0                # uint8 [cite: 8256]
-    pit_lane_timer_active: int = 0        # uint8 [cite: 8257]
-    pit_lane_time_in_lane_ms: int = 0     # uint16 [cite: 8258]
-    pit_stop_timer_ms: int = 0            # uint16 [cite: 8259]
-    pit_stop_should_serve_pen: int = 0    # uint8 [cite: 8260]
-    speed_trap_fastest_speed: float = 0.0 # float [cite: 8261]
-    speed_trap_fastest_lap: int = 0       # uint8 [cite: 8262]
-
-    # Aantal velden: 33
+    __slots__ = ()
+
+    STRUCT_FORMAT = LAP_DATA_STRUCT.format
+    PACKET_LEN = LAP_DATA_STRUCT.size # = 57 bytes, 33 velden
 
     @staticmethod
     def from_bytes(data: bytes) -> 'LapData':
@@ -85,11 +49,8 @@ class LapData:
             return LapData()
 
         try:
-            # Unpack de 57 bytes in één keer
-            unpacked_data = struct.unpack(LapData.STRUCT_FORMAT, data[:LapData.PACKET_LEN])
-
-            # Maak het LapData object aan
-            return LapData(*unpacked_data)
+            # Unpack de 57 bytes in één keer, direct naar een LapData
+            return LAP_DATA.decode_from(data, 0)
 
         except struct.error as e:
             lap_parser_logger.error(f"LapData unpack failed (Struct-based, 57-byte): {e}. Data len: {len(data)}")
@@ -98,6 +59,18 @@ class LapData:
             lap_parser_logger.error(f"Onverwachte fout in LapData.from_bytes: {e}")
             return LapData()
 
+    @staticmethod
+    def from_buffer(buffer, offset: int = 0) -> 'LapData':
+        """
+        Unpackt 57 bytes vanaf 'offset' in buffer (bytes of memoryview),
+        zonder eerst een slice (kopie) te maken.
+        """
+        try:
+            return LAP_DATA.decode_from(buffer, offset)
+        except struct.error as e:
+            lap_parser_logger.error(f"LapData unpack failed op offset {offset}: {e}. Data len: {len(buffer)}")
+            return LapData()
+
 @dataclass
 class LapDataPacket(BaseParser):
     """
@@ -109,7 +82,7 @@ class LapDataPacket(BaseParser):
     time_trial_pb_car_idx: Optional[int] = None   # [cite: 8266]
     time_trial_rival_car_idx: Optional[int] = None # [cite: 8267]
 
-    def __init__(self, header: PacketHeader, data: bytes):
+    def __init__(self, header: PacketHeader, data: bytes, car_mask: Optional[Iterable[int]] = None):
         self.header = header
 
         # De totale payload (data) MOET 1256 bytes zijn.
@@ -121,49 +94,161 @@ class LapDataPacket(BaseParser):
         if not self.validate_payload_size(data):
             return
 
-        self.parse(data)
+        self.parse(data, car_mask)
 
     def validate_payload_size(self, data: bytes) -> bool:
         """Controleert de payload size (1256 bytes)."""
 
-        # 1256 bytes = (22 * 57 bytes) + 1 byte + 1 byte
-        total_expected_payload = (LapData.PACKET_LEN * 22) + 2
-
-        if len(data) != total_expected_payload:
+        if len(data) != _PAYLOAD_SIZE:
             lap_parser_logger.warning(
-                f"LapDataPacket payload size incorrect. Expected {total_expected_payload} (1256), Got {len(data)}"
+                f"LapDataPacket payload size incorrect. Expected {_PAYLOAD_SIZE}, Got {len(data)}"
             )
             return False
         return True
 
-    def parse(self, data: bytes):
-        """Parse de volledige 1256-byte payload."""
+    def parse(self, data: bytes, car_mask: Optional[Iterable[int]] = None):
+        """
+        Parse de volledige 1256-byte payload.
+        Met een car_mask is lap_data een RecordArray: alleen die auto's
+        worden direct gedecodeerd, de rest bij toegang.
+        """
 
         # 1. Parse de 22 auto's (1254 bytes)
-        for i in range(22):
-            start = i * LapData.PACKET_LEN # Stride is nu 57
-            end = start + LapData.PACKET_LEN
-
-            # We hoeven end niet te checken, want validate_payload_size()
-            # heeft al gegarandeerd dat data lang genoeg is.
-            car_data_bytes = data[start:end]
-            self.lap_data.append(LapData.from_bytes(car_data_bytes))
+        # iter_unpack over een view: geen slice (kopie) per auto en één C-lus voor alle auto's.
+        # validate_payload_size() heeft al gegarandeerd dat data lang genoeg is.
+        view = memoryview(data)
+        if car_mask is None:
+            self.lap_data = LAP_DATA.decode_array(view[:_TAIL_OFFSET])
+        else:
+            self.lap_data = LAP_DATA.decode_masked(view, MAX_CARS, car_mask)
 
         # 2. Parse de laatste 2 bytes
         try:
-            pb_rival_offset = LapData.PACKET_LEN * 22 # 1254
-            self.time_trial_pb_car_idx = struct.unpack_from('<B', data, pb_rival_offset)[0]
-            self.time_trial_rival_car_idx = struct.unpack_from('<B', data, pb_rival_offset + 1)[0]
+            self.time_trial_pb_car_idx, self.time_trial_rival_car_idx = LAP_TAIL_STRUCT.unpack_from(view, _TAIL_OFFSET)
         except struct.error as e:
             lap_parser_logger.error(f"Fout bij parsen van PB/Rival index: {e}")
         except Exception as e:
             lap_parser_logger.error(f"Onverwachte fout bij PB/Rival parse: {e}")
 
 
-class LapDataParser:
+class _LazyField:
+    """
+    Non-data descriptor voor één LapData veld: decodeert het veld bij de
+    eerste toegang en zet de waarde in de __dict__ van de instantie, zodat
+    elke volgende toegang een gewone attribuut lookup is (per-instance cache).
+    """
+    __slots__ = ('name', 'offset', 'unpack_from')
+
+    def __init__(self, name: str, code: str, offset: int):
+        self.name = name
+        self.offset = offset
+        self.unpack_from = struct.Struct('<' + code).unpack_from
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.unpack_from(instance._buffer, instance._offset + self.offset)[0]
+        instance.__dict__[self.name] = value
+        return value
+
+
+class LazyLapData:
+    """
+    LapData van één auto met dezelfde attributen, maar zonder vooraf te
+    decoderen: alleen de velden die gelezen worden kosten een unpack.
+    """
+
+    def __init__(self, buffer: bytes, offset: int = 0):
+        self._buffer = buffer
+        self._offset = offset
+
+    def to_lap_data(self) -> LapData:
+        """Volledig gedecodeerde LapData (alle 33 velden)"""
+        return LAP_DATA.decode_from(self._buffer, self._offset)
+
+    def __repr__(self) -> str:
+        return f"Lazy{self.to_lap_data()!r}"
+
+
+# Eén descriptor per LapData veld, op de offset uit het struct format
+_field_offset = 0
+for _field, _code in zip(LapData._fields, LAP_DATA_STRUCT.format.lstrip('<')):
+    setattr(LazyLapData, _field, _LazyField(_field, _code, _field_offset))
+    _field_offset += struct.calcsize('<' + _code)
+del _field, _code, _field_offset
+
+
+class LazyLapDataList:
+    """Lijst van 22 LazyLapData; een auto wordt pas bij toegang aangemaakt (en bewaard)"""
+
+    def __init__(self, buffer: bytes):
+        self._buffer = buffer
+        self._cars: List[Optional[LazyLapData]] = [None] * 22
+
+    def __len__(self) -> int:
+        return 22
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(22))]
+        car = self._cars[index]
+        if car is None:
+            if index < 0:
+                index += 22
+            car = self._cars[index] = LazyLapData(self._buffer, index * LapData.PACKET_LEN)
+        return car
+
+    def __iter__(self) -> Iterator[LazyLapData]:
+        for index in range(22):
+            yield self[index]
+
+
+class LazyLapDataPacket:
+    """
+    Packet 2 met dezelfde attributen als LapDataPacket, maar lazy: de
+    payload wordt één keer gekopieerd (de ontvangstbuffer wordt hergebruikt)
+    en auto's en velden worden pas bij gebruik gedecodeerd.
+    """
+
+    def __init__(self, header: PacketHeader, data: bytes):
+        self.header = header
+        self._buffer = bytes(data)
+        self.lap_data = LazyLapDataList(self._buffer)
+
+    @property
+    def time_trial_pb_car_idx(self) -> int:
+        return self._buffer[_TAIL_OFFSET]
+
+    @property
+    def time_trial_rival_car_idx(self) -> int:
+        return self._buffer[_TAIL_OFFSET + 1]
+
+
+class LapDataParser(BaseParser):
     """
     Parser voor Lap Data Packet (Packet 2).
+
+    Met lazy=True levert parse() een LazyLapDataPacket: de kosten schalen
+    dan met de velden die gelezen worden in plaats van met 22 x 33 velden.
+
+    Met een car_mask (gaat vóór lazy) levert parse() een LapDataPacket
+    waarvan alleen de auto's uit het masker direct gedecodeerd zijn; de
+    andere auto's worden als volledige LapData bij toegang gedecodeerd.
     """
-    def parse(self, header: PacketHeader, data: bytes) -> LapDataPacket:
-        """Parse het pakket en retourneer een LapDataPacket object."""
-        return LapDataPacket(header, data)
\ No newline at end of file
+    def __init__(self, lazy: bool = False, car_mask: Optional[Iterable[int]] = None):
+        super().__init__(car_mask)
+        self.lazy = lazy
+
+    def parse(self, header: PacketHeader, data: bytes):
+        """Parse het pakket en retourneer een LapDataPacket (of LazyLapDataPacket) object."""
+        car_mask = self.car_mask
+        if car_mask is not None:
+            return LapDataPacket(header, data, car_mask)
+        if self.lazy:
+            if len(data) != _PAYLOAD_SIZE:
+                lap_parser_logger.warning(
+                    f"LapDataPacket payload size incorrect. Expected {_PAYLOAD_SIZE}, Got {len(data)}"
+                )
+                return None
+            return LazyLapDataPacket(header, data)
+        return LapDataPacket(header, data)
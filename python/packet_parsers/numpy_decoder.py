@@ -0,0 +1,179 @@
+"""
+F1 25 Telemetry - NumPy Decoder
+Kolomgewijze, zero-copy decodering van de 22-auto packets (Motion, Lap Data,
+Car Setups, Car Telemetry, Car Status, Car Damage) via np.frombuffer met een
+structured dtype die 1:1 de F1 25 layout volgt. De dtypes komen uit de
+packet schemas (schemas.py).
+
+    packet = decode_car_arrays(data)
+    speeds = packet['speed']          # ndarray met 22 snelheden
+    lap = packet.to_packet()          # Object API op dezelfde buffer
+
+NumPy is optioneel: zonder numpy is NUMPY_AVAILABLE False en geeft
+decode_car_arrays een ImportError. De rest van packet_parsers werkt gewoon.
+"""
+
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from .packet_header import PacketHeader
+from .packet_types import PacketID, MAX_CARS
+from .schema import SCHEMAS, SchemaParser
+from . import schemas  # Vult het SCHEMAS register
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+
+def _car_array_schemas():
+    """
+    (cars, tail) RecordSchema per packet uit het schema register: packets
+    die beginnen met 22 records, eventueel gevolgd door één tail record
+    """
+    result = {}
+    for packet_id, schema in SCHEMAS.items():
+        first, rest = schema.sections[0], schema.sections[1:]
+        if first.count != MAX_CARS or len(rest) > 1 or any(section.count is not None for section in rest):
+            continue
+        result[packet_id] = (first.schema, rest[0].schema if rest else None)
+    return result
+
+
+# Veldnamen volgen de records van de object API; arrays [RL, RR, FL, FR]
+# zijn sub-arrays, dus packet['tyres_pressure'] heeft vorm (22, 4).
+_SCHEMAS = _car_array_schemas()
+
+# Record grootte per auto volgens de spec, ter controle van de dtypes
+CAR_RECORD_SIZES = {
+    PacketID.MOTION: 60,
+    PacketID.LAP_DATA: 57,
+    PacketID.CAR_SETUPS: 50,
+    PacketID.CAR_TELEMETRY: 60,
+    PacketID.CAR_STATUS: 55,
+    PacketID.CAR_DAMAGE: 46,
+}
+
+CAR_ARRAY_IDS = frozenset(_SCHEMAS)
+
+if NUMPY_AVAILABLE:
+    # Geen alignment: de game stuurt packed structs
+    CAR_DTYPES: Dict[int, Any] = {packet_id: cars.dtype for packet_id, (cars, _) in _SCHEMAS.items()}
+    TAIL_DTYPES: Dict[int, Any] = {packet_id: tail.dtype for packet_id, (_, tail) in _SCHEMAS.items()
+                                   if tail is not None}
+else:
+    CAR_DTYPES = {}
+    TAIL_DTYPES = {}
+
+
+def _object_parser(packet_id: int):
+    """Parser van de object API voor dit packet type (SchemaParser als er geen eigen parser is)"""
+    if packet_id == PacketID.MOTION:
+        from .motion_parser import MotionParser
+        return MotionParser()
+    if packet_id == PacketID.LAP_DATA:
+        from .lap_parser import LapDataParser
+        return LapDataParser()
+    if packet_id == PacketID.CAR_TELEMETRY:
+        from .car_parser import CarTelemetryParser
+        return CarTelemetryParser()
+    if packet_id == PacketID.CAR_STATUS:
+        from .status_parser import CarStatusParser
+        return CarStatusParser()
+    if packet_id == PacketID.CAR_DAMAGE:
+        from .status_parser import CarDamageParser
+        return CarDamageParser()
+    schema = SCHEMAS.get(packet_id)
+    return SchemaParser(schema) if schema is not None else None
+
+
+_object_parsers: Dict[int, Any] = {}
+
+
+class CarArrayPacket(NamedTuple):
+    """
+    Eén 22-auto packet als kolommen
+
+    cars is een structured ndarray (22 records) en tail een 0-d record met
+    de velden na de auto's (of None). Beide zijn views op de originele
+    buffer: zolang het pakket gebruikt wordt, moet de buffer niet
+    hergebruikt worden (kopieer met cars.copy() om te bewaren).
+    """
+    header: PacketHeader
+    cars: Any
+    tail: Any
+    buffer: Any
+
+    def __getitem__(self, key):
+        """packet['speed'] geeft de kolom van alle auto's; een int geeft het tuple veld"""
+        if isinstance(key, str):
+            if key in self.cars.dtype.names:
+                return self.cars[key]
+            if self.tail is not None and key in self.tail.dtype.names:
+                return self.tail[key]
+            raise KeyError(key)
+        return tuple.__getitem__(self, key)
+
+    @property
+    def packet_id(self) -> int:
+        return self.header.packet_id
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        names = self.cars.dtype.names
+        return names + self.tail.dtype.names if self.tail is not None else names
+
+    def to_packet(self) -> Optional[Any]:
+        """
+        Object API op dezelfde buffer, via de gewone parser (of de SchemaParser)
+
+        Returns:
+            Bijv. LapDataPacket, of None als er (nog) geen parser is
+        """
+        packet_id = self.header.packet_id
+        parser = _object_parsers.get(packet_id)
+        if parser is None:
+            parser = _object_parser(packet_id)
+            if parser is None:
+                return None
+            _object_parsers[packet_id] = parser
+        return parser.parse(self.header, self.header.get_payload(self.buffer))
+
+
+def decode_car_arrays(data, header: Optional[PacketHeader] = None) -> Optional[CarArrayPacket]:
+    """
+    Decodeer een 22-auto packet zonder kopie
+
+    Args:
+        data: Volledig datagram (bytes, bytearray of memoryview)
+        header: Al geparste header (optioneel)
+
+    Returns:
+        CarArrayPacket, of None als het geen 22-auto packet is of te kort
+
+    Raises:
+        ImportError: Als numpy niet geïnstalleerd is
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy decodering vereist numpy (pip install numpy)")
+
+    if header is None:
+        header = PacketHeader.from_bytes(data)
+        if header is None:
+            return None
+    car_dtype = CAR_DTYPES.get(header.packet_id)
+    if car_dtype is None:
+        return None
+
+    offset = PacketHeader.HEADER_SIZE
+    cars_size = car_dtype.itemsize * MAX_CARS
+    tail_dtype = TAIL_DTYPES.get(header.packet_id)
+    if len(data) < offset + cars_size + (tail_dtype.itemsize if tail_dtype is not None else 0):
+        return None
+
+    cars = np.frombuffer(data, dtype=car_dtype, count=MAX_CARS, offset=offset)
+    tail = None
+    if tail_dtype is not None:
+        tail = np.frombuffer(data, dtype=tail_dtype, count=1, offset=offset + cars_size)[0]
+    return CarArrayPacket(header, cars, tail, data)
@@ -4,15 +4,37 @@ Parse de header van elk UDP packet
 """
 
 import struct
-from dataclasses import dataclass
-from typing import Optional
+from typing import NamedTuple, Optional
 from .packet_types import PACKET_FORMAT_2025, GAME_YEAR
 
-@dataclass
-class PacketHeader:
+# Volledige header, één keer gecompileerd: "<HBBBBBQfIIBB" = 29 bytes
+HEADER_STRUCT = struct.Struct('<HBBBBBQfIIBB')
+
+# Alleen packet_format (offset 0) en packet_id (offset 6), voor filteren
+# vóór de volledige header parse: HEADER_PEEK.unpack_from(data) -> (format, id)
+HEADER_PEEK = struct.Struct('<H4xB')
+
+_tuple_new = tuple.__new__
+
+
+def is_valid_header_values(values: tuple) -> bool:
+    """
+    Zelfde controle als PacketHeader.is_valid, maar op het ruwe unpack tuple
+    (HEADER_STRUCT.unpack_from), dus zonder eerst een PacketHeader te maken
+    """
+    return (
+        values[0] == PACKET_FORMAT_2025 and
+        values[1] == GAME_YEAR and
+        values[5] <= 15 and
+        values[10] <= 21
+    )
+
+
+class PacketHeader(NamedTuple):
     """
     Packet Header structuur (29 bytes)
-    Elke packet begint met deze header
+    Elke packet begint met deze header. NamedTuple: direct uit het unpack
+    tuple gemaakt, zonder keyword argumenten of __dict__.
     """
     packet_format: int          # 2025 voor F1 25
     game_year: int             # 25
@@ -28,42 +50,30 @@ class PacketHeader:
     secondary_player_car_index: int  # Tweede speler (splitscreen), 255 = geen
     
     # Header format: "<HBBBBBQfIIBB" = 29 bytes
-    HEADER_FORMAT = "<HBBBBBQfIIBB"
-    HEADER_SIZE = 29
+    HEADER_FORMAT = HEADER_STRUCT.format
+    HEADER_SIZE = HEADER_STRUCT.size
     
     @classmethod
-    def from_bytes(cls, data: bytes) -> Optional['PacketHeader']:
+    def from_bytes(cls, data: bytes, validate: bool = False) -> Optional['PacketHeader']:
         """
         Parse header van raw bytes
         
         Args:
-            data: Raw packet data (minimaal 29 bytes)
+            data: Raw packet data (minimaal 29 bytes), bytes of memoryview
+            validate: Controleer format, jaar, packet id en speler index op het
+                ruwe tuple; bij een ongeldige header wordt geen object gemaakt
             
         Returns:
-            PacketHeader object of None bij fout
+            PacketHeader object of None bij fout (of ongeldig, met validate)
         """
-        if len(data) < cls.HEADER_SIZE:
-            return None
-        
         try:
-            unpacked = struct.unpack(cls.HEADER_FORMAT, data[:cls.HEADER_SIZE])
-            
-            return cls(
-                packet_format=unpacked[0],
-                game_year=unpacked[1],
-                game_major_version=unpacked[2],
-                game_minor_version=unpacked[3],
-                packet_version=unpacked[4],
-                packet_id=unpacked[5],
-                session_uid=unpacked[6],
-                session_time=unpacked[7],
-                frame_identifier=unpacked[8],
-                overall_frame_identifier=unpacked[9],
-                player_car_index=unpacked[10],
-                secondary_player_car_index=unpacked[11]
-            )
+            values = HEADER_STRUCT.unpack_from(data, 0)
         except struct.error:
+            # Korter dan 29 bytes
+            return None
+        if validate and not is_valid_header_values(values):
             return None
+        return _tuple_new(cls, values)
     
     def is_valid(self) -> bool:
         """
@@ -72,24 +82,19 @@ class PacketHeader:
         Returns:
             bool: True als header correct is
         """
-        return (
-            self.packet_format == PACKET_FORMAT_2025 and
-            self.game_year == GAME_YEAR and
-            0 <= self.packet_id <= 15 and
-            0 <= self.player_car_index <= 21
-        )
+        return is_valid_header_values(self)
     
-    def get_payload(self, data: bytes) -> bytes:
+    def get_payload(self, data: bytes) -> memoryview:
         """
-        Verkrijg packet data zonder header
+        Verkrijg packet data zonder header (zonder kopie)
         
         Args:
-            data: Volledige packet data
+            data: Volledige packet data (bytes, bytearray of memoryview)
             
         Returns:
-            bytes: Payload zonder header
+            memoryview: Payload zonder header, deelt het geheugen met data
         """
-        return data[self.HEADER_SIZE:]
+        return memoryview(data)[self.HEADER_SIZE:]
     
     def __repr__(self) -> str:
         """String representatie voor debugging"""
@@ -90,6 +90,8 @@ class EventCode:
     BUTTON_STATUS = "BUTN"
     RED_FLAG = "RDFL"
     OVERTAKE = "OVTK"
+    SAFETY_CAR = "SCAR"
+    COLLISION = "COLL"
 
 # Packet header constanten
 PACKET_FORMAT_2025 = 2025
@@ -97,22 +99,22 @@ GAME_YEAR = 25
 MAX_CARS = 22
 MAX_NAME_LENGTH = 32
 
-# Packet sizes (in bytes) voor validatie
+# Packet sizes (in bytes, inclusief header) voor validatie, volgens de F1 25 spec
 PACKET_SIZES = {
     PacketID.MOTION: 1349,
-    PacketID.SESSION: 644,
-    PacketID.LAP_DATA: 1131,
+    PacketID.SESSION: 753,
+    PacketID.LAP_DATA: 1285,
     PacketID.EVENT: 45,
-    PacketID.PARTICIPANTS: 1306,
-    PacketID.CAR_SETUPS: 1107,
+    PacketID.PARTICIPANTS: 1284,
+    PacketID.CAR_SETUPS: 1133,
     PacketID.CAR_TELEMETRY: 1352,
     PacketID.CAR_STATUS: 1239,
-    PacketID.FINAL_CLASSIFICATION: 1020,
-    PacketID.LOBBY_INFO: 1218,
-    PacketID.CAR_DAMAGE: 953,
+    PacketID.FINAL_CLASSIFICATION: 1042,
+    PacketID.LOBBY_INFO: 954,
+    PacketID.CAR_DAMAGE: 1041,
     PacketID.SESSION_HISTORY: 1460,
     PacketID.TYRE_SETS: 231,
-    PacketID.MOTION_EX: 217,
+    PacketID.MOTION_EX: 273,
     PacketID.TIME_TRIAL: 101,
     PacketID.LAP_POSITIONS: 1131
 }
@@ -26,7 +26,7 @@ class LapPositionsData:
     @staticmethod
     def from_bytes(data: bytes) -> 'LapPositionsData':
         """Unpackt de positie data."""
-        num_laps, lap_start = struct.unpack('<BB', data[:2])
+        num_laps, lap_start = struct.unpack_from('<BB', data, 0)
 
         offset = 2
         max_laps = 50 # cs_maxNumLapsInLapPositionsHistoryPacket
@@ -35,7 +35,7 @@ class LapPositionsData:
         try:
             # Lees de volledige 50x22 byte array
             expected_len = max_laps * max_cars
-            position_flat_list = struct.unpack('<' + ('B' * expected_len), data[offset:offset + expected_len])
+            position_flat_list = struct.unpack_from(f'<{expected_len}B', data, offset)
         except struct.error as e:
             # Data is korter dan verwacht (komt voor bij P15)
             # Maak een lege grid
@@ -0,0 +1,344 @@
+"""
+F1 25 Telemetry - Packet Schema
+Declaratieve beschrijving van een packet: per record de velden (naam, C type,
+array lengte). Uit één schema worden gegenereerd:
+- de gecompileerde struct.Struct en de record grootte
+- de record class (NamedTuple) en een gegenereerde decoder
+- het numpy dtype (alleen als numpy geïnstalleerd is)
+- de verwachte payload grootte en de validatie daarvan
+
+De schema entries zelf staan in schemas.py; een nieuw packet type is daar
+één register(PacketSchema(...)) plus de records die het gebruikt.
+"""
+
+import struct
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from .base_parser import BaseParser
+from .packet_header import PacketHeader
+
+# C type -> (struct code, numpy code, default waarde)
+C_TYPES = {
+    'uint8': ('B', 'u1', 0),
+    'int8': ('b', 'i1', 0),
+    'bool': ('?', '?', False),
+    'uint16': ('H', '<u2', 0),
+    'int16': ('h', '<i2', 0),
+    'uint32': ('I', '<u4', 0),
+    'int32': ('i', '<i4', 0),
+    'uint64': ('Q', '<u8', 0),
+    'float': ('f', '<f4', 0.0),
+    'double': ('d', '<f8', 0.0),
+    'char': ('s', 'S', ''),  # char[n]: null-terminated UTF-8 string
+}
+
+
+class Field(NamedTuple):
+    """Eén veld: naam (snake_case), C type uit C_TYPES, array lengte (1 = scalar)"""
+    name: str
+    ctype: str
+    count: int = 1
+
+
+def _text(raw: bytes) -> str:
+    """char[n] naar str: tot de eerste null byte"""
+    return raw.split(b'\x00', 1)[0].decode('utf-8', 'ignore')
+
+
+class RecordSchema:
+    """
+    Schema van één C struct (bijv. één auto in een 22-auto packet)
+
+    Arrays worden tuples in het record, char[n] wordt str. Records zonder
+    arrays en strings worden direct uit het unpack tuple gemaakt.
+    """
+
+    def __init__(self, name: str, fields: Sequence[Any], defaults: bool = False):
+        """
+        Args:
+            name: Naam van de record class
+            fields: Field objecten of tuples (naam, ctype[, count])
+            defaults: Geef elk veld een nul-default (Record() is dan geldig)
+        """
+        self.name = name
+        self.fields: Tuple[Field, ...] = tuple(Field(*field) for field in fields)
+
+        codes = []
+        for field in self.fields:
+            if field.ctype not in C_TYPES:
+                raise ValueError(f"{name}.{field.name}: onbekend C type '{field.ctype}'")
+            code = C_TYPES[field.ctype][0]
+            if field.ctype == 'char':
+                codes.append(f"{field.count}s")
+            else:
+                codes.append(f"{field.count}{code}" if field.count > 1 else code)
+        self.struct = struct.Struct('<' + ''.join(codes))
+        self.size = self.struct.size
+        self.names = tuple(field.name for field in self.fields)
+        self.default_values = tuple(self._default(field) for field in self.fields) if defaults else None
+
+        self.record = namedtuple(name, self.names, defaults=self.default_values)
+        self._compile()
+
+    @staticmethod
+    def _default(field: Field) -> Any:
+        value = C_TYPES[field.ctype][2]
+        return (value,) * field.count if field.count > 1 and field.ctype != 'char' else value
+
+    @property
+    def is_flat(self) -> bool:
+        """True als elk veld één struct waarde is (geen arrays of strings)"""
+        return all(field.count == 1 and field.ctype != 'char' for field in self.fields)
+
+    def bind(self, cls):
+        """
+        Class decorator: gebruik een subclass van self.record (met methodes of
+        constanten) als record type. De subclass moet __slots__ = () zetten.
+        """
+        if not issubclass(cls, self.record):
+            raise TypeError(f"{cls.__name__} moet een subclass van {self.record.__name__} zijn")
+        self.record = cls
+        self._compile()
+        return cls
+
+    def _compile(self):
+        """Genereer decode(values), decode_from(buffer, offset) en decode_array(view)"""
+        if self.is_flat:
+            values = "u"
+        else:
+            parts = []
+            index = 0
+            for field in self.fields:
+                if field.ctype == 'char':
+                    parts.append(f"_text(u[{index}])")
+                    index += 1
+                elif field.count > 1:
+                    parts.append(f"u[{index}:{index + field.count}]")
+                    index += field.count
+                else:
+                    parts.append(f"u[{index}]")
+                    index += 1
+            values = "(" + ", ".join(parts) + ",)"
+
+        source = (
+            f"def decode(u):\n"
+            f"    return _new(_cls, {values})\n"
+            f"def decode_from(buffer, offset=0):\n"
+            f"    u = _unpack_from(buffer, offset)\n"
+            f"    return _new(_cls, {values})\n"
+            f"def decode_array(view):\n"
+            f"    return [_new(_cls, {values}) for u in _iter_unpack(view)]\n"
+        )
+        namespace = {
+            '_new': tuple.__new__, '_cls': self.record, '_text': _text,
+            '_unpack_from': self.struct.unpack_from, '_iter_unpack': self.struct.iter_unpack,
+        }
+        exec(compile(source, f"<schema {self.name}>", 'exec'), namespace)
+        self.decode: Callable[[tuple], Any] = namespace['decode']
+        self.decode_from: Callable[..., Any] = namespace['decode_from']
+        self.decode_array: Callable[[Any], List[Any]] = namespace['decode_array']
+
+    def decode_masked(self, view, count: int, mask) -> 'RecordArray':
+        """
+        Decodeer van count records alleen de indices in mask; de rest pas bij toegang
+
+        Args:
+            view: Buffer met minstens count records (bytes of memoryview)
+            count: Aantal records in de array (bijv. 22 auto's)
+            mask: Indices die direct gedecodeerd worden
+        """
+        return RecordArray(self, view, count, mask)
+
+    @property
+    def dtype(self):
+        """
+        numpy structured dtype met dezelfde veldnamen (arrays als sub-arrays)
+
+        Raises:
+            ImportError: Als numpy niet geïnstalleerd is
+        """
+        import numpy as np
+        descr = []
+        for field in self.fields:
+            code = C_TYPES[field.ctype][1]
+            if field.ctype == 'char':
+                descr.append((field.name, f"S{field.count}"))
+            elif field.count > 1:
+                descr.append((field.name, code, (field.count,)))
+            else:
+                descr.append((field.name, code))
+        return np.dtype(descr)
+
+    def __repr__(self) -> str:
+        return f"RecordSchema({self.name}, {self.size} bytes, '{self.struct.format}')"
+
+
+class RecordArray:
+    """
+    Array van records (bijv. 22 auto's) waarvan alleen de indices uit een
+    masker direct gedecodeerd zijn. De andere records worden bij de eerste
+    toegang gedecodeerd en bewaard; voor de lezer gedraagt het zich als de
+    gewone lijst records.
+
+    Houdt een eigen kopie van de bytes, want de ontvangstbuffer wordt
+    hergebruikt.
+    """
+    __slots__ = ('_decode_from', '_size', '_buffer', '_records')
+
+    def __init__(self, schema: RecordSchema, view, count: int, mask):
+        self._decode_from = schema.decode_from
+        self._size = schema.size
+        self._buffer = bytes(view[:schema.size * count])
+        records: List[Any] = [None] * count
+        for index in mask:
+            if 0 <= index < count:
+                records[index] = self._decode_from(self._buffer, index * self._size)
+        self._records = records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._records)))]
+        record = self._records[index]
+        if record is None:
+            if index < 0:
+                index += len(self._records)
+            record = self._records[index] = self._decode_from(self._buffer, index * self._size)
+        return record
+
+    def __iter__(self):
+        for index in range(len(self._records)):
+            yield self[index]
+
+    def decoded(self) -> List[int]:
+        """Indices die al gedecodeerd zijn (masker plus gelezen records)"""
+        return [index for index, record in enumerate(self._records) if record is not None]
+
+    def __repr__(self) -> str:
+        return f"RecordArray({len(self._records)} records, gedecodeerd: {self.decoded()})"
+
+
+class Section(NamedTuple):
+    """
+    Eén deel van de payload: één record (count None) of een array van records.
+    limit: naam van een veld uit een eerder enkel record met het aantal
+    gebruikte records (bijv. 'num_laps'); de rest van de array wordt weggelaten.
+    """
+    name: str
+    schema: RecordSchema
+    count: Optional[int] = None
+    limit: Optional[str] = None
+
+
+class PacketSchema:
+    """Schema van een volledige payload (alles na de 29-byte header)"""
+
+    def __init__(self, packet_id: int, name: str, sections: Sequence[Section]):
+        self.packet_id = packet_id
+        self.name = name
+        self.sections: Tuple[Section, ...] = tuple(sections)
+
+        self.offsets: Dict[str, int] = {}
+        offset = 0
+        singles: Dict[str, int] = {}
+        self._limits: List[Optional[Tuple[int, int]]] = []
+        for index, section in enumerate(self.sections):
+            self.offsets[section.name] = offset
+            offset += section.schema.size * (section.count or 1)
+            if section.count is None:
+                for field_name in section.schema.names:
+                    singles[field_name] = index
+            limit = None
+            if section.limit is not None:
+                if section.limit not in singles:
+                    raise ValueError(f"{name}.{section.name}: limit veld '{section.limit}' niet gevonden")
+                owner = singles[section.limit]
+                limit = (owner, self.sections[owner].schema.names.index(section.limit))
+            self._limits.append(limit)
+        self.payload_size = offset
+        self.packet_size = PacketHeader.HEADER_SIZE + offset
+
+        self.record = namedtuple(name, ('header',) + tuple(section.name for section in self.sections))
+
+    def section(self, name: str) -> Section:
+        """Sectie op naam (KeyError als die niet bestaat)"""
+        for section in self.sections:
+            if section.name == name:
+                return section
+        raise KeyError(name)
+
+    def validate(self, payload) -> bool:
+        """True als de payload minstens de schema grootte heeft"""
+        return len(payload) >= self.payload_size
+
+    def unpack(self, payload) -> List[Any]:
+        """
+        Decodeer alle secties; verwacht een gevalideerde payload.
+
+        Returns:
+            Per sectie een record of een lijst records
+        """
+        view = memoryview(payload)
+        values: List[Any] = []
+        offset = 0
+        for section, limit in zip(self.sections, self._limits):
+            schema = section.schema
+            if section.count is None:
+                values.append(schema.decode_from(view, offset))
+                offset += schema.size
+                continue
+            end = offset + schema.size * section.count
+            records = schema.decode_array(view[offset:end])
+            if limit is not None:
+                records = records[:values[limit[0]][limit[1]]]
+            values.append(records)
+            offset = end
+        return values
+
+    def decode(self, header: PacketHeader, payload) -> Optional[Any]:
+        """Decodeer naar self.record (header + secties), of None als de payload te kort is"""
+        if not self.validate(payload):
+            return None
+        return self.record(header, *self.unpack(payload))
+
+    def __repr__(self) -> str:
+        return f"PacketSchema({self.packet_id}, {self.name}, {self.payload_size} bytes)"
+
+
+# Registry: packet_id -> PacketSchema (gevuld door schemas.py)
+SCHEMAS: Dict[int, PacketSchema] = {}
+
+
+def register(schema: PacketSchema) -> PacketSchema:
+    """Registreer een packet schema (één per packet id)"""
+    if schema.packet_id in SCHEMAS:
+        raise ValueError(f"Schema voor packet {schema.packet_id} bestaat al")
+    SCHEMAS[schema.packet_id] = schema
+    return schema
+
+
+def get_schema(packet_id: int) -> Optional[PacketSchema]:
+    """Schema voor een packet id, of None"""
+    return SCHEMAS.get(packet_id)
+
+
+class SchemaParser(BaseParser):
+    """
+    Parser die volledig uit een PacketSchema komt: geeft schema.record terug
+    (header + één attribuut per sectie).
+    """
+
+    def __init__(self, schema: PacketSchema):
+        super().__init__()
+        self.schema = schema
+
+    def parse(self, header: PacketHeader, payload: bytes) -> Optional[Any]:
+        if not self.validate_payload_size(payload, self.schema.payload_size):
+            return None
+        try:
+            return self.schema.record(header, *self.schema.unpack(payload))
+        except struct.error as e:
+            self.logger.error(f"{self.schema.name} unpack fout: {e}")
+            return None
@@ -0,0 +1,262 @@
+"""
+F1 25 Telemetry - Packet Schemas
+Eén schema per packet, 1:1 met F1 25 Telemetry Output Structures (veldnamen
+in snake_case, arrays [RL, RR, FL, FR] tenzij anders vermeld). De parsers,
+het numpy dtype en de grootte controles komen hieruit (zie schema.py).
+
+Session (1) en Event (3) hebben een eigen parser: geneste weekend arrays
+respectievelijk een union per event code.
+"""
+
+from .packet_types import PacketID, MAX_CARS
+from .schema import RecordSchema, PacketSchema, Section, register
+
+# --- Packet 0: Motion ---
+CAR_MOTION = RecordSchema('CarMotionData', [
+    ('world_position_x', 'float'), ('world_position_y', 'float'), ('world_position_z', 'float'),
+    ('world_velocity_x', 'float'), ('world_velocity_y', 'float'), ('world_velocity_z', 'float'),
+    ('world_forward_dir_x', 'int16'), ('world_forward_dir_y', 'int16'), ('world_forward_dir_z', 'int16'),
+    ('world_right_dir_x', 'int16'), ('world_right_dir_y', 'int16'), ('world_right_dir_z', 'int16'),
+    ('g_force_lateral', 'float'), ('g_force_longitudinal', 'float'), ('g_force_vertical', 'float'),
+    ('yaw', 'float'), ('pitch', 'float'), ('roll', 'float'),
+])
+
+MOTION = register(PacketSchema(PacketID.MOTION, 'MotionPacket', [
+    Section('car_motion_data', CAR_MOTION, MAX_CARS),
+]))
+
+# --- Packet 2: Lap Data ---
+LAP_DATA = RecordSchema('LapData', [
+    ('last_lap_time_ms', 'uint32'), ('current_lap_time_ms', 'uint32'),
+    ('sector1_time_ms', 'uint16'), ('sector1_time_minutes', 'uint8'),
+    ('sector2_time_ms', 'uint16'), ('sector2_time_minutes', 'uint8'),
+    ('delta_to_car_in_front_ms', 'uint16'), ('delta_to_car_in_front_minutes', 'uint8'),
+    ('delta_to_race_leader_ms', 'uint16'), ('delta_to_race_leader_minutes', 'uint8'),
+    ('lap_distance', 'float'), ('total_distance', 'float'), ('safety_car_delta', 'float'),
+    ('car_position', 'uint8'), ('current_lap_num', 'uint8'), ('pit_status', 'uint8'),
+    ('num_pit_stops', 'uint8'), ('sector', 'uint8'), ('current_lap_invalid', 'uint8'),
+    ('penalties', 'uint8'), ('total_warnings', 'uint8'), ('corner_cutting_warnings', 'uint8'),
+    ('num_unserved_drive_through_pens', 'uint8'), ('num_unserved_stop_go_pens', 'uint8'),
+    ('grid_position', 'uint8'), ('driver_status', 'uint8'), ('result_status', 'uint8'),
+    ('pit_lane_timer_active', 'uint8'), ('pit_lane_time_in_lane_ms', 'uint16'),
+    ('pit_stop_timer_ms', 'uint16'), ('pit_stop_should_serve_pen', 'uint8'),
+    ('speed_trap_fastest_speed', 'float'), ('speed_trap_fastest_lap', 'uint8'),
+], defaults=True)
+
+LAP_DATA_TAIL = RecordSchema('LapDataTail', [
+    ('time_trial_pb_car_idx', 'uint8'), ('time_trial_rival_car_idx', 'uint8'),
+])
+
+LAP_DATA_PACKET = register(PacketSchema(PacketID.LAP_DATA, 'LapDataPacket', [
+    Section('lap_data', LAP_DATA, MAX_CARS),
+    Section('tail', LAP_DATA_TAIL),
+]))
+
+# --- Packet 4: Participants ---
+PARTICIPANT = RecordSchema('ParticipantData', [
+    ('ai_controlled', 'bool'), ('driver_id', 'uint8'), ('network_id', 'uint8'),
+    ('team_id', 'uint8'), ('my_team', 'bool'), ('race_number', 'uint8'),
+    ('nationality', 'uint8'), ('name', 'char', 32), ('your_telemetry', 'bool'),
+    ('show_online_names', 'bool'), ('tech_level', 'uint16'), ('platform', 'uint8'),
+    ('num_colours', 'uint8'),
+    ('livery_colours', 'uint8', 12),  # 4 x (R, G, B)
+], defaults=True)
+
+PARTICIPANTS_HEAD = RecordSchema('ParticipantsHead', [('num_active_cars', 'uint8')])
+
+PARTICIPANTS = register(PacketSchema(PacketID.PARTICIPANTS, 'ParticipantsPacket', [
+    Section('head', PARTICIPANTS_HEAD),
+    Section('participants', PARTICIPANT, MAX_CARS),
+]))
+
+# --- Packet 5: Car Setups ---
+CAR_SETUP = RecordSchema('CarSetupData', [
+    ('front_wing', 'uint8'), ('rear_wing', 'uint8'), ('on_throttle', 'uint8'), ('off_throttle', 'uint8'),
+    ('front_camber', 'float'), ('rear_camber', 'float'), ('front_toe', 'float'), ('rear_toe', 'float'),
+    ('front_suspension', 'uint8'), ('rear_suspension', 'uint8'),
+    ('front_anti_roll_bar', 'uint8'), ('rear_anti_roll_bar', 'uint8'),
+    ('front_suspension_height', 'uint8'), ('rear_suspension_height', 'uint8'),
+    ('brake_pressure', 'uint8'), ('brake_bias', 'uint8'), ('engine_braking', 'uint8'),
+    ('rear_left_tyre_pressure', 'float'), ('rear_right_tyre_pressure', 'float'),
+    ('front_left_tyre_pressure', 'float'), ('front_right_tyre_pressure', 'float'),
+    ('ballast', 'uint8'), ('fuel_load', 'float'),
+])
+
+CAR_SETUPS_TAIL = RecordSchema('CarSetupsTail', [('next_front_wing_value', 'float')])
+
+CAR_SETUPS = register(PacketSchema(PacketID.CAR_SETUPS, 'CarSetupsPacket', [
+    Section('car_setups', CAR_SETUP, MAX_CARS),
+    Section('tail', CAR_SETUPS_TAIL),
+]))
+
+# --- Packet 6: Car Telemetry ---
+CAR_TELEMETRY = RecordSchema('CarTelemetryData', [
+    ('speed', 'uint16'), ('throttle', 'float'), ('steer', 'float'), ('brake', 'float'),
+    ('clutch', 'uint8'), ('gear', 'int8'), ('engine_rpm', 'uint16'), ('drs', 'bool'),
+    ('rev_lights_percent', 'uint8'), ('rev_lights_bit_value', 'uint16'),
+    ('brakes_temperature', 'uint16', 4), ('tyres_surface_temperature', 'uint8', 4),
+    ('tyres_inner_temperature', 'uint8', 4), ('engine_temperature', 'uint16'),
+    ('tyres_pressure', 'float', 4), ('surface_type', 'uint8', 4),
+])
+
+CAR_TELEMETRY_TAIL = RecordSchema('CarTelemetryTail', [
+    ('mfd_panel_index', 'uint8'), ('mfd_panel_index_secondary_player', 'uint8'),
+    ('suggested_gear', 'int8'),
+])
+
+CAR_TELEMETRY_PACKET = register(PacketSchema(PacketID.CAR_TELEMETRY, 'CarTelemetryPacket', [
+    Section('car_telemetry_data', CAR_TELEMETRY, MAX_CARS),
+    Section('tail', CAR_TELEMETRY_TAIL),
+]))
+
+# --- Packet 7: Car Status ---
+CAR_STATUS = RecordSchema('CarStatusData', [
+    ('traction_control', 'uint8'), ('anti_lock_brakes', 'uint8'), ('fuel_mix', 'uint8'),
+    ('front_brake_bias', 'uint8'), ('pit_limiter_status', 'uint8'),
+    ('fuel_in_tank', 'float'), ('fuel_capacity', 'float'), ('fuel_remaining_laps', 'float'),
+    ('max_rpm', 'uint16'), ('idle_rpm', 'uint16'), ('max_gears', 'uint8'), ('drs_allowed', 'uint8'),
+    ('drs_activation_distance', 'uint16'), ('actual_tyre_compound', 'uint8'),
+    ('visual_tyre_compound', 'uint8'), ('tyres_age_laps', 'uint8'), ('vehicle_fia_flags', 'int8'),
+    ('engine_power_ice', 'float'), ('engine_power_mguk', 'float'), ('ers_store_energy', 'float'),
+    ('ers_deploy_mode', 'uint8'), ('ers_harvested_this_lap_mguk', 'float'),
+    ('ers_harvested_this_lap_mguh', 'float'), ('ers_deployed_this_lap', 'float'),
+    ('network_paused', 'uint8'),
+])
+
+CAR_STATUS_PACKET = register(PacketSchema(PacketID.CAR_STATUS, 'CarStatusPacket', [
+    Section('car_status_data', CAR_STATUS, MAX_CARS),
+]))
+
+# --- Packet 8: Final Classification ---
+FINAL_CLASSIFICATION = RecordSchema('FinalClassificationData', [
+    ('position', 'uint8'), ('num_laps', 'uint8'), ('grid_position', 'uint8'), ('points', 'uint8'),
+    ('num_pit_stops', 'uint8'), ('result_status', 'uint8'), ('result_reason', 'uint8'),
+    ('best_lap_time_ms', 'uint32'), ('total_race_time', 'double'),
+    ('penalties_time', 'uint8'), ('num_penalties', 'uint8'), ('num_tyre_stints', 'uint8'),
+    ('tyre_stints_actual', 'uint8', 8), ('tyre_stints_visual', 'uint8', 8),
+    ('tyre_stints_end_laps', 'uint8', 8),
+])
+
+FINAL_CLASSIFICATION_HEAD = RecordSchema('FinalClassificationHead', [('num_cars', 'uint8')])
+
+FINAL_CLASSIFICATION_PACKET = register(PacketSchema(PacketID.FINAL_CLASSIFICATION, 'FinalClassificationPacket', [
+    Section('head', FINAL_CLASSIFICATION_HEAD),
+    Section('classification_data', FINAL_CLASSIFICATION, MAX_CARS),
+]))
+
+# --- Packet 9: Lobby Info ---
+LOBBY_INFO = RecordSchema('LobbyInfoData', [
+    ('ai_controlled', 'bool'), ('team_id', 'uint8'), ('nationality', 'uint8'), ('platform', 'uint8'),
+    ('name', 'char', 32), ('car_number', 'uint8'), ('your_telemetry', 'bool'),
+    ('show_online_names', 'bool'), ('tech_level', 'uint16'), ('ready_status', 'uint8'),
+])
+
+LOBBY_INFO_HEAD = RecordSchema('LobbyInfoHead', [('num_players', 'uint8')])
+
+LOBBY_INFO_PACKET = register(PacketSchema(PacketID.LOBBY_INFO, 'LobbyInfoPacket', [
+    Section('head', LOBBY_INFO_HEAD),
+    Section('lobby_players', LOBBY_INFO, MAX_CARS),
+]))
+
+# --- Packet 10: Car Damage ---
+CAR_DAMAGE = RecordSchema('CarDamageData', [
+    ('tyres_wear', 'float', 4), ('tyres_damage', 'uint8', 4), ('brakes_damage', 'uint8', 4),
+    ('tyre_blisters', 'uint8', 4), ('front_left_wing_damage', 'uint8'),
+    ('front_right_wing_damage', 'uint8'), ('rear_wing_damage', 'uint8'), ('floor_damage', 'uint8'),
+    ('diffuser_damage', 'uint8'), ('sidepod_damage', 'uint8'), ('drs_fault', 'uint8'), ('ers_fault', 'uint8'),
+    ('gear_box_damage', 'uint8'), ('engine_damage', 'uint8'), ('engine_mguh_wear', 'uint8'),
+    ('engine_es_wear', 'uint8'), ('engine_ce_wear', 'uint8'), ('engine_ice_wear', 'uint8'),
+    ('engine_mguk_wear', 'uint8'), ('engine_tc_wear', 'uint8'), ('engine_blown', 'uint8'),
+    ('engine_seized', 'uint8'),
+])
+
+CAR_DAMAGE_PACKET = register(PacketSchema(PacketID.CAR_DAMAGE, 'CarDamagePacket', [
+    Section('car_damage_data', CAR_DAMAGE, MAX_CARS),
+]))
+
+# --- Packet 11: Session History ---
+SESSION_HISTORY_HEAD = RecordSchema('SessionHistoryHead', [
+    ('car_idx', 'uint8'), ('num_laps', 'uint8'), ('num_tyre_stints', 'uint8'),
+    ('best_lap_time_lap_num', 'uint8'), ('best_sector1_lap_num', 'uint8'),
+    ('best_sector2_lap_num', 'uint8'), ('best_sector3_lap_num', 'uint8'),
+])
+
+LAP_HISTORY = RecordSchema('LapHistoryData', [
+    ('lap_time_ms', 'uint32'),
+    ('sector1_time_ms', 'uint16'), ('sector1_time_minutes', 'uint8'),
+    ('sector2_time_ms', 'uint16'), ('sector2_time_minutes', 'uint8'),
+    ('sector3_time_ms', 'uint16'), ('sector3_time_minutes', 'uint8'),
+    ('lap_valid_bit_flags', 'uint8'),
+])
+
+TYRE_STINT_HISTORY = RecordSchema('TyreStintHistoryData', [
+    ('end_lap', 'uint8'), ('tyre_actual_compound', 'uint8'), ('tyre_visual_compound', 'uint8'),
+])
+
+SESSION_HISTORY = register(PacketSchema(PacketID.SESSION_HISTORY, 'SessionHistoryPacket', [
+    Section('head', SESSION_HISTORY_HEAD),
+    Section('lap_history_data', LAP_HISTORY, 100, limit='num_laps'),
+    Section('tyre_stints_history_data', TYRE_STINT_HISTORY, 8, limit='num_tyre_stints'),
+]))
+
+# --- Packet 12: Tyre Sets ---
+TYRE_SET = RecordSchema('TyreSetData', [
+    ('actual_tyre_compound', 'uint8'), ('visual_tyre_compound', 'uint8'), ('wear', 'uint8'),
+    ('available', 'uint8'), ('recommended_session', 'uint8'), ('life_span', 'uint8'),
+    ('usable_life', 'uint8'), ('lap_delta_time', 'int16'), ('fitted', 'uint8'),
+])
+
+TYRE_SETS_HEAD = RecordSchema('TyreSetsHead', [('car_idx', 'uint8')])
+TYRE_SETS_TAIL = RecordSchema('TyreSetsTail', [('fitted_idx', 'uint8')])
+
+TYRE_SETS = register(PacketSchema(PacketID.TYRE_SETS, 'TyreSetsPacket', [
+    Section('head', TYRE_SETS_HEAD),
+    Section('tyre_set_data', TYRE_SET, 20),  # 13 droog + 7 nat
+    Section('tail', TYRE_SETS_TAIL),
+]))
+
+# --- Packet 13: Motion Ex (alleen de speler auto) ---
+MOTION_EX_DATA = RecordSchema('MotionExData', [
+    ('suspension_position', 'float', 4), ('suspension_velocity', 'float', 4),
+    ('suspension_acceleration', 'float', 4), ('wheel_speed', 'float', 4),
+    ('wheel_slip_ratio', 'float', 4), ('wheel_slip_angle', 'float', 4),
+    ('wheel_lat_force', 'float', 4), ('wheel_long_force', 'float', 4),
+    ('height_of_cog_above_ground', 'float'),
+    ('local_velocity_x', 'float'), ('local_velocity_y', 'float'), ('local_velocity_z', 'float'),
+    ('angular_velocity_x', 'float'), ('angular_velocity_y', 'float'), ('angular_velocity_z', 'float'),
+    ('angular_acceleration_x', 'float'), ('angular_acceleration_y', 'float'), ('angular_acceleration_z', 'float'),
+    ('front_wheels_angle', 'float'), ('vertical_force', 'float', 4),
+    ('front_aero_height', 'float'), ('rear_aero_height', 'float'),
+    ('front_roll_angle', 'float'), ('rear_roll_angle', 'float'),
+    ('chassis_yaw', 'float'), ('chassis_pitch', 'float'),
+    ('wheel_camber', 'float', 4), ('wheel_camber_gain', 'float', 4),
+])
+
+MOTION_EX = register(PacketSchema(PacketID.MOTION_EX, 'MotionExPacket', [
+    Section('motion_ex_data', MOTION_EX_DATA),
+]))
+
+# --- Packet 14: Time Trial ---
+TIME_TRIAL_DATA_SET = RecordSchema('TimeTrialDataSet', [
+    ('car_idx', 'uint8'), ('team_id', 'uint8'), ('lap_time_ms', 'uint32'),
+    ('sector1_time_ms', 'uint32'), ('sector2_time_ms', 'uint32'), ('sector3_time_ms', 'uint32'),
+    ('traction_control', 'uint8'), ('gearbox_assist', 'uint8'), ('anti_lock_brakes', 'uint8'),
+    ('equal_car_performance', 'uint8'), ('custom_setup', 'uint8'), ('valid', 'uint8'),
+])
+
+TIME_TRIAL = register(PacketSchema(PacketID.TIME_TRIAL, 'TimeTrialPacket', [
+    Section('player_session_best_data_set', TIME_TRIAL_DATA_SET),
+    Section('personal_best_data_set', TIME_TRIAL_DATA_SET),
+    Section('rival_data_set', TIME_TRIAL_DATA_SET),
+]))
+
+# --- Packet 15: Lap Positions ---
+LAP_POSITIONS_HEAD = RecordSchema('LapPositionsHead', [('num_laps', 'uint8'), ('lap_start', 'uint8')])
+
+# Eén rij per ronde: positie van elke auto (0 = geen data)
+LAP_POSITIONS_ROW = RecordSchema('LapPositionsRow', [('position_for_vehicle_idx', 'uint8', MAX_CARS)])
+
+LAP_POSITIONS = register(PacketSchema(PacketID.LAP_POSITIONS, 'LapPositionsPacket', [
+    Section('head', LAP_POSITIONS_HEAD),
+    Section('positions', LAP_POSITIONS_ROW, 50, limit='num_laps'),
+]))
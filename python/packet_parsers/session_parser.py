@@ -11,6 +11,15 @@ from .packet_types import SessionType, Weather
 import struct
 import logging
 
+# Eén keer gecompileerd, in packet volgorde (PacketSessionData, 724 bytes payload).
+# Alleen de velden tot en met numRedFlagPeriods worden uitgepakt; de rest
+# (sessie instellingen, weekend structuur) gebruikt de applicatie niet.
+SESSION_HEAD_STRUCT = struct.Struct("<BbbBHBbBHHBBBBBB")
+MARSHAL_ZONE_STRUCT = struct.Struct("<fb")
+SESSION_MID_STRUCT = struct.Struct("<BBB")
+WEATHER_SAMPLE_STRUCT = struct.Struct("<BBBbbbbB")
+SESSION_FOOTER_STRUCT = struct.Struct("<BBIIIBBBBBBBBBBBBBBIBBBBBBBB")
+
 # Gebruik de logger van de BaseParser, maar definieer deze hier voor SessionData struct
 # zodat de SessionData dataclass er zelf geen afhankelijkheid van heeft.
 
@@ -29,6 +38,8 @@ class WeatherForecastSample:
     track_temperature: int
     air_temperature: int
     rain_percentage: int
+    track_temperature_change: int = 0
+    air_temperature_change: int = 0
 
 @dataclass
 class SessionData:
@@ -101,87 +112,72 @@ class SessionParser(BaseParser):
     
     # 21 Marshal Zones
     NUM_MARSHAL_ZONES = 21
-    MARSHAL_ZONE_FORMAT = "<fb" # float zoneStart, int8 zoneFlag (5 bytes)
+    MARSHAL_ZONE_FORMAT = MARSHAL_ZONE_STRUCT.format # float zoneStart, int8 zoneFlag (5 bytes)
     
-    # 20 Weather Forecast Samples
-    NUM_WEATHER_SAMPLES = 20
-    # structuur: uint8, uint8, uint8, int8, int8, uint8
-    WEATHER_SAMPLE_FORMAT = "<BBBbbB" 
+    # 64 Weather Forecast Samples
+    NUM_WEATHER_SAMPLES = 64
+    # structuur: sessionType, timeOffset, weather, trackTemp, trackTempChange, airTemp, airTempChange, rain
+    WEATHER_SAMPLE_FORMAT = WEATHER_SAMPLE_STRUCT.format
     
     # Hoofdstructuur - Eerste deel (16 velden)
-    # B weather(B) trackTemperature(b) airTemperature(b) H totalLaps(H) H trackLength(H) B sessionType(B) 
-    # b trackId(b) B formula(B) H sessionTimeLeft(H) H sessionDuration(H) B pitSpeedLimit(B) 
-    # B gamePaused(B) B isSpectating(B) B spectatorCarIndex(B) B sliProNativeSupport(B) B numMarshalZones(B)
-    SESSION_DATA_HEADER_FORMAT = "<BbBHBHBH HBBBBBB" 
+    # weather(B) trackTemperature(b) airTemperature(b) totalLaps(B) trackLength(H) sessionType(B)
+    # trackId(b) formula(B) sessionTimeLeft(H) sessionDuration(H) pitSpeedLimit(B)
+    # gamePaused(B) isSpectating(B) spectatorCarIndex(B) sliProNativeSupport(B) numMarshalZones(B)
+    SESSION_DATA_HEADER_FORMAT = SESSION_HEAD_STRUCT.format
     
     # Hoofdstructuur - Middelste deel (3 velden tussen arrays)
     # safetyCarStatus(B) networkGame(B) numWeatherForecastSamples(B)
-    SESSION_DATA_MID_FORMAT = "<BBB"
+    SESSION_DATA_MID_FORMAT = SESSION_MID_STRUCT.format
     
-    # Hoofdstructuur - Derde deel (28 velden na arrays) - Gecorrigeerd voor F1 25
+    # Hoofdstructuur - Derde deel (28 velden na arrays)
     # B(forecast) B(ai_diff) I(season) I(weekend) I(session) B(pit_ideal) B(pit_latest) B(pit_rejoin) 
     # B(steer) B(brake) B(gear) B(pit_assist) B(pit_release) B(ers) B(drs) B(dyn_line) B(dyn_type)
     # B(game_mode) B(rule_set) I(time_of_day) B(session_length)
     # B(speed_lead) B(temp_lead) B(speed_secondary) B(temp_secondary)
     # B(num_sc) B(num_vsc) B(num_red)
-    SESSION_DATA_FOOTER_FORMAT = "<BBIII BBB BBBBBBBBB BBIBBBBBB"
+    SESSION_DATA_FOOTER_FORMAT = SESSION_FOOTER_STRUCT.format
+
+    # Offsets in de payload
+    _MARSHAL_OFFSET = SESSION_HEAD_STRUCT.size
+    _MID_OFFSET = _MARSHAL_OFFSET + MARSHAL_ZONE_STRUCT.size * NUM_MARSHAL_ZONES
+    _WEATHER_OFFSET = _MID_OFFSET + SESSION_MID_STRUCT.size
+    _FOOTER_OFFSET = _WEATHER_OFFSET + WEATHER_SAMPLE_STRUCT.size * NUM_WEATHER_SAMPLES
+    _MIN_SIZE = _FOOTER_OFFSET + SESSION_FOOTER_STRUCT.size
 
     
     def parse(self, header: PacketHeader, payload: bytes) -> Optional[SessionData]:
+        if not self.validate_payload_size(payload, self._MIN_SIZE):
+            return None
+
         try:
-            # 1. Parse het eerste deel (16 velden, excl. Marshal Zones)
-            header_data = self.unpack_safely(self.SESSION_DATA_HEADER_FORMAT, payload, offset=0)
-            if not header_data:
-                return None
-            
-            offset = struct.calcsize(self.SESSION_DATA_HEADER_FORMAT)
-            
-            # 2. Parse Marshal Zones (21 zones)
-            marshal_zones_list = []
-            
-            # We gebruiken NUM_MARSHAL_ZONES (21), niet num_marshal_zones van de data,
-            # omdat de struct altijd 21 zones stuurt, ongeacht de waarde van de uint8 in het packet.
-            for i in range(self.NUM_MARSHAL_ZONES):
-                zone_data = self.unpack_safely(self.MARSHAL_ZONE_FORMAT, payload, offset)
-                if zone_data:
-                    marshal_zones_list.append(MarshalZone(
-                        zone_start=zone_data[0],
-                        zone_flag=zone_data[1]
-                    ))
-                offset += struct.calcsize(self.MARSHAL_ZONE_FORMAT)
+            view = memoryview(payload)
+
+            # 1. Het eerste deel (16 velden, excl. Marshal Zones)
+            header_data = SESSION_HEAD_STRUCT.unpack_from(view, 0)
             
-            # 3. Parse het middelste deel (3 velden)
-            mid_data = self.unpack_safely(self.SESSION_DATA_MID_FORMAT, payload, offset)
-            if not mid_data:
-                return None
+            # 2. Marshal Zones: de struct stuurt altijd 21 zones, ongeacht numMarshalZones
+            marshal_zones_list = [
+                MarshalZone(zone_start, zone_flag)
+                for zone_start, zone_flag in MARSHAL_ZONE_STRUCT.iter_unpack(
+                    view[self._MARSHAL_OFFSET:self._MID_OFFSET])
+            ]
             
-            offset += struct.calcsize(self.SESSION_DATA_MID_FORMAT)
-
-            # 4. Parse Weather Forecast Samples (20 samples)
-            weather_samples_list = []
-
-            # We gebruiken NUM_WEATHER_SAMPLES (20), de struct stuurt altijd 20 samples.
-            for i in range(self.NUM_WEATHER_SAMPLES):
-                sample_data = self.unpack_safely(self.WEATHER_SAMPLE_FORMAT, payload, offset)
-                if sample_data:
-                    weather_samples_list.append(WeatherForecastSample(
-                        session_type=sample_data[0],
-                        time_offset=sample_data[1],
-                        weather=sample_data[2],
-                        track_temperature=sample_data[3],
-                        air_temperature=sample_data[4],
-                        rain_percentage=sample_data[5]
-                    ))
-                offset += struct.calcsize(self.WEATHER_SAMPLE_FORMAT)
-
-            # 5. Parse het laatste deel (28 velden)
-            footer_data = self.unpack_safely(self.SESSION_DATA_FOOTER_FORMAT, payload, offset)
-            if not footer_data:
-                return None
+            # 3. Het middelste deel (3 velden)
+            mid_data = SESSION_MID_STRUCT.unpack_from(view, self._MID_OFFSET)
+
+            # 4. Weather Forecast Samples: altijd 64 in de struct, alleen de eerste
+            # numWeatherForecastSamples zijn gevuld
+            weather_samples_list = [
+                WeatherForecastSample(s[0], s[1], s[2], s[3], s[5], s[7], s[4], s[6])
+                for s in WEATHER_SAMPLE_STRUCT.iter_unpack(view[self._WEATHER_OFFSET:self._FOOTER_OFFSET])
+            ][:mid_data[2]]
+
+            # 5. Het laatste deel (28 velden)
+            footer_data = SESSION_FOOTER_STRUCT.unpack_from(view, self._FOOTER_OFFSET)
             
             # --- Combineer en creëer het SessionData object ---
             
-            unpacked = list(header_data) + list(mid_data) + list(footer_data)
+            unpacked = header_data + mid_data + footer_data
             
             # De indices in 'unpacked' zijn nu als volgt:
             # Header Data: [0] tot [15] (16 velden)
@@ -249,7 +245,5 @@ class SessionParser(BaseParser):
             )
             
         except Exception as e:
-            # U kunt de logging hier beter inschakelen om te zien welke index de fout geeft,
-            # maar de structurele fout is nu opgelost.
-            # self.logger.error(f"Session parse fout: {e}", exc_info=True)
-            return None
\ No newline at end of file
+            self.logger.error(f"Session parse fout: {e}")
+            return None
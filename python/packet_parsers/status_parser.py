@@ -0,0 +1,98 @@
+"""
+F1 25 Telemetry - Car Status en Car Damage Parser
+Parse Car Status packets (ID 7: brandstof, ERS, banden) en Car Damage
+packets (ID 10: slijtage en schade) voor alle 22 auto's
+"""
+
+import struct
+from typing import Optional
+from .base_parser import BaseParser
+from .packet_header import PacketHeader
+from .packet_types import MAX_CARS
+from .schemas import CAR_STATUS, CAR_STATUS_PACKET, CAR_DAMAGE, CAR_DAMAGE_PACKET
+
+# Uit de schemas: 22 x CarStatusData (55 bytes) en 22 x CarDamageData (46 bytes)
+CAR_STATUS_STRUCT = CAR_STATUS.struct
+CAR_DAMAGE_STRUCT = CAR_DAMAGE.struct
+_STATUS_SIZE = CAR_STATUS_PACKET.payload_size
+_DAMAGE_SIZE = CAR_DAMAGE_PACKET.payload_size
+
+# Records per auto en de packets (NamedTuples uit de schemas; arrays zijn tuples [RL, RR, FL, FR])
+CarStatusData = CAR_STATUS.record
+CarDamageData = CAR_DAMAGE.record
+CarStatusPacket = CAR_STATUS_PACKET.record   # (header, car_status_data)
+CarDamagePacket = CAR_DAMAGE_PACKET.record   # (header, car_damage_data)
+
+_tuple_new = tuple.__new__
+
+
+class CarStatusParser(BaseParser):
+    """
+    Parser voor Car Status packets (ID 7)
+
+    Met een car_mask is car_status_data een RecordArray: alleen de auto's
+    uit het masker worden direct gedecodeerd.
+    """
+
+    def parse(self, header: PacketHeader, payload: bytes) -> Optional[CarStatusPacket]:
+        """
+        Parse car status packet
+
+        Args:
+            header: Packet header
+            payload: Packet payload
+
+        Returns:
+            CarStatusPacket object of None
+        """
+        if not self.validate_payload_size(payload, _STATUS_SIZE):
+            return None
+
+        try:
+            view = memoryview(payload)[:_STATUS_SIZE]
+            car_mask = self.car_mask
+            if car_mask is None:
+                cars = CAR_STATUS.decode_array(view)
+            else:
+                cars = CAR_STATUS.decode_masked(view, MAX_CARS, car_mask)
+            return _tuple_new(CarStatusPacket, (header, cars))
+
+        except struct.error as e:
+            self.logger.error(f"Car status parse fout: {e}")
+            return None
+
+
+class CarDamageParser(BaseParser):
+    """
+    Parser voor Car Damage packets (ID 10)
+
+    Met een car_mask is car_damage_data een RecordArray: alleen de auto's
+    uit het masker worden direct gedecodeerd.
+    """
+
+    def parse(self, header: PacketHeader, payload: bytes) -> Optional[CarDamagePacket]:
+        """
+        Parse car damage packet
+
+        Args:
+            header: Packet header
+            payload: Packet payload
+
+        Returns:
+            CarDamagePacket object of None
+        """
+        if not self.validate_payload_size(payload, _DAMAGE_SIZE):
+            return None
+
+        try:
+            view = memoryview(payload)[:_DAMAGE_SIZE]
+            car_mask = self.car_mask
+            if car_mask is None:
+                cars = CAR_DAMAGE.decode_array(view)
+            else:
+                cars = CAR_DAMAGE.decode_masked(view, MAX_CARS, car_mask)
+            return _tuple_new(CarDamagePacket, (header, cars))
+
+        except struct.error as e:
+            self.logger.error(f"Car damage parse fout: {e}")
+            return None
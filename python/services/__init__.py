@@ -1,14 +1,43 @@
 # services/__init__.py
 """
 Services package voor de F1 telemetry applicatie.
-Bevat de UDP listener en logging functionaliteit.
+Bevat:
+- UDP listeners (thread, asyncio en SO_REUSEPORT workers)
+- Capture opname, replay en archief
+- Synthetische pakket generator
+- Payload cache, event stream en per-auto state tabellen
+- Logging
 """
 
 from .logger_services import LoggerService, logger_service
 from .udp_listener import UDPListener
+from .async_udp_listener import AsyncUDPListener
+from .reuseport_supervisor import ReusePortSupervisor
+from .sequence_tracker import FrameSequenceTracker, merge_sequence_stats
+from .capture_recorder import CaptureRecorder
+from .replay_source import ReplaySource
+from .capture_mmap_reader import MmapCaptureReader
+from .capture_archive import CaptureArchiveReader, CaptureCompactor
+from .packet_generator import PacketGenerator
+from .payload_cache import PayloadCache
+from .event_stream import EventStream
+from .car_state import CarStateTable
 
 __all__ = [
     'LoggerService',
     'logger_service',
-    'UDPListener'
+    'UDPListener',
+    'AsyncUDPListener',
+    'ReusePortSupervisor',
+    'FrameSequenceTracker',
+    'merge_sequence_stats',
+    'CaptureRecorder',
+    'ReplaySource',
+    'MmapCaptureReader',
+    'CaptureArchiveReader',
+    'CaptureCompactor',
+    'PacketGenerator',
+    'PayloadCache',
+    'EventStream',
+    'CarStateTable'
 ]
\ No newline at end of file
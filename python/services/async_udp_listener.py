@@ -0,0 +1,321 @@
+"""
+F1 25 Telemetry System - Async UDP Listener Service
+asyncio variant van de UDPListener: meerdere poorten in één event loop
+"""
+
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from services import logger_service
+from services.socket_stats import set_receive_buffer, get_kernel_drops
+# Importeer de CONFIG dictionary uit config.py
+try:
+    from config import UDP_CONFIG
+except ImportError:
+    # Fallback als config.py niet gevonden kan worden
+    print("[FATAL ERROR] config.py niet gevonden of UDP_CONFIG mist.")
+    UDP_CONFIG = {'host': '0.0.0.0', 'port': 20777, 'buffer_size': 2048, 'timeout': 1.0}
+
+
+class _TelemetryProtocol(asyncio.DatagramProtocol):
+    """DatagramProtocol per gebonden poort: zet ontvangen datagrammen in de queue"""
+
+    def __init__(self, listener: 'AsyncUDPListener', port: int):
+        self.listener = listener
+        self.port = port
+
+    def datagram_received(self, data: bytes, addr):
+        self.listener._enqueue(data, addr)
+
+    def error_received(self, exc: Exception):
+        # Bijv. ICMP port unreachable op Windows, socket blijft bruikbaar
+        self.listener.logger.warning(f"Socket fout op poort {self.port}: {exc}")
+        self.listener.packets_errors += 1
+
+
+class AsyncUDPListener:
+    """
+    Luistert met asyncio naar UDP pakketten op één of meer poorten.
+
+    Heeft dezelfde start()/stop()/is_running()/get_stats() interface als
+    UDPListener. Alle sockets delen één event loop op een achtergrond
+    thread, dus meerdere rigs op één host kosten geen thread per socket.
+    Andere coroutines (database writes, een web API) kunnen met submit()
+    op dezelfde loop draaien.
+
+    Ontvangen datagrammen gaan in een begrensde asyncio.Queue; bij een
+    volle queue vervalt het oudste pakket. Een verwerkings-taak haalt per
+    wakeup alles op wat klaarstaat (max. max_batch) en geeft het aan de
+    handlers. packet_handler en batch_handler mogen een gewone functie of
+    een coroutine functie zijn. Een coroutine handler draait op de loop en
+    mag dus niet blokkeren. Een gewone handler (zoals
+    DataProcessor.process_batch, met controller- en database werk) draait
+    op één handler thread via run_in_executor, zodat de loop intussen
+    datagrammen blijft ontvangen; de volgorde van de batches blijft gelijk.
+    """
+
+    def __init__(self, packet_handler: Callable[[bytes], Optional[Awaitable[None]]],
+                 batch_handler: Optional[Callable[[List[Tuple[Any, Any]]], Optional[Awaitable[None]]]] = None,
+                 ports: Optional[List[int]] = None):
+        """
+        Initialiseer async UDP listener
+
+        Args:
+            packet_handler: Callback (of coroutine functie) die de rauwe
+                            bytes van een pakket accepteert.
+            batch_handler: Optioneel. Krijgt per wakeup een lijst met
+                           (data, addr) tuples.
+            ports: Poorten om op te binden (default UDP_CONFIG['ports'] of
+                   UDP_CONFIG['port'])
+        """
+        self.logger = logger_service.get_logger('AsyncUDPListener')
+        self.host = UDP_CONFIG.get('host', '0.0.0.0')
+        self.port = UDP_CONFIG.get('port', 20777)
+        self.ports = list(ports or UDP_CONFIG.get('ports') or [self.port])
+        self.timeout = UDP_CONFIG.get('timeout', 1.0)
+        self.queue_size = UDP_CONFIG.get('queue_size', 4096)
+        self.recv_buffer_size = UDP_CONFIG.get('recv_buffer_size', 0)
+        self.max_batch = max(1, UDP_CONFIG.get('max_batch', 64))
+
+        self.packet_handler = packet_handler
+        self.batch_handler = batch_handler
+        # Optionele tap: CaptureRecorder die elk rauw datagram opneemt
+        self.recorder = None
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self.transports: List[asyncio.DatagramTransport] = []
+        self.queue: Optional[asyncio.Queue] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._started = threading.Event()
+        self._start_error: Optional[BaseException] = None
+        # Eén thread voor gewone (blokkerende) handlers, zodat de volgorde gelijk blijft
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Stats (alleen aangepast op de loop thread)
+        self.packets_received = 0
+        self.packets_processed = 0
+        self.packets_errors = 0
+        self.packets_dropped = 0
+        self.dropped_by_packet_id: Dict[int, int] = {}
+        self.queue_high_water = 0
+        self.wakeups = 0
+        self.max_batch_seen = 0
+
+    def start(self):
+        """Start de event loop thread en bind alle poorten"""
+        if self.running:
+            self.logger.warning("Async UDP listener is al gestart")
+            return
+
+        self._started.clear()
+        self._start_error = None
+        self.thread = threading.Thread(target=self._run_loop, name="UDPAsyncLoop", daemon=True)
+        self.thread.start()
+        self._started.wait()
+
+        if self._start_error is not None:
+            self.thread.join(timeout=2.0)
+            # Gooi de exceptie opnieuw op zodat F1TelemetryApp deze kan vangen
+            raise self._start_error
+
+    def stop(self):
+        """Stop de event loop en sluit alle sockets"""
+        if self.loop and self._stopping and self.running:
+            self.loop.call_soon_threadsafe(self._stopping.set)
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.logger.info("Async UDP listener gestopt")
+
+    def is_running(self) -> bool:
+        """Check of listener actief is"""
+        return self.running
+
+    def submit(self, coro: Awaitable) -> 'asyncio.Future':
+        """
+        Plan een coroutine in op de listener loop (thread-safe)
+
+        Returns:
+            concurrent.futures.Future met het resultaat
+        """
+        if not self.loop or not self.running:
+            raise RuntimeError("Async UDP listener draait niet")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def get_bound_addresses(self) -> List[Tuple[str, int]]:
+        """Verkrijg de (host, port) van alle gebonden sockets"""
+        return [transport.get_extra_info('sockname')[:2] for transport in self.transports]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg statistieken (zelfde sleutels als UDPListener)"""
+        stats = {
+            "running": self.running,
+            "engine": "asyncio",
+            "ports": list(self.ports),
+            "packets_received": self.packets_received,
+            "kernel_drops": self._get_kernel_drops(),
+            "packets_processed": self.packets_processed,
+            "packets_errors": self.packets_errors,
+            "wakeups": self.wakeups,
+            # Zelfde definitie als UDPListener: ontvangen datagrammen per wakeup
+            "packets_per_wakeup": (self.packets_received / self.wakeups) if self.wakeups else 0.0,
+            "max_batch": self.max_batch_seen,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "queue_capacity": self.queue_size,
+            "queue_high_water": self.queue_high_water,
+            "packets_dropped": self.packets_dropped,
+            "dropped_by_packet_id": dict(self.dropped_by_packet_id),
+        }
+        if self.recorder is not None:
+            stats.update(self.recorder.get_stats())
+        return stats
+
+    def _get_kernel_drops(self) -> Optional[int]:
+        """Tel de kernel drops van alle sockets op (None = onbekend)"""
+        drops = [get_kernel_drops(transport.get_extra_info('socket'))
+                 for transport in self.transports if not transport.is_closing()]
+        if not drops or None in drops:
+            return None
+        return sum(drops)
+
+    # --- Event loop (draait op de UDPAsyncLoop thread) ---
+
+    def _run_loop(self):
+        """Thread target: eigen event loop voor alle sockets en de pipeline"""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._main())
+        except Exception as e:
+            self.logger.error(f"Fout in async listener loop: {e}", exc_info=True)
+        finally:
+            self.running = False
+            self._started.set()
+            self.loop.close()
+            self.logger.info("Async UDP listener loop gestopt")
+
+    async def _main(self):
+        """Bind de poorten, start de verwerking en wacht op stop()"""
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stopping = asyncio.Event()
+        self.transports = []
+        try:
+            for port in self.ports:
+                transport, _ = await self.loop.create_datagram_endpoint(
+                    lambda port=port: _TelemetryProtocol(self, port),
+                    local_addr=(self.host, port)
+                )
+                self.transports.append(transport)
+                set_receive_buffer(transport.get_extra_info('socket'), self.recv_buffer_size)
+                self.logger.info(f"Async UDP listener gestart op {self.host}:{port}")
+        except OSError as e:
+            self.logger.error(f"Kon socket niet binden op {self.host}:{port}: {e}")
+            for transport in self.transports:
+                transport.close()
+            self._start_error = e
+            self._started.set()
+            return
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='UDPAsyncHandler')
+        self.running = True
+        self._started.set()
+        consumer = asyncio.ensure_future(self._consume())
+        try:
+            await self._stopping.wait()
+        finally:
+            for transport in self.transports:
+                transport.close()
+            # Verwerk wat nog in de queue staat en stop dan de consumer
+            await self.queue.put(None)
+            await consumer
+            self._executor.shutdown(wait=True)
+
+    def _enqueue(self, data: bytes, addr):
+        """Zet een datagram in de queue; bij een volle queue vervalt het oudste"""
+        self.packets_received += 1
+        if self.recorder is not None:
+            self.recorder.record(data, addr)
+        queue = self.queue
+        if queue.full():
+            old_data, _ = queue.get_nowait()
+            packet_id = old_data[6] if len(old_data) > 6 else 255
+            self.packets_dropped += 1
+            self.dropped_by_packet_id[packet_id] = self.dropped_by_packet_id.get(packet_id, 0) + 1
+        queue.put_nowait((data, addr))
+        if queue.qsize() > self.queue_high_water:
+            self.queue_high_water = queue.qsize()
+
+    async def _consume(self):
+        """Verwerkings-taak: haal per wakeup alle klaarstaande pakketten op"""
+        queue = self.queue
+        while True:
+            item = await queue.get()
+            batch = []
+            stop = item is None
+            if not stop:
+                batch.append(item)
+            while len(batch) < self.max_batch and not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            if batch:
+                self.wakeups += 1
+                if len(batch) > self.max_batch_seen:
+                    self.max_batch_seen = len(batch)
+                await self._handle_batch(batch)
+            if stop:
+                break
+
+    async def _handle_batch(self, batch: List[Tuple[bytes, Any]]):
+        """Geef een batch aan de batch handler, of per pakket aan de packet handler"""
+        if self.batch_handler is not None:
+            handler = self.batch_handler
+            try:
+                if _is_coroutine_function(handler):
+                    await handler(batch)
+                else:
+                    await self.loop.run_in_executor(self._executor, handler, batch)
+                self.packets_processed += len(batch)
+            except Exception as e:
+                self.logger.error(f"Fout in batch handler: {e}", exc_info=True)
+                self.packets_errors += 1
+            return
+
+        if not _is_coroutine_function(self.packet_handler):
+            processed, errors = await self.loop.run_in_executor(self._executor, self._run_packets, batch)
+            self.packets_processed += processed
+            self.packets_errors += errors
+            return
+
+        for data, _addr in batch:
+            try:
+                result = self.packet_handler(data)
+                if inspect.isawaitable(result):
+                    await result
+                self.packets_processed += 1
+            except Exception as e:
+                self.logger.error(f"Fout in packet handler: {e}", exc_info=True)
+                self.packets_errors += 1
+
+    def _run_packets(self, batch: List[Tuple[bytes, Any]]) -> Tuple[int, int]:
+        """Gewone packet handler per pakket (op de handler thread); geeft (verwerkt, fouten)"""
+        processed = errors = 0
+        for data, _addr in batch:
+            try:
+                self.packet_handler(data)
+                processed += 1
+            except Exception as e:
+                self.logger.error(f"Fout in packet handler: {e}", exc_info=True)
+                errors += 1
+        return processed, errors
+
+
+def _is_coroutine_function(handler: Callable) -> bool:
+    """True voor een coroutine functie (ook als __call__ van een object)"""
+    return inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(getattr(handler, '__call__', None))
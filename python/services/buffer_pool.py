@@ -0,0 +1,57 @@
+"""
+F1 25 Telemetry System - Buffer Pool
+Pool van herbruikbare bytearray buffers voor het zero-copy receive pad
+"""
+
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class BufferPool:
+    """
+    Vaste set vooraf gealloceerde bytearrays.
+
+    De receive thread vraagt een buffer aan, laat de socket er direct in
+    schrijven (recvfrom_into) en de worker geeft hem na verwerking terug.
+    deque.append/popleft zijn atomair, dus er is geen extra lock nodig.
+    """
+
+    def __init__(self, count: int, buffer_size: int):
+        """
+        Initialiseer de pool
+
+        Args:
+            count: Aantal buffers
+            buffer_size: Grootte van elke buffer in bytes
+        """
+        self.count = count
+        self.buffer_size = buffer_size
+        self._free = deque(bytearray(buffer_size) for _ in range(count))
+
+        # Stats
+        self.exhausted = 0
+
+    def acquire(self) -> Optional[bytearray]:
+        """
+        Verkrijg een vrije buffer
+
+        Returns:
+            Een bytearray, of None als de pool leeg is
+        """
+        try:
+            return self._free.popleft()
+        except IndexError:
+            self.exhausted += 1
+            return None
+
+    def release(self, buffer: bytearray):
+        """Geef een buffer terug aan de pool"""
+        self._free.append(buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg pool statistieken"""
+        return {
+            "buffer_pool_size": self.count,
+            "buffer_pool_free": len(self._free),
+            "buffer_pool_exhausted": self.exhausted,
+        }
@@ -0,0 +1,524 @@
+"""
+F1 25 Telemetry System - Capture Archive
+Gecomprimeerd archief van een capture in losse, onafhankelijk te
+decomprimeren chunks, plus een achtergrond compactor voor afgesloten captures.
+
+Archief bestand (.f1arc):
+    Header (17 bytes):  '<6sHBd'       magic b'F1ARC1', versie, codec,
+                                       aanmaaktijd van de capture (unix)
+    Chunks:                            gecomprimeerde reeksen capture records
+                                       (zelfde '<d4sHH' + data layout als .f1cap)
+    Chunk index:        '<QIIIIQffBB'  per chunk: offset, gecomprimeerde en
+                                       ruwe grootte, records, crc32 (ruw),
+                                       session_uid, eerste en laatste
+                                       session_time, eerste en laatste ronde
+    Footer (18 bytes):  '<QI6s'        offset van de chunk index, aantal
+                                       chunks, magic b'F1AEND'
+
+Een chunk bevat nooit twee sessies. Zoeken op tijd of ronde gebruikt de
+chunk index om alleen de chunks te decomprimeren die nodig zijn.
+"""
+
+import lzma
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from services import logger_service
+from services.capture_format import (CaptureReader, CaptureRecord, CaptureFormatError, RECORD_HEADER,
+                                      index_path_for, pack_address, peek_header_keys, peek_player_lap)
+from services.capture_mmap_reader import time_index_path_for
+
+ARCHIVE_MAGIC = b'F1ARC1'
+ARCHIVE_END_MAGIC = b'F1AEND'
+ARCHIVE_VERSION = 1
+ARCHIVE_EXTENSION = '.f1arc'
+
+ARCHIVE_HEADER = struct.Struct('<6sHBd')
+CHUNK_ENTRY = struct.Struct('<QIIIIQffBB')
+ARCHIVE_FOOTER = struct.Struct('<QI6s')
+
+# session_time (15) uit de F1 header
+_SESSION_TIME = struct.Struct('<15xf')
+
+CODECS = {
+    'zlib': 1,
+    'lzma': 2,
+}
+_CODEC_NAMES = {codec_id: name for name, codec_id in CODECS.items()}
+
+
+def _compress(codec: int, raw: bytes, level: Optional[int]) -> bytes:
+    """Comprimeer één chunk"""
+    if codec == CODECS['lzma']:
+        return lzma.compress(raw, preset=6 if level is None else level)
+    return zlib.compress(raw, 6 if level is None else level)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    """Decomprimeer één chunk"""
+    if codec == CODECS['lzma']:
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+class ChunkEntry(NamedTuple):
+    """Eén entry uit de chunk index"""
+    offset: int
+    compressed_size: int
+    raw_size: int
+    records: int
+    crc32: int
+    session_uid: int
+    first_time: float
+    last_time: float
+    first_lap: int
+    last_lap: int
+
+
+class CaptureArchiveWriter:
+    """
+    Schrijft records naar een archief, in chunks van ongeveer chunk_size
+    ruwe bytes. Niet thread-safe.
+    """
+
+    def __init__(self, path: str, codec: str = 'zlib', chunk_size: int = 1024 * 1024,
+                 level: Optional[int] = None, created_at: Optional[float] = None):
+        """
+        Open een nieuw archief
+
+        Args:
+            path: Pad van het archief (wordt overschreven)
+            codec: 'zlib' of 'lzma'
+            chunk_size: Ruwe bytes per chunk
+            level: Compressie niveau (default 6 voor beide codecs)
+            created_at: Aanmaaktijd van de oorspronkelijke capture
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Onbekende archief codec: {codec} (kies uit {', '.join(CODECS)})")
+        self.path = str(path)
+        self.codec = CODECS[codec]
+        self.chunk_size = chunk_size
+        self.level = level
+        self._file = open(self.path, 'wb')
+        self._file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, self.codec,
+                                             time.time() if created_at is None else created_at))
+        self.offset = ARCHIVE_HEADER.size
+        self.chunks: List[ChunkEntry] = []
+        self.raw_bytes = 0
+
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._records = 0
+        self._session_uid: Optional[int] = None
+        self._first_time = 0.0
+        self._last_time = 0.0
+        self._first_lap = 0
+        self._lap = 0
+
+    def write(self, timestamp: float, addr, data):
+        """Voeg één datagram toe (zelfde argumenten als CaptureWriter.write)"""
+        keys = peek_header_keys(data)
+        session_uid = keys[0] if keys else self._session_uid
+        if self._records and session_uid != self._session_uid:
+            self._flush_chunk()
+            self._lap = 0
+
+        session_time = _SESSION_TIME.unpack_from(data)[0] if keys else self._last_time
+        lap = peek_player_lap(data)
+        if lap is not None:
+            self._lap = lap
+        if not self._records:
+            self._session_uid = session_uid
+            self._first_time = session_time
+            self._first_lap = self._lap
+        self._last_time = session_time
+
+        ip, port = pack_address(addr)
+        record = RECORD_HEADER.pack(timestamp, ip, port, len(data)) + bytes(data)
+        self._buffer.append(record)
+        self._buffered += len(record)
+        self._records += 1
+        if self._buffered >= self.chunk_size:
+            self._flush_chunk()
+
+    def close(self):
+        """Schrijf de laatste chunk, de chunk index en de footer"""
+        if self._file.closed:
+            return
+        self._flush_chunk()
+        index_offset = self.offset
+        self._file.write(b''.join(CHUNK_ENTRY.pack(*entry) for entry in self.chunks))
+        self._file.write(ARCHIVE_FOOTER.pack(index_offset, len(self.chunks), ARCHIVE_END_MAGIC))
+        self.offset += len(self.chunks) * CHUNK_ENTRY.size + ARCHIVE_FOOTER.size
+        self._file.close()
+
+    def _flush_chunk(self):
+        """Comprimeer de gebufferde records tot één chunk"""
+        if not self._records:
+            return
+        raw = b''.join(self._buffer)
+        compressed = _compress(self.codec, raw, self.level)
+        self._file.write(compressed)
+        self.chunks.append(ChunkEntry(self.offset, len(compressed), len(raw), self._records,
+                                      zlib.crc32(raw), self._session_uid or 0, self._first_time,
+                                      self._last_time, self._first_lap, self._lap))
+        self.offset += len(compressed)
+        self.raw_bytes += len(raw)
+        self._buffer = []
+        self._buffered = 0
+        self._records = 0
+
+
+class CaptureArchiveReader:
+    """
+    Leest een archief. Alleen de chunk index wordt bij openen gelezen;
+    chunks worden pas gedecomprimeerd als ze nodig zijn.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open een archief
+
+        Raises:
+            CaptureFormatError: Als het geen (volledig) archief is
+        """
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._read_index()
+        except CaptureFormatError:
+            self._file.close()
+            raise
+
+        # Decode stats
+        self.chunks_decoded = 0
+        self.bytes_decoded = 0
+        self.decode_seconds = 0.0
+
+    @property
+    def codec_name(self) -> str:
+        """Naam van de codec ('zlib' of 'lzma')"""
+        return _CODEC_NAMES[self.codec]
+
+    @property
+    def raw_size(self) -> int:
+        """Totale ruwe grootte van alle records"""
+        return sum(chunk.raw_size for chunk in self.chunks)
+
+    @property
+    def compressed_size(self) -> int:
+        """Totale gecomprimeerde grootte van alle chunks"""
+        return sum(chunk.compressed_size for chunk in self.chunks)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Ruwe bytes per gecomprimeerde byte"""
+        compressed = self.compressed_size
+        return self.raw_size / compressed if compressed else 0.0
+
+    def read_chunk(self, index: int) -> bytes:
+        """
+        Decomprimeer één chunk
+
+        Raises:
+            CaptureFormatError: Als de chunk beschadigd is
+        """
+        chunk = self.chunks[index]
+        self._file.seek(chunk.offset)
+        data = self._file.read(chunk.compressed_size)
+        started = time.perf_counter()
+        try:
+            raw = _decompress(self.codec, data)
+        except (zlib.error, lzma.LZMAError) as e:
+            raise CaptureFormatError(f"{self.path}: chunk {index} beschadigd: {e}")
+        self.decode_seconds += time.perf_counter() - started
+        if len(raw) != chunk.raw_size or zlib.crc32(raw) != chunk.crc32:
+            raise CaptureFormatError(f"{self.path}: chunk {index} checksum klopt niet")
+        self.chunks_decoded += 1
+        self.bytes_decoded += len(raw)
+        return raw
+
+    def records(self, chunks: Optional[Iterable[int]] = None) -> Iterator[CaptureRecord]:
+        """
+        Lees records uit (een selectie van) chunks
+
+        CaptureRecord.offset is hier de offset binnen de ruwe chunk data.
+        """
+        for index in (range(len(self.chunks)) if chunks is None else chunks):
+            raw = self.read_chunk(index)
+            position = 0
+            while position < len(raw):
+                timestamp, ip, port, length = RECORD_HEADER.unpack_from(raw, position)
+                start = position + RECORD_HEADER.size
+                yield CaptureRecord(position, timestamp, (socket.inet_ntoa(ip), port),
+                                    raw[start:start + length])
+                position = start + length
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        return self.records()
+
+    def sessions(self) -> List[int]:
+        """Session UIDs in het archief, in volgorde van voorkomen"""
+        seen: List[int] = []
+        for chunk in self.chunks:
+            if chunk.session_uid not in seen:
+                seen.append(chunk.session_uid)
+        return seen
+
+    def chunks_for_lap(self, lap: int, session_uid: Optional[int] = None) -> List[int]:
+        """Indices van de chunks die (een deel van) een ronde van de speler bevatten"""
+        session_uid = self._default_session(session_uid)
+        return [index for index, chunk in enumerate(self.chunks)
+                if chunk.session_uid == session_uid and chunk.first_lap <= lap <= chunk.last_lap]
+
+    def chunks_from_time(self, session_time: float, session_uid: Optional[int] = None) -> List[int]:
+        """Indices van de chunks vanaf een session_time tot het einde van de sessie"""
+        session_uid = self._default_session(session_uid)
+        return [index for index, chunk in enumerate(self.chunks)
+                if chunk.session_uid == session_uid and chunk.last_time >= session_time]
+
+    def lap_packets(self, lap: int, session_uid: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Datagrammen van één ronde van de speler
+
+        Alleen de chunks van die ronde worden gedecomprimeerd. De ronde
+        wordt per datagram gevolgd via de Lap Data pakketten.
+        """
+        indices = self.chunks_for_lap(lap, session_uid)
+        if not indices:
+            return
+        current = self.chunks[indices[0]].first_lap
+        for record in self.records(indices):
+            record_lap = peek_player_lap(record.data)
+            if record_lap is not None:
+                current = record_lap
+            if current == lap:
+                yield record.data
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg archief en decode statistieken"""
+        return {
+            "codec": self.codec_name,
+            "chunks": len(self.chunks),
+            "raw_bytes": self.raw_size,
+            "compressed_bytes": self.compressed_size,
+            "compression_ratio": self.compression_ratio,
+            "chunks_decoded": self.chunks_decoded,
+            "decode_mb_per_s": (self.bytes_decoded / self.decode_seconds / 1e6)
+            if self.decode_seconds > 0 else 0.0,
+        }
+
+    def close(self):
+        """Sluit het bestand"""
+        self._file.close()
+
+    def __enter__(self) -> 'CaptureArchiveReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _default_session(self, session_uid: Optional[int]) -> Optional[int]:
+        """Session UID, default de eerste sessie in het archief"""
+        if session_uid is None and self.chunks:
+            return self.chunks[0].session_uid
+        return session_uid
+
+    def _read_index(self):
+        """Lees header, footer en chunk index"""
+        f = self._file
+        header = f.read(ARCHIVE_HEADER.size)
+        if len(header) < ARCHIVE_HEADER.size:
+            raise CaptureFormatError(f"{self.path}: bestand te kort voor een archief header")
+        magic, version, codec, created_at = ARCHIVE_HEADER.unpack(header)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION or codec not in _CODEC_NAMES:
+            raise CaptureFormatError(f"{self.path}: geen F1 archief (magic {magic!r}, versie {version})")
+        self.codec = codec
+        self.created_at = created_at
+
+        size = f.seek(0, os.SEEK_END)
+        if size < ARCHIVE_HEADER.size + ARCHIVE_FOOTER.size:
+            raise CaptureFormatError(f"{self.path}: archief zonder footer (niet afgesloten?)")
+        f.seek(size - ARCHIVE_FOOTER.size)
+        index_offset, count, end_magic = ARCHIVE_FOOTER.unpack(f.read(ARCHIVE_FOOTER.size))
+        if end_magic != ARCHIVE_END_MAGIC or index_offset + count * CHUNK_ENTRY.size != size - ARCHIVE_FOOTER.size:
+            raise CaptureFormatError(f"{self.path}: archief zonder geldige footer (niet afgesloten?)")
+        f.seek(index_offset)
+        raw = f.read(count * CHUNK_ENTRY.size)
+        self.chunks: List[ChunkEntry] = [ChunkEntry(*entry) for entry in CHUNK_ENTRY.iter_unpack(raw)]
+
+
+def archive_path_for(capture_path: str) -> str:
+    """Archief pad voor een capture (zelfde naam, andere extensie)"""
+    return str(Path(capture_path).with_suffix(ARCHIVE_EXTENSION))
+
+
+def compact_capture(capture_path: str, archive_path: Optional[str] = None, codec: str = 'zlib',
+                    chunk_size: int = 1024 * 1024, level: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Zet een afgesloten capture om in een archief en controleer het resultaat
+
+    Het archief wordt eerst onder een tijdelijke naam geschreven en na een
+    volledige decode-controle op zijn plek gezet.
+
+    Returns:
+        Dict met archive, raw_bytes, compressed_bytes, compression_ratio,
+        records, encode_seconds en decode_mb_per_s
+    """
+    archive_path = archive_path or archive_path_for(capture_path)
+    temp_path = archive_path + '.tmp'
+    started = time.perf_counter()
+    records = 0
+    with CaptureReader(capture_path) as reader:
+        writer = CaptureArchiveWriter(temp_path, codec, chunk_size, level, created_at=reader.created_at)
+        try:
+            for record in reader:
+                writer.write(record.timestamp, record.addr, record.data)
+                records += 1
+        finally:
+            writer.close()
+    encode_seconds = time.perf_counter() - started
+
+    with CaptureArchiveReader(temp_path) as archive:
+        decoded = sum(1 for _ in archive)
+        stats = archive.get_stats()
+    if decoded != records:
+        os.remove(temp_path)
+        raise CaptureFormatError(f"{archive_path}: {decoded} van {records} records terug gelezen")
+    os.replace(temp_path, archive_path)
+
+    return {
+        "archive": archive_path,
+        "raw_bytes": stats["raw_bytes"],
+        "compressed_bytes": stats["compressed_bytes"],
+        "compression_ratio": stats["compression_ratio"],
+        "records": records,
+        "encode_seconds": encode_seconds,
+        "decode_mb_per_s": stats["decode_mb_per_s"],
+    }
+
+
+class CaptureCompactor:
+    """
+    Achtergrond job die afgesloten captures archiveert.
+
+    Koppel submit() aan CaptureRecorder(on_file_closed=...): de recorder
+    thread zet alleen het pad in een queue, de compactor thread doet de
+    compressie. Met delete_raw=True worden de capture en zijn index na
+    een geslaagde controle verwijderd.
+    """
+
+    def __init__(self, codec: str = 'zlib', chunk_size: int = 1024 * 1024,
+                 level: Optional[int] = None, delete_raw: bool = False,
+                 on_archived: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialiseer de compactor
+
+        Args:
+            codec: 'zlib' of 'lzma'
+            chunk_size: Ruwe bytes per chunk
+            level: Compressie niveau
+            delete_raw: Capture verwijderen na archiveren
+            on_archived: Callback met het resultaat van compact_capture()
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Onbekende archief codec: {codec} (kies uit {', '.join(CODECS)})")
+        self.logger = logger_service.get_logger('CaptureCompactor')
+        self.codec = codec
+        self.chunk_size = chunk_size
+        self.level = level
+        self.delete_raw = delete_raw
+        self.on_archived = on_archived
+
+        self._queue: queue.Queue = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+
+        # Stats
+        self.files_compacted = 0
+        self.files_failed = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.last_decode_mb_per_s = 0.0
+
+    def start(self):
+        """Start de compactor thread"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="CaptureCompactor", daemon=True)
+        self.thread.start()
+        self.logger.info(f"Capture compactor gestart ({self.codec})")
+
+    def stop(self):
+        """Archiveer wat nog in de queue staat en stop"""
+        if not self.running:
+            return
+        self._queue.put(None)
+        if self.thread:
+            self.thread.join()
+        self.running = False
+        self.logger.info(f"Capture compactor gestopt ({self.files_compacted} gearchiveerd)")
+
+    def submit(self, capture_path: str):
+        """Zet een afgesloten capture in de wachtrij"""
+        self._queue.put(capture_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg compactor statistieken"""
+        return {
+            "archive_files": self.files_compacted,
+            "archive_failed": self.files_failed,
+            "archive_pending": self._queue.qsize(),
+            "archive_raw_bytes": self.raw_bytes,
+            "archive_compressed_bytes": self.compressed_bytes,
+            "archive_compression_ratio": (self.raw_bytes / self.compressed_bytes)
+            if self.compressed_bytes else 0.0,
+            "archive_decode_mb_per_s": self.last_decode_mb_per_s,
+        }
+
+    def _run(self):
+        """Verwerk de wachtrij tot stop()"""
+        while True:
+            capture_path = self._queue.get()
+            if capture_path is None:
+                return
+            self._compact(capture_path)
+
+    def _compact(self, capture_path: str):
+        """Archiveer één capture"""
+        try:
+            result = compact_capture(capture_path, codec=self.codec,
+                                     chunk_size=self.chunk_size, level=self.level)
+        except (OSError, CaptureFormatError) as e:
+            self.files_failed += 1
+            self.logger.error(f"Archiveren van {capture_path} mislukt: {e}", exc_info=True)
+            return
+
+        self.files_compacted += 1
+        self.raw_bytes += result["raw_bytes"]
+        self.compressed_bytes += result["compressed_bytes"]
+        self.last_decode_mb_per_s = result["decode_mb_per_s"]
+        self.logger.info(f"Gearchiveerd: {result['archive']} (ratio {result['compression_ratio']:.1f}x, "
+                         f"decode {result['decode_mb_per_s']:.0f} MB/s)")
+
+        if self.delete_raw:
+            for path in (capture_path, index_path_for(capture_path), time_index_path_for(capture_path)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self.logger.warning(f"Kon {path} niet verwijderen: {e}")
+
+        if self.on_archived is not None:
+            try:
+                self.on_archived(result)
+            except Exception as e:
+                self.logger.error(f"Fout in on_archived: {e}", exc_info=True)
@@ -0,0 +1,264 @@
+"""
+F1 25 Telemetry System - Capture File Format
+Append-only bestandsformaat voor rauwe UDP datagrammen plus sparse index.
+
+Capture bestand (.f1cap):
+    Header (16 bytes):  '<6sHd'  magic b'F1CAP1', versie, aanmaaktijd (unix)
+    Records:            '<d4sHH' ontvangsttijd (unix), IPv4 adres, poort,
+                                 lengte, gevolgd door de datagram bytes
+
+Index bestand (.f1cap.idx, naast de capture):
+    Header (8 bytes):   '<6sH'   magic b'F1IDX1', versie
+    Entries (21 bytes): '<QBIQ'  session_uid, packet_id,
+                                 overall_frame_identifier, byte offset
+
+De index is sparse: één entry per 'index_interval' records (en bij elke
+nieuwe sessie). Een lezer zoekt de laatste entry vóór het gewenste punt,
+springt naar die offset en leest vanaf daar verder.
+"""
+
+import os
+import socket
+import struct
+import time
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+CAPTURE_MAGIC = b'F1CAP1'
+INDEX_MAGIC = b'F1IDX1'
+FORMAT_VERSION = 1
+
+FILE_HEADER = struct.Struct('<6sHd')
+RECORD_HEADER = struct.Struct('<d4sHH')
+INDEX_HEADER = struct.Struct('<6sH')
+INDEX_ENTRY = struct.Struct('<QBIQ')
+
+# packet_id (6), session_uid (7) en overall_frame_identifier (23) uit de F1 header
+_HEADER_KEYS = struct.Struct('<6xBQ8xI')
+
+# current_lap_num van de speler in een Lap Data pakket (ID 2):
+# header (29) + player_car_index * LapData stride (57) + 33
+LAP_DATA_ID = 2
+_LAP_DATA_STRIDE = 57
+_LAP_NUM_OFFSET = 29 + 33
+_PLAYER_CAR_OFFSET = 27
+
+CAPTURE_EXTENSION = '.f1cap'
+INDEX_EXTENSION = '.idx'
+
+_NO_ADDRESS = b'\x00\x00\x00\x00'
+
+
+class CaptureRecord(NamedTuple):
+    """Eén opgenomen datagram"""
+    offset: int           # Byte offset van de record header in het bestand
+    timestamp: float      # Ontvangsttijd (unix)
+    addr: Tuple[str, int]
+    data: bytes
+
+
+class IndexEntry(NamedTuple):
+    """Eén entry uit de sparse index"""
+    session_uid: int
+    packet_id: int
+    overall_frame_identifier: int
+    offset: int
+
+
+class CaptureFormatError(Exception):
+    """Ongeldig of beschadigd capture bestand"""
+
+
+def index_path_for(path: str) -> str:
+    """Pad van het index bestand naast een capture"""
+    return str(path) + INDEX_EXTENSION
+
+
+def peek_header_keys(data) -> Optional[Tuple[int, int, int]]:
+    """
+    Lees (session_uid, packet_id, overall_frame_identifier) uit een datagram
+
+    Returns:
+        Tuple, of None als het datagram te kort is voor een F1 header
+    """
+    if len(data) < _HEADER_KEYS.size:
+        return None
+    packet_id, session_uid, overall = _HEADER_KEYS.unpack_from(data)
+    return session_uid, packet_id, overall
+
+
+def player_lap_offset(player_car_index: int) -> int:
+    """Offset van current_lap_num van een auto binnen een Lap Data datagram"""
+    return _LAP_NUM_OFFSET + player_car_index * _LAP_DATA_STRIDE
+
+
+def peek_player_lap(data) -> Optional[int]:
+    """
+    Lees de huidige ronde van de speler uit een datagram
+
+    Returns:
+        current_lap_num, of None als het geen (volledig) Lap Data pakket is
+    """
+    if len(data) <= _PLAYER_CAR_OFFSET or data[6] != LAP_DATA_ID:
+        return None
+    offset = player_lap_offset(data[_PLAYER_CAR_OFFSET])
+    return data[offset] if offset < len(data) else None
+
+
+def pack_address(addr: Optional[Tuple[str, int]]) -> Tuple[bytes, int]:
+    """IPv4 adres naar 4 bytes (andere adressen worden 0.0.0.0)"""
+    if not addr:
+        return _NO_ADDRESS, 0
+    try:
+        return socket.inet_aton(addr[0]), addr[1]
+    except (OSError, TypeError):
+        return _NO_ADDRESS, addr[1] if len(addr) > 1 else 0
+
+
+class CaptureWriter:
+    """
+    Schrijft records naar een capture bestand en entries naar de index
+
+    Niet thread-safe: bedoeld voor één schrijf-thread (CaptureRecorder).
+    """
+
+    def __init__(self, path: str, index_interval: int = 256, buffer_size: int = 1024 * 1024):
+        """
+        Open een nieuw capture bestand
+
+        Args:
+            path: Pad van het capture bestand (wordt overschreven)
+            index_interval: Om de hoeveel records een index entry geschreven wordt
+            buffer_size: Grootte van de schrijfbuffer in bytes
+        """
+        self.path = str(path)
+        self.index_interval = max(1, index_interval)
+        self._file: BinaryIO = open(self.path, 'wb', buffering=buffer_size)
+        self._index: BinaryIO = open(index_path_for(self.path), 'wb')
+        self._file.write(FILE_HEADER.pack(CAPTURE_MAGIC, FORMAT_VERSION, time.time()))
+        self._index.write(INDEX_HEADER.pack(INDEX_MAGIC, FORMAT_VERSION))
+
+        self.offset = FILE_HEADER.size
+        self.records = 0
+        self.session_uid: Optional[int] = None
+        self._since_index = self.index_interval  # Eerste record altijd indexeren
+
+    def write(self, timestamp: float, addr: Optional[Tuple[str, int]], data) -> int:
+        """
+        Schrijf één datagram
+
+        Returns:
+            Byte offset van de record
+        """
+        offset = self.offset
+        keys = peek_header_keys(data)
+        if keys is not None:
+            session_uid = keys[0]
+            if self._since_index >= self.index_interval or session_uid != self.session_uid:
+                self._index.write(INDEX_ENTRY.pack(session_uid, keys[1], keys[2], offset))
+                self._since_index = 0
+            self.session_uid = session_uid
+        self._since_index += 1
+
+        ip, port = pack_address(addr)
+        length = len(data)
+        self._file.write(RECORD_HEADER.pack(timestamp, ip, port, length))
+        self._file.write(data)
+        self.offset += RECORD_HEADER.size + length
+        self.records += 1
+        return offset
+
+    def flush(self):
+        """Schrijf gebufferde data naar het OS"""
+        self._file.flush()
+        self._index.flush()
+
+    def close(self):
+        """Sluit capture en index"""
+        if not self._file.closed:
+            self._file.close()
+        if not self._index.closed:
+            self._index.close()
+
+
+class CaptureReader:
+    """Leest een capture bestand sequentieel (vanaf het begin of een offset)"""
+
+    def __init__(self, path: str):
+        """
+        Open een capture bestand
+
+        Raises:
+            CaptureFormatError: Als het geen capture bestand is
+        """
+        self.path = str(path)
+        self._file: BinaryIO = open(self.path, 'rb')
+        header = self._file.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            self._file.close()
+            raise CaptureFormatError(f"{self.path}: bestand te kort voor een capture header")
+        magic, version, created_at = FILE_HEADER.unpack(header)
+        if magic != CAPTURE_MAGIC or version != FORMAT_VERSION:
+            self._file.close()
+            raise CaptureFormatError(f"{self.path}: geen F1 capture (magic {magic!r}, versie {version})")
+        self.created_at = created_at
+
+    def records(self, offset: Optional[int] = None) -> Iterator[CaptureRecord]:
+        """
+        Lees records tot het einde van het bestand
+
+        Een afgebroken laatste record (bijv. na een crash) wordt genegeerd.
+
+        Args:
+            offset: Start offset (uit de index), default direct na de header
+        """
+        f = self._file
+        position = FILE_HEADER.size if offset is None else offset
+        f.seek(position)
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            timestamp, ip, port, length = RECORD_HEADER.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            yield CaptureRecord(position, timestamp, (socket.inet_ntoa(ip), port), data)
+            position += RECORD_HEADER.size + length
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        return self.records()
+
+    def close(self):
+        """Sluit het bestand"""
+        self._file.close()
+
+    def __enter__(self) -> 'CaptureReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_index(path: str) -> List[IndexEntry]:
+    """
+    Lees de sparse index van een capture
+
+    Args:
+        path: Pad van het capture bestand (of direct het .idx bestand)
+
+    Returns:
+        Lijst met IndexEntry, leeg als er geen (geldige) index is
+    """
+    index_path = str(path) if str(path).endswith(INDEX_EXTENSION) else index_path_for(path)
+    if not os.path.exists(index_path):
+        return []
+    with open(index_path, 'rb') as f:
+        raw = f.read()
+    if len(raw) < INDEX_HEADER.size:
+        return []
+    magic, version = INDEX_HEADER.unpack_from(raw)
+    if magic != INDEX_MAGIC or version != FORMAT_VERSION:
+        return []
+    usable = (len(raw) - INDEX_HEADER.size) // INDEX_ENTRY.size * INDEX_ENTRY.size
+    return [IndexEntry(*entry) for entry in
+            INDEX_ENTRY.iter_unpack(raw[INDEX_HEADER.size:INDEX_HEADER.size + usable])]
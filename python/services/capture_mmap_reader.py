@@ -0,0 +1,362 @@
+"""
+F1 25 Telemetry System - Memory-mapped Capture Reader
+Random-access lezer voor (grote) capture bestanden: mmap in plaats van
+inlezen, plus een sparse tijd/ronde index die naast de capture gecached wordt.
+
+Tijd index (.f1cap.tidx, naast de capture):
+    Header (32 bytes):  '<6sHQQd'  magic b'F1TIX1', versie, grootte en mtime_ns
+                                   van de capture, index interval (seconden)
+    Entries (25 bytes): '<QfIBQ'   session_uid, session_time,
+                                   overall_frame_identifier, ronde van de
+                                   speler (0 = onbekend), byte offset
+
+Een entry wordt geschreven bij elke nieuwe sessie, na elke 'interval'
+seconden session_time, bij een sprong terug in de tijd (flashback) en
+bij elke nieuwe ronde van de speler (uit Lap Data). Past de grootte of
+mtime van de capture niet meer bij de cache, dan wordt de index opnieuw
+opgebouwd.
+"""
+
+import mmap
+import os
+import struct
+import weakref
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from services import logger_service
+from services.capture_format import (CaptureFormatError, CAPTURE_MAGIC, FORMAT_VERSION,
+                                      FILE_HEADER, RECORD_HEADER, LAP_DATA_ID, player_lap_offset)
+
+TIME_INDEX_MAGIC = b'F1TIX1'
+TIME_INDEX_VERSION = 1
+TIME_INDEX_EXTENSION = '.tidx'
+
+TIME_INDEX_HEADER = struct.Struct('<6sHQQd')
+TIME_INDEX_ENTRY = struct.Struct('<QfIBQ')
+
+# packet_id (6), session_uid (7), session_time (15), overall_frame_identifier (23),
+# player_car_index (27) uit de F1 header
+_HEADER_PEEK = struct.Struct('<6xBQfxxxxIB')
+
+_PACKET_ID_OFFSET = 6
+_PLAYER_CAR_OFFSET = 27
+
+
+class TimeIndexEntry(NamedTuple):
+    """Eén entry uit de tijd/ronde index"""
+    session_uid: int
+    session_time: float
+    overall_frame_identifier: int
+    lap: int
+    offset: int
+
+
+def time_index_path_for(path: str) -> str:
+    """Pad van de tijd index naast een capture"""
+    return str(path) + TIME_INDEX_EXTENSION
+
+
+class MmapCaptureReader:
+    """
+    Leest een capture via mmap: de pagina's worden pas door het OS geladen
+    als ze gelezen worden, dus ook captures groter dan het geheugen werken.
+
+    packets() geeft memoryviews direct op de mmap. Net als de pool buffers
+    in zero-copy mode is een view alleen geldig tot de volgende iteratie:
+    wie de data wil bewaren maakt een bytes() kopie. close() sluit ook nog
+    lopende packets() iterators, zodat er geen views meer op de mmap staan.
+    """
+
+    def __init__(self, path: str, index_interval: float = 1.0, use_cache: bool = True):
+        """
+        Open en map een capture bestand
+
+        Args:
+            path: Pad van het capture bestand
+            index_interval: Seconden session_time tussen index entries
+            use_cache: Tijd index uit/naar het .tidx bestand lezen/schrijven
+
+        Raises:
+            CaptureFormatError: Als het geen capture bestand is
+        """
+        self.logger = logger_service.get_logger('MmapCaptureReader')
+        self.path = str(path)
+        self.index_interval = index_interval
+        # Lopende packets() generators; die houden een view op de mmap vast
+        self._iterators: 'weakref.WeakSet[Iterator[memoryview]]' = weakref.WeakSet()
+
+        self._file = open(self.path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self.size = stat.st_size
+        self._mtime_ns = stat.st_mtime_ns
+        if self.size < FILE_HEADER.size:
+            self._file.close()
+            raise CaptureFormatError(f"{self.path}: bestand te kort voor een capture header")
+
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, created_at = FILE_HEADER.unpack_from(self._mm)
+        if magic != CAPTURE_MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise CaptureFormatError(f"{self.path}: geen F1 capture (magic {magic!r}, versie {version})")
+        self.created_at = created_at
+
+        self.time_index: List[TimeIndexEntry] = []
+        if not (use_cache and self._load_time_index()):
+            self.time_index = self._build_time_index()
+            if use_cache:
+                self._save_time_index()
+
+    # --- Iteratie ---
+
+    def packets(self, offset: Optional[int] = None, end: Optional[int] = None,
+                packet_ids: Optional[Iterable[int]] = None,
+                car_index: Optional[int] = None) -> Iterator[memoryview]:
+        """
+        Lees datagrammen als memoryview
+
+        Args:
+            offset: Start offset (uit seek_time/seek_lap), default het begin
+            end: Stop offset (exclusief), default het einde van het bestand
+            packet_ids: Alleen deze packet types
+            car_index: Alleen pakketten met deze player_car_index
+
+        Yields:
+            memoryview op het datagram (geldig tot de volgende iteratie)
+        """
+        iterator = self._iter_packets(offset, end, packet_ids, car_index)
+        self._iterators.add(iterator)
+        return iterator
+
+    def _iter_packets(self, offset: Optional[int], end: Optional[int],
+                      packet_ids: Optional[Iterable[int]],
+                      car_index: Optional[int]) -> Iterator[memoryview]:
+        """Generator achter packets()"""
+        mm = self._mm
+        wanted = frozenset(packet_ids) if packet_ids is not None else None
+        with memoryview(mm) as whole:
+            for _record, start, stop in self._scan(offset, end):
+                length = stop - start
+                if wanted is not None and (length <= _PACKET_ID_OFFSET
+                                           or mm[start + _PACKET_ID_OFFSET] not in wanted):
+                    continue
+                if car_index is not None and (length <= _PLAYER_CAR_OFFSET
+                                              or mm[start + _PLAYER_CAR_OFFSET] != car_index):
+                    continue
+                view = whole[start:stop]
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return self.packets()
+
+    def feed(self, handler: Callable[[memoryview], None], **filters) -> int:
+        """
+        Gebruik de capture als pakketbron, bijv. feed(data_processor.process_packet)
+
+        Args:
+            handler: Callback voor elk datagram
+            **filters: Zelfde argumenten als packets()
+
+        Returns:
+            Aantal afgeleverde pakketten
+        """
+        count = 0
+        for view in self.packets(**filters):
+            handler(view)
+            count += 1
+        return count
+
+    # --- Zoeken ---
+
+    def sessions(self) -> List[int]:
+        """Session UIDs in de capture, in volgorde van voorkomen"""
+        seen: List[int] = []
+        for entry in self.time_index:
+            if entry.session_uid not in seen:
+                seen.append(entry.session_uid)
+        return seen
+
+    def seek_time(self, session_time: float, session_uid: Optional[int] = None) -> Optional[int]:
+        """
+        Zoek het eerste datagram op of na een session_time
+
+        Args:
+            session_time: Gewenste session_time in seconden
+            session_uid: Sessie (default de eerste sessie in de capture)
+
+        Returns:
+            Byte offset voor packets(), of None als die tijd niet voorkomt
+        """
+        entries = self._session_entries(session_uid)
+        if not entries:
+            return None
+        session_uid = entries[0].session_uid
+
+        # Laatste index entry vóór de gewenste tijd, daarna lineair verder
+        start = entries[0].offset
+        for entry in entries:
+            if entry.session_time > session_time:
+                break
+            start = entry.offset
+
+        mm = self._mm
+        for record, data_start, data_stop in self._scan(start, None):
+            if data_stop - data_start < _HEADER_PEEK.size:
+                continue
+            _packet_id, uid, time_value, _overall, _car = _HEADER_PEEK.unpack_from(mm, data_start)
+            if uid == session_uid and time_value >= session_time:
+                return record
+        return None
+
+    def seek_lap(self, lap: int, session_uid: Optional[int] = None) -> Optional[int]:
+        """
+        Zoek het begin van een ronde van de speler
+
+        Returns:
+            Byte offset voor packets(), of None als de ronde niet voorkomt
+        """
+        for entry in self._session_entries(session_uid):
+            if entry.lap == lap:
+                return entry.offset
+        return None
+
+    def lap_range(self, lap: int, session_uid: Optional[int] = None) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Offsets (start, end) van een ronde, bruikbaar als packets(start, end)
+
+        end is None als de ronde tot het einde van de capture loopt.
+        """
+        entries = self._session_entries(session_uid)
+        start = None
+        for entry in entries:
+            if start is None:
+                if entry.lap == lap:
+                    start = entry.offset
+            elif entry.lap != lap:
+                return start, entry.offset
+        if start is None:
+            return None
+        # Een volgende sessie begint na deze ronde
+        following = [entry.offset for entry in self.time_index if entry.offset > start
+                     and entry.session_uid != entries[0].session_uid]
+        return start, (min(following) if following else None)
+
+    # --- Afsluiten ---
+
+    def close(self):
+        """Sluit lopende iterators, unmap en sluit het bestand"""
+        for iterator in list(self._iterators):
+            iterator.close()
+        if not self._mm.closed:
+            self._mm.close()
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> 'MmapCaptureReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Interne helpers ---
+
+    def _scan(self, offset: Optional[int], end: Optional[int]) -> Iterator[Tuple[int, int, int]]:
+        """Loop over (record offset, data start, data eind); een afgebroken laatste record stopt de scan"""
+        mm = self._mm
+        limit = self.size if end is None else min(end, self.size)
+        position = FILE_HEADER.size if offset is None else offset
+        unpack_record = RECORD_HEADER.unpack_from
+        header_size = RECORD_HEADER.size
+        while position + header_size <= limit:
+            length = unpack_record(mm, position)[3]
+            data_start = position + header_size
+            data_stop = data_start + length
+            if data_stop > limit:
+                return
+            yield position, data_start, data_stop
+            position = data_stop
+
+    def _session_entries(self, session_uid: Optional[int]) -> List[TimeIndexEntry]:
+        """Index entries van één sessie (default de eerste)"""
+        if session_uid is None:
+            if not self.time_index:
+                return []
+            session_uid = self.time_index[0].session_uid
+        return [entry for entry in self.time_index if entry.session_uid == session_uid]
+
+    def _build_time_index(self) -> List[TimeIndexEntry]:
+        """Scan de hele capture één keer en bouw de sparse tijd/ronde index"""
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._mm.madvise(mmap.MADV_SEQUENTIAL)
+
+        mm = self._mm
+        peek = _HEADER_PEEK.unpack_from
+        entries: List[TimeIndexEntry] = []
+        session_uid = None
+        next_time = 0.0
+        last_time = 0.0
+        lap = 0
+
+        for record, data_start, data_stop in self._scan(None, None):
+            if data_stop - data_start < _HEADER_PEEK.size:
+                continue
+            packet_id, uid, session_time, overall, player_car = peek(mm, data_start)
+
+            new_lap = lap
+            if packet_id == LAP_DATA_ID:
+                lap_offset = data_start + player_lap_offset(player_car)
+                if lap_offset < data_stop:
+                    new_lap = mm[lap_offset]
+
+            if uid != session_uid:
+                session_uid = uid
+                lap = new_lap if packet_id == LAP_DATA_ID else 0
+            elif session_time >= next_time or session_time < last_time or new_lap != lap:
+                lap = new_lap
+            else:
+                last_time = session_time
+                continue
+
+            entries.append(TimeIndexEntry(uid, session_time, overall, lap, record))
+            next_time = session_time + self.index_interval
+            last_time = session_time
+
+        if hasattr(mmap, 'MADV_NORMAL'):
+            self._mm.madvise(mmap.MADV_NORMAL)
+        self.logger.info(f"Tijd index opgebouwd voor {self.path}: {len(entries)} entries")
+        return entries
+
+    def _load_time_index(self) -> bool:
+        """Lees de gecachte index; False als die ontbreekt of niet (meer) bij de capture past"""
+        index_path = time_index_path_for(self.path)
+        try:
+            with open(index_path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return False
+        if len(raw) < TIME_INDEX_HEADER.size:
+            return False
+        magic, version, size, mtime_ns, interval = TIME_INDEX_HEADER.unpack_from(raw)
+        if (magic != TIME_INDEX_MAGIC or version != TIME_INDEX_VERSION or size != self.size
+                or mtime_ns != self._mtime_ns or interval != self.index_interval):
+            return False
+        body = raw[TIME_INDEX_HEADER.size:]
+        if len(body) % TIME_INDEX_ENTRY.size:
+            return False
+        self.time_index = [TimeIndexEntry(*entry) for entry in TIME_INDEX_ENTRY.iter_unpack(body)]
+        return True
+
+    def _save_time_index(self):
+        """Schrijf de index naast de capture (atomair via een tijdelijk bestand)"""
+        index_path = time_index_path_for(self.path)
+        temp_path = index_path + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(TIME_INDEX_HEADER.pack(TIME_INDEX_MAGIC, TIME_INDEX_VERSION, self.size,
+                                               self._mtime_ns, self.index_interval))
+                f.write(b''.join(TIME_INDEX_ENTRY.pack(*entry) for entry in self.time_index))
+            os.replace(temp_path, index_path)
+        except OSError as e:
+            # Bijv. een alleen-lezen map: de index blijft dan alleen in geheugen
+            self.logger.warning(f"Kon tijd index niet cachen naast {self.path}: {e}")
@@ -0,0 +1,235 @@
+"""
+F1 25 Telemetry System - Capture Recorder
+Neemt alle rauwe datagrammen op in capture bestanden (zie capture_format)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from services import logger_service
+from services.capture_format import CaptureWriter, CAPTURE_EXTENSION, peek_header_keys
+
+
+class CaptureRecorder:
+    """
+    Recorder die aan een UDP listener gehangen wordt (listener.recorder).
+
+    De receive thread roept alleen record()/record_batch() aan: die kopiëren
+    het datagram en zetten het in een deque, zonder lock of I/O. Een eigen
+    schrijf-thread haalt periodiek alles op en schrijft het in één batch
+    weg. Loopt de deque vol (schijf te traag), dan vallen nieuwe records af
+    en worden ze geteld; de receive thread wacht nooit.
+
+    Elke session_uid schrijft naar een eigen bestand, zodat de pakketten
+    van meerdere rigs (MULTI_RIG) door elkaar binnen kunnen komen zonder
+    dat er per datagram een nieuw bestand start. Een bestand wordt
+    afgesloten als het max_file_bytes bereikt (de sessie gaat verder in een
+    nieuw bestand), als de sessie idle_close seconden niets gestuurd heeft,
+    of als er meer dan max_open_files sessies open zijn (de langst niet
+    gebruikte eerst).
+    """
+
+    def __init__(self, directory: str, max_file_bytes: int = 512 * 1024 * 1024,
+                 index_interval: int = 256, flush_interval: float = 0.25,
+                 max_queue: int = 65536, max_open_files: int = 8,
+                 idle_close: float = 30.0,
+                 on_file_closed: Optional[Callable[[str], None]] = None):
+        """
+        Initialiseer de recorder
+
+        Args:
+            directory: Map voor de capture bestanden
+            max_file_bytes: Bestandsgrootte waarna geroteerd wordt
+            index_interval: Om de hoeveel records een index entry komt
+            flush_interval: Seconden tussen schrijf-batches
+            max_queue: Maximaal aantal wachtende records
+            max_open_files: Maximaal aantal tegelijk open bestanden (sessies)
+            idle_close: Seconden zonder records waarna het bestand van een
+                        sessie afgesloten wordt
+            on_file_closed: Callback met het pad van elk afgesloten bestand
+        """
+        self.logger = logger_service.get_logger('CaptureRecorder')
+        self.directory = Path(directory)
+        self.max_file_bytes = max_file_bytes
+        self.index_interval = index_interval
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.max_open_files = max(1, max_open_files)
+        self.idle_close = idle_close
+        self.on_file_closed = on_file_closed
+
+        self._pending: deque = deque()
+        self._wakeup = threading.Event()
+        # session_uid -> open writer, langst niet gebruikt eerst
+        self._writers: 'OrderedDict[Optional[int], CaptureWriter]' = OrderedDict()
+        self._last_write: Dict[Optional[int], float] = {}
+        self._last_session: Optional[int] = None
+        self._file_sequence = 0
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+
+        # Stats
+        self.records_written = 0
+        self.bytes_written = 0
+        self.records_dropped = 0
+        self.files_written = 0
+        self._bytes_closed = 0  # Bytes in al afgesloten bestanden
+
+    def start(self):
+        """Start de schrijf-thread"""
+        if self.running:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.running = True
+        self.thread = threading.Thread(target=self._writer_loop, name="CaptureWriter", daemon=True)
+        self.thread.start()
+        self.logger.info(f"Capture recorder gestart in {self.directory}")
+
+    def stop(self):
+        """Schrijf alles wat nog wacht weg en sluit het huidige bestand"""
+        if not self.running:
+            return
+        self.running = False
+        self._wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=5.0)
+        self.logger.info(f"Capture recorder gestopt ({self.records_written} records, "
+                         f"{self.records_dropped} gedropt)")
+
+    def record(self, data, addr: Optional[Tuple[str, int]]):
+        """Neem één datagram op (aangeroepen door de receive thread)"""
+        if len(self._pending) >= self.max_queue:
+            self.records_dropped += 1
+            return
+        # bytes(): in zero-copy mode is data een view op een pool buffer
+        self._pending.append((time.time(), addr, bytes(data)))
+
+    def record_batch(self, items: List[Tuple[Any, Any]]):
+        """Neem een batch (data, addr) tuples op met één tijdstempel"""
+        free = self.max_queue - len(self._pending)
+        if free < len(items):
+            self.records_dropped += len(items) - max(free, 0)
+            items = items[:max(free, 0)]
+        timestamp = time.time()
+        append = self._pending.append
+        for data, addr in items:
+            append((timestamp, addr, bytes(data)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg recorder statistieken"""
+        # .get(): de schrijf-thread kan het bestand intussen afsluiten
+        writer = self._writers.get(self._last_session)
+        return {
+            "capture_running": self.running,
+            "capture_file": writer.path if writer is not None else None,
+            "capture_open_files": len(self._writers),
+            "capture_records": self.records_written,
+            "capture_bytes": self.bytes_written,
+            "capture_dropped": self.records_dropped,
+            "capture_pending": len(self._pending),
+            "capture_files": self.files_written,
+        }
+
+    # --- Schrijf-thread ---
+
+    def _writer_loop(self):
+        """Schrijf periodiek alle wachtende records weg"""
+        while self.running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._drain()
+                self._close_idle(time.monotonic())
+            except OSError as e:
+                self.logger.error(f"Fout bij schrijven capture: {e}", exc_info=True)
+                self._close_all()
+
+        try:
+            self._drain()
+        except OSError as e:
+            self.logger.error(f"Fout bij schrijven capture: {e}", exc_info=True)
+        self._close_all()
+
+    def _drain(self):
+        """Schrijf alles wat nu in de deque staat"""
+        pending = self._pending
+        if not pending:
+            return
+        popleft = pending.popleft
+        touched = set()
+        for _ in range(len(pending)):
+            timestamp, addr, data = popleft()
+            session_uid = self._session_of(data)
+            writer = self._writer_for(session_uid)
+            writer.write(timestamp, addr, data)
+            touched.add(session_uid)
+            self.records_written += 1
+
+        now = time.monotonic()
+        for session_uid in touched:
+            self._last_write[session_uid] = now
+        for writer in self._writers.values():
+            writer.flush()
+        self.bytes_written = self._bytes_closed + sum(writer.offset for writer in self._writers.values())
+
+    def _session_of(self, data: bytes) -> Optional[int]:
+        """session_uid van een datagram; zonder geldige header die van het vorige record"""
+        keys = peek_header_keys(data)
+        if keys is None:
+            return self._last_session
+        self._last_session = keys[0]
+        return keys[0]
+
+    def _writer_for(self, session_uid: Optional[int]) -> CaptureWriter:
+        """Open bestand van een sessie; nieuw bij een volle file of een nieuwe sessie"""
+        writers = self._writers
+        writer = writers.get(session_uid)
+        if writer is not None:
+            if writer.offset < self.max_file_bytes:
+                writers.move_to_end(session_uid)
+                return writer
+            self._close_file(session_uid)
+        elif len(writers) >= self.max_open_files:
+            self._close_file(next(iter(writers)))
+
+        self._file_sequence += 1
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        name = f"capture_{stamp}_{session_uid or 0:016x}_{self._file_sequence:03d}{CAPTURE_EXTENSION}"
+        writer = CaptureWriter(os.path.join(self.directory, name), self.index_interval)
+        writers[session_uid] = writer
+        self.files_written += 1
+        self.logger.info(f"Nieuw capture bestand: {name}")
+        return writer
+
+    def _close_idle(self, now: float):
+        """Sluit de bestanden van sessies die idle_close seconden niets stuurden"""
+        idle = [session_uid for session_uid in self._writers
+                if now - self._last_write.get(session_uid, now) > self.idle_close]
+        for session_uid in idle:
+            self._close_file(session_uid)
+
+    def _close_all(self):
+        """Sluit alle open bestanden"""
+        for session_uid in list(self._writers):
+            self._close_file(session_uid)
+
+    def _close_file(self, session_uid: Optional[int]):
+        """Sluit het bestand van een sessie en meld het aan on_file_closed"""
+        writer = self._writers.pop(session_uid, None)
+        self._last_write.pop(session_uid, None)
+        if writer is None:
+            return
+        self._bytes_closed += writer.offset
+        try:
+            writer.close()
+        except OSError as e:
+            self.logger.error(f"Fout bij sluiten capture {writer.path}: {e}")
+        if self.on_file_closed is not None:
+            try:
+                self.on_file_closed(writer.path)
+            except Exception as e:
+                self.logger.error(f"Fout in on_file_closed voor {writer.path}: {e}", exc_info=True)
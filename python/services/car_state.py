@@ -0,0 +1,137 @@
+"""
+F1 25 Telemetry System - Car State Table
+Compacte live state per auto voor de 22-auto packets (Car Status, Car
+Damage): per veld één array.array met de waarden van alle auto's, plus het
+laatste record per auto. Een update schrijft alleen de velden die echt
+veranderd zijn en houdt per veld bij wanneer dat was.
+"""
+
+from array import array
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from packet_parsers.schema import C_TYPES, RecordSchema
+from packet_parsers.packet_types import MAX_CARS
+
+# struct code -> array typecode (bool als uint8)
+_ARRAY_CODES = {
+    'B': 'B', 'b': 'b', '?': 'B', 'H': 'H', 'h': 'h',
+    'I': 'I', 'i': 'i', 'Q': 'Q', 'f': 'f', 'd': 'd',
+}
+
+
+class CarStateTable:
+    """
+    Kolommen per veld voor num_cars auto's, gevuld uit schema records.
+
+    update() vergelijkt elk record eerst als geheel met het vorige record
+    van die auto (één tuple vergelijking in C); alleen bij een verschil
+    worden de gewijzigde velden gezocht en in hun kolom geschreven. Array
+    velden (bijv. tyres_wear[4]) staan als count waarden per auto achter
+    elkaar in hun kolom.
+
+    Elke update met wijzigingen verhoogt version; field_versions houdt per
+    veld de version van de laatste wijziging bij, zodat een view met
+    changed_since() alleen hoeft te tekenen wat veranderd is.
+
+    Niet thread-safe: de eigenaar (TelemetryController) houdt de lock vast.
+    """
+
+    def __init__(self, schema: RecordSchema, num_cars: int = MAX_CARS):
+        """
+        Args:
+            schema: RecordSchema van één auto (zonder char velden)
+            num_cars: Aantal auto's (22)
+        """
+        self.schema = schema
+        self.num_cars = num_cars
+        self.names: Tuple[str, ...] = schema.names
+        self._widths: Tuple[int, ...] = tuple(field.count for field in schema.fields)
+        self._columns: Dict[str, array] = {}
+        for field in schema.fields:
+            code = _ARRAY_CODES.get(C_TYPES[field.ctype][0])
+            if code is None:
+                raise ValueError(f"{schema.name}.{field.name}: type '{field.ctype}' past niet in een array")
+            self._columns[field.name] = array(code, [0]) * (num_cars * field.count)
+        self._column_list: List[array] = [self._columns[name] for name in self.names]
+        self._records: List[Optional[Any]] = [None] * num_cars
+        self.version = 0
+        self.field_versions: Dict[str, int] = dict.fromkeys(self.names, 0)
+
+    def update(self, records) -> Dict[int, Tuple[str, ...]]:
+        """
+        Verwerk de records van één packet
+
+        Alle auto's worden verwerkt; bij een RecordArray (car mask) worden
+        de niet gemaskeerde auto's daarvoor alsnog gedecodeerd.
+
+        Args:
+            records: Lijst (of RecordArray) met één record per auto
+
+        Returns:
+            Per gewijzigde auto de namen van de gewijzigde velden
+        """
+        last = self._records
+        widths = self._widths
+        columns = self._column_list
+        names = self.names
+        changes: Dict[int, Tuple[str, ...]] = {}
+
+        for index in range(min(len(records), self.num_cars)):
+            record = records[index]
+            previous = last[index]
+            if record == previous:
+                continue
+            last[index] = record
+            if previous is None:
+                changed = range(len(names))
+            else:
+                changed = [position for position, (new, old) in enumerate(zip(record, previous)) if new != old]
+            for position in changed:
+                width = widths[position]
+                if width == 1:
+                    columns[position][index] = record[position]
+                else:
+                    start = index * width
+                    columns[position][start:start + width] = array(columns[position].typecode, record[position])
+            changes[index] = tuple(names[position] for position in changed)
+
+        if changes:
+            self.version += 1
+            version = self.version
+            field_versions = self.field_versions
+            for fields in changes.values():
+                for name in fields:
+                    field_versions[name] = version
+        return changes
+
+    def get(self, index: int) -> Optional[Any]:
+        """Laatste record van een auto, of None als er nog niets ontvangen is"""
+        if 0 <= index < self.num_cars:
+            return self._records[index]
+        return None
+
+    def value(self, index: int, name: str) -> Any:
+        """Waarde van één veld van één auto (tuple voor array velden)"""
+        width = self._widths[self.names.index(name)]
+        column = self._columns[name]
+        if width == 1:
+            return column[index]
+        return tuple(column[index * width:(index + 1) * width])
+
+    def column(self, name: str) -> array:
+        """Kopie van de kolom van een veld (num_cars x count waarden)"""
+        return array(self._columns[name].typecode, self._columns[name])
+
+    def changed_since(self, version: int) -> Set[str]:
+        """Velden die na 'version' veranderd zijn"""
+        return {name for name, field_version in self.field_versions.items() if field_version > version}
+
+    def clear(self):
+        """Wis alle state (bijv. bij een nieuwe sessie)"""
+        for column in self._column_list:
+            for position in range(len(column)):
+                column[position] = 0
+        self._records = [None] * self.num_cars
+        self.version += 1
+        for name in self.names:
+            self.field_versions[name] = self.version
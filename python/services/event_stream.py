@@ -0,0 +1,117 @@
+"""
+F1 25 Telemetry System - Event Stream
+Publiceert de geparste Event packets (ID 3) aan subscribers, gefilterd op
+event code. Controllers reageren zo direct op sessie start/einde, snelste
+ronde en straffen.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from services import logger_service
+
+EventCallback = Callable[[Any], None]
+
+
+class EventStream:
+    """
+    Subscribable stroom van events, gefilterd op event code.
+
+    Per code staat een kant-en-klaar tuple met callbacks (inclusief de
+    subscribers op alle codes). publish() is daardoor één dict lookup: een
+    code zonder subscribers kost geen Python aanroep. Bij elke (un)subscribe
+    wordt de tabel opnieuw opgebouwd en in één keer vervangen, zodat
+    publish() zonder lock kan lezen.
+
+    wants(code) laat de DataProcessor een event zonder subscribers al vóór
+    het parsen weggooien (bijv. de frequente BUTN events).
+    """
+
+    def __init__(self):
+        self.logger = logger_service.get_logger('EventStream')
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[int, Tuple[EventCallback, Optional[frozenset]]] = {}
+        self._next_token = 1
+        self._routes: Dict[str, Tuple[EventCallback, ...]] = {}
+        self._wildcard: Tuple[EventCallback, ...] = ()
+        self._published: Dict[str, int] = {}
+        self._delivered = 0
+        self._errors = 0
+
+    def subscribe(self, callback: EventCallback, codes: Optional[Iterable[str]] = None) -> int:
+        """
+        Registreer een callback voor een set event codes
+
+        Args:
+            callback: Functie die het EventPacket krijgt
+            codes: EventCode strings, of None voor alle events
+
+        Returns:
+            Token voor unsubscribe()
+        """
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscriptions[token] = (callback, None if codes is None else frozenset(codes))
+            self._rebuild()
+        return token
+
+    def unsubscribe(self, token: int):
+        """Verwijder een subscription (onbekend token wordt genegeerd)"""
+        with self._lock:
+            if self._subscriptions.pop(token, None) is not None:
+                self._rebuild()
+
+    def _rebuild(self):
+        """Bouw de code -> callbacks tabel opnieuw op (lock wordt vastgehouden)"""
+        subscriptions = list(self._subscriptions.values())
+        codes_in_use = set()
+        for _callback, codes in subscriptions:
+            codes_in_use.update(codes or ())
+        # Subscribers op alle codes staan ook in elke specifieke route, in registratie volgorde
+        self._routes = {
+            code: tuple(callback for callback, codes in subscriptions if codes is None or code in codes)
+            for code in codes_in_use
+        }
+        self._wildcard = tuple(callback for callback, codes in subscriptions if codes is None)
+
+    def wants(self, code: str) -> bool:
+        """True als er een subscriber voor deze code (of voor alle codes) is"""
+        return bool(self._wildcard) or code in self._routes
+
+    def publish(self, event) -> int:
+        """
+        Stuur een event naar de subscribers van event.code
+
+        Een fout in één callback wordt gelogd en stopt de andere niet.
+
+        Returns:
+            Aantal callbacks dat het event kreeg
+        """
+        code = event.code
+        self._published[code] = self._published.get(code, 0) + 1
+        callbacks = self._routes.get(code, self._wildcard)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                self._errors += 1
+                self.logger.error(f"Event subscriber fout ({code}): {e}", exc_info=True)
+        self._delivered += len(callbacks)
+        return len(callbacks)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Verkrijg event tellers
+
+        Returns:
+            Dict met published, delivered, errors, subscribers en per_code
+        """
+        per_code = dict(self._published)
+        return {
+            "published": sum(per_code.values()),
+            "delivered": self._delivered,
+            "errors": self._errors,
+            "subscribers": len(self._subscriptions),
+            "per_code": per_code,
+        }
@@ -0,0 +1,211 @@
+"""
+F1 25 Telemetry System - Frame Assembler
+Bundelt de per-frame pakketten (lap data, motion, car telemetry, car status)
+met dezelfde overall_frame_identifier tot één onveranderlijke FrameBundle.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class FramePacket:
+    """Eén gedecodeerd pakket binnen een frame"""
+    header: Any   # PacketHeader
+    packet: Any   # Geparsed packet object (bijv. LapDataPacket)
+
+
+@dataclass(frozen=True)
+class FrameBundle:
+    """
+    Alle per-frame pakketten van één frame van één sessie
+
+    complete is False als de bundle door een timeout of een nieuwer frame
+    is vrijgegeven voordat alle verwachte packet types binnen waren.
+    """
+    session_uid: int
+    overall_frame_identifier: int
+    frame_identifier: int
+    session_time: float
+    player_car_index: int
+    packets: Mapping[int, FramePacket]
+    complete: bool
+
+    def get(self, packet_id: int) -> Optional[FramePacket]:
+        """Verkrijg het pakket van een type (of None als het ontbrak)"""
+        return self.packets.get(packet_id)
+
+    def __contains__(self, packet_id: int) -> bool:
+        return packet_id in self.packets
+
+
+class _PendingFrame:
+    """Frame dat nog pakketten verwacht"""
+
+    __slots__ = ('header', 'packets', 'created_at')
+
+    def __init__(self, header: Any, now: float):
+        self.header = header
+        self.packets: Dict[int, FramePacket] = {}
+        self.created_at = now
+
+
+class FrameAssembler:
+    """
+    Buffert per-frame pakketten tot een frame compleet is.
+
+    Een frame is compleet zodra alle expected_ids binnen zijn; dan gaat er
+    één FrameBundle naar on_frame. Een onvolledig frame wordt vrijgegeven
+    na 'timeout' seconden, of zodra een nieuwer frame van dezelfde sessie
+    vrijgegeven wordt (frames gaan altijd in volgorde naar on_frame).
+    Pakketten voor een frame dat al vrijgegeven is komen te laat en
+    vervallen: de controllers hebben dan al nieuwere data.
+
+    Timeouts worden gecontroleerd bij elke add() en bij poll(); roep poll()
+    periodiek aan als er ook stiltes in de stroom kunnen zitten.
+
+    add(), poll() en flush() mogen uit verschillende threads komen (bijv.
+    de ingest worker en de UI): verzamelen en afleveren gebeuren samen
+    onder _delivery_lock, zodat on_frame de frames nooit in een andere
+    volgorde krijgt dan ze vrijgegeven zijn.
+    """
+
+    def __init__(self, on_frame: Callable[[FrameBundle], None], expected_ids: Iterable[int],
+                 timeout: float = 0.05, max_pending: int = 8,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialiseer de assembler
+
+        Args:
+            on_frame: Callback voor elke vrijgegeven FrameBundle
+            expected_ids: Packet IDs die samen een compleet frame vormen
+            timeout: Seconden dat een onvolledig frame mag wachten
+            max_pending: Maximaal aantal openstaande frames
+            clock: Tijdsbron (monotonic), instelbaar voor tests
+        """
+        self.on_frame = on_frame
+        self.expected_ids: FrozenSet[int] = frozenset(expected_ids)
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.clock = clock
+
+        self._pending: Dict[Tuple[int, int], _PendingFrame] = {}
+        self._last_released: Dict[int, int] = {}  # session_uid -> overall frame
+        self._lock = threading.Lock()
+        # Houdt vrijgeven + on_frame bij elkaar (één aflevering tegelijk)
+        self._delivery_lock = threading.Lock()
+
+        # Stats
+        self.frames_complete = 0
+        self.frames_incomplete = 0
+        self.late_packets = 0
+
+    def add(self, header: Any, packet_id: int, packet: Any):
+        """
+        Voeg een gedecodeerd per-frame pakket toe
+
+        Args:
+            header: PacketHeader van het pakket
+            packet_id: Packet ID
+            packet: Geparsed packet object
+        """
+        session_uid = header.session_uid
+        overall = header.overall_frame_identifier
+        key = (session_uid, overall)
+
+        with self._delivery_lock:
+            now = self.clock()
+            with self._lock:
+                last = self._last_released.get(session_uid)
+                if last is not None and overall <= last:
+                    self.late_packets += 1
+                    released = self._expire(now)
+                else:
+                    pending = self._pending.get(key)
+                    if pending is None:
+                        pending = _PendingFrame(header, now)
+                        self._pending[key] = pending
+                    pending.packets[packet_id] = FramePacket(header, packet)
+
+                    if self.expected_ids.issubset(pending.packets):
+                        released = self._release_through(key, complete_key=key)
+                    elif len(self._pending) > self.max_pending:
+                        oldest = min(self._pending, key=lambda k: self._pending[k].created_at)
+                        released = self._release_through(oldest)
+                    else:
+                        released = []
+                    released += self._expire(now)
+
+            for bundle in released:
+                self.on_frame(bundle)
+
+    def poll(self):
+        """Geef frames vrij waarvan de timeout verlopen is"""
+        with self._delivery_lock:
+            with self._lock:
+                released = self._expire(self.clock())
+            for bundle in released:
+                self.on_frame(bundle)
+
+    def flush(self):
+        """Geef alle openstaande frames direct vrij (bijv. bij stoppen)"""
+        with self._delivery_lock:
+            with self._lock:
+                released = []
+                for key in sorted(self._pending):
+                    if key in self._pending:
+                        released += self._release_through(key)
+            for bundle in released:
+                self.on_frame(bundle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg assembler statistieken"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "frames_complete": self.frames_complete,
+            "frames_incomplete": self.frames_incomplete,
+            "frames_pending": pending,
+            "late_packets": self.late_packets,
+        }
+
+    # --- Interne helpers (lock wordt al vastgehouden) ---
+
+    def _expire(self, now: float) -> List[FrameBundle]:
+        """Geef alle frames vrij die langer dan timeout wachten"""
+        released: List[FrameBundle] = []
+        expired = [key for key, pending in self._pending.items()
+                   if now - pending.created_at >= self.timeout]
+        for key in sorted(expired):
+            if key in self._pending:
+                released += self._release_through(key)
+        return released
+
+    def _release_through(self, key: Tuple[int, int],
+                         complete_key: Optional[Tuple[int, int]] = None) -> List[FrameBundle]:
+        """Geef frame 'key' vrij, plus alle oudere frames van dezelfde sessie (in volgorde)"""
+        session_uid, overall = key
+        keys = sorted(k for k in self._pending if k[0] == session_uid and k[1] <= overall)
+        released = []
+        for k in keys:
+            pending = self._pending.pop(k)
+            complete = k == complete_key
+            if complete:
+                self.frames_complete += 1
+            else:
+                self.frames_incomplete += 1
+            header = pending.header
+            released.append(FrameBundle(
+                session_uid=session_uid,
+                overall_frame_identifier=k[1],
+                frame_identifier=header.frame_identifier,
+                session_time=header.session_time,
+                player_car_index=header.player_car_index,
+                packets=MappingProxyType(pending.packets),
+                complete=complete,
+            ))
+        self._last_released[session_uid] = overall
+        return released
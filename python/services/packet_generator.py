@@ -0,0 +1,734 @@
+"""
+F1 25 Telemetry System - Synthetic Packet Generator
+Lokale vervanger van de game voor load- en soak tests: genereert spec-correcte
+F1 25 datagrammen voor alle 16 packet types, voor een instelbaar aantal auto's,
+rigs en frames per seconde, met rondes, pitstops, flashbacks en pakketverlies.
+
+Gebruik (vanuit de python map):
+    python -m services.packet_generator --rigs 2 --cars 22 --rate 60 --duration 60
+"""
+
+import argparse
+import math
+import random
+import socket
+import struct
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+from packet_parsers.packet_types import PacketID, EventCode, PACKET_FORMAT_2025, GAME_YEAR, MAX_CARS
+
+# --- Spec formats (F1 25 Telemetry Output Structures) ---
+
+HEADER = struct.Struct('<HBBBBBQfIIBB')
+MOTION_CAR = struct.Struct('<6f6h6f')
+SESSION = struct.Struct('<BbbBHBbBHHBBBBBB' + 'fb' * 21 + 'BBB' + 'BBBbbbbB' * 64
+                        + 'BBIII' + 'B' * 14 + 'I' + 'B' * 33 + '12B' + 'ff')
+LAP_CAR = struct.Struct('<IIHBHBHBHBfff' + 'B' * 15 + 'HHBfB')
+LAP_TAIL = struct.Struct('<BB')
+EVENT = struct.Struct('<4s12s')
+COUNT_HEAD = struct.Struct('<B')
+PARTICIPANT = struct.Struct('<7B32sBBHBB12B')
+CAR_SETUP = struct.Struct('<4B4f9B4fBf')
+FLOAT_TAIL = struct.Struct('<f')
+TELEMETRY_CAR = struct.Struct('<HfffBbHBBH4H4B4BH4f4B')
+TELEMETRY_TAIL = struct.Struct('<BBb')
+STATUS_CAR = struct.Struct('<5BfffHHBBHBBBbfffBfffB')
+FINAL_CAR = struct.Struct('<7BIdBBB8B8B8B')
+LOBBY_CAR = struct.Struct('<4B32sBBBHB')
+DAMAGE_CAR = struct.Struct('<4f30B')
+HISTORY_HEAD = struct.Struct('<7B')
+HISTORY_LAP = struct.Struct('<IHBHBHBB')
+HISTORY_STINT = struct.Struct('<3B')
+TYRE_SET = struct.Struct('<7BhB')
+MOTION_EX = struct.Struct('<61f')
+TIME_TRIAL_SET = struct.Struct('<BBIIIIBBBBBB')
+LAP_POSITIONS_HEAD = struct.Struct('<BB')
+
+MAX_LAPS_IN_HISTORY = 100
+MAX_TYRE_STINTS = 8
+MAX_TYRE_SETS = 20
+MAX_LAP_POSITIONS = 50
+
+# Packet types die elke frame verstuurd worden
+PER_FRAME_IDS = (PacketID.MOTION, PacketID.LAP_DATA, PacketID.CAR_TELEMETRY,
+                 PacketID.CAR_STATUS, PacketID.MOTION_EX)
+
+# Verzendfrequentie (Hz) van de overige packet types. Event en Final
+# Classification worden verstuurd als ze gebeuren. Lobby Info stuurt de
+# game alleen in de lobby; hier periodiek zodat ook die parser belast wordt.
+DEFAULT_PACKET_RATES = {
+    PacketID.SESSION: 2.0,
+    PacketID.PARTICIPANTS: 0.2,
+    PacketID.CAR_SETUPS: 2.0,
+    PacketID.LOBBY_INFO: 0.5,
+    PacketID.CAR_DAMAGE: 10.0,
+    PacketID.SESSION_HISTORY: 20.0,  # Eén auto per pakket, om de beurt
+    PacketID.TYRE_SETS: 20.0,        # Eén auto per pakket, om de beurt
+    PacketID.TIME_TRIAL: 1.0,
+    PacketID.LAP_POSITIONS: 1.0,
+}
+
+POINTS = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+PIT_LANE_SECONDS = 20.0
+PIT_STOP_SECONDS = 2.5
+PIT_LANE_SPEED = 80.0 / 3.6  # m/s
+FUEL_CAPACITY = 110.0
+
+# Compounds voor en na de pitstop: (actual, visual)
+START_COMPOUND = (18, 17)   # C3 medium
+PIT_COMPOUND = (19, 18)     # C2 hard
+
+
+def _split_ms(ms: int) -> Tuple[int, int]:
+    """Tijd in ms naar (ms deel, minuten deel) zoals de spec sectortijden opslaat"""
+    return ms % 60000, min(ms // 60000, 255)
+
+
+class _Car:
+    """Gesimuleerde toestand van één auto"""
+
+    __slots__ = ('index', 'lap_target', 'lap_distance', 'total_distance', 'lap',
+                 'current_lap_ms', 'last_lap_ms', 'best_lap_ms', 'sector1_ms', 'sector2_ms',
+                 'position', 'grid', 'pit_lap', 'pit_timer', 'pit_stops', 'tyre_age',
+                 'compound', 'fuel', 'speed', 'finish_rank', 'history', 'stints')
+
+    def __init__(self, index: int):
+        self.index = index
+        self.lap_target = 90.0
+        self.lap_distance = 0.0
+        self.total_distance = 0.0
+        self.lap = 1
+        self.current_lap_ms = 0.0
+        self.last_lap_ms = 0
+        self.best_lap_ms = 0
+        self.sector1_ms = 0
+        self.sector2_ms = 0
+        self.position = index + 1
+        self.grid = index + 1
+        self.pit_lap = 0
+        self.pit_timer = 0.0
+        self.pit_stops = 0
+        self.tyre_age = 0
+        self.compound = START_COMPOUND
+        self.fuel = 0.0
+        self.speed = 0.0
+        self.finish_rank = 0  # 0 = nog niet gefinisht
+        self.history: List[Tuple[int, int, int, int]] = []   # (lap, s1, s2, s3) in ms
+        self.stints: List[Tuple[int, int, int]] = []         # (eind ronde, actual, visual)
+
+    def copy(self) -> '_Car':
+        """Kopie voor een flashback snapshot"""
+        car = _Car.__new__(_Car)
+        for name in _Car.__slots__:
+            setattr(car, name, getattr(self, name))
+        car.history = list(self.history)
+        car.stints = list(self.stints)
+        return car
+
+    @property
+    def in_pit(self) -> bool:
+        return self.pit_timer > 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.finish_rank > 0
+
+
+class SimulatedRig:
+    """
+    Eén gesimuleerde game: een sessie met num_cars auto's op een ronde baan.
+
+    step() gaat één frame vooruit en geeft de datagrammen van die frame;
+    build_packet() bouwt elk packet type op aanvraag uit de huidige toestand.
+    Na de finish (total_laps) volgen Final Classification en een SEND
+    event, en begint automatisch een nieuwe sessie met een nieuwe
+    session_uid.
+    """
+
+    def __init__(self, num_cars: int = 20, rate: int = 60, total_laps: int = 5,
+                 lap_time: float = 90.0, track_length: float = 5000.0,
+                 flashback_interval: Optional[float] = None, flashback_seconds: float = 5.0,
+                 player_car_index: int = 0, rng: Optional[random.Random] = None):
+        """
+        Initialiseer de rig
+
+        Args:
+            num_cars: Aantal actieve auto's (max 22)
+            rate: Frames per seconde (game instelling 'UDP Send Rate')
+            total_laps: Ronden per race
+            lap_time: Gemiddelde rondetijd in seconden
+            track_length: Baanlengte in meters
+            flashback_interval: Seconden tussen flashbacks (None = geen)
+            flashback_seconds: Hoe ver een flashback terug gaat
+            player_car_index: Index van de speler
+            rng: Random bron (voor reproduceerbare runs)
+        """
+        if not 1 <= num_cars <= MAX_CARS:
+            raise ValueError(f"num_cars moet tussen 1 en {MAX_CARS} liggen, kreeg {num_cars}")
+        self.num_cars = num_cars
+        self.rate = rate
+        self.total_laps = total_laps
+        self.lap_time = lap_time
+        self.track_length = track_length
+        self.flashback_interval = flashback_interval
+        self.flashback_seconds = flashback_seconds
+        self.player_car_index = min(player_car_index, num_cars - 1)
+        self.rng = rng or random.Random()
+
+        self.frame_identifier = 0
+        self.overall_frame_identifier = 0
+        self.sessions = 0
+        self.flashbacks = 0
+        self._history_car = 0
+        self._tyre_set_car = 0
+        self._intervals = {packet_id: max(1, round(rate / hz)) for packet_id, hz in DEFAULT_PACKET_RATES.items()}
+        self._new_session()
+
+    # --- Simulatie ---
+
+    def step(self) -> List[bytes]:
+        """Ga één frame vooruit en geef de datagrammen van die frame"""
+        dt = 1.0 / self.rate
+        self.session_time += dt
+        self.frame_identifier += 1
+        self.overall_frame_identifier += 1
+        self._advance(dt)
+
+        packets: List[bytes] = []
+        if self.flashback_interval and self.session_time >= self._next_flashback:
+            self._flashback()
+        elif self.session_time >= self._next_snapshot:
+            self._snapshots.append((self.session_time, self.frame_identifier,
+                                    [car.copy() for car in self.cars]))
+            self._next_snapshot = self.session_time + 1.0
+
+        for packet_id in PER_FRAME_IDS:
+            packets.append(self.build_packet(packet_id))
+        # Vaste frame intervallen vanaf de sessie start (ook door flashbacks heen)
+        session_frame = self.overall_frame_identifier - self._session_start_frame
+        for packet_id, interval in self._intervals.items():
+            if session_frame % interval == 0:
+                packets.append(self.build_packet(packet_id))
+
+        for code, details in self._events:
+            packets.append(self._event_packet(code, details))
+        self._events.clear()
+
+        if self.finished_cars == self.num_cars:
+            packets.append(self.build_packet(PacketID.FINAL_CLASSIFICATION))
+            packets.append(self._event_packet(EventCode.SESSION_ENDED))
+            self._new_session()
+        return packets
+
+    def _new_session(self):
+        """Start een nieuwe sessie (nieuwe session_uid, auto's op de grid)"""
+        self.session_uid = self.rng.getrandbits(64)
+        self.session_time = 0.0
+        self.frame_identifier = 0
+        self.sessions += 1
+        self.cars = [self._new_car(index) for index in range(self.num_cars)]
+        self.cars_by_position = list(self.cars)
+        self.fastest_lap_ms = 0
+        self.finished_cars = 0
+        self.lap_positions: List[List[int]] = [[car.position for car in self.cars]]
+        self._snapshots: Deque[Tuple[float, int, List[_Car]]] = deque(
+            maxlen=int(self.flashback_seconds) + 2)
+        self._next_snapshot = 0.0
+        self._next_flashback = self.flashback_interval or 0.0
+        self._session_start_frame = self.overall_frame_identifier + 1
+        self._events: List[Tuple[str, bytes]] = [(EventCode.SESSION_STARTED, b''),
+                                                 (EventCode.LIGHTS_OUT, b'')]
+
+    def _new_car(self, index: int) -> _Car:
+        """Auto op de grid, met eigen tempo en pitstop ronde"""
+        car = _Car(index)
+        car.lap_target = self.lap_time * (1.0 + 0.003 * index) + self.rng.uniform(-0.3, 0.3)
+        car.lap_distance = -12.0 * index  # Grid opstelling achter de startlijn
+        car.total_distance = car.lap_distance
+        car.fuel = 2.0 + self.total_laps * 1.6
+        if self.total_laps >= 3:
+            car.pit_lap = self.rng.randint(max(2, self.total_laps // 3), max(2, 2 * self.total_laps // 3))
+        return car
+
+    def _advance(self, dt: float):
+        """Verplaats alle auto's en werk ronden, sectoren en pitstops bij"""
+        third = self.track_length / 3.0
+        for car in self.cars:
+            if car.finished:
+                car.speed = 0.0
+                continue
+            if car.in_pit:
+                car.pit_timer -= dt
+                stationary = abs(car.pit_timer - PIT_LANE_SECONDS / 2.0) < PIT_STOP_SECONDS / 2.0
+                car.speed = 0.0 if stationary else PIT_LANE_SPEED
+                if car.pit_timer <= 0.0:
+                    car.pit_timer = 0.0
+                    car.pit_stops += 1
+                    car.stints.append((car.lap - 1, *car.compound))
+                    car.compound = PIT_COMPOUND
+                    car.tyre_age = 0
+                distance = car.speed * dt
+            else:
+                # Gemiddeld tempo voor de afstand, variërende snelheid voor de telemetrie
+                average = self.track_length / car.lap_target
+                phase = 2.0 * math.pi * 5.0 * car.lap_distance / self.track_length
+                car.speed = average * (1.0 + 0.25 * math.sin(phase))
+                distance = average * dt
+
+            before = car.lap_distance
+            car.lap_distance += distance
+            car.total_distance += distance
+            car.current_lap_ms += dt * 1000.0
+            car.fuel = max(0.0, car.fuel - distance / self.track_length * 1.6)
+            if before < third <= car.lap_distance:
+                car.sector1_ms = int(car.current_lap_ms)
+            elif before < 2 * third <= car.lap_distance:
+                car.sector2_ms = int(car.current_lap_ms) - car.sector1_ms
+            if car.lap_distance >= self.track_length:
+                self._complete_lap(car)
+
+        self.cars_by_position = sorted(self.cars, key=lambda car: (car.finish_rank or MAX_CARS + 1,
+                                                                   -car.total_distance))
+        for position, car in enumerate(self.cars_by_position, 1):
+            car.position = position
+
+    def _complete_lap(self, car: _Car):
+        """Auto komt over de finish"""
+        lap_ms = int(car.current_lap_ms)
+        sector3 = max(0, lap_ms - car.sector1_ms - car.sector2_ms)
+        car.history.append((lap_ms, car.sector1_ms, car.sector2_ms, sector3))
+        car.last_lap_ms = lap_ms
+        if not car.best_lap_ms or lap_ms < car.best_lap_ms:
+            car.best_lap_ms = lap_ms
+        if not self.fastest_lap_ms or lap_ms < self.fastest_lap_ms:
+            self.fastest_lap_ms = lap_ms
+            self._events.append((EventCode.FASTEST_LAP, struct.pack('<Bf', car.index, lap_ms / 1000.0)))
+
+        car.lap_distance -= self.track_length
+        car.current_lap_ms = 0.0
+        car.sector1_ms = car.sector2_ms = 0
+        car.lap += 1
+        car.tyre_age += 1
+        car.lap_target = self.lap_time * (1.0 + 0.003 * car.index) + self.rng.uniform(-0.3, 0.3)
+
+        if car.lap > self.total_laps or self.finished_cars:
+            # Na de winnaar finisht iedereen bij de volgende doorkomst
+            self.finished_cars += 1
+            car.finish_rank = self.finished_cars
+            car.lap -= 1
+            if self.finished_cars == 1:
+                self._events.append((EventCode.CHEQUERED_FLAG, b''))
+        elif car.lap == car.pit_lap:
+            car.pit_timer = PIT_LANE_SECONDS
+
+        if car.position == 1 and car.lap > len(self.lap_positions):
+            self.lap_positions.append([other.position for other in self.cars])
+
+    def _flashback(self):
+        """Zet de sessie flashback_seconds terug (overall frame loopt door)"""
+        target = self.session_time - self.flashback_seconds
+        snapshot = None
+        for candidate in self._snapshots:
+            if candidate[0] <= target:
+                snapshot = candidate
+        self._next_flashback = self.session_time + self.flashback_interval
+        if snapshot is None:
+            return
+        self.session_time, self.frame_identifier, cars = snapshot
+        self.cars = [car.copy() for car in cars]
+        self.finished_cars = sum(1 for car in self.cars if car.finished)
+        self.cars_by_position = sorted(self.cars, key=lambda car: car.position)
+        self._next_flashback = self.session_time + self.flashback_interval
+        self._next_snapshot = self.session_time + 1.0
+        while self._snapshots and self._snapshots[-1][0] > self.session_time:
+            self._snapshots.pop()
+        self.flashbacks += 1
+        self._events.append((EventCode.FLASHBACK,
+                             struct.pack('<If', self.frame_identifier, self.session_time)))
+
+    # --- Packet builders ---
+
+    def build_packet(self, packet_id: int) -> bytes:
+        """Bouw één datagram van een packet type uit de huidige toestand"""
+        if packet_id == PacketID.EVENT:
+            return self._event_packet(EventCode.BUTTON_STATUS, struct.pack('<I', 0))
+        return self._header(packet_id) + self._builders[packet_id](self)
+
+    def _header(self, packet_id: int) -> bytes:
+        return HEADER.pack(PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1, packet_id, self.session_uid,
+                           self.session_time, self.frame_identifier, self.overall_frame_identifier,
+                           self.player_car_index, 255)
+
+    def _event_packet(self, code: str, details: bytes = b'') -> bytes:
+        return self._header(PacketID.EVENT) + EVENT.pack(code.encode('ascii'), details)
+
+    def _slots(self, record: struct.Struct, build: Callable[[_Car], tuple]) -> bytes:
+        """22 records: actieve auto's gevuld, de rest nullen (zoals de game)"""
+        empty = bytes(record.size)
+        return b''.join(record.pack(*build(car)) for car in self.cars) + empty * (MAX_CARS - self.num_cars)
+
+    def _motion(self) -> bytes:
+        radius = self.track_length / (2.0 * math.pi)
+
+        def build(car: _Car) -> tuple:
+            angle = car.lap_distance / radius
+            sin, cos = math.sin(angle), math.cos(angle)
+            return (radius * cos, 0.0, radius * sin,
+                    -car.speed * sin, 0.0, car.speed * cos,
+                    int(-sin * 32767), 0, int(cos * 32767), int(cos * 32767), 0, int(sin * 32767),
+                    car.speed ** 2 / radius / 9.81, 0.0, 1.0, angle, 0.0, 0.0)
+        return self._slots(MOTION_CAR, build)
+
+    def _session(self) -> bytes:
+        leader = self.cars_by_position[0]
+        values: List[Any] = [0, 33, 24, self.total_laps, int(self.track_length), 10, 0, 0,
+                             max(0, int(self.total_laps * self.lap_time * 1.5 - self.session_time)),
+                             int(self.total_laps * self.lap_time * 1.5), 80, 0, 0, 255, 0, 21]
+        for zone in range(21):
+            values += [zone / 21.0, 1]
+        values += [0, 0, 64]
+        for sample in range(64):
+            values += [10, sample * 5 % 256, 0, 33, 2, 24, 2, 0]
+        values += [0, 90, 1, 1, 1]                  # Forecast, AI, link ids
+        values += [max(2, self.total_laps // 2), self.total_laps, 10]  # Pit window
+        values += [0] * 9 + [4, 0]                  # Assists, game mode, rule set
+        values += [14 * 60]                         # Time of day
+        values += [7, 1, 0, 1, 0, 0, 0, 0]          # Lengte, eenheden, safety cars, rode vlaggen
+        values += [0, 1, 3, 0, 0, 1, 1, 1, 1, 1]    # Regels en simulatie instellingen
+        values += [1, 1, 0, 0, 2, 0, 1, 1, 2, 1, 1, 1, 1, 1, 1]
+        values += [10] + [0] * 11                   # Weekend structuur (alleen race)
+        values += [self.track_length / 3.0, 2.0 * self.track_length / 3.0]
+        if leader.finished:
+            values[8] = 0
+        return SESSION.pack(*values)
+
+    def _lap_data(self) -> bytes:
+        leader = self.cars_by_position[0]
+
+        def build(car: _Car) -> tuple:
+            speed = self.track_length / car.lap_target
+            ahead = self.cars_by_position[car.position - 2] if car.position > 1 else car
+            to_front = int(max(0.0, ahead.total_distance - car.total_distance) / speed * 1000)
+            to_leader = int(max(0.0, leader.total_distance - car.total_distance) / speed * 1000)
+            sector = min(2, int(max(0.0, car.lap_distance) / (self.track_length / 3.0)))
+            driver_status = 2 if car.in_pit else 4
+            pit_status = (2 if car.speed == 0.0 else 1) if car.in_pit else 0
+            pit_lane_ms = int((PIT_LANE_SECONDS - car.pit_timer) * 1000) if car.in_pit else 0
+            return (car.last_lap_ms, int(car.current_lap_ms),
+                    *_split_ms(car.sector1_ms), *_split_ms(car.sector2_ms),
+                    *_split_ms(to_front), *_split_ms(to_leader),
+                    car.lap_distance, car.total_distance, 0.0,
+                    car.position, car.lap, pit_status, car.pit_stops, sector, 0, 0, 0, 0, 0, 0,
+                    car.grid, driver_status, 3 if car.finished else 2,
+                    1 if car.in_pit else 0, min(pit_lane_ms, 65535), 0, 0, 0.0, 255)
+        return self._slots(LAP_CAR, build) + LAP_TAIL.pack(255, 255)
+
+    def _participants(self) -> bytes:
+        def build(car: _Car) -> tuple:
+            is_player = car.index == self.player_car_index
+            return (0 if is_player else 1, car.index, car.index, car.index // 2 % 10, 0, car.index + 1, 1,
+                    f"Driver {car.index + 1:02d}".encode('utf-8'), 1, 1, 0, 1, 0, *([0] * 12))
+        return COUNT_HEAD.pack(self.num_cars) + self._slots(PARTICIPANT, build)
+
+    def _car_setups(self) -> bytes:
+        def build(car: _Car) -> tuple:
+            return (25, 20, 50, 50, -3.0, -1.5, 0.05, 0.2, 20, 10, 10, 8, 30, 50, 95, 55, 50,
+                    22.5, 22.5, 24.0, 24.0, 0, car.fuel)
+        return self._slots(CAR_SETUP, build) + FLOAT_TAIL.pack(25.0)
+
+    def _car_telemetry(self) -> bytes:
+        def build(car: _Car) -> tuple:
+            kmh = car.speed * 3.6
+            gear = 0 if kmh < 1.0 else min(8, 1 + int(kmh / 40.0))
+            rpm = 3500 + int((kmh % 40.0) / 40.0 * 8000) if gear else 3500
+            throttle = 1.0 if car.speed >= self.track_length / car.lap_target else 0.4
+            brake = 0.0 if throttle == 1.0 else 0.3
+            tyre = 85 + min(car.tyre_age, 20)
+            return (int(kmh), throttle, 0.0, brake, 0, gear, rpm, 0, min(100, rpm // 120),
+                    (1 << min(15, rpm // 800)) - 1, 500, 500, 520, 520, tyre, tyre, tyre + 5, tyre + 5,
+                    100, 100, 105, 105, 110, 22.5, 22.5, 24.0, 24.0, 0, 0, 0, 0)
+        return self._slots(TELEMETRY_CAR, build) + TELEMETRY_TAIL.pack(255, 255, 0)
+
+    def _car_status(self) -> bytes:
+        def build(car: _Car) -> tuple:
+            ers = 4_000_000.0 * (0.5 + 0.5 * math.sin(car.lap_distance / self.track_length * 2 * math.pi))
+            return (0, 0, 1, 55, 1 if car.in_pit else 0, car.fuel, FUEL_CAPACITY, car.fuel / 1.6,
+                    13000, 3500, 8, 1, 0, car.compound[0], car.compound[1], car.tyre_age, 0,
+                    560000.0, 120000.0, ers, 1, 500000.0, 300000.0, 800000.0, 0)
+        return self._slots(STATUS_CAR, build)
+
+    def _final_classification(self) -> bytes:
+        def build(car: _Car) -> tuple:
+            stints = car.stints + [(car.lap, *car.compound)]
+            stints = stints[:MAX_TYRE_STINTS]
+            padding = [0] * (MAX_TYRE_STINTS - len(stints))
+            return (car.position, len(car.history), car.grid,
+                    POINTS[car.position - 1] if car.position <= len(POINTS) else 0,
+                    car.pit_stops, 3 if car.finished else 2, 2 if car.finished else 0,
+                    car.best_lap_ms, sum(lap[0] for lap in car.history) / 1000.0, 0, 0, len(stints),
+                    *[stint[1] for stint in stints], *padding,
+                    *[stint[2] for stint in stints], *padding,
+                    *[stint[0] for stint in stints], *padding)
+        return COUNT_HEAD.pack(self.num_cars) + self._slots(FINAL_CAR, build)
+
+    def _lobby_info(self) -> bytes:
+        def build(car: _Car) -> tuple:
+            return (0 if car.index == self.player_car_index else 1, car.index // 2 % 10, 1, 1,
+                    f"Driver {car.index + 1:02d}".encode('utf-8'), car.index + 1, 1, 1, 0, 1)
+        return COUNT_HEAD.pack(self.num_cars) + self._slots(LOBBY_CAR, build)
+
+    def _car_damage(self) -> bytes:
+        def build(car: _Car) -> tuple:
+            wear = min(100.0, car.tyre_age * 2.5 + max(0.0, car.lap_distance) / self.track_length * 2.5)
+            return (wear, wear, wear * 1.1, wear * 1.1, *([int(wear) // 10] * 4), *([0] * 8),
+                    *([0] * 12), min(100, car.lap), min(100, car.lap), 0, 0, 0, 0)
+        return self._slots(DAMAGE_CAR, build)
+
+    def _session_history(self) -> bytes:
+        car = self.cars[self._history_car]
+        self._history_car = (self._history_car + 1) % self.num_cars
+        history = car.history[:MAX_LAPS_IN_HISTORY]
+
+        def best(column: int) -> int:
+            if not history:
+                return 0
+            return 1 + min(range(len(history)), key=lambda lap: history[lap][column])
+
+        laps = [HISTORY_LAP.pack(lap_ms, *_split_ms(s1), *_split_ms(s2), *_split_ms(s3), 0x0F)
+                for lap_ms, s1, s2, s3 in history]
+        if len(laps) < MAX_LAPS_IN_HISTORY:
+            # Huidige, nog niet afgeronde ronde
+            laps.append(HISTORY_LAP.pack(0, *_split_ms(car.sector1_ms), *_split_ms(car.sector2_ms), 0, 0, 0x01))
+        laps += [bytes(HISTORY_LAP.size)] * (MAX_LAPS_IN_HISTORY - len(laps))
+
+        stints = (car.stints + [(255, *car.compound)])[:MAX_TYRE_STINTS]
+        stint_bytes = [HISTORY_STINT.pack(*stint) for stint in stints]
+        stint_bytes += [bytes(HISTORY_STINT.size)] * (MAX_TYRE_STINTS - len(stints))
+        return (HISTORY_HEAD.pack(car.index, len(history) + 1, len(stints), best(0), best(1), best(2), best(3))
+                + b''.join(laps) + b''.join(stint_bytes))
+
+    def _tyre_sets(self) -> bytes:
+        car = self.cars[self._tyre_set_car]
+        self._tyre_set_car = (self._tyre_set_car + 1) % self.num_cars
+        sets = []
+        fitted_index = 0
+        for index in range(MAX_TYRE_SETS):
+            if index < 13:
+                actual, visual = ((17, 16), START_COMPOUND, PIT_COMPOUND)[index % 3]
+            else:
+                actual = visual = 7 if index < 17 else 8
+            fitted = (actual, visual) == car.compound and not fitted_index
+            if fitted:
+                fitted_index = index
+            sets.append(TYRE_SET.pack(actual, visual, car.tyre_age * 3 if fitted else 0, 1, 0,
+                                      30 - (car.tyre_age if fitted else 0), 30, 0, 1 if fitted else 0))
+        return COUNT_HEAD.pack(car.index) + b''.join(sets) + COUNT_HEAD.pack(fitted_index)
+
+    def _motion_ex(self) -> bytes:
+        car = self.cars[self.player_car_index]
+        speed = car.speed
+        values = ([10.0] * 4 + [0.0] * 4 + [0.0] * 4          # Vering positie, snelheid, versnelling
+                  + [speed] * 4 + [0.01] * 4 + [0.0] * 4        # Wielsnelheid, slip ratio, slip hoek
+                  + [0.0] * 4 + [1000.0] * 4                    # Laterale en longitudinale kracht
+                  + [0.3, 0.0, 0.0, speed]                      # Zwaartepunt hoogte, lokale snelheid
+                  + [0.0] * 6 + [0.0]                           # Hoeksnelheid/-versnelling, stuurhoek
+                  + [4000.0] * 4 + [0.03, 0.06, 0.0, 0.0, 0.0, 0.0]
+                  + [-0.05] * 4 + [0.0] * 4)                    # Camber en camber gain
+        return MOTION_EX.pack(*values)
+
+    def _time_trial(self) -> bytes:
+        car = self.cars[self.player_car_index]
+        best = car.best_lap_ms or 0
+        third = best // 3
+        data_set = TIME_TRIAL_SET.pack(car.index, car.index // 2 % 10, best, third, third,
+                                       best - 2 * third, 0, 0, 0, 0, 0, 1 if best else 0)
+        return data_set * 3
+
+    def _lap_positions(self) -> bytes:
+        rows = self.lap_positions[-MAX_LAP_POSITIONS:]
+        lap_start = len(self.lap_positions) - len(rows)
+        data = bytearray(MAX_LAP_POSITIONS * MAX_CARS)
+        for lap, positions in enumerate(rows):
+            data[lap * MAX_CARS:lap * MAX_CARS + len(positions)] = bytes(positions)
+        return LAP_POSITIONS_HEAD.pack(len(rows), lap_start) + bytes(data)
+
+    _builders: Dict[int, Callable[['SimulatedRig'], bytes]] = {
+        PacketID.MOTION: _motion,
+        PacketID.SESSION: _session,
+        PacketID.LAP_DATA: _lap_data,
+        PacketID.PARTICIPANTS: _participants,
+        PacketID.CAR_SETUPS: _car_setups,
+        PacketID.CAR_TELEMETRY: _car_telemetry,
+        PacketID.CAR_STATUS: _car_status,
+        PacketID.FINAL_CLASSIFICATION: _final_classification,
+        PacketID.LOBBY_INFO: _lobby_info,
+        PacketID.CAR_DAMAGE: _car_damage,
+        PacketID.SESSION_HISTORY: _session_history,
+        PacketID.TYRE_SETS: _tyre_sets,
+        PacketID.MOTION_EX: _motion_ex,
+        PacketID.TIME_TRIAL: _time_trial,
+        PacketID.LAP_POSITIONS: _lap_positions,
+    }
+
+
+class PacketGenerator:
+    """
+    Meerdere gesimuleerde rigs plus pakketverlies, met twee uitvoerpaden:
+    feed() geeft de datagrammen direct aan een processor, send() verstuurt
+    ze over UDP (één socket per rig, dus elke rig een eigen bron poort).
+
+    De simulatietijd loopt per frame 1/rate seconde; feed() draait zo snel
+    mogelijk, send() standaard in real-time.
+    """
+
+    def __init__(self, num_rigs: int = 1, num_cars: int = 20, rate: int = 60,
+                 loss_rate: float = 0.0, seed: Optional[int] = None, **rig_options):
+        """
+        Initialiseer de generator
+
+        Args:
+            num_rigs: Aantal gelijktijdige games (elk een eigen sessie)
+            num_cars: Auto's per sessie
+            rate: Frames per seconde
+            loss_rate: Kans (0..1) dat een datagram verloren gaat
+            seed: Seed voor reproduceerbare runs
+            **rig_options: Doorgegeven aan SimulatedRig (total_laps,
+                           lap_time, flashback_interval, ...)
+        """
+        self.rng = random.Random(seed)
+        self.rate = rate
+        self.loss_rate = loss_rate
+        self.rigs = [SimulatedRig(num_cars=num_cars, rate=rate, player_car_index=index,
+                                  rng=random.Random(self.rng.getrandbits(32)), **rig_options)
+                     for index in range(num_rigs)]
+
+        # Stats
+        self.frames = 0
+        self.datagrams_generated = 0
+        self.datagrams_dropped = 0
+        self.generated_by_packet_id: Dict[int, int] = {}
+
+    def tick(self) -> List[Tuple[int, bytes]]:
+        """Eén frame van alle rigs: lijst (rig index, datagram), na pakketverlies"""
+        self.frames += 1
+        output: List[Tuple[int, bytes]] = []
+        loss_rate = self.loss_rate
+        random_value = self.rng.random
+        counts = self.generated_by_packet_id
+        for index, rig in enumerate(self.rigs):
+            for data in rig.step():
+                self.datagrams_generated += 1
+                counts[data[6]] = counts.get(data[6], 0) + 1
+                if loss_rate and random_value() < loss_rate:
+                    self.datagrams_dropped += 1
+                    continue
+                output.append((index, data))
+        return output
+
+    def datagrams(self, duration: float) -> Iterator[Tuple[int, bytes]]:
+        """Alle (rig index, datagram) voor 'duration' seconden simulatietijd"""
+        for _ in range(int(duration * self.rate)):
+            yield from self.tick()
+
+    def feed(self, packet_handler: Callable[[bytes], Any], duration: float,
+             batch_handler: Optional[Callable[[List[Tuple[bytes, Any]]], Any]] = None) -> int:
+        """
+        Geef de datagrammen direct aan een processor (zonder sockets)
+
+        Args:
+            packet_handler: Bijv. DataProcessor.process_packet
+            duration: Seconden simulatietijd
+            batch_handler: Optioneel, krijgt per frame een lijst (data, addr)
+
+        Returns:
+            Aantal afgeleverde datagrammen
+        """
+        count = 0
+        for _ in range(int(duration * self.rate)):
+            frame = self.tick()
+            if batch_handler is not None:
+                batch_handler([(data, ('127.0.0.1', 20000 + index)) for index, data in frame])
+            else:
+                for _index, data in frame:
+                    packet_handler(data)
+            count += len(frame)
+        return count
+
+    def send(self, host: str = '127.0.0.1', port: int = 20777, duration: float = 10.0,
+             realtime: bool = True) -> int:
+        """
+        Verstuur de datagrammen over UDP
+
+        Args:
+            host: Doel adres
+            port: Doel poort
+            duration: Seconden simulatietijd
+            realtime: Frames op 'rate' Hz versturen (False = zo snel mogelijk)
+
+        Returns:
+            Aantal verstuurde datagrammen
+        """
+        sockets = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for _ in self.rigs]
+        target = (host, port)
+        count = 0
+        interval = 1.0 / self.rate
+        next_frame = time.perf_counter()
+        try:
+            for _ in range(int(duration * self.rate)):
+                for index, data in self.tick():
+                    sockets[index].sendto(data, target)
+                    count += 1
+                if realtime:
+                    next_frame += interval
+                    delay = next_frame - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+        finally:
+            for sock in sockets:
+                sock.close()
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg generator statistieken"""
+        return {
+            "frames": self.frames,
+            "datagrams_generated": self.datagrams_generated,
+            "datagrams_dropped": self.datagrams_dropped,
+            "generated_by_packet_id": dict(self.generated_by_packet_id),
+            "sessions": sum(rig.sessions for rig in self.rigs),
+            "flashbacks": sum(rig.flashbacks for rig in self.rigs),
+        }
+
+
+def main():
+    """Command line: verstuur synthetische telemetrie naar een listener"""
+    parser = argparse.ArgumentParser(description="Synthetische F1 25 telemetrie generator")
+    parser.add_argument('--host', default='127.0.0.1', help="Doel adres")
+    parser.add_argument('--port', type=int, default=20777, help="Doel poort")
+    parser.add_argument('--rigs', type=int, default=1, help="Aantal gelijktijdige games")
+    parser.add_argument('--cars', type=int, default=20, help="Auto's per sessie")
+    parser.add_argument('--rate', type=int, default=60, help="Frames per seconde")
+    parser.add_argument('--laps', type=int, default=5, help="Ronden per race")
+    parser.add_argument('--lap-time', type=float, default=90.0, help="Rondetijd in seconden")
+    parser.add_argument('--duration', type=float, default=60.0, help="Seconden simulatietijd")
+    parser.add_argument('--loss', type=float, default=0.0, help="Pakketverlies (0..1)")
+    parser.add_argument('--flashback', type=float, default=None, help="Seconden tussen flashbacks")
+    parser.add_argument('--max-speed', action='store_true', help="Niet in real-time, maar zo snel mogelijk")
+    parser.add_argument('--seed', type=int, default=None, help="Seed voor reproduceerbare runs")
+    args = parser.parse_args()
+
+    generator = PacketGenerator(num_rigs=args.rigs, num_cars=args.cars, rate=args.rate,
+                                loss_rate=args.loss, seed=args.seed, total_laps=args.laps,
+                                lap_time=args.lap_time, flashback_interval=args.flashback)
+    started = time.perf_counter()
+    sent = generator.send(args.host, args.port, args.duration, realtime=not args.max_speed)
+    elapsed = time.perf_counter() - started
+    stats = generator.get_stats()
+    print(f"{sent} datagrammen verstuurd naar {args.host}:{args.port} in {elapsed:.1f}s "
+          f"({sent / elapsed:,.0f}/s), {stats['datagrams_dropped']} bewust gedropt, "
+          f"{stats['sessions']} sessies, {stats['flashbacks']} flashbacks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+F1 25 Telemetry System - Packet Ring Queue
+Begrensde buffer tussen de UDP receive thread en de verwerkings-workers.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class PacketRingBuffer:
+    """
+    Thread-safe buffer met vaste capaciteit voor ontvangen datagrammen.
+
+    De receive thread doet alleen put()/put_many(), de worker threads doen
+    get()/get_many(). Als de buffer vol is bepaalt de overflow policy wat er
+    weggegooid wordt (en gaat het gedropte item naar de on_drop callback):
+
+    - 'drop_oldest': het oudste pakket in de buffer vervalt
+    - 'priority':    het oudste pakket met de laagste prioriteit vervalt,
+                     maar alleen als die prioriteit lager is dan die van het
+                     nieuwe pakket. Anders wordt het nieuwe pakket gedropt.
+
+    Intern staat elk prioriteitsniveau in een eigen deque (lane) met een
+    volgnummer per item. Een overflow kost zo hooguit één stap per niveau
+    in plaats van een scan over de hele buffer; get() pakt het item met
+    het laagste volgnummer uit de koppen van de lanes, zodat de volgorde
+    van ontvangst behouden blijft. Met 'drop_oldest' is er één lane.
+    """
+
+    POLICY_DROP_OLDEST = 'drop_oldest'
+    POLICY_PRIORITY = 'priority'
+    POLICIES = (POLICY_DROP_OLDEST, POLICY_PRIORITY)
+
+    DEFAULT_PRIORITY = 1
+
+    def __init__(self, capacity: int, overflow_policy: str = POLICY_DROP_OLDEST,
+                 packet_priorities: Optional[Dict[int, int]] = None,
+                 on_drop: Optional[Callable[[Any], None]] = None):
+        """
+        Initialiseer de buffer
+
+        Args:
+            capacity: Maximaal aantal pakketten in de buffer
+            overflow_policy: 'drop_oldest' of 'priority'
+            packet_priorities: Prioriteit per packet ID (hoger = belangrijker)
+            on_drop: Callback voor elk gedropt item, verdrongen of geweigerd
+                     (bijv. om een pool buffer terug te geven)
+        """
+        if capacity < 1:
+            raise ValueError(f"Capaciteit moet minimaal 1 zijn, kreeg {capacity}")
+        if overflow_policy not in self.POLICIES:
+            raise ValueError(f"Onbekende overflow policy: {overflow_policy}")
+
+        self.capacity = capacity
+        self.overflow_policy = overflow_policy
+        self.on_drop = on_drop
+
+        # Lane per prioriteitsniveau (laagste eerst); lane index per packet ID als lijst voor snelle lookup
+        self._lane_of = [0] * 256
+        levels = [self.DEFAULT_PRIORITY]
+        if overflow_policy == self.POLICY_PRIORITY:
+            priorities = {int(packet_id): priority for packet_id, priority in (packet_priorities or {}).items()}
+            levels = sorted(set(priorities.values()) | {self.DEFAULT_PRIORITY})
+            rank = {priority: index for index, priority in enumerate(levels)}
+            self._lane_of = [rank[priorities.get(packet_id, self.DEFAULT_PRIORITY)] for packet_id in range(256)]
+        # Items als (volgnummer, item, packet_id)
+        self._lanes: List[Deque[Tuple[int, Any, int]]] = [deque() for _ in levels]
+        self._sequence = 0
+        self._count = 0
+
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._closed = False
+
+        # Stats
+        self.high_water = 0
+        self.dropped = 0
+        self.dropped_by_packet_id: Dict[int, int] = {}
+
+    def put(self, item: Any, packet_id: int) -> bool:
+        """
+        Voeg een pakket toe (aangeroepen door de receive thread)
+
+        Args:
+            item: Het pakket (bijv. (data, addr))
+            packet_id: Packet ID voor de overflow policy
+
+        Returns:
+            False als het nieuwe pakket zelf gedropt is
+        """
+        with self._lock:
+            accepted = self._append(item, packet_id)
+            self._not_empty.notify()
+            return accepted
+
+    def put_many(self, items: List[Any], packet_ids: List[int]) -> int:
+        """
+        Voeg een batch pakketten toe met één lock-acquire en één notify
+
+        Args:
+            items: De pakketten
+            packet_ids: Packet ID per pakket (zelfde volgorde)
+
+        Returns:
+            Aantal geaccepteerde pakketten
+        """
+        accepted = 0
+        with self._lock:
+            for item, packet_id in zip(items, packet_ids):
+                if self._append(item, packet_id):
+                    accepted += 1
+            self._not_empty.notify_all()
+        return accepted
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Haal het oudste pakket op (aangeroepen door een worker thread)
+
+        Args:
+            timeout: Maximale wachttijd in seconden
+
+        Returns:
+            Het pakket, of None bij timeout of een gesloten, lege buffer
+        """
+        with self._not_empty:
+            if self._count == 0:
+                if self._closed:
+                    return None
+                self._not_empty.wait(timeout)
+                if self._count == 0:
+                    return None
+            return self._pop_oldest()[1]
+
+    def get_many(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Haal tot max_items pakketten in één keer op (oudste eerst)
+
+        Args:
+            max_items: Maximaal aantal pakketten
+            timeout: Maximale wachttijd als de buffer leeg is
+
+        Returns:
+            Lijst met pakketten (leeg bij timeout of een gesloten, lege buffer)
+        """
+        with self._not_empty:
+            if self._count == 0:
+                if self._closed:
+                    return []
+                self._not_empty.wait(timeout)
+
+            take = min(max_items, self._count)
+            if len(self._lanes) == 1:
+                popleft = self._lanes[0].popleft
+                items = [popleft()[1] for _ in range(take)]
+                self._count -= take
+                return items
+            return [self._pop_oldest()[1] for _ in range(take)]
+
+    def close(self):
+        """Sluit de buffer en wek alle wachtende workers"""
+        with self._not_empty:
+            self._closed = True
+            self._not_empty.notify_all()
+
+    def record_drops(self, packet_ids: List[int]):
+        """Tel pakketten die vóór de buffer al gedropt zijn (bijv. lege buffer pool)"""
+        with self._lock:
+            for packet_id in packet_ids:
+                self._record_drop(packet_id)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg queue statistieken"""
+        with self._lock:
+            return {
+                "queue_depth": self._count,
+                "queue_capacity": self.capacity,
+                "queue_high_water": self.high_water,
+                "packets_dropped": self.dropped,
+                "dropped_by_packet_id": dict(self.dropped_by_packet_id),
+            }
+
+    # --- Interne helpers (lock wordt al vastgehouden) ---
+
+    def _append(self, item: Any, packet_id: int) -> bool:
+        """Zet één item achteraan, of drop het volgens de overflow policy"""
+        if self._count == self.capacity and not self._make_room(packet_id):
+            self._record_drop(packet_id)
+            if self.on_drop is not None:
+                self.on_drop(item)
+            return False
+
+        self._lanes[self._lane_of[packet_id]].append((self._sequence, item, packet_id))
+        self._sequence += 1
+        self._count += 1
+        if self._count > self.high_water:
+            self.high_water = self._count
+        return True
+
+    def _make_room(self, packet_id: int) -> bool:
+        """
+        Maak één slot vrij volgens de overflow policy
+
+        drop_oldest: de kop van de enige lane. priority: de kop van de
+        laagste niet-lege lane onder die van het nieuwe pakket, dus het
+        oudste pakket met de laagste prioriteit.
+        """
+        lanes = self._lanes
+        if self.overflow_policy == self.POLICY_DROP_OLDEST:
+            self._drop(lanes[0].popleft())
+            return True
+
+        for lane in lanes[:self._lane_of[packet_id]]:
+            if lane:
+                self._drop(lane.popleft())
+                return True
+        return False
+
+    def _pop_oldest(self) -> Tuple[int, Any, int]:
+        """Haal het item met het laagste volgnummer uit de koppen van de lanes"""
+        oldest = None
+        for lane in self._lanes:
+            if lane and (oldest is None or lane[0][0] < oldest[0][0]):
+                oldest = lane
+        self._count -= 1
+        return oldest.popleft()
+
+    def _drop(self, entry: Tuple[int, Any, int]):
+        """Verwerk een verdrongen item"""
+        _sequence, item, packet_id = entry
+        self._count -= 1
+        self._record_drop(packet_id)
+        if self.on_drop is not None:
+            self.on_drop(item)
+
+    def _record_drop(self, packet_id: int):
+        """Tel een gedropt pakket"""
+        self.dropped += 1
+        self.dropped_by_packet_id[packet_id] = self.dropped_by_packet_id.get(packet_id, 0) + 1
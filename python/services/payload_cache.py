@@ -0,0 +1,117 @@
+"""
+F1 25 Telemetry System - Payload Cache
+Dedup van traag veranderende packets: Session (P1), Participants (P4) en
+Lap Positions (P15) komen herhaaldelijk binnen met (bijna altijd) dezelfde
+payload. Per (session_uid, packet_id) wordt een hash van de laatste payload
+bewaard met het geparste object; bij dezelfde bytes wordt dat object
+hergebruikt in plaats van opnieuw te parsen.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Session (1), Participants (4) en Lap Positions (15)
+DEFAULT_DEDUP_IDS = frozenset({1, 4, 15})
+
+# Digest grootte van blake2b in bytes (128 bit: botsingen zijn verwaarloosbaar)
+DIGEST_SIZE = 16
+
+
+class PayloadCache:
+    """
+    Content-hash cache per (session_uid, packet_id).
+
+    parse() hasht de payload (blake2b, direct op de memoryview, zonder
+    kopie) en vergelijkt met de vorige payload van dezelfde stroom:
+    - hit:  het eerder geparste object wordt teruggegeven, unchanged=True
+    - miss: de parser draait, het resultaat vervangt de vorige entry
+
+    Het object van een hit bevat de header van het eerste pakket met deze
+    payload; de actuele header komt los mee in de routing.
+
+    Het aantal stromen is begrensd (LRU); een nieuwe sessie verdringt zo
+    vanzelf de oude entries.
+    """
+
+    def __init__(self, packet_ids: Iterable[int] = DEFAULT_DEDUP_IDS, max_entries: int = 64):
+        """
+        Args:
+            packet_ids: Packet IDs die gededupliceerd worden
+            max_entries: Maximaal aantal (session_uid, packet_id) entries
+        """
+        self.packet_ids = frozenset(packet_ids)
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[int, int], Tuple[bytes, Any]]' = OrderedDict()
+        self._hits: Dict[int, int] = {}
+        self._misses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, header, payload, parser: Callable[[Any, Any], Any]) -> Tuple[Any, bool]:
+        """
+        Parse een payload, of hergebruik het object van een identieke vorige payload
+
+        Args:
+            header: PacketHeader van het pakket
+            payload: Payload (bytes of memoryview)
+            parser: parse(header, payload) functie voor een miss
+
+        Returns:
+            (geparsed object, unchanged). unchanged is True bij een hit.
+        """
+        packet_id = header.packet_id
+        if packet_id not in self.packet_ids:
+            return parser(header, payload), False
+
+        key = (header.session_uid, packet_id)
+        digest = hashlib.blake2b(payload, digest_size=DIGEST_SIZE).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == digest:
+                self._entries.move_to_end(key)
+                self._hits[packet_id] = self._hits.get(packet_id, 0) + 1
+                return entry[1], True
+            self._misses[packet_id] = self._misses.get(packet_id, 0) + 1
+
+        # Parsen buiten de lock: andere packet types wachten niet
+        parsed = parser(header, payload)
+        if parsed is not None:
+            with self._lock:
+                self._entries[key] = (digest, parsed)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return parsed, False
+
+    def invalidate(self, session_uid: Optional[int] = None):
+        """Verwijder de entries van één sessie, of alles (session_uid None)"""
+        with self._lock:
+            if session_uid is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == session_uid]:
+                del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Verkrijg hit/miss tellers
+
+        Returns:
+            Dict met hits, misses, hit_rate, entries en per_packet_id
+        """
+        with self._lock:
+            per_packet_id = {
+                packet_id: {"hits": self._hits.get(packet_id, 0), "misses": self._misses.get(packet_id, 0)}
+                for packet_id in sorted(set(self._hits) | set(self._misses))
+            }
+            entries = len(self._entries)
+        hits = sum(entry["hits"] for entry in per_packet_id.values())
+        misses = sum(entry["misses"] for entry in per_packet_id.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": entries,
+            "per_packet_id": per_packet_id,
+        }
@@ -0,0 +1,223 @@
+"""
+F1 25 Telemetry System - Replay Source
+Speelt opgenomen captures (zie capture_format) opnieuw af door de
+DataProcessor, als vervanger van de UDP listener.
+"""
+
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from services import logger_service
+from services.capture_format import CaptureReader, CAPTURE_EXTENSION, RECORD_HEADER
+
+# session_time (float) staat op offset 15 in de F1 header
+_SESSION_TIME = struct.Struct('<15xf')
+
+# Een sprong terug in session_time groter dan dit is een nieuwe sessie of een flashback
+_REWIND_TOLERANCE = 1.0
+
+
+def find_captures(path: Union[str, Path]) -> List[Path]:
+    """
+    Verzamel capture bestanden
+
+    Args:
+        path: Eén capture bestand of een map met captures
+
+    Returns:
+        Gesorteerde lijst met capture paden (naam = opnametijd, dus chronologisch)
+    """
+    path = Path(path)
+    if path.is_dir():
+        return sorted(path.glob(f'*{CAPTURE_EXTENSION}'))
+    return [path]
+
+
+class ReplaySource:
+    """
+    Speelt captures af met dezelfde interface als UDPListener
+    (start/stop/is_running/get_stats), zodat main.py hem als pakketbron
+    kan gebruiken zonder dat de game draait.
+
+    Tempo (speed):
+    - 1.0:  real-time, volgens session_time uit de header
+    - N:    N keer sneller (0.5 = half tempo)
+    - None: zo snel mogelijk, in batches (benchmark / profiling van de pipeline)
+
+    Na het laatste pakket blijft de bron 'running' (de schermen tonen de
+    eindstand) met replay_finished=True in de stats, tenzij loop=True.
+    """
+
+    def __init__(self, packet_handler: Callable[[bytes], None],
+                 batch_handler: Optional[Callable[[List[Tuple[Any, Any]]], None]] = None,
+                 path: Union[str, Path] = '', speed: Optional[float] = 1.0,
+                 loop: bool = False, max_batch: int = 64):
+        """
+        Initialiseer de replay bron
+
+        Args:
+            packet_handler: Callback voor elk pakket (bijv. DataProcessor.process_packet)
+            batch_handler: Optioneel, callback voor een lijst (data, addr) tuples
+            path: Capture bestand of map met captures
+            speed: Tempo factor, of None voor maximale snelheid
+            loop: Opnieuw beginnen na het laatste bestand
+            max_batch: Maximale batch grootte voor batch_handler
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError(f"Replay snelheid moet positief zijn, kreeg {speed}")
+
+        self.logger = logger_service.get_logger('ReplaySource')
+        self.packet_handler = packet_handler
+        self.batch_handler = batch_handler
+        self.paths = find_captures(path)
+        self.speed = speed
+        self.loop = loop
+        self.max_batch = max(1, max_batch)
+
+        self.running = False
+        self.finished = False
+        self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Stats
+        self.packets_received = 0
+        self.packets_processed = 0
+        self.packets_errors = 0
+        self.bytes_total = sum(p.stat().st_size for p in self.paths if p.exists())
+        self.bytes_read = 0
+        self._started_at = 0.0
+        self._finished_at = 0.0
+
+    def start(self):
+        """Start de replay thread"""
+        if self.running:
+            self.logger.warning("Replay is al gestart")
+            return
+        missing = [str(p) for p in self.paths if not p.exists()]
+        if not self.paths or missing:
+            raise FileNotFoundError(f"Geen capture bestanden gevonden: {missing or self.paths}")
+
+        self._stop_event.clear()
+        self.running = True
+        self.finished = False
+        self.thread = threading.Thread(target=self.run, name="ReplaySource", daemon=True)
+        self.thread.start()
+        tempo = "max" if self.speed is None else f"{self.speed:g}x"
+        self.logger.info(f"Replay gestart: {len(self.paths)} bestand(en), tempo {tempo}")
+
+    def stop(self):
+        """Stop de replay"""
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        self.running = False
+        self.logger.info("Replay gestopt")
+
+    def is_running(self) -> bool:
+        """Check of de replay actief is"""
+        return self.running
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg statistieken (zelfde basis sleutels als UDPListener)"""
+        end = self._finished_at if self.finished else time.perf_counter()
+        elapsed = end - self._started_at if self._started_at else 0.0
+        return {
+            "running": self.running,
+            "engine": "replay",
+            "packets_received": self.packets_received,
+            "packets_processed": self.packets_processed,
+            "packets_errors": self.packets_errors,
+            "replay_speed": self.speed,
+            "replay_progress": (self.bytes_read / self.bytes_total) if self.bytes_total else 0.0,
+            "replay_finished": self.finished,
+            "replay_rate": (self.packets_processed / elapsed) if elapsed > 0 else 0.0,
+            "queue_depth": 0,
+            "queue_capacity": 0,
+            "queue_high_water": 0,
+            "packets_dropped": 0,
+            "dropped_by_packet_id": {},
+        }
+
+    # --- Replay thread ---
+
+    def run(self):
+        """Lees de captures en voer de pakketten aan de handler"""
+        self._started_at = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                for path in self.paths:
+                    if self._stop_event.is_set():
+                        break
+                    self._replay_file(path)
+                if not self.loop:
+                    break
+                self.bytes_read = 0
+        except Exception as e:
+            self.logger.error(f"Fout tijdens replay: {e}", exc_info=True)
+            self.packets_errors += 1
+
+        self._finished_at = time.perf_counter()
+        self.finished = True
+        self.logger.info(f"Replay klaar: {self.packets_processed} pakketten "
+                         f"({self.get_stats()['replay_rate']:,.0f} pkt/s)")
+
+    def _replay_file(self, path: Path):
+        """Speel één capture bestand af"""
+        batch: List[Tuple[bytes, Any]] = []
+        anchor_wall = None
+        anchor_session = 0.0
+        last_session_time = None
+        paced = self.speed is not None
+        base = self.bytes_read  # Bytes van eerder afgespeelde bestanden
+
+        with CaptureReader(str(path)) as reader:
+            for record in reader:
+                if self._stop_event.is_set():
+                    break
+                data = record.data
+                self.bytes_read = base + record.offset + RECORD_HEADER.size + len(data)
+
+                if paced and len(data) >= _SESSION_TIME.size:
+                    session_time = _SESSION_TIME.unpack_from(data)[0]
+                    if (anchor_wall is None or last_session_time is None
+                            or session_time < last_session_time - _REWIND_TOLERANCE):
+                        # Begin, nieuwe sessie of flashback: opnieuw ankeren
+                        self._flush(batch)
+                        anchor_wall = time.perf_counter()
+                        anchor_session = session_time
+                    last_session_time = session_time
+
+                    delay = anchor_wall + (session_time - anchor_session) / self.speed - time.perf_counter()
+                    if delay > 0:
+                        self._flush(batch)
+                        if self._stop_event.wait(delay):
+                            break
+
+                batch.append((data, record.addr))
+                if len(batch) >= self.max_batch:
+                    self._flush(batch)
+
+            self._flush(batch)
+        self.bytes_read = base + path.stat().st_size
+
+    def _flush(self, batch: List[Tuple[bytes, Any]]):
+        """Geef de verzamelde pakketten aan de handler(s) en leeg de batch"""
+        if not batch:
+            return
+        # Handlers mogen de lijst bewaren, dus een eigen kopie meegeven
+        items = batch[:]
+        batch.clear()
+        self.packets_received += len(items)
+        try:
+            if self.batch_handler is not None:
+                self.batch_handler(items)
+                self.packets_processed += len(items)
+            else:
+                for data, _addr in items:
+                    self.packet_handler(data)
+                    self.packets_processed += 1
+        except Exception as e:
+            self.logger.error(f"Fout in replay handler: {e}", exc_info=True)
+            self.packets_errors += 1
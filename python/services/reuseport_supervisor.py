@@ -0,0 +1,209 @@
+"""
+F1 25 Telemetry System - SO_REUSEPORT Supervisor
+Verdeelt de UDP verwerking over meerdere processen op dezelfde poort
+"""
+
+import multiprocessing
+import queue
+import time
+from typing import Any, Callable, Dict, List
+from services import logger_service
+from services.udp_listener import UDPListener
+
+# Tellers die over alle workers opgeteld worden
+SUMMED_STATS = (
+    'packets_received', 'packets_processed', 'packets_errors', 'packets_dropped',
+    'wakeups', 'queue_depth', 'queue_capacity', 'kernel_drops',
+)
+# Tellers waarvan het maximum over de workers telt
+MAX_STATS = ('queue_high_water', 'max_batch')
+
+# Workers starten met 'spawn', niet 'fork': een geforkt proces erft de open
+# MySQL connecties van de Database singleton (gemaakt bij het importeren van
+# main.py) en zou die delen met de andere workers
+START_METHOD = 'spawn'
+
+
+def _worker_main(index: int, processor_factory: Callable[[], Any], host: str, port: int,
+                 stats_queue, stop_event, stats_interval: float):
+    """
+    Entry point van een worker proces
+
+    Maakt een eigen processor (controllers, database connecties) en een
+    UDPListener met SO_REUSEPORT, en stuurt periodiek get_stats() naar
+    de supervisor. Door START_METHOD importeert het proces alle modules
+    opnieuw, dus module-level state (zoals de Database pool) is van deze
+    worker alleen.
+    """
+    logger = logger_service.get_logger(f'UDPWorkerProcess-{index}')
+    try:
+        processor = processor_factory()
+        listener = UDPListener(
+            packet_handler=processor.process_packet,
+            batch_handler=getattr(processor, 'process_batch', None)
+        )
+        listener.host = host
+        listener.port = port
+        listener.reuse_port = True
+        listener.start()
+    except Exception as e:
+        logger.error(f"Worker {index} kon niet starten: {e}", exc_info=True)
+        stats_queue.put((index, {"error": str(e)}))
+        return
+
+    try:
+        # Eerste rapport direct: de supervisor wacht hierop als start-bevestiging
+        stats_queue.put((index, listener.get_stats()))
+        while not stop_event.wait(stats_interval):
+            stats_queue.put((index, listener.get_stats()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.stop()
+        stats_queue.put((index, listener.get_stats()))
+
+
+class ReusePortSupervisor:
+    """
+    Start N worker processen die allemaal dezelfde UDP poort binden met
+    SO_REUSEPORT (Linux). De kernel verdeelt de datagrammen per afzender
+    (hash op het adres), dus alle pakketten van één rig komen bij dezelfde
+    worker aan en blijven in volgorde. Zo schaalt het parsen over cores
+    in plaats van tegen de GIL aan te lopen.
+
+    De workers rapporteren hun get_stats() via een multiprocessing queue;
+    get_stats() van de supervisor telt die op.
+
+    De workers worden met START_METHOD ('spawn') gestart: elke worker
+    bouwt zijn eigen Database pool op in plaats van de connecties van de
+    supervisor te erven.
+    """
+
+    def __init__(self, num_workers: int, processor_factory: Callable[[], Any],
+                 host: str, port: int, stats_interval: float = 1.0):
+        """
+        Initialiseer de supervisor
+
+        Args:
+            num_workers: Aantal worker processen
+            processor_factory: Picklable functie (module niveau) die in elk
+                               worker proces een processor met process_packet
+                               (en optioneel process_batch) maakt
+            host: Host om op te binden
+            port: UDP poort (gedeeld door alle workers)
+            stats_interval: Seconden tussen stats rapporten van de workers
+        """
+        if num_workers < 1:
+            raise ValueError(f"Aantal workers moet minimaal 1 zijn, kreeg {num_workers}")
+
+        self.logger = logger_service.get_logger('ReusePortSupervisor')
+        self.num_workers = num_workers
+        self.processor_factory = processor_factory
+        self.host = host
+        self.port = port
+        self.stats_interval = stats_interval
+
+        self._context = multiprocessing.get_context(START_METHOD)
+        self.processes: List[multiprocessing.Process] = []
+        self._stats_queue = self._context.Queue()
+        self._stop_event = self._context.Event()
+        self._worker_stats: Dict[int, Dict[str, Any]] = {}
+        self.running = False
+
+    def start(self, timeout: float = 10.0):
+        """
+        Start de worker processen en wacht tot ze allemaal gebonden zijn
+
+        Raises:
+            OSError: Als een worker de poort niet kon binden
+        """
+        if self.running:
+            self.logger.warning("Supervisor is al gestart")
+            return
+
+        self._stop_event.clear()
+        self._worker_stats = {}
+        self.processes = []
+        for index in range(self.num_workers):
+            process = self._context.Process(
+                target=_worker_main,
+                name=f"UDPWorkerProcess-{index}",
+                args=(index, self.processor_factory, self.host, self.port,
+                      self._stats_queue, self._stop_event, self.stats_interval),
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+
+        # Wacht op het eerste rapport van elke worker
+        deadline = time.monotonic() + timeout
+        while len(self._worker_stats) < self.num_workers:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.stop()
+                raise OSError("Niet alle workers zijn op tijd gestart")
+            try:
+                index, stats = self._stats_queue.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if 'error' in stats:
+                self.stop()
+                raise OSError(f"Worker {index} kon niet starten: {stats['error']}")
+            self._worker_stats[index] = stats
+
+        self.running = True
+        self.logger.info(f"{self.num_workers} UDP workers gestart op {self.host}:{self.port} (SO_REUSEPORT)")
+
+    def stop(self):
+        """Stop alle workers en verzamel hun laatste stats"""
+        self._stop_event.set()
+        for process in self.processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                self.logger.warning(f"{process.name} reageert niet, wordt beëindigd")
+                process.terminate()
+                process.join(timeout=1.0)
+        self._collect_stats()
+        self.running = False
+        self.logger.info("Alle UDP workers gestopt")
+
+    def is_running(self) -> bool:
+        """Check of er nog workers actief zijn"""
+        return self.running and any(process.is_alive() for process in self.processes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verkrijg de opgetelde statistieken van alle workers"""
+        self._collect_stats()
+        worker_stats = list(self._worker_stats.values())
+
+        stats: Dict[str, Any] = {
+            "running": self.is_running(),
+            "workers": self.num_workers,
+            "workers_alive": sum(1 for process in self.processes if process.is_alive()),
+        }
+        for key in SUMMED_STATS:
+            stats[key] = sum(worker.get(key) or 0 for worker in worker_stats)
+        for key in MAX_STATS:
+            stats[key] = max((worker.get(key, 0) for worker in worker_stats), default=0)
+        stats["packets_per_wakeup"] = (stats["packets_received"] / stats["wakeups"]) if stats["wakeups"] else 0.0
+
+        dropped_by_packet_id: Dict[int, int] = {}
+        for worker in worker_stats:
+            for packet_id, count in worker.get('dropped_by_packet_id', {}).items():
+                dropped_by_packet_id[packet_id] = dropped_by_packet_id.get(packet_id, 0) + count
+        stats["dropped_by_packet_id"] = dropped_by_packet_id
+        stats["packets_received_per_worker"] = [
+            self._worker_stats.get(index, {}).get('packets_received', 0)
+            for index in range(self.num_workers)
+        ]
+        return stats
+
+    def _collect_stats(self):
+        """Lees alle binnengekomen worker rapporten uit de queue"""
+        while True:
+            try:
+                index, stats = self._stats_queue.get_nowait()
+            except queue.Empty:
+                break
+            if 'error' not in stats:
+                self._worker_stats[index] = stats
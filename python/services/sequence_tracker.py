@@ -0,0 +1,236 @@
+"""
+F1 25 Telemetry System - Frame Sequence Tracker
+Detecteert verloren, dubbele en te laat aangekomen pakketten en flashbacks
+op basis van frame_identifier en overall_frame_identifier uit de header.
+"""
+
+import struct
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# packet_id (6), session_uid (7), frame_identifier (19), overall_frame_identifier (23)
+SEQUENCE_PEEK = struct.Struct('<6xBQ4xII')
+
+# Packet types zonder vast ritme per frame: Event (3), Session History (11,
+# één auto per pakket) en Tyre Sets (12, één auto per pakket)
+DEFAULT_UNTRACKED_IDS = frozenset({3, 11, 12})
+
+# Bovengrenzen van de histogram bakken voor het verlies per venster (fractie)
+LOSS_BUCKETS = (0.0, 0.001, 0.01, 0.05, 0.10, 1.0)
+LOSS_BUCKET_LABELS = ('0%', '<0.1%', '<1%', '<5%', '<10%', '>=10%')
+
+
+class _StreamState:
+    """Sequence state van één (session_uid, packet_id) stroom"""
+
+    __slots__ = ('last_frame', 'last_overall', 'stride', 'received', 'lost',
+                 'out_of_order', 'duplicates', 'flashbacks',
+                 'window_received', 'window_lost', 'histogram')
+
+    def __init__(self, frame: int, overall: int):
+        self.last_frame = frame
+        self.last_overall = overall
+        self.stride = 0  # Kleinste positieve stap in overall frames (0 = nog onbekend)
+        self.received = 1
+        self.lost = 0
+        self.out_of_order = 0
+        self.duplicates = 0
+        self.flashbacks = 0
+        self.window_received = 1
+        self.window_lost = 0
+        self.histogram = [0] * len(LOSS_BUCKETS)
+
+
+class FrameSequenceTracker:
+    """
+    Houdt per (session_uid, packet_id) de frame volgorde bij.
+
+    Elk packet type heeft een eigen zendritme (bijv. motion elke frame,
+    session twee keer per seconde). De verwachte stap wordt daarom per
+    stroom geleerd als de kleinste positieve stap in overall_frame_identifier.
+    Een grotere stap telt als (stap / verwacht - 1) verloren pakketten.
+
+    - Dubbel:        zelfde overall frame als het laatste pakket
+    - Out-of-order:  ouder overall frame dan het laatste pakket (eerder als
+                     verloren geteld, dus dat verlies wordt teruggedraaid)
+    - Flashback:     frame_identifier springt terug terwijl
+                     overall_frame_identifier doorloopt. Elke stroom van een
+                     sessie ziet dezelfde flashback, dus het totaal telt per
+                     sessie het maximum over de packet types.
+
+    Na elk venster van 'window' pakketten wordt het verliespercentage van
+    dat venster in een histogram bijgehouden.
+
+    Eén tracker volgt één bron: bij meerdere rigs krijgt elke rig processor
+    een eigen tracker (twee rigs in dezelfde online sessie delen een
+    session_uid), en merge_sequence_stats() telt hun get_stats() op.
+    """
+
+    def __init__(self, window: int = 60, untracked_ids: Iterable[int] = DEFAULT_UNTRACKED_IDS):
+        """
+        Initialiseer de tracker
+
+        Args:
+            window: Aantal verwachte pakketten per histogram venster
+            untracked_ids: Packet IDs die niet gevolgd worden
+        """
+        self.window = window
+        self.untracked_ids: FrozenSet[int] = frozenset(untracked_ids)
+        self._streams: Dict[Tuple[int, int], _StreamState] = {}
+        self._lock = threading.Lock()
+
+    def observe_packet(self, data) -> None:
+        """Volg een rauw datagram (bytes of memoryview, minimaal 27 bytes)"""
+        if len(data) < SEQUENCE_PEEK.size:
+            return
+        packet_id, session_uid, frame, overall = SEQUENCE_PEEK.unpack_from(data)
+        self.observe(session_uid, packet_id, frame, overall)
+
+    def observe(self, session_uid: int, packet_id: int, frame: int, overall: int) -> None:
+        """Volg één pakket aan de hand van de header velden"""
+        if packet_id in self.untracked_ids:
+            return
+        key = (session_uid, packet_id)
+        with self._lock:
+            state = self._streams.get(key)
+            if state is None:
+                self._streams[key] = _StreamState(frame, overall)
+                return
+
+            state.received += 1
+            state.window_received += 1
+            delta = overall - state.last_overall
+            if delta > 0:
+                if frame < state.last_frame:
+                    state.flashbacks += 1
+                if state.stride == 0 or delta < state.stride:
+                    state.stride = delta
+                missing = delta // state.stride - 1
+                if missing > 0:
+                    state.lost += missing
+                    state.window_lost += missing
+                state.last_frame = frame
+                state.last_overall = overall
+            elif delta == 0:
+                state.duplicates += 1
+            else:
+                state.out_of_order += 1
+                # Was bij aankomst van het nieuwere pakket als verloren geteld
+                if state.lost > 0:
+                    state.lost -= 1
+                if state.window_lost > 0:
+                    state.window_lost -= 1
+
+            if state.window_received + state.window_lost >= self.window:
+                self._close_window(state)
+
+    def reset(self):
+        """Vergeet alle stromen (bijv. bij een nieuwe sessie)"""
+        with self._lock:
+            self._streams.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Verkrijg totalen over alle stromen en per packet ID
+
+        Returns:
+            Dict met received, lost, loss_rate, out_of_order, duplicates,
+            flashbacks (één per flashback per sessie), per_packet_id en
+            loss_histogram
+        """
+        totals = {"received": 0, "lost": 0, "out_of_order": 0, "duplicates": 0}
+        per_packet_id: Dict[int, Dict[str, int]] = {}
+        flashbacks_per_session: Dict[int, int] = {}
+        with self._lock:
+            for (session_uid, packet_id), state in self._streams.items():
+                entry = per_packet_id.setdefault(packet_id, {
+                    "received": 0, "lost": 0, "out_of_order": 0, "duplicates": 0,
+                    "flashbacks": 0, "stride": state.stride,
+                })
+                for name in totals:
+                    value = getattr(state, name)
+                    totals[name] += value
+                    entry[name] += value
+                entry["flashbacks"] += state.flashbacks
+                if state.flashbacks > flashbacks_per_session.get(session_uid, 0):
+                    flashbacks_per_session[session_uid] = state.flashbacks
+            histogram = self._merge_histograms(self._streams.values())
+
+        totals["flashbacks"] = sum(flashbacks_per_session.values())
+
+        expected = totals["received"] + totals["lost"]
+        totals["loss_rate"] = totals["lost"] / expected if expected else 0.0
+        totals["per_packet_id"] = per_packet_id
+        totals["loss_histogram"] = histogram
+        return totals
+
+    def get_loss_histogram(self, packet_id: Optional[int] = None) -> Dict[str, int]:
+        """
+        Verkrijg het histogram van verlies per venster
+
+        Args:
+            packet_id: Alleen deze packet type (None = alle)
+
+        Returns:
+            Dict van bak label naar aantal vensters
+        """
+        with self._lock:
+            streams = [state for (_uid, pid), state in self._streams.items()
+                       if packet_id is None or pid == packet_id]
+            return self._merge_histograms(streams)
+
+    # --- Interne helpers (lock wordt al vastgehouden) ---
+
+    def _close_window(self, state: _StreamState):
+        """Boek het verlies van het afgelopen venster in het histogram"""
+        index = 0
+        if state.window_lost:
+            rate = state.window_lost / (state.window_received + state.window_lost)
+            index = len(LOSS_BUCKETS) - 1
+            for bucket in range(1, len(LOSS_BUCKETS) - 1):
+                if rate < LOSS_BUCKETS[bucket]:
+                    index = bucket
+                    break
+        state.histogram[index] += 1
+        state.window_received = 0
+        state.window_lost = 0
+
+    @staticmethod
+    def _merge_histograms(streams: Iterable[_StreamState]) -> Dict[str, int]:
+        """Tel de histogrammen van meerdere stromen op"""
+        merged: List[int] = [0] * len(LOSS_BUCKETS)
+        for state in streams:
+            for index, count in enumerate(state.histogram):
+                merged[index] += count
+        return dict(zip(LOSS_BUCKET_LABELS, merged))
+
+
+def merge_sequence_stats(stats_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Tel de get_stats() van meerdere trackers (bijv. één per rig) op
+
+    Returns:
+        Dict met dezelfde sleutels als FrameSequenceTracker.get_stats()
+    """
+    counters = ("received", "lost", "out_of_order", "duplicates", "flashbacks")
+    merged: Dict[str, Any] = dict.fromkeys(counters, 0)
+    per_packet_id: Dict[int, Dict[str, int]] = {}
+    histogram = dict.fromkeys(LOSS_BUCKET_LABELS, 0)
+    for stats in stats_list:
+        for name in counters:
+            merged[name] += stats[name]
+        for packet_id, entry in stats["per_packet_id"].items():
+            target = per_packet_id.setdefault(packet_id, dict.fromkeys(counters + ("stride",), 0))
+            for name in counters:
+                target[name] += entry[name]
+            # Kleinste bekende stap (0 = nog onbekend)
+            if entry["stride"] and (not target["stride"] or entry["stride"] < target["stride"]):
+                target["stride"] = entry["stride"]
+        for label, count in stats["loss_histogram"].items():
+            histogram[label] += count
+
+    expected = merged["received"] + merged["lost"]
+    merged["loss_rate"] = merged["lost"] / expected if expected else 0.0
+    merged["per_packet_id"] = per_packet_id
+    merged["loss_histogram"] = histogram
+    return merged
@@ -0,0 +1,65 @@
+"""
+F1 25 Telemetry System - Socket Statistieken
+Socket buffer tuning en kernel drop tellers voor de UDP listeners
+"""
+
+import os
+import socket
+from typing import Optional
+
+# Per-socket tabellen van de Linux kernel (laatste kolom = drops)
+PROC_NET_UDP = ('/proc/net/udp', '/proc/net/udp6')
+_INODE_COLUMN = 9
+_DROPS_COLUMN = 12
+
+
+def set_receive_buffer(sock, size: int) -> int:
+    """
+    Stel SO_RCVBUF in en geef de werkelijke grootte terug
+
+    Linux verdubbelt de gevraagde waarde (administratie overhead) en kapt
+    af op net.core.rmem_max; de teruggegeven waarde is wat de kernel
+    daadwerkelijk gebruikt.
+
+    Args:
+        sock: socket (of asyncio TransportSocket)
+        size: Gewenste buffer grootte in bytes (0 = systeem default laten)
+
+    Returns:
+        Effectieve buffer grootte in bytes
+    """
+    if size > 0:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+    return sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+
+def get_kernel_drops(sock) -> Optional[int]:
+    """
+    Lees de kernel drop teller van een UDP socket (Linux)
+
+    Telt datagrammen die de kernel weggooide omdat de receive buffer van
+    deze socket vol was, dus vóórdat wij ze konden lezen.
+
+    Args:
+        sock: socket (of asyncio TransportSocket)
+
+    Returns:
+        Aantal drops, of None als dit platform het niet ondersteunt
+    """
+    try:
+        inode = str(os.fstat(sock.fileno()).st_ino)
+    except (OSError, ValueError):
+        return None
+
+    for path in PROC_NET_UDP:
+        try:
+            with open(path, 'r') as f:
+                next(f, None)  # Kolomnamen
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > _DROPS_COLUMN and fields[_INODE_COLUMN] == inode:
+                        return int(fields[_DROPS_COLUMN])
+        except OSError:
+            # Geen /proc (Windows, macOS)
+            return None
+    return None
@@ -3,10 +3,14 @@ F1 25 Telemetry System - UDP Listener Service
 Luistert naar UDP pakketten van F1 25
 """
 
+import select
 import socket
 import threading
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from services import logger_service
+from services.packet_queue import PacketRingBuffer
+from services.buffer_pool import BufferPool
+from services.socket_stats import set_receive_buffer, get_kernel_drops
 # Importeer de CONFIG dictionary uit config.py
 try:
     from config import UDP_CONFIG
@@ -18,15 +22,32 @@ except ImportError:
 
 
 class UDPListener:
-    """Luistert naar UDP pakketten op een aparte thread"""
+    """
+    Luistert naar UDP pakketten op een aparte thread.
+
+    De receive thread leest alleen de socket leeg naar een begrensde ring
+    buffer; één of meer worker threads roepen de packet_handler aan. Zo
+    blokkeert een trage parse of database lookup nooit recvfrom().
+
+    In zero-copy mode (UDP_CONFIG['zero_copy']) schrijft de socket direct in
+    herbruikbare bytearrays uit een BufferPool en krijgt de handler een
+    memoryview. Die view is alleen geldig tijdens de aanroep: de buffer gaat
+    daarna terug naar de pool. Bewaar dus nooit de view zelf, maar kopieer
+    wat je wilt houden (bytes(view)).
+    """
     
-    def __init__(self, packet_handler: Callable[[bytes], None]):
+    def __init__(self, packet_handler: Callable[[bytes], None],
+                 batch_handler: Optional[Callable[[List[Tuple[Any, Any]]], None]] = None):
         """
         Initialiseer UDP listener
         
         Args:
-            packet_handler: Een callback functie die de rauwe bytes
-                            van een pakket als argument accepteert.
+            packet_handler: Een callback functie die de rauwe bytes (of in
+                            zero-copy mode een memoryview) van een pakket
+                            als argument accepteert.
+            batch_handler: Optioneel. Krijgt per wakeup een lijst met
+                           (data, addr) tuples in plaats van losse aanroepen
+                           van packet_handler.
         """
         self.logger = logger_service.get_logger('UDPListener')
         
@@ -35,18 +56,39 @@ class UDPListener:
         self.port = UDP_CONFIG.get('port', 20777)
         self.buffer_size = UDP_CONFIG.get('buffer_size', 2048)
         self.timeout = UDP_CONFIG.get('timeout', 1.0)
+        self.queue_size = UDP_CONFIG.get('queue_size', 4096)
+        self.num_workers = max(1, UDP_CONFIG.get('worker_threads', 1))
+        self.overflow_policy = UDP_CONFIG.get('overflow_policy', PacketRingBuffer.POLICY_DROP_OLDEST)
+        self.packet_priorities = UDP_CONFIG.get('packet_priorities', {})
+        self.zero_copy = UDP_CONFIG.get('zero_copy', True)
+        self.max_batch = max(1, UDP_CONFIG.get('max_batch', 64))
+        self.recv_buffer_size = UDP_CONFIG.get('recv_buffer_size', 0)
+        self.recv_buffer_effective = 0
+        self.kernel_drops_at_close: Optional[int] = None
+        # SO_REUSEPORT: meerdere processen op dezelfde poort (supervisor mode)
+        self.reuse_port = UDP_CONFIG.get('reuse_port', False)
         
         self.sock: Optional[socket.socket] = None
         self.running = False
         self.thread: Optional[threading.Thread] = None
+        self.worker_threads: List[threading.Thread] = []
+        self.queue: Optional[PacketRingBuffer] = None
+        self.buffer_pool: Optional[BufferPool] = None
+        self._scratch = bytearray(self.buffer_size)
         
         # De handler die de rauwe data gaat verwerken
         self.packet_handler = packet_handler 
+        self.batch_handler = batch_handler
+        # Optionele tap: CaptureRecorder die elk rauw datagram opneemt
+        self.recorder = None
         
         # Stats
         self.packets_received = 0
         self.packets_processed = 0
         self.packets_errors = 0
+        self.wakeups = 0
+        self.max_batch_seen = 0
+        self._stats_lock = threading.Lock()
 
     def start(self):
         """Start de listener thread"""
@@ -58,8 +100,20 @@ class UDPListener:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             # SO_REUSEADDR is goed gebruik in je originele bestand
             self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.reuse_port:
+                if not hasattr(socket, 'SO_REUSEPORT'):
+                    raise OSError("SO_REUSEPORT wordt niet ondersteund op dit platform")
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            # Grote kernel buffer vangt bursts op (bijv. 22x Session History)
+            self.recv_buffer_effective = set_receive_buffer(self.sock, self.recv_buffer_size)
+            if self.recv_buffer_effective < self.recv_buffer_size:
+                self.logger.warning(
+                    f"SO_RCVBUF is {self.recv_buffer_effective} bytes i.p.v. {self.recv_buffer_size} "
+                    f"(begrensd door het OS, bijv. net.core.rmem_max)"
+                )
             self.sock.bind((self.host, self.port))
-            self.sock.settimeout(self.timeout)  # Gebruik timeout uit config
+            # Non-blocking: run() wacht zelf met select() (timeout uit config)
+            self.sock.setblocking(False)
             self.logger.info(f"UDP listener gestart op {self.host}:{self.port}")
         except OSError as e:
             self.logger.error(f"Kon socket niet binden op {self.host}:{self.port}: {e}")
@@ -67,8 +121,28 @@ class UDPListener:
             # Gooi de exceptie opnieuw op zodat F1TelemetryApp deze kan vangen
             raise 
         
+        on_drop = None
+        if self.zero_copy:
+            # Genoeg buffers voor een volle queue, een batch per worker en één receive batch
+            pool_size = self.queue_size + (self.num_workers + 1) * self.max_batch
+            self.buffer_pool = BufferPool(pool_size, self.buffer_size)
+            on_drop = self._release_item
+        
+        self.queue = PacketRingBuffer(
+            capacity=self.queue_size,
+            overflow_policy=self.overflow_policy,
+            packet_priorities=self.packet_priorities,
+            on_drop=on_drop
+        )
+        
         self.running = True
-        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.worker_threads = []
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self.worker_loop, name=f"UDPWorker-{i}", daemon=True)
+            worker.start()
+            self.worker_threads.append(worker)
+        
+        self.thread = threading.Thread(target=self.run, name="UDPReceive", daemon=True)
         self.thread.start()
 
     def stop(self):
@@ -78,43 +152,216 @@ class UDPListener:
             self.thread.join(timeout=2.0)
             self.logger.info("UDP listener thread gestopt")
         
+        if self.queue is not None:
+            self.queue.close()
+        for worker in self.worker_threads:
+            worker.join(timeout=2.0)
+        if self.worker_threads:
+            self.logger.info(f"{len(self.worker_threads)} UDP worker thread(s) gestopt")
+        self.worker_threads = []
+        
         if self.sock:
+            # Laatste kernel drop stand bewaren, na close is hij niet meer te lezen
+            self.kernel_drops_at_close = get_kernel_drops(self.sock)
             self.sock.close()
             self.sock = None
             self.logger.info("Socket gesloten")
 
     def run(self):
-        """Hoofd loop voor de listener thread"""
+        """
+        Hoofd loop voor de receive thread: alleen ontvangen en in de queue zetten.
+
+        De socket staat non-blocking. Per wakeup wacht select() op data en
+        daarna worden alle leesbare datagrammen (max. max_batch) in één
+        keer leeggelezen en als batch in de queue gezet.
+        """
+        sock = self.sock
+        queue = self.queue
+        drain = self._drain_zero_copy if self.zero_copy else self._drain_copy
         while self.running:
             try:
-                # Wacht op data
-                data, addr = self.sock.recvfrom(self.buffer_size)
-                self.packets_received += 1
-                
-                if data:
-                    # Stuur rauwe data naar de packet handler (DataProcessor)
-                    self.packet_handler(data)
-                    self.packets_processed += 1
-                    
-            except socket.timeout:
+                readable, _, _ = select.select([sock], [], [], self.timeout)
+            except (OSError, ValueError):
+                # Socket gesloten tijdens stop()
+                break
+            if not readable:
                 # Geen data ontvangen, check of we nog moeten runnen
                 continue
-            except Exception as e:
-                if self.running:
-                    self.logger.error(f"Fout in listener loop: {e}", exc_info=True)
-                    self.packets_errors += 1
+            
+            received_before = self.packets_received
+            items, packet_ids = drain(sock)
+            self.packets_received += len(items)
+            # Gelezen datagrammen, inclusief de door een lege pool gedropte
+            read = self.packets_received - received_before
+            if not read:
+                continue
+            
+            self.wakeups += 1
+            if read > self.max_batch_seen:
+                self.max_batch_seen = read
+            if not items:
+                continue
+            if self.recorder is not None:
+                # Vóór put_many: daarna kan een worker de pool buffer al hergebruiken
+                self.recorder.record_batch(items)
+            queue.put_many(items, packet_ids)
         
         self.logger.info("UDP listener run loop gestopt")
 
+    def _drain_copy(self, sock: socket.socket):
+        """Lees alle leesbare datagrammen als losse bytes objecten"""
+        items = []
+        packet_ids = []
+        for _ in range(self.max_batch):
+            try:
+                data, addr = sock.recvfrom(self.buffer_size)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                self._log_receive_error(e)
+                break
+            if data:
+                items.append((data, addr))
+                # Packet ID (byte 6 van de header) voor de overflow policy
+                packet_ids.append(data[6] if len(data) > 6 else 255)
+        return items, packet_ids
+
+    def _drain_zero_copy(self, sock: socket.socket):
+        """
+        Lees alle leesbare datagrammen met recvfrom_into in buffers uit de pool
+
+        Is de pool leeg, dan wordt het datagram in _scratch weggelezen en
+        als ontvangen én gedropt geteld (packets_dropped, dropped_by_packet_id).
+        Een actieve recorder neemt het datagram wel op.
+        """
+        pool = self.buffer_pool
+        items = []
+        packet_ids = []
+        exhausted_ids = []
+        for _ in range(self.max_batch):
+            buffer = pool.acquire()
+            if buffer is None:
+                # Pool leeg: lees het datagram weg zodat de socket niet vastloopt
+                buffer = self._scratch
+            try:
+                nbytes, addr = sock.recvfrom_into(buffer)
+            except BlockingIOError:
+                if buffer is not self._scratch:
+                    pool.release(buffer)
+                break
+            except OSError as e:
+                if buffer is not self._scratch:
+                    pool.release(buffer)
+                self._log_receive_error(e)
+                break
+            
+            if buffer is self._scratch:
+                if nbytes:
+                    exhausted_ids.append(buffer[6] if nbytes > 6 else 255)
+                    if self.recorder is not None:
+                        # Wel in de capture, ook al gaat hij niet naar de queue
+                        self.recorder.record(buffer[:nbytes], addr)
+                continue
+            if nbytes == 0:
+                pool.release(buffer)
+                continue
+            items.append((memoryview(buffer)[:nbytes], addr))
+            packet_ids.append(buffer[6] if nbytes > 6 else 255)
+
+        if exhausted_ids:
+            self.packets_received += len(exhausted_ids)
+            self.queue.record_drops(exhausted_ids)
+        return items, packet_ids
+
+    def _log_receive_error(self, error: Exception):
+        """Log een fout van recvfrom (bijv. ICMP port unreachable op Windows)"""
+        if self.running:
+            self.logger.error(f"Fout in listener loop: {error}", exc_info=True)
+            self.packets_errors += 1
+
+    def _release_item(self, item):
+        """Geef de pool buffer van een (gedropt of verwerkt) item terug"""
+        # In zero-copy mode is data een memoryview op de pool buffer
+        self.buffer_pool.release(item[0].obj)
+
+    def worker_loop(self):
+        """Worker loop: haalt batches uit de queue en verwerkt ze"""
+        queue = self.queue
+        while True:
+            items = queue.get_many(self.max_batch, timeout=self.timeout)
+            if not items:
+                if not self.running:
+                    break
+                continue
+            
+            try:
+                if self.batch_handler is not None:
+                    # Hele batch in één aanroep (DataProcessor.process_batch)
+                    self._handle_batch(items)
+                else:
+                    for data, addr in items:
+                        self._handle_packet(data)
+            finally:
+                if self.zero_copy:
+                    for item in items:
+                        self._release_item(item)
+        
+        self.logger.info("UDP worker loop gestopt")
+
+    def _handle_batch(self, items):
+        """Geef een batch (data, addr) tuples aan de batch handler"""
+        try:
+            self.batch_handler(items)
+            with self._stats_lock:
+                self.packets_processed += len(items)
+        except Exception as e:
+            self.logger.error(f"Fout in batch handler: {e}", exc_info=True)
+            with self._stats_lock:
+                self.packets_errors += 1
+
+    def _handle_packet(self, data):
+        """Geef één pakket aan de packet handler"""
+        try:
+            # Stuur rauwe data naar de packet handler (DataProcessor)
+            self.packet_handler(data)
+            with self._stats_lock:
+                self.packets_processed += 1
+        except Exception as e:
+            self.logger.error(f"Fout in packet handler: {e}", exc_info=True)
+            with self._stats_lock:
+                self.packets_errors += 1
+
     def is_running(self) -> bool:
         """Check of de listener actief is"""
         return self.running
 
     def get_stats(self) -> Dict[str, Any]:
-        """Verkrijg statistieken"""
-        return {
+        """Verkrijg statistieken (inclusief queue diepte, piek en drops)"""
+        stats = {
             "running": self.running,
             "packets_received": self.packets_received,
+            # Drops door een volle socket buffer (kernel), None = onbekend op dit platform
+            "kernel_drops": get_kernel_drops(self.sock) if self.sock else self.kernel_drops_at_close,
+            "recv_buffer_size": self.recv_buffer_effective,
             "packets_processed": self.packets_processed,
             "packets_errors": self.packets_errors,
-        }
\ No newline at end of file
+            "zero_copy": self.zero_copy,
+            "wakeups": self.wakeups,
+            "packets_per_wakeup": (self.packets_received / self.wakeups) if self.wakeups else 0.0,
+            "max_batch": self.max_batch_seen,
+        }
+        if self.buffer_pool:
+            stats.update(self.buffer_pool.get_stats())
+        if self.recorder is not None:
+            stats.update(self.recorder.get_stats())
+        if self.queue is not None:
+            stats.update(self.queue.get_stats())
+        else:
+            stats.update({
+                "queue_depth": 0,
+                "queue_capacity": self.queue_size,
+                "queue_high_water": 0,
+                "packets_dropped": 0,
+                "dropped_by_packet_id": {},
+            })
+        return stats
\ No newline at end of file
@@ -9,6 +9,7 @@ Om specifieke test module uit te voeren:
     python -m unittest tests.test_parsers
     python -m unittest tests.test_models
     python -m unittest tests.test_controllers
+    python -m unittest tests.test_services
 """
 
-__all__ = ['test_parsers', 'test_models', 'test_controllers']
\ No newline at end of file
+__all__ = ['test_parsers', 'test_models', 'test_controllers', 'test_services']
\ No newline at end of file
@@ -3,9 +3,13 @@ F1 25 Telemetry System - Controller Tests
 Unit tests voor controllers
 """
 
+import struct
 import unittest
 from unittest.mock import Mock, MagicMock, patch
-from controllers import DataProcessor, SessionController
+from controllers import DataProcessor, SessionController, SessionRouter, TelemetryController
+from services.frame_assembler import FrameBundle
+from services.payload_cache import PayloadCache
+from packet_parsers.packet_types import PACKET_SIZES
 
 class TestDataProcessor(unittest.TestCase):
     """Tests voor DataProcessor"""
@@ -177,6 +181,275 @@ class TestSessionController(unittest.TestCase):
         
         self.assertFalse(self.session_controller.is_session_active())
 
+    @patch('controllers.session_controller.SessionModel')
+    def test_session_ended_event(self, mock_session_model):
+        """Test dat SEND de actieve sessie afsluit en een SEND van een andere sessie niet"""
+        session_controller = SessionController()
+        session_controller.current_session_id = 123
+        session_controller.current_session_uid = 12345
+        session_controller.session_active = True
+
+        other = Mock(code='SEND', header=Mock(session_uid=999))
+        session_controller.process_event(other)
+        self.assertTrue(session_controller.is_session_active())
+
+        ended = Mock(code='SEND', header=Mock(session_uid=12345))
+        session_controller.process_event(ended)
+        self.assertFalse(session_controller.is_session_active())
+        mock_session_model.return_value.end_session.assert_called_once_with(123)
+
+
+class TestDataProcessorSubscriptions(unittest.TestCase):
+    """Tests voor header-peek filtering en de subscription API"""
+
+    def setUp(self):
+        """Setup met nep controllers"""
+        self.processor = DataProcessor(telemetry_controller=Mock(), session_controller=Mock())
+
+    @staticmethod
+    def make_packet(packet_id: int) -> bytes:
+        """Bouw een header-only pakket"""
+        return struct.pack('<HBBBBBQfIIBB', 2025, 25, 1, 0, 1, packet_id, 1, 0.0, 1, 1, 0, 255)
+
+    def test_default_subscriptions(self):
+        """Test dat standaard alle packet types met een parser gedecodeerd worden"""
+        self.assertTrue(self.processor.is_subscribed(2))
+        self.assertFalse(self.processor.is_subscribed(6))
+        self.assertFalse(self.processor.subscribe(6))
+
+    def test_unsubscribed_packet_not_decoded(self):
+        """Test dat een uitgezet packet type niet naar de parser gaat"""
+        parser = Mock()
+        self.processor.parsers[2] = parser
+        self.processor.unsubscribe(2)
+        self.processor.process_packet(self.make_packet(2))
+        parser.parse.assert_not_called()
+
+        self.assertTrue(self.processor.subscribe(2))
+        self.processor.process_packet(self.make_packet(2))
+        parser.parse.assert_called_once()
+
+    def test_set_subscriptions(self):
+        """Test vervangen van alle subscriptions"""
+        self.processor.set_subscriptions([1, 2, 6])
+        self.assertEqual(self.processor.get_subscriptions(), {1, 2})
+
+    def test_payload_cache_skips_unchanged_participants(self):
+        """Test dat een ongewijzigde Participants payload niet opnieuw geparst of gerouteerd wordt"""
+        processor = DataProcessor(telemetry_controller=Mock(), session_controller=Mock(),
+                                  payload_cache=PayloadCache())
+        packet = self.make_packet(4) + bytes(PACKET_SIZES[4] - 29)
+        processor.process_packet(packet)
+        processor.process_packet(packet)
+        processor.telemetry_controller.update_participant_data.assert_called_once()
+
+        changed = bytearray(packet)
+        changed[29] = 20  # num_active_cars
+        processor.process_packet(bytes(changed))
+        self.assertEqual(processor.telemetry_controller.update_participant_data.call_count, 2)
+        self.assertEqual(processor.payload_cache.get_stats()['hits'], 1)
+
+    def test_events_to_controllers(self):
+        """Test dat events naar de geabonneerde controllers gaan en andere codes niet geparst worden"""
+        processor = DataProcessor(telemetry_controller=Mock(), session_controller=Mock())
+        parser = processor.parsers[3]
+        processor.parsers[3] = Mock(wraps=parser)
+        header = self.make_packet(3)
+
+        processor.process_packet(header + struct.pack('<4sBf7x', b'FTLP', 3, 80.25))
+        event = processor.telemetry_controller.process_event.call_args[0][0]
+        self.assertEqual((event.code, event.details.vehicle_idx), ('FTLP', 3))
+        processor.session_controller.process_event.assert_not_called()
+
+        processor.process_packet(header + struct.pack('<4s12x', b'SEND'))
+        self.assertEqual(processor.session_controller.process_event.call_args[0][0].code, 'SEND')
+
+        processor.process_packet(header + struct.pack('<4sI8x', b'BUTN', 1))
+        self.assertEqual(processor.parsers[3].parse.call_count, 2)
+
+    def test_car_status_and_damage_routing(self):
+        """Test dat P7 en P10 zonder frame assembly naar de TelemetryController gaan"""
+        processor = DataProcessor(telemetry_controller=Mock(), session_controller=Mock())
+        processor.process_packet(self.make_packet(7) + bytes(55 * 22))
+        processor.process_packet(self.make_packet(10) + bytes(46 * 22))
+
+        packet, header = processor.telemetry_controller.update_car_status_packet.call_args[0]
+        self.assertEqual((len(packet.car_status_data), header.packet_id), (22, 7))
+        packet, _header = processor.telemetry_controller.update_car_damage_packet.call_args[0]
+        self.assertEqual(packet.car_damage_data[0].tyres_wear, (0.0, 0.0, 0.0, 0.0))
+
+    def test_car_mask_follows_player(self):
+        """Test dat het car mask de speler uit P4 volgt en naar de parsers gaat"""
+        processor = DataProcessor(telemetry_controller=Mock(), session_controller=Mock(),
+                                  car_mask=[0], follow_player_car=True)
+        self.assertEqual(processor.get_car_mask(), {0})
+
+        header = struct.pack('<HBBBBBQfIIBB', 2025, 25, 1, 0, 1, 4, 1, 0.0, 1, 1, 7, 12)
+        processor.process_packet(header + bytes(PACKET_SIZES[4] - 29))
+        self.assertEqual(processor.get_car_mask(), {0, 7, 12})
+        self.assertEqual(processor.parsers[2].car_mask, frozenset({0, 7, 12}))
+
+        self.assertIsNone(processor.parsers[7].car_mask)
+        self.assertIsNone(processor.parsers[10].car_mask)
+
+        processor.follow_player_car = False
+        processor.set_car_mask(None)
+        self.assertIsNone(processor.parsers[2].car_mask)
+
+    def test_empty_car_mask_decodes_all(self):
+        """Test dat follow_player_car vóór de eerste P4 niets wegfiltert"""
+        from packet_parsers.lap_parser import LazyLapDataPacket
+        processor = DataProcessor(telemetry_controller=Mock(), session_controller=Mock(),
+                                  follow_player_car=True)
+        self.assertIsNone(processor.get_car_mask())
+        self.assertIsNone(processor.parsers[2].car_mask)
+
+        processor.set_car_mask([])
+        self.assertIsNone(processor.parsers[2].car_mask)
+        processor.process_packet(self.make_packet(2) + bytes(PACKET_SIZES[2] - 29))
+        packet = processor.telemetry_controller.update_lap_data_packet.call_args[0][0]
+        self.assertIsInstance(packet, LazyLapDataPacket)
+
+
+class TestDataProcessorFrames(unittest.TestCase):
+    """Tests voor frame assembly in de DataProcessor"""
+
+    def test_lap_data_via_frame(self):
+        """Test dat Lap Data als frame bundle bij de controller aankomt"""
+        telemetry_controller = Mock()
+        processor = DataProcessor(telemetry_controller=telemetry_controller,
+                                  session_controller=Mock(), frame_timeout=0.05)
+        header = struct.pack('<HBBBBBQfIIBB', 2025, 25, 1, 0, 1, 2, 1, 0.0, 7, 7, 0, 255)
+        processor.process_packet(header + bytes(57 * 22 + 2))
+        # Car Status (P7) hoort bij hetzelfde frame; pas daarna is het frame compleet
+        telemetry_controller.update_frame.assert_not_called()
+        header = struct.pack('<HBBBBBQfIIBB', 2025, 25, 1, 0, 1, 7, 1, 0.0, 7, 7, 0, 255)
+        processor.process_packet(header + bytes(55 * 22))
+
+        telemetry_controller.update_lap_data_packet.assert_not_called()
+        telemetry_controller.update_car_status_packet.assert_not_called()
+        bundle = telemetry_controller.update_frame.call_args[0][0]
+        self.assertEqual(bundle.overall_frame_identifier, 7)
+        self.assertTrue(bundle.complete)
+        self.assertEqual(len(bundle.get(2).packet.lap_data), 22)
+        self.assertEqual(len(bundle.get(7).packet.car_status_data), 22)
+
+    def test_older_frame_ignored(self):
+        """Test dat update_frame een frame dat niet nieuwer is overslaat (per sessie)"""
+        controller = TelemetryController(session_controller=Mock())
+
+        def bundle(overall, session_uid=1):
+            return FrameBundle(session_uid, overall, overall, 0.0, 0, {}, True)
+
+        controller.update_frame(bundle(11))
+        controller.update_frame(bundle(10))
+        controller.update_frame(bundle(11))
+        self.assertEqual(controller.current_frame_identifier, 11)
+        self.assertEqual(controller.frames_skipped, 2)
+
+        controller.update_frame(bundle(3, session_uid=2))
+        self.assertEqual(controller.current_frame_identifier, 3)
+
+
+class TestSessionRouter(unittest.TestCase):
+    """Tests voor SessionRouter (multi-rig ingest)"""
+
+    def setUp(self):
+        """Setup met nep processors en een instelbare klok"""
+        self.now = 100.0
+        self.evicted = []
+        self.router = SessionRouter(
+            processor_factory=lambda key: Mock(),
+            idle_timeout=30.0,
+            max_rigs=2,
+            on_evict=self.evicted.append,
+            clock=lambda: self.now
+        )
+
+    @staticmethod
+    def make_packet(session_uid: int) -> bytes:
+        """Bouw een header-only pakket met een session_uid"""
+        return struct.pack('<HBBBBBQfIIBB', 2025, 25, 1, 0, 1, 2, session_uid, 0.0, 1, 1, 0, 255)
+
+    def test_state_per_host_and_session(self):
+        """Test dat elke (host, session_uid) een eigen processor krijgt"""
+        self.router.process_packet(self.make_packet(1), ('10.0.0.1', 5000))
+        self.router.process_packet(self.make_packet(1), ('10.0.0.1', 5000))
+        self.router.process_packet(self.make_packet(1), ('10.0.0.2', 5000))
+
+        rig_a = self.router.get_rig(('10.0.0.1', 1))
+        rig_b = self.router.get_rig(('10.0.0.2', 1))
+        self.assertIsNot(rig_a.processor, rig_b.processor)
+        self.assertIsNot(rig_a.lock, rig_b.lock)
+        self.assertEqual(rig_a.processor.process_packet.call_count, 2)
+        self.assertEqual(rig_b.processor.process_packet.call_count, 1)
+
+    def test_shared_processor_shares_lock(self):
+        """Test dat rigs met dezelfde processor (primaire rig) ook één lock delen"""
+        primary = Mock()
+        self.router.processor_factory = lambda key: primary
+        self.router.process_packet(self.make_packet(1), ('10.0.0.1', 5000))
+        self.router.process_packet(self.make_packet(2), ('10.0.0.1', 5000))
+
+        rig_a = self.router.get_rig(('10.0.0.1', 1))
+        rig_b = self.router.get_rig(('10.0.0.1', 2))
+        self.assertIsNot(rig_a, rig_b)
+        self.assertIs(rig_a.lock, rig_b.lock)
+
+    def test_batch_polls_frames(self):
+        """Test dat process_batch na de batch poll_frames() van elke betrokken rig aanroept"""
+        self.router.process_batch([
+            (self.make_packet(1), ('10.0.0.1', 5000)),
+            (self.make_packet(1), ('10.0.0.1', 5000)),
+            (self.make_packet(2), ('10.0.0.2', 5000)),
+        ])
+        for key in (('10.0.0.1', 1), ('10.0.0.2', 2)):
+            self.assertEqual(self.router.get_rig(key).processor.poll_frames.call_count, 1)
+
+    def test_poll_frames_once_per_processor(self):
+        """Test dat poll_frames() elke processor één keer onder de rig lock aanroept"""
+        primary = Mock()
+        self.router.processor_factory = lambda key: primary
+        self.router.process_packet(self.make_packet(1), ('10.0.0.1', 5000))
+        self.router.process_packet(self.make_packet(2), ('10.0.0.1', 5000))
+        lock = self.router.get_rig(('10.0.0.1', 1)).lock
+        primary.poll_frames.reset_mock()
+        held = []
+        primary.poll_frames.side_effect = lambda: held.append(lock.locked())
+
+        self.router.poll_frames()
+        self.assertEqual(held, [True])
+
+    def test_factory_outside_router_lock(self):
+        """Test dat de processor factory niet onder de router lock draait"""
+        held = []
+        self.router.processor_factory = lambda key: held.append(self.router._lock.locked()) or Mock()
+        self.router.process_packet(self.make_packet(1), ('10.0.0.1', 5000))
+        self.assertEqual(held, [False])
+
+    def test_max_rigs(self):
+        """Test dat nieuwe rigs boven max_rigs genegeerd worden"""
+        for uid in (1, 2, 3):
+            self.router.process_packet(self.make_packet(uid), ('10.0.0.1', 5000))
+
+        stats = self.router.get_stats()
+        self.assertEqual(stats['rigs_active'], 2)
+        self.assertEqual(stats['rigs_rejected_packets'], 1)
+
+    def test_idle_eviction(self):
+        """Test dat inactieve rigs na idle_timeout verwijderd worden"""
+        self.router.process_batch([
+            (self.make_packet(1), ('10.0.0.1', 5000)),
+            (self.make_packet(2), ('10.0.0.2', 5000)),
+        ])
+        self.now += 20.0
+        self.router.process_packet(self.make_packet(2), ('10.0.0.2', 5000))
+        self.now += 15.0
+
+        self.assertEqual(self.router.evict_idle(), 1)
+        self.assertEqual([state.key for state in self.evicted], [('10.0.0.1', 1)])
+        self.assertIsNotNone(self.router.get_rig(('10.0.0.2', 2)))
+
 
 class TestMenuController(unittest.TestCase):
     """Tests voor MenuController"""
@@ -38,7 +38,40 @@ class TestPacketHeader(unittest.TestCase):
         self.assertEqual(header.packet_id, PacketID.SESSION)
         self.assertEqual(header.player_car_index, 0)
         self.assertTrue(header.is_valid())
+
+    def test_header_peek(self):
+        """Test dat HEADER_PEEK alleen packet_format en packet_id leest"""
+        from packet_parsers.packet_header import HEADER_PEEK
+        header_data = struct.pack(
+            "<HBBBBBQfIIBB",
+            PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1, PacketID.CAR_TELEMETRY,
+            12345678, 100.5, 1000, 1000, 0, 255
+        )
+
+        self.assertEqual(HEADER_PEEK.unpack_from(memoryview(header_data)),
+                         (PACKET_FORMAT_2025, PacketID.CAR_TELEMETRY))
     
+    def test_header_record_and_validate(self):
+        """Test NamedTuple header, unpack op offset 0 van een grotere buffer en validate=True"""
+        from packet_parsers.packet_header import HEADER_STRUCT, is_valid_header_values
+        values = (PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1, PacketID.LAP_DATA, 42, 1.5, 10, 11, 3, 255)
+        data = bytearray(HEADER_STRUCT.pack(*values) + bytes(100))
+
+        header = PacketHeader.from_bytes(memoryview(data), validate=True)
+        self.assertEqual(tuple(header), values)
+        self.assertFalse(hasattr(header, '__dict__'))
+        self.assertEqual(header.overall_frame_identifier, 11)
+        self.assertTrue(is_valid_header_values(values))
+
+        # Ongeldig (verkeerd jaar of speler index): geen object met validate=True
+        data[2] = 24
+        self.assertIsNone(PacketHeader.from_bytes(data, validate=True))
+        self.assertFalse(PacketHeader.from_bytes(data).is_valid())
+        data[2] = GAME_YEAR
+        data[27] = 22
+        self.assertIsNone(PacketHeader.from_bytes(data, validate=True))
+        self.assertIsNone(PacketHeader.from_bytes(data[:28]))
+
     def test_invalid_packet_format(self):
         """Test header met verkeerd packet format"""
         header_data = struct.pack(
@@ -194,5 +227,450 @@ class TestSessionHistoryParser(unittest.TestCase):
         self.assertFalse(lap_history_invalid.is_lap_valid())
 
 
+class TestZeroCopyPayload(unittest.TestCase):
+    """Tests voor het zero-copy pad (memoryview payloads)"""
+
+    def _lap_packet(self) -> bytearray:
+        """Bouw een Lap Data datagram in een herbruikbare buffer"""
+        from packet_parsers.lap_parser import LapData
+        header_data = struct.pack(
+            "<HBBBBBQfIIBB",
+            PACKET_FORMAT_2025, GAME_YEAR,
+            1, 0, 1, PacketID.LAP_DATA,
+            12345678, 100.5,
+            1000, 1000, 3, 255
+        )
+        payload = bytearray(LapData.PACKET_LEN * 22 + 2)
+        struct.pack_into('<I', payload, 3 * LapData.PACKET_LEN, 91234)  # last_lap_time_ms auto 3
+        return bytearray(header_data) + payload
+
+    def test_payload_is_view(self):
+        """Test dat get_payload geen kopie maakt"""
+        buffer = self._lap_packet()
+        header = PacketHeader.from_bytes(memoryview(buffer))
+        payload = header.get_payload(memoryview(buffer))
+
+        self.assertIsInstance(payload, memoryview)
+        buffer[PacketHeader.HEADER_SIZE] = 0x7F
+        self.assertEqual(payload[0], 0x7F)
+
+    def test_lap_data_from_view(self):
+        """Test Lap Data parsing direct op een memoryview"""
+        from packet_parsers.lap_parser import LapDataParser
+        buffer = self._lap_packet()
+        header = PacketHeader.from_bytes(buffer)
+        result = LapDataParser().parse(header, header.get_payload(buffer))
+
+        self.assertEqual(len(result.lap_data), 22)
+        self.assertEqual(result.lap_data[3].last_lap_time_ms, 91234)
+
+
+class TestCarArrayParsers(unittest.TestCase):
+    """Tests voor de parsers die 22-auto arrays met iter_unpack uitpakken"""
+
+    def _header(self, packet_id: int) -> PacketHeader:
+        data = struct.pack("<HBBBBBQfIIBB", PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1,
+                           packet_id, 1, 10.0, 600, 600, 0, 255)
+        return PacketHeader.from_bytes(data)
+
+    def test_car_telemetry_spec_layout(self):
+        """Test het 60-byte F1 25 telemetrie record en de MFD bytes"""
+        from packet_parsers.car_parser import CarTelemetryParser, TELEMETRY_CAR_STRUCT
+        cars = b''.join(
+            TELEMETRY_CAR_STRUCT.pack(200 + i, 1.0, 0.0, 0.0, 0, 7, 11000, 1, 80, 0x3FF,
+                                      500, 501, 502, 503, 90, 91, 92, 93, 100, 101, 102, 103, 110,
+                                      22.5, 22.6, 23.5, 23.6, 0, 1, 2, 3)
+            for i in range(22)
+        )
+        payload = memoryview(cars + struct.pack("<BBb", 2, 255, -1))
+        result = CarTelemetryParser().parse(self._header(PacketID.CAR_TELEMETRY), payload)
+
+        self.assertEqual(TELEMETRY_CAR_STRUCT.size, 60)
+        self.assertEqual(len(result.car_telemetry_data), 22)
+        car = result.car_telemetry_data[21]
+        self.assertEqual(car.speed, 221)
+        self.assertTrue(car.drs)
+        self.assertEqual(car.tyres_surface_temperature, (90, 91, 92, 93))
+        self.assertEqual(car.tyres_inner_temperature, (100, 101, 102, 103))
+        self.assertEqual(car.engine_temperature, 110)
+        self.assertEqual(car.surface_type, (0, 1, 2, 3))
+        self.assertEqual((result.mfd_panel_index, result.suggested_gear), (2, -1))
+
+    def test_motion_and_short_payload(self):
+        """Test motion data per auto en None bij een te korte payload"""
+        from packet_parsers.motion_parser import MotionParser, MOTION_CAR_STRUCT
+        payload = b''.join(MOTION_CAR_STRUCT.pack(float(i), 0.0, 2.0, *([0.0] * 3), *([0] * 6),
+                                                  *([0.0] * 3), 0.5, 0.0, 0.0)
+                           for i in range(22))
+        parser = MotionParser()
+        result = parser.parse(self._header(PacketID.MOTION), payload)
+
+        self.assertEqual([car.world_position_x for car in result.car_motion_data], [float(i) for i in range(22)])
+        self.assertEqual(result.car_motion_data[5].yaw, 0.5)
+        self.assertIsNone(parser.parse(self._header(PacketID.MOTION), payload[:-1]))
+
+    def test_car_mask(self):
+        """Test dat alleen de gemaskeerde auto's direct gedecodeerd worden en de rest bij toegang"""
+        from packet_parsers.motion_parser import MotionParser, MOTION_CAR_STRUCT
+        from packet_parsers.lap_parser import LapDataParser, LapData, LAP_DATA_STRUCT
+        payload = bytearray(b''.join(MOTION_CAR_STRUCT.pack(float(i), *([0.0] * 5), *([0] * 6), *([0.0] * 6))
+                                     for i in range(22)))
+        parser = MotionParser(car_mask=[3, 7, 40])
+        cars = parser.parse(self._header(PacketID.MOTION), memoryview(payload)).car_motion_data
+
+        self.assertEqual(parser.car_mask, frozenset({3, 7}))
+        self.assertEqual(cars.decoded(), [3, 7])
+        payload[:4] = struct.pack("<f", 99.0)  # Ontvangstbuffer hergebruikt: de array heeft een eigen kopie
+        self.assertEqual(cars[0].world_position_x, 0.0)
+        self.assertEqual(cars[-1].world_position_x, 21.0)
+        self.assertEqual(cars.decoded(), [0, 3, 7, 21])
+        self.assertEqual([car.world_position_x for car in cars], [float(i) for i in range(22)])
+
+        lap_parser = LapDataParser(lazy=True)
+        lap_parser.set_car_mask([5])
+        lap_payload = b''.join(LAP_DATA_STRUCT.pack(*LapData(current_lap_num=4, car_position=i + 1))
+                               for i in range(22)) + b'\x01\x02'
+        packet = lap_parser.parse(self._header(PacketID.LAP_DATA), lap_payload)
+        self.assertIsInstance(packet.lap_data[5], LapData)
+        self.assertEqual(packet.lap_data.decoded(), [5])
+        self.assertEqual([car.car_position for car in packet.lap_data[:3]], [1, 2, 3])
+        self.assertEqual(packet.time_trial_rival_car_idx, 2)
+
+        lap_parser.set_car_mask(None)
+        self.assertEqual(lap_parser.parse(self._header(PacketID.LAP_DATA), lap_payload).lap_data[5].current_lap_num, 4)
+
+    def test_car_status_and_damage(self):
+        """Test Car Status (55 bytes per auto) en Car Damage (46 bytes per auto) uit de generator"""
+        from packet_parsers.status_parser import CarStatusParser, CarDamageParser, CarStatusData
+        from services.packet_generator import SimulatedRig
+        rig = SimulatedRig(num_cars=22)
+        rig.step()
+
+        data = rig.build_packet(PacketID.CAR_STATUS)
+        header = PacketHeader.from_bytes(data)
+        status = CarStatusParser().parse(header, memoryview(data)[29:])
+        self.assertEqual(len(status.car_status_data), 22)
+        self.assertIsInstance(status.car_status_data[0], CarStatusData)
+        self.assertEqual((status.car_status_data[3].max_rpm, status.car_status_data[3].max_gears), (13000, 8))
+        self.assertGreater(status.car_status_data[3].fuel_in_tank, 0.0)
+
+        data = rig.build_packet(PacketID.CAR_DAMAGE)
+        parser = CarDamageParser(car_mask=[header.player_car_index])
+        damage = parser.parse(PacketHeader.from_bytes(data), memoryview(data)[29:])
+        self.assertEqual(damage.car_damage_data.decoded(), [header.player_car_index])
+        self.assertEqual(len(damage.car_damage_data[21].tyres_wear), 4)
+        self.assertIsNone(parser.parse(header, memoryview(data)[29:-1]))
+
+    def test_session_weather_samples(self):
+        """Test de session payload van 724 bytes met 64 weer samples"""
+        from packet_parsers.session_parser import (
+            SessionParser, SESSION_HEAD_STRUCT, MARSHAL_ZONE_STRUCT, SESSION_MID_STRUCT,
+            WEATHER_SAMPLE_STRUCT, SESSION_FOOTER_STRUCT
+        )
+        payload = bytearray(724)
+        SESSION_HEAD_STRUCT.pack_into(payload, 0, 1, 35, 25, 58, 5303, 10, 0, 0, 3600, 7200,
+                                      80, 0, 0, 255, 0, 21)
+        offset = SESSION_HEAD_STRUCT.size + MARSHAL_ZONE_STRUCT.size * 21
+        SESSION_MID_STRUCT.pack_into(payload, offset, 0, 0, 2)
+        offset += SESSION_MID_STRUCT.size
+        WEATHER_SAMPLE_STRUCT.pack_into(payload, offset + 8, 10, 5, 3, 30, 1, 20, -1, 60)
+        offset += WEATHER_SAMPLE_STRUCT.size * 64
+        footer = [0] * 28
+        footer[19] = 840  # timeOfDay
+        footer[27] = 1    # numRedFlagPeriods
+        SESSION_FOOTER_STRUCT.pack_into(payload, offset, *footer)
+
+        result = SessionParser().parse(self._header(PacketID.SESSION), memoryview(payload))
+        self.assertEqual((result.total_laps, result.track_length, result.session_duration), (58, 5303, 7200))
+        self.assertEqual(len(result.marshal_zones), 21)
+        self.assertEqual(len(result.weather_forecast_samples), 2)
+        sample = result.weather_forecast_samples[1]
+        self.assertEqual((sample.weather, sample.air_temperature, sample.rain_percentage), (3, 20, 60))
+        self.assertEqual(sample.air_temperature_change, -1)
+        self.assertEqual((result.time_of_day, result.num_red_flag_periods), (840, 1))
+
+    def test_motion_ex_spec_size(self):
+        """Test motion ex op de F1 25 payload van 244 bytes"""
+        from packet_parsers.motion_parser import MotionExParser
+        payload = struct.pack("<61f", *range(61))
+        result = MotionExParser().parse(self._header(PacketID.MOTION_EX), payload).motion_ex_data
+
+        self.assertEqual(result.wheel_long_force, (28.0, 29.0, 30.0, 31.0))
+        self.assertEqual(result.front_wheels_angle, 42.0)
+        self.assertEqual(result.vertical_force, (43.0, 44.0, 45.0, 46.0))
+        self.assertEqual(result.wheel_camber_gain, (57.0, 58.0, 59.0, 60.0))
+
+
+class TestEventParser(unittest.TestCase):
+    """Tests voor de Event parser (union per event code)"""
+
+    def _parse(self, code: bytes, details: bytes = b''):
+        from packet_parsers.event_parser import EventParser
+        header = struct.pack("<HBBBBBQfIIBB", PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1,
+                             PacketID.EVENT, 1, 10.0, 600, 600, 0, 255)
+        payload = memoryview(struct.pack("<4s12s", code, details))
+        return EventParser().parse(PacketHeader.from_bytes(header), payload)
+
+    def test_details_per_code(self):
+        """Test getypeerde details voor FTLP, PENA en SPTP"""
+        event = self._parse(b'FTLP', struct.pack("<Bf", 4, 81.5))
+        self.assertEqual(event.code, 'FTLP')
+        self.assertEqual(type(event.details).__name__, 'FastestLap')
+        self.assertEqual((event.details.vehicle_idx, event.details.lap_time), (4, 81.5))
+
+        event = self._parse(b'PENA', bytes([2, 7, 3, 255, 5, 12, 0]))
+        self.assertEqual((event.details.penalty_type, event.details.vehicle_idx, event.details.time,
+                          event.details.lap_num), (2, 3, 5, 12))
+
+        event = self._parse(b'SPTP', struct.pack("<BfBBBf", 1, 330.5, 1, 1, 1, 330.5))
+        self.assertEqual(event.details.speed, 330.5)
+        self.assertEqual(event.details.fastest_vehicle_idx_in_session, 1)
+
+    def test_codes_without_details(self):
+        """Test SSTA zonder details, onbekende codes en een te korte payload"""
+        self.assertIsNone(self._parse(b'SSTA').details)
+        event = self._parse(b'XXXX', b'\x01')
+        self.assertEqual((event.code, event.details), ('XXXX', None))
+
+        from packet_parsers.event_parser import EventParser
+        header = struct.pack("<HBBBBBQfIIBB", PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1,
+                             PacketID.EVENT, 1, 10.0, 600, 600, 0, 255)
+        self.assertIsNone(EventParser().parse(PacketHeader.from_bytes(header), b'FTLP'))
+
+    def test_every_code_fits_union(self):
+        """Test dat elk union lid in de 12 detail bytes past"""
+        from packet_parsers.event_parser import EVENT_DETAILS
+        from packet_parsers.packet_types import EventCode
+        codes = [value for name, value in vars(EventCode).items() if not name.startswith('_')]
+        self.assertEqual(set(codes), set(EVENT_DETAILS))
+        for schema in EVENT_DETAILS.values():
+            if schema is not None:
+                self.assertLessEqual(schema.size, 12, schema.name)
+
+
+class TestCompactRecords(unittest.TestCase):
+    """Tests voor de record types per auto (NamedTuple, geen __dict__)"""
+
+    def test_records_have_no_instance_dict(self):
+        """Test dat de records per auto geen __dict__ hebben"""
+        from packet_parsers.lap_parser import LapData
+        from packet_parsers.car_parser import CarTelemetryData
+        from packet_parsers.motion_parser import CarMotionData
+        from packet_parsers.participant_parser import ParticipantData
+        from packet_parsers.history_parser import LapHistoryData
+
+        records = [
+            LapData(),
+            CarTelemetryData(*range(10), (1, 2, 3, 4), (1, 2, 3, 4), (1, 2, 3, 4), 90,
+                             (1.0, 2.0, 3.0, 4.0), (0, 0, 0, 0)),
+            CarMotionData(*([0.0] * 18)),
+            ParticipantData(),
+            LapHistoryData(90000, 500, 0, 800, 0, 700, 0, 0x0F),
+        ]
+        for record in records:
+            self.assertFalse(hasattr(record, '__dict__'), type(record).__name__)
+
+    def test_defaults_and_methods_kept(self):
+        """Test dat defaults, class constanten en methodes blijven werken"""
+        from packet_parsers.lap_parser import LapData
+        from packet_parsers.participant_parser import ParticipantData
+        from packet_parsers.history_parser import LapHistoryData
+
+        self.assertEqual(LapData().car_position, 0)
+        self.assertEqual(LapData.PACKET_LEN, 57)
+        self.assertEqual(len(LapData._fields), 33)
+        self.assertEqual(ParticipantData(name="VERSTAPPEN").get_name(), "VERSTAPPEN")
+        lap = LapHistoryData(90000, 500, 1, 800, 0, 700, 0, 0x0F)
+        self.assertTrue(lap.is_sector3_valid())
+        self.assertEqual(lap.get_sector1_total_ms(), 60500)
+
+
+class TestPacketSchemas(unittest.TestCase):
+    """Tests voor het schema register en de gegenereerde decoders"""
+
+    def _header(self, packet_id: int) -> PacketHeader:
+        data = struct.pack("<HBBBBBQfIIBB", PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1,
+                           packet_id, 1, 10.0, 600, 600, 0, 255)
+        return PacketHeader.from_bytes(data)
+
+    def test_sizes_match_spec(self):
+        """Test dat elke schema packet grootte gelijk is aan PACKET_SIZES"""
+        from packet_parsers.packet_types import PACKET_SIZES
+        from packet_parsers.schema import SCHEMAS
+        import packet_parsers.schemas  # Vult het register
+
+        self.assertGreaterEqual(len(SCHEMAS), 14)
+        for packet_id, schema in SCHEMAS.items():
+            self.assertEqual(schema.packet_size, PACKET_SIZES[packet_id], schema.name)
+
+    def test_record_decoding(self):
+        """Test arrays als tuples, char[n] als str, defaults en bind()"""
+        from packet_parsers.schema import RecordSchema
+        from packet_parsers.participant_parser import ParticipantData
+
+        schema = RecordSchema('Example', [('speed', 'uint16'), ('name', 'char', 8),
+                                          ('wear', 'float', 4), ('drs', 'bool')], defaults=True)
+        data = schema.struct.pack(300, b'HAM\x00junk', 1.0, 2.0, 3.0, 4.0, 1)
+        record = schema.decode_from(data)
+        self.assertEqual(record, (300, 'HAM', (1.0, 2.0, 3.0, 4.0), True))
+        self.assertEqual(record.name, 'HAM')
+        self.assertEqual(schema.record(), (0, '', (0.0, 0.0, 0.0, 0.0), False))
+        self.assertEqual(schema.decode_array(data * 3)[2].speed, 300)
+
+        # Gebonden subclass: de decoder maakt de subclass met methodes
+        self.assertIsInstance(ParticipantData.from_bytes(bytes(57)), ParticipantData)
+        with self.assertRaises(TypeError):
+            schema.bind(ParticipantData)
+        with self.assertRaises(ValueError):
+            RecordSchema('Bad', [('x', 'uint128')])
+
+    def test_participants_spec_stride(self):
+        """Test de 57-byte participants records (namen en liveries)"""
+        from packet_parsers.participant_parser import ParticipantsParser
+        from packet_parsers.schemas import PARTICIPANT
+        payload = bytes([20]) + b''.join(
+            PARTICIPANT.struct.pack(0, i, 0, 3, 0, i + 1, 7, f"DRIVER{i}".encode(), 1, 0, 2, 1, 1, *range(12))
+            for i in range(22)
+        )
+        result = ParticipantsParser().parse(self._header(PacketID.PARTICIPANTS), payload)
+
+        self.assertEqual(result.num_active_cars, 20)
+        self.assertEqual(len(result.participants), 22)
+        self.assertEqual(result.participants[21].get_name(), "DRIVER21")
+        self.assertEqual(result.participants[21].race_number, 22)
+        self.assertEqual(result.participants[5].livery_colours, tuple(range(12)))
+
+    def test_schema_parser_with_limits(self):
+        """Test SchemaParser voor een packet zonder eigen parser (limit op num_laps)"""
+        from packet_parsers.schema import SchemaParser, get_schema
+        schema = get_schema(PacketID.LAP_POSITIONS)
+        payload = bytes([3, 1]) + bytes(range(22)) * 50
+        result = SchemaParser(schema).parse(self._header(PacketID.LAP_POSITIONS), payload)
+
+        self.assertEqual(result.head.num_laps, 3)
+        self.assertEqual(len(result.positions), 3)
+        self.assertEqual(result.positions[2].position_for_vehicle_idx[21], 21)
+        self.assertIsNone(SchemaParser(schema).parse(result.header, payload[:-1]))
+
+
+class TestLazyLapData(unittest.TestCase):
+    """Tests voor de lazy Lap Data packets"""
+
+    def setUp(self):
+        from packet_parsers.lap_parser import LAP_DATA_STRUCT
+        payload = bytearray(57 * 22 + 2)
+        for i in range(22):
+            values = [90000 + i, 1234, 30000, 0, 31000, 0, 0, 0, 0, 0, 100.5 + i, 5000.0, 0.0,
+                      i + 1, 3, 0, 1, 2, 0, 0, 0, 0, 0, 0, 22 - i, 4, 2, 0, 0, 0, 0, 310.5, 2]
+            LAP_DATA_STRUCT.pack_into(payload, i * 57, *values)
+        payload[-2:] = bytes([5, 255])
+        self.payload = payload
+        header = struct.pack("<HBBBBBQfIIBB", PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1,
+                             PacketID.LAP_DATA, 1, 10.0, 600, 600, 0, 255)
+        self.header = PacketHeader.from_bytes(header)
+
+    def test_same_fields_as_eager(self):
+        """Test dat elk veld gelijk is aan de volledig gedecodeerde LapData"""
+        from packet_parsers.lap_parser import LapDataParser, LapData
+        eager = LapDataParser().parse(self.header, bytes(self.payload))
+        lazy = LapDataParser(lazy=True).parse(self.header, memoryview(self.payload))
+
+        self.assertEqual(len(lazy.lap_data), 22)
+        for eager_car, lazy_car in zip(eager.lap_data, lazy.lap_data):
+            for field in LapData._fields:
+                self.assertEqual(getattr(lazy_car, field), getattr(eager_car, field), field)
+        self.assertEqual(lazy.lap_data[-1].to_lap_data(), eager.lap_data[21])
+        self.assertEqual((lazy.time_trial_pb_car_idx, lazy.time_trial_rival_car_idx), (5, 255))
+
+    def test_decodes_on_access_and_caches(self):
+        """Test dat alleen gelezen velden gedecodeerd worden, één keer"""
+        from packet_parsers.lap_parser import LapDataParser
+        packet = LapDataParser(lazy=True).parse(self.header, memoryview(self.payload))
+        # Eigen kopie: de ontvangstbuffer mag daarna hergebruikt worden
+        self.payload[:4] = bytes(4)
+
+        car = packet.lap_data[0]
+        self.assertIs(packet.lap_data[0], car)
+        self.assertNotIn('car_position', vars(car))
+        self.assertEqual(car.last_lap_time_ms, 90000)
+        self.assertEqual(car.car_position, 1)
+        self.assertEqual(vars(car)['car_position'], 1)
+        self.assertNotIn('lap_distance', vars(car))
+        with self.assertRaises(AttributeError):
+            car.best_lap_time_ms
+
+    def test_invalid_size(self):
+        """Test None bij een payload met de verkeerde grootte"""
+        from packet_parsers.lap_parser import LapDataParser
+        self.assertIsNone(LapDataParser(lazy=True).parse(self.header, bytes(100)))
+
+
+try:
+    from packet_parsers.numpy_decoder import (
+        NUMPY_AVAILABLE, CAR_DTYPES, CAR_RECORD_SIZES, decode_car_arrays
+    )
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy niet geïnstalleerd")
+class TestNumpyDecoder(unittest.TestCase):
+    """Tests voor de zero-copy numpy decodering van 22-auto packets"""
+
+    def _packet(self, packet_id: int, payload: bytes) -> bytearray:
+        header = struct.pack("<HBBBBBQfIIBB", PACKET_FORMAT_2025, GAME_YEAR, 1, 0, 1,
+                             packet_id, 1, 10.0, 600, 600, 0, 255)
+        return bytearray(header + payload)
+
+    def test_dtype_sizes_match_spec(self):
+        """Test dat elke structured dtype de spec record grootte heeft"""
+        for packet_id, dtype in CAR_DTYPES.items():
+            self.assertEqual(dtype.itemsize, CAR_RECORD_SIZES[packet_id], packet_id)
+
+    def test_telemetry_columns_are_views(self):
+        """Test kolom toegang, sub-arrays, tail velden en zero-copy"""
+        from packet_parsers.car_parser import TELEMETRY_CAR_STRUCT
+        cars = b''.join(
+            TELEMETRY_CAR_STRUCT.pack(100 + i, 1.0, 0.0, 0.0, 0, 6, 10000, 0, 50, 0,
+                                      *([500] * 4), *([90] * 4), *([100] * 4), 110,
+                                      22.5, 22.5, 24.0, 24.0 + i, *([0] * 4))
+            for i in range(22)
+        )
+        buffer = self._packet(PacketID.CAR_TELEMETRY, cars + struct.pack("<BBb", 1, 255, 7))
+        packet = decode_car_arrays(buffer)
+
+        self.assertEqual(packet['speed'].tolist(), list(range(100, 122)))
+        self.assertEqual(packet['tyres_pressure'].shape, (22, 4))
+        self.assertEqual(float(packet['tyres_pressure'][3, 3]), 27.0)
+        self.assertEqual(int(packet['suggested_gear']), 7)
+
+        # Zero-copy: een wijziging in de buffer is direct zichtbaar in de kolom
+        struct.pack_into('<H', buffer, PacketHeader.HEADER_SIZE, 333)
+        self.assertEqual(int(packet['speed'][0]), 333)
+
+        # Object API op dezelfde buffer
+        objects = packet.to_packet()
+        self.assertEqual(objects.car_telemetry_data[0].speed, 333)
+        self.assertEqual(objects.suggested_gear, 7)
+
+    def test_lap_data_and_unsupported(self):
+        """Test Lap Data kolommen en None voor andere of te korte packets"""
+        from packet_parsers.lap_parser import LAP_DATA_STRUCT
+        payload = bytearray(57 * 22 + 2)
+        for i in range(22):
+            values = [0] * 33
+            values[13] = i + 1  # car_position
+            LAP_DATA_STRUCT.pack_into(payload, i * 57, *values)
+        packet = decode_car_arrays(self._packet(PacketID.LAP_DATA, bytes(payload)))
+
+        self.assertEqual(packet['car_position'].tolist(), list(range(1, 23)))
+        self.assertEqual(packet.to_packet().lap_data[21].car_position, 22)
+        self.assertIsNone(decode_car_arrays(self._packet(PacketID.SESSION, bytes(724))))
+        self.assertIsNone(decode_car_arrays(self._packet(PacketID.CAR_STATUS, bytes(100))))
+        # Zonder eigen parser levert to_packet() het schema record
+        status = decode_car_arrays(self._packet(PacketID.CAR_STATUS, bytes(55 * 22))).to_packet()
+        self.assertEqual(len(status.car_status_data), 22)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
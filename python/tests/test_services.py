@@ -0,0 +1,1253 @@
+"""
+F1 25 Telemetry System - Service Tests
+Unit tests voor de UDP services
+"""
+
+import asyncio
+import os
+import socket
+import struct
+import threading
+import time
+import unittest
+from services import UDPListener, AsyncUDPListener, ReusePortSupervisor
+from services.packet_queue import PacketRingBuffer
+from services.sequence_tracker import FrameSequenceTracker, merge_sequence_stats
+from services.frame_assembler import FrameAssembler
+from services.payload_cache import PayloadCache
+from services.event_stream import EventStream
+from services.car_state import CarStateTable
+from services.capture_format import CaptureWriter, CaptureReader, read_index
+from services.capture_recorder import CaptureRecorder
+from services.replay_source import ReplaySource
+from services.capture_mmap_reader import MmapCaptureReader, time_index_path_for
+from services.capture_archive import CaptureArchiveReader, CaptureCompactor, compact_capture
+from services.capture_format import CaptureFormatError
+from services.packet_generator import PacketGenerator, SimulatedRig
+from packet_parsers.packet_types import PacketID, PACKET_SIZES
+from types import SimpleNamespace
+import tempfile
+
+
+class TestPacketRingBuffer(unittest.TestCase):
+    """Tests voor PacketRingBuffer"""
+
+    def test_fifo_order(self):
+        """Test dat pakketten in volgorde van ontvangst terugkomen"""
+        queue = PacketRingBuffer(capacity=4)
+        for i in range(3):
+            self.assertTrue(queue.put(f"pkt{i}", packet_id=2))
+
+        self.assertEqual(len(queue), 3)
+        self.assertEqual([queue.get(timeout=0) for _ in range(3)], ["pkt0", "pkt1", "pkt2"])
+        self.assertIsNone(queue.get(timeout=0))
+
+    def test_drop_oldest(self):
+        """Test drop-oldest policy bij een volle buffer"""
+        queue = PacketRingBuffer(capacity=2)
+        queue.put("a", packet_id=1)
+        queue.put("b", packet_id=2)
+        queue.put("c", packet_id=6)
+
+        self.assertEqual(queue.get(timeout=0), "b")
+        self.assertEqual(queue.get(timeout=0), "c")
+
+        stats = queue.get_stats()
+        self.assertEqual(stats['packets_dropped'], 1)
+        self.assertEqual(stats['dropped_by_packet_id'], {1: 1})
+        self.assertEqual(stats['queue_high_water'], 2)
+
+    def test_priority_policy(self):
+        """Test dat de priority policy het minst belangrijke pakket dropt"""
+        priorities = {0: 0, 2: 1, 11: 2}
+        queue = PacketRingBuffer(capacity=3, overflow_policy='priority', packet_priorities=priorities)
+        queue.put("lap1", packet_id=2)
+        queue.put("motion", packet_id=0)
+        queue.put("lap2", packet_id=2)
+
+        # History (prio 2) verdringt motion (prio 0)
+        self.assertTrue(queue.put("history", packet_id=11))
+        # Motion (prio 0) kan niets verdringen en wordt zelf gedropt
+        self.assertFalse(queue.put("motion2", packet_id=0))
+
+        self.assertEqual([queue.get(timeout=0) for _ in range(3)], ["lap1", "lap2", "history"])
+        self.assertEqual(queue.get_stats()['dropped_by_packet_id'], {0: 2})
+
+    def test_priority_keeps_arrival_order(self):
+        """Test dat de volgorde van ontvangst over de prioriteiten heen behouden blijft"""
+        priorities = {0: 0, 2: 1, 11: 2}
+        dropped = []
+        queue = PacketRingBuffer(capacity=4, overflow_policy='priority', packet_priorities=priorities,
+                                 on_drop=dropped.append)
+        queue.put_many(["h1", "m1", "l1", "m2"], [11, 0, 2, 0])
+        queue.put("h2", packet_id=11)   # Verdringt m1
+        queue.put("l2", packet_id=2)    # Verdringt m2
+        queue.put("l3", packet_id=2)    # Niets lager dan prio 1 meer: l3 vervalt
+
+        self.assertEqual(dropped, ["m1", "m2", "l3"])
+        self.assertEqual(queue.get(timeout=0), "h1")
+        self.assertEqual(queue.get_many(10, timeout=0), ["l1", "h2", "l2"])
+        self.assertEqual(len(queue), 0)
+
+    def test_close_wakes_consumer(self):
+        """Test dat een gesloten, lege buffer direct None geeft"""
+        queue = PacketRingBuffer(capacity=2)
+        queue.close()
+        self.assertIsNone(queue.get(timeout=5))
+
+    def test_put_many_get_many(self):
+        """Test batch put/get met drop bij een volle buffer"""
+        dropped = []
+        queue = PacketRingBuffer(capacity=3, on_drop=dropped.append)
+        accepted = queue.put_many(["a", "b", "c", "d"], [2, 2, 2, 6])
+
+        self.assertEqual(accepted, 4)
+        self.assertEqual(dropped, ["a"])
+        self.assertEqual(queue.get_many(2, timeout=0), ["b", "c"])
+        self.assertEqual(queue.get_many(10, timeout=0), ["d"])
+        self.assertEqual(queue.get_many(10, timeout=0), [])
+
+    def test_invalid_policy(self):
+        """Test onbekende overflow policy"""
+        with self.assertRaises(ValueError):
+            PacketRingBuffer(capacity=2, overflow_policy='random')
+
+
+class TestFrameSequenceTracker(unittest.TestCase):
+    """Tests voor FrameSequenceTracker"""
+
+    def setUp(self):
+        """Setup met een klein histogram venster"""
+        self.tracker = FrameSequenceTracker(window=10)
+
+    def feed(self, packet_id, frames):
+        """Voer (frame, overall) paren in voor sessie 1"""
+        for frame, overall in frames:
+            self.tracker.observe(1, packet_id, frame, overall)
+
+    def test_gap_with_learned_stride(self):
+        """Test verlies detectie bij een packet type dat elke 2 frames komt"""
+        self.feed(1, [(0, 0), (2, 2), (4, 4), (10, 10), (12, 12)])
+
+        stats = self.tracker.get_stats()
+        self.assertEqual(stats['received'], 5)
+        self.assertEqual(stats['lost'], 2)
+        self.assertEqual(stats['per_packet_id'][1]['stride'], 2)
+
+    def test_out_of_order_and_duplicate(self):
+        """Test te laat aangekomen en dubbele pakketten"""
+        self.feed(0, [(0, 0), (1, 1), (3, 3), (2, 2), (3, 3)])
+
+        stats = self.tracker.get_stats()
+        self.assertEqual(stats['out_of_order'], 1)
+        self.assertEqual(stats['duplicates'], 1)
+        self.assertEqual(stats['lost'], 0)
+
+    def test_flashback(self):
+        """Test flashback: frame_identifier terug, overall loopt door"""
+        self.feed(0, [(100, 100), (101, 101), (50, 102), (51, 103)])
+
+        stats = self.tracker.get_stats()
+        self.assertEqual(stats['flashbacks'], 1)
+        self.assertEqual(stats['lost'], 0)
+
+    def test_flashback_counted_once_per_session(self):
+        """Test dat een flashback in alle packet types van een sessie één keer telt"""
+        flashback = [(100, 100), (101, 101), (50, 102), (51, 103)]
+        for packet_id in (0, 2, 6, 7):
+            self.feed(packet_id, flashback)
+        # Sessie 2: twee flashbacks, alleen in Motion gezien
+        for frame, overall in [(10, 10), (5, 11), (6, 12), (1, 13)]:
+            self.tracker.observe(2, 0, frame, overall)
+
+        stats = self.tracker.get_stats()
+        self.assertEqual(stats['flashbacks'], 3)
+        self.assertEqual(stats['per_packet_id'][2]['flashbacks'], 1)
+        self.assertEqual(stats['per_packet_id'][0]['flashbacks'], 3)
+
+    def test_merge_trackers_per_rig(self):
+        """Test dat twee rigs in dezelfde sessie elk een schone stroom houden"""
+        other = FrameSequenceTracker(window=10)
+        # Zelfde session_uid, verschillende overall frames: in één tracker zou dit verlies lijken
+        self.feed(0, [(i, i) for i in range(5)])
+        for i in range(5):
+            other.observe(1, 0, i + 1000, i + 1000)
+
+        merged = merge_sequence_stats([self.tracker.get_stats(), other.get_stats()])
+        self.assertEqual(merged['received'], 10)
+        self.assertEqual((merged['lost'], merged['out_of_order']), (0, 0))
+        self.assertEqual(merged['per_packet_id'][0]['stride'], 1)
+        self.assertEqual(merged['loss_rate'], 0.0)
+
+    def test_untracked_and_raw_packet(self):
+        """Test dat Event pakketten genegeerd worden en rauwe headers werken"""
+        header = struct.pack('<HBBBBBQfIIBB', 2025, 25, 1, 0, 1, 3, 1, 0.0, 5, 5, 0, 255)
+        self.tracker.observe_packet(header)
+        self.assertEqual(self.tracker.get_stats()['received'], 0)
+
+        header = struct.pack('<HBBBBBQfIIBB', 2025, 25, 1, 0, 1, 6, 1, 0.0, 5, 5, 0, 255)
+        self.tracker.observe_packet(memoryview(header))
+        self.assertEqual(self.tracker.get_stats()['per_packet_id'][6]['received'], 1)
+
+    def test_loss_histogram(self):
+        """Test histogram: één schoon venster en één met 10% verlies"""
+        self.feed(0, [(i, i) for i in range(10)])
+        self.feed(0, [(i, i) for i in range(11, 20)])
+
+        histogram = self.tracker.get_loss_histogram(0)
+        self.assertEqual(histogram['0%'], 1)
+        self.assertEqual(histogram['>=10%'], 1)
+        self.assertEqual(sum(self.tracker.get_loss_histogram(6).values()), 0)
+
+
+class TestPayloadCache(unittest.TestCase):
+    """Tests voor PayloadCache"""
+
+    def setUp(self):
+        """Setup met een parser die zijn aanroepen telt"""
+        self.cache = PayloadCache(packet_ids=[4, 15], max_entries=2)
+        self.calls = []
+
+    def parse(self, header, payload):
+        self.calls.append(bytes(payload))
+        return ('parsed', bytes(payload))
+
+    def header(self, packet_id, session_uid=1):
+        return SimpleNamespace(packet_id=packet_id, session_uid=session_uid)
+
+    def test_hit_on_identical_payload(self):
+        """Test dat een identieke payload (ook als memoryview) niet opnieuw geparst wordt"""
+        first, unchanged = self.cache.parse(self.header(4), b'abc', self.parse)
+        self.assertFalse(unchanged)
+        second, unchanged = self.cache.parse(self.header(4), memoryview(b'xabc')[1:], self.parse)
+        self.assertTrue(unchanged)
+        self.assertIs(second, first)
+        self.assertEqual(len(self.calls), 1)
+
+        _, unchanged = self.cache.parse(self.header(4), b'abd', self.parse)
+        self.assertFalse(unchanged)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_key_per_session_and_packet_id(self):
+        """Test dat een andere sessie of packet ID een eigen entry heeft"""
+        self.cache.parse(self.header(4), b'abc', self.parse)
+        _, unchanged = self.cache.parse(self.header(4, session_uid=2), b'abc', self.parse)
+        self.assertFalse(unchanged)
+        _, unchanged = self.cache.parse(self.header(15), b'abc', self.parse)
+        self.assertFalse(unchanged)
+        # max_entries=2: de entry van sessie 1, packet 4 is verdrongen
+        _, unchanged = self.cache.parse(self.header(4), b'abc', self.parse)
+        self.assertFalse(unchanged)
+
+    def test_untracked_packet_id_and_invalidate(self):
+        """Test dat andere packet IDs altijd geparst worden en invalidate()"""
+        for _ in range(2):
+            _, unchanged = self.cache.parse(self.header(1), b'abc', self.parse)
+            self.assertFalse(unchanged)
+        self.cache.parse(self.header(4), b'abc', self.parse)
+        self.cache.invalidate(session_uid=1)
+        _, unchanged = self.cache.parse(self.header(4), b'abc', self.parse)
+        self.assertFalse(unchanged)
+
+    def test_none_not_cached_and_stats(self):
+        """Test dat een mislukte parse niet bewaard wordt en de tellers"""
+        for _ in range(2):
+            parsed, unchanged = self.cache.parse(self.header(4), b'bad', lambda header, payload: None)
+            self.assertIsNone(parsed)
+            self.assertFalse(unchanged)
+        self.cache.parse(self.header(15), b'abc', self.parse)
+        self.cache.parse(self.header(15), b'abc', self.parse)
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['hit_rate'], 0.25)
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['per_packet_id'][4], {'hits': 0, 'misses': 2})
+
+
+class TestEventStream(unittest.TestCase):
+    """Tests voor EventStream"""
+
+    def setUp(self):
+        """Setup met een stream en een lijst ontvangen events"""
+        self.stream = EventStream()
+        self.received = []
+
+    def event(self, code):
+        return SimpleNamespace(code=code)
+
+    def test_filter_by_code(self):
+        """Test dat subscribers alleen hun codes krijgen, wildcard alles"""
+        self.stream.subscribe(lambda event: self.received.append(('fast', event.code)), ['FTLP'])
+        self.stream.subscribe(lambda event: self.received.append(('all', event.code)))
+
+        self.assertEqual(self.stream.publish(self.event('FTLP')), 2)
+        self.assertEqual(self.stream.publish(self.event('BUTN')), 1)
+        self.assertEqual(self.received, [('fast', 'FTLP'), ('all', 'FTLP'), ('all', 'BUTN')])
+
+    def test_wants_and_unsubscribe(self):
+        """Test wants() voor het filteren vóór de parse, en unsubscribe()"""
+        token = self.stream.subscribe(self.received.append, ['SSTA', 'SEND'])
+        self.assertTrue(self.stream.wants('SEND'))
+        self.assertFalse(self.stream.wants('BUTN'))
+
+        self.stream.unsubscribe(token)
+        self.assertFalse(self.stream.wants('SEND'))
+        self.assertEqual(self.stream.publish(self.event('SEND')), 0)
+        self.assertEqual(self.received, [])
+
+    def test_subscriber_error_isolated(self):
+        """Test dat een fout in één subscriber de andere niet stopt"""
+        def broken(event):
+            raise ValueError("kapot")
+        self.stream.subscribe(broken, ['PENA'])
+        self.stream.subscribe(self.received.append, ['PENA'])
+
+        self.stream.publish(self.event('PENA'))
+        stats = self.stream.get_stats()
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual((stats['published'], stats['delivered'], stats['errors']), (1, 2, 1))
+        self.assertEqual(stats['per_code'], {'PENA': 1})
+
+
+class TestCarStateTable(unittest.TestCase):
+    """Tests voor CarStateTable"""
+
+    def setUp(self):
+        """Setup met een klein schema voor drie auto's"""
+        from packet_parsers.schema import RecordSchema
+        self.schema = RecordSchema('Example', [('fuel', 'float'), ('wear', 'uint8', 4), ('drs', 'bool')])
+        self.table = CarStateTable(self.schema, num_cars=3)
+
+    def records(self, *values):
+        return [self.schema.record(*value) for value in values]
+
+    def test_only_changed_fields(self):
+        """Test dat alleen gewijzigde auto's en velden doorgegeven worden"""
+        first = self.records((10.0, (1, 2, 3, 4), False), (20.0, (0, 0, 0, 0), True), (5.0, (9, 9, 9, 9), False))
+        changes = self.table.update(first)
+        self.assertEqual(set(changes), {0, 1, 2})
+        self.assertEqual(self.table.version, 1)
+
+        self.assertEqual(self.table.update(first), {})
+        self.assertEqual(self.table.version, 1)
+
+        second = list(first)
+        second[1] = self.schema.record(19.5, (0, 0, 1, 0), True)
+        self.assertEqual(self.table.update(second), {1: ('fuel', 'wear')})
+        self.assertEqual(self.table.changed_since(1), {'fuel', 'wear'})
+        self.assertEqual(self.table.value(1, 'fuel'), 19.5)
+        self.assertEqual(self.table.value(1, 'wear'), (0, 0, 1, 0))
+        self.assertEqual(self.table.value(1, 'drs'), 1)
+        self.assertEqual(list(self.table.column('fuel')), [10.0, 19.5, 5.0])
+        self.assertIs(self.table.get(1), second[1])
+
+    def test_record_array_and_clear(self):
+        """Test dat bij een car mask ook de niet gemaskeerde auto's bijgewerkt worden"""
+        from packet_parsers.schema import RecordArray
+        data = b''.join(self.schema.struct.pack(float(i), 1, 2, 3, 4, True) for i in range(3))
+        self.assertEqual(set(self.table.update(RecordArray(self.schema, data, 3, [2]))), {0, 1, 2})
+        self.assertEqual(self.table.value(0, 'fuel'), 0.0)
+        self.assertEqual(self.table.value(1, 'wear'), (1, 2, 3, 4))
+        self.assertEqual(self.table.value(2, 'fuel'), 2.0)
+
+        self.table.clear()
+        self.assertIsNone(self.table.get(2))
+        self.assertEqual(self.table.value(2, 'fuel'), 0.0)
+
+    def test_char_fields_rejected(self):
+        """Test dat string velden niet in een kolom passen"""
+        from packet_parsers.schema import RecordSchema
+        with self.assertRaises(ValueError):
+            CarStateTable(RecordSchema('Named', [('name', 'char', 8)]))
+
+
+class TestFrameAssembler(unittest.TestCase):
+    """Tests voor FrameAssembler"""
+
+    def setUp(self):
+        """Setup met twee verwachte packet types en een instelbare klok"""
+        self.now = 0.0
+        self.bundles = []
+        self.assembler = FrameAssembler(
+            on_frame=self.bundles.append, expected_ids={2, 6}, timeout=0.05,
+            clock=lambda: self.now
+        )
+
+    @staticmethod
+    def header(overall: int, session_uid: int = 1):
+        """Nep header met alleen de velden die de assembler gebruikt"""
+        return SimpleNamespace(session_uid=session_uid, overall_frame_identifier=overall,
+                               frame_identifier=overall, session_time=overall / 60,
+                               player_car_index=0)
+
+    def test_complete_frame(self):
+        """Test dat een frame vrijkomt zodra alle types binnen zijn"""
+        self.assembler.add(self.header(10), 2, "lap")
+        self.assertEqual(self.bundles, [])
+        self.assembler.add(self.header(10), 6, "telemetry")
+
+        self.assertEqual(len(self.bundles), 1)
+        bundle = self.bundles[0]
+        self.assertTrue(bundle.complete)
+        self.assertEqual(bundle.get(2).packet, "lap")
+        self.assertIn(6, bundle)
+        with self.assertRaises(TypeError):
+            bundle.packets[7] = None
+
+    def test_timeout_and_order(self):
+        """Test timeout van een onvolledig frame en vrijgave in volgorde"""
+        self.assembler.add(self.header(10), 2, "lap10")
+        self.assembler.add(self.header(11), 2, "lap11")
+        self.assembler.add(self.header(11), 6, "tel11")
+
+        self.assertEqual([(b.overall_frame_identifier, b.complete) for b in self.bundles],
+                         [(10, False), (11, True)])
+
+        self.assembler.add(self.header(12), 2, "lap12")
+        self.now = 0.1
+        self.assembler.poll()
+        self.assertEqual(self.bundles[-1].overall_frame_identifier, 12)
+        self.assertFalse(self.bundles[-1].complete)
+
+    def test_delivery_under_lock(self):
+        """Test dat on_frame onder de delivery lock draait (add en poll vanuit twee threads)"""
+        held = []
+        self.assembler.on_frame = lambda bundle: held.append(self.assembler._delivery_lock.locked())
+        self.assembler.add(self.header(10), 2, "lap10")
+        self.assembler.add(self.header(11), 2, "lap11")
+        self.now = 0.1
+        self.assembler.poll()
+
+        self.assertEqual(held, [True, True])
+
+    def test_late_packet_dropped(self):
+        """Test dat een pakket voor een al vrijgegeven frame vervalt"""
+        self.assembler.add(self.header(10), 2, "lap")
+        self.assembler.add(self.header(10), 6, "telemetry")
+        self.assembler.add(self.header(9), 2, "late")
+
+        self.assertEqual(len(self.bundles), 1)
+        stats = self.assembler.get_stats()
+        self.assertEqual(stats['late_packets'], 1)
+        self.assertEqual(stats['frames_complete'], 1)
+
+
+def make_header_packet(packet_id: int, session_uid: int = 1, overall: int = 0,
+                       session_time: float = 0.0, payload: bytes = b'') -> bytes:
+    """Bouw een F1 25 datagram (header + payload) voor de capture tests"""
+    return struct.pack('<HBBBBBQfIIBB', 2025, 25, 1, 0, 1, packet_id, session_uid,
+                       session_time, overall, overall, 0, 255) + payload
+
+
+class TestCaptureFormat(unittest.TestCase):
+    """Tests voor het capture bestandsformaat en de sparse index"""
+
+    def setUp(self):
+        """Tijdelijke map voor capture bestanden"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'test.f1cap')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_with_index(self):
+        """Test schrijven en teruglezen van records en index entries"""
+        writer = CaptureWriter(self.path, index_interval=4)
+        offsets = [writer.write(100.0 + i, ('192.168.1.20', 20777),
+                                make_header_packet(6, overall=i, payload=bytes([i])))
+                   for i in range(10)]
+        writer.close()
+
+        with CaptureReader(self.path) as reader:
+            records = list(reader)
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[3].addr, ('192.168.1.20', 20777))
+        self.assertEqual(records[3].timestamp, 103.0)
+        self.assertEqual(records[3].data[-1], 3)
+        self.assertEqual([r.offset for r in records], offsets)
+
+        index = read_index(self.path)
+        self.assertEqual([entry.overall_frame_identifier for entry in index], [0, 4, 8])
+        self.assertEqual(index[1].offset, offsets[4])
+        self.assertEqual(index[1].packet_id, 6)
+
+        with CaptureReader(self.path) as reader:
+            from_index = [r.data[-1] for r in reader.records(index[2].offset)]
+        self.assertEqual(from_index, [8, 9])
+
+    def test_truncated_tail_ignored(self):
+        """Test dat een afgebroken laatste record genegeerd wordt"""
+        writer = CaptureWriter(self.path)
+        writer.write(1.0, None, make_header_packet(2))
+        writer.write(2.0, None, make_header_packet(2))
+        writer.close()
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 5)
+
+        with CaptureReader(self.path) as reader:
+            self.assertEqual(len(list(reader)), 1)
+
+
+class TestCaptureRecorder(unittest.TestCase):
+    """Tests voor CaptureRecorder"""
+
+    def test_rotation_by_session_and_size(self):
+        """Test rotatie bij een nieuwe sessie en bij de maximale grootte"""
+        closed = []
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = CaptureRecorder(directory, max_file_bytes=2000, flush_interval=0.01,
+                                       on_file_closed=closed.append)
+            recorder.start()
+            recorder.record_batch([(make_header_packet(2, session_uid=1), ('127.0.0.1', 1))])
+            recorder.record(memoryview(make_header_packet(2, session_uid=2)), ('127.0.0.1', 1))
+            for _ in range(5):
+                recorder.record(make_header_packet(2, session_uid=2, payload=bytes(500)), ('127.0.0.1', 1))
+            recorder.stop()
+
+            stats = recorder.get_stats()
+            self.assertEqual(stats['capture_records'], 7)
+            self.assertEqual(stats['capture_dropped'], 0)
+            self.assertEqual(len(closed), stats['capture_files'])
+            self.assertGreaterEqual(len(closed), 3)
+            total = 0
+            for path in closed:
+                with CaptureReader(path) as reader:
+                    records = list(reader)
+                total += len(records)
+                self.assertEqual(len({record.data[7] for record in records}), 1)
+            self.assertEqual(total, 7)
+
+    def test_interleaved_sessions_one_file_each(self):
+        """Test dat door elkaar lopende rigs (MULTI_RIG) elk in één bestand komen"""
+        closed = []
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = CaptureRecorder(directory, flush_interval=0.01, on_file_closed=closed.append)
+            recorder.start()
+            recorder.record_batch([(make_header_packet(2, session_uid=1 + i % 2), ('127.0.0.1', 1))
+                                   for i in range(40)])
+            time.sleep(0.05)
+            self.assertEqual(recorder.get_stats()['capture_open_files'], 2)
+            recorder.stop()
+
+            self.assertEqual(recorder.get_stats()['capture_files'], 2)
+            self.assertEqual(len(closed), 2)
+            for path in closed:
+                with CaptureReader(path) as reader:
+                    self.assertEqual(len(list(reader)), 20)
+
+    def test_idle_session_closed(self):
+        """Test dat het bestand van een idle sessie afgesloten wordt"""
+        closed = []
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = CaptureRecorder(directory, flush_interval=0.01, idle_close=0.05,
+                                       on_file_closed=closed.append)
+            recorder.start()
+            recorder.record(make_header_packet(2, session_uid=1), ('127.0.0.1', 1))
+            deadline = time.monotonic() + 2.0
+            while not closed and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(closed), 1)
+            self.assertEqual(recorder.get_stats()['capture_open_files'], 0)
+            recorder.stop()
+
+    def test_full_queue_drops(self):
+        """Test dat een volle queue records dropt in plaats van te blokkeren"""
+        recorder = CaptureRecorder(tempfile.gettempdir(), max_queue=2)
+        recorder.record_batch([(b'x' * 30, None)] * 3)
+        recorder.record(b'y' * 30, None)
+        self.assertEqual(recorder.get_stats()['capture_dropped'], 2)
+        self.assertEqual(recorder.get_stats()['capture_pending'], 2)
+
+
+class TestMmapCaptureReader(unittest.TestCase):
+    """Tests voor MmapCaptureReader en de tijd/ronde index"""
+
+    def setUp(self):
+        """Capture met 10 seconden aan motion + lap data, ronde 1 → 2 op t=6"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'mmap.f1cap')
+        writer = CaptureWriter(self.path)
+        for overall in range(40):
+            session_time = overall * 0.25
+            lap = bytearray(22 * 57 + 2)
+            lap[33] = 1 if session_time < 6.0 else 2  # current_lap_num van de speler (auto 0)
+            writer.write(0.0, None, make_header_packet(0, overall=overall, session_time=session_time))
+            writer.write(0.0, None, make_header_packet(2, overall=overall, session_time=session_time,
+                                                       payload=bytes(lap)))
+        writer.write(0.0, None, make_header_packet(0, session_uid=2, overall=0, session_time=0.0))
+        writer.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_seek_time_and_lap(self):
+        """Test zoeken op session_time en op ronde"""
+        with MmapCaptureReader(self.path) as reader:
+            self.assertEqual(reader.sessions(), [1, 2])
+            offset = reader.seek_time(3.3)
+            packets = reader.packets(offset)
+            self.assertEqual(struct.unpack_from('<f', next(packets), 15)[0], 3.5)
+            packets.close()
+
+            start, end = reader.lap_range(2)
+            self.assertEqual(start, reader.seek_lap(2))
+            laps = [view[29 + 33] for view in reader.packets(start, end, packet_ids=[2])]
+            self.assertEqual(laps, [2] * 16)
+            self.assertIsNone(reader.seek_lap(3))
+            self.assertIsNone(reader.seek_time(100.0))
+
+    def test_close_with_open_iterator(self):
+        """Test dat close() werkt terwijl een packets() iterator nog openstaat"""
+        with MmapCaptureReader(self.path) as reader:
+            packets = reader.packets()
+            next(packets)
+        self.assertTrue(reader._mm.closed)
+        self.assertEqual(list(packets), [])
+
+    def test_filters_and_feed(self):
+        """Test filteren op packet ID en auto en het gebruik als pakketbron"""
+        received = []
+        with MmapCaptureReader(self.path) as reader:
+            count = reader.feed(lambda view: received.append(bytes(view)), packet_ids=[0])
+            self.assertEqual(sum(1 for _ in reader.packets(car_index=0)), 81)
+            self.assertEqual(sum(1 for _ in reader.packets(car_index=5)), 0)
+        self.assertEqual(count, 41)
+        self.assertTrue(all(data[6] == 0 for data in received))
+
+    def test_index_cache(self):
+        """Test dat de index gecached en bij een gewijzigde capture herbouwd wordt"""
+        with MmapCaptureReader(self.path) as reader:
+            entries = reader.time_index
+        self.assertTrue(os.path.exists(time_index_path_for(self.path)))
+        with MmapCaptureReader(self.path) as reader:
+            self.assertEqual(reader.time_index, entries)
+
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00' * 4)  # Afgebroken record: nieuwe grootte, index herbouwen
+        with MmapCaptureReader(self.path) as reader:
+            self.assertEqual(reader.time_index, entries)
+            self.assertEqual(sum(1 for _ in reader), 81)
+
+
+class TestCaptureArchive(unittest.TestCase):
+    """Tests voor het chunked capture archief en de compactor"""
+
+    def setUp(self):
+        """Capture met 5 ronden van elk 20 lap data pakketten"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'race.f1cap')
+        writer = CaptureWriter(self.path)
+        for overall in range(100):
+            lap = bytearray(22 * 57 + 2)
+            lap[33] = overall // 20 + 1
+            writer.write(float(overall), ('10.0.0.2', 20777),
+                         make_header_packet(2, overall=overall, session_time=overall * 0.5, payload=bytes(lap)))
+        writer.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_both_codecs(self):
+        """Test dat beide codecs exact dezelfde records teruggeven"""
+        with CaptureReader(self.path) as reader:
+            original = list(reader)
+        for codec in ('zlib', 'lzma'):
+            result = compact_capture(self.path, os.path.join(self.tmp.name, f'race_{codec}.f1arc'),
+                                     codec=codec, chunk_size=8 * 1024)
+            self.assertGreater(result['compression_ratio'], 5.0)
+            with CaptureArchiveReader(result['archive']) as archive:
+                self.assertEqual(archive.codec_name, codec)
+                self.assertGreater(len(archive.chunks), 5)
+                records = list(archive)
+            self.assertEqual([(r.timestamp, r.addr, r.data) for r in records],
+                             [(r.timestamp, r.addr, r.data) for r in original])
+
+    def test_lap_seek_decodes_only_needed_chunks(self):
+        """Test dat zoeken op een ronde alleen de chunks van die ronde decomprimeert"""
+        result = compact_capture(self.path, chunk_size=8 * 1024)
+        with CaptureArchiveReader(result['archive']) as archive:
+            packets = list(archive.lap_packets(4))
+            self.assertEqual(len(packets), 20)
+            self.assertTrue(all(packet[29 + 33] == 4 for packet in packets))
+            self.assertLess(archive.chunks_decoded, len(archive.chunks))
+            self.assertEqual(archive.chunks_from_time(49.5), [len(archive.chunks) - 1])
+            self.assertGreater(archive.get_stats()['decode_mb_per_s'], 0.0)
+
+    def test_truncated_archive_rejected(self):
+        """Test dat een archief zonder footer geweigerd wordt"""
+        result = compact_capture(self.path)
+        with open(result['archive'], 'r+b') as f:
+            f.truncate(os.path.getsize(result['archive']) - 3)
+        with self.assertRaises(CaptureFormatError):
+            CaptureArchiveReader(result['archive'])
+
+    def test_compactor_deletes_raw(self):
+        """Test de achtergrond compactor met delete_raw"""
+        archived = []
+        compactor = CaptureCompactor(codec='lzma', delete_raw=True, on_archived=archived.append)
+        compactor.start()
+        compactor.submit(self.path)
+        compactor.stop()
+
+        self.assertEqual(len(archived), 1)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(os.path.exists(archived[0]['archive']))
+        stats = compactor.get_stats()
+        self.assertEqual(stats['archive_files'], 1)
+        self.assertGreater(stats['archive_compression_ratio'], 1.0)
+
+
+class TestReplaySource(unittest.TestCase):
+    """Tests voor ReplaySource"""
+
+    def _write_capture(self, directory: str, session_times) -> str:
+        """Schrijf een capture met één pakket per session_time"""
+        path = os.path.join(directory, 'replay.f1cap')
+        writer = CaptureWriter(path)
+        for overall, session_time in enumerate(session_times):
+            writer.write(0.0, ('127.0.0.1', 1), make_header_packet(2, overall=overall, session_time=session_time))
+        writer.close()
+        return path
+
+    def _wait_finished(self, source: ReplaySource, timeout: float = 5.0):
+        """Wacht tot de replay alle pakketten afgespeeld heeft"""
+        deadline = time.monotonic() + timeout
+        while not source.get_stats()['replay_finished'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_max_speed_batches(self):
+        """Test dat max tempo alles in batches en in volgorde aflevert"""
+        batches = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = self._write_capture(directory, [i * 10.0 for i in range(10)])
+            source = ReplaySource(packet_handler=None, batch_handler=batches.append,
+                                  path=directory, speed=None, max_batch=4)
+            source.start()
+            self._wait_finished(source)
+            stats = source.get_stats()
+            self.assertTrue(source.is_running())
+            source.stop()
+
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+        overall = [struct.unpack_from('<I', data, 23)[0] for batch in batches for data, _addr in batch]
+        self.assertEqual(overall, list(range(10)))
+        self.assertEqual(stats['packets_processed'], 10)
+        self.assertEqual(stats['replay_progress'], 1.0)
+        self.assertFalse(source.is_running())
+
+    def test_paced_by_session_time(self):
+        """Test dat het tempo session_time volgt (en een rewind opnieuw ankert)"""
+        received = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = self._write_capture(directory, [100.0, 100.2, 100.4, 5.0, 5.2])
+            source = ReplaySource(packet_handler=received.append, path=path, speed=2.0)
+            started = time.monotonic()
+            source.start()
+            self._wait_finished(source)
+            elapsed = time.monotonic() - started
+            source.stop()
+
+        self.assertEqual(len(received), 5)
+        # (0.4 + 0.2) seconden session_time op 2x tempo
+        self.assertGreaterEqual(elapsed, 0.28)
+        self.assertLess(elapsed, 2.0)
+
+    def test_invalid_speed_and_missing_file(self):
+        """Test foutmeldingen voor een ongeldig tempo en een ontbrekend bestand"""
+        with self.assertRaises(ValueError):
+            ReplaySource(packet_handler=print, path='x.f1cap', speed=0)
+        source = ReplaySource(packet_handler=print, path=os.path.join(tempfile.gettempdir(), 'missing.f1cap'))
+        with self.assertRaises(FileNotFoundError):
+            source.start()
+
+
+class TestPacketGenerator(unittest.TestCase):
+    """Tests voor de synthetische pakket generator"""
+
+    def _generator(self, **options) -> PacketGenerator:
+        """Korte races op een korte baan, zodat finish en pitstops snel komen"""
+        defaults = dict(num_rigs=2, num_cars=20, total_laps=3, lap_time=20.0, track_length=1000.0, seed=7)
+        defaults.update(options)
+        return PacketGenerator(**defaults)
+
+    def test_all_packet_sizes_match_spec(self):
+        """Test dat elk packet type de spec grootte en header heeft"""
+        rig = SimulatedRig(num_cars=20)
+        for _ in range(120):
+            rig.step()
+        for packet_id in PacketID:
+            data = rig.build_packet(packet_id)
+            self.assertEqual(len(data), PACKET_SIZES[packet_id], f"packet {packet_id.name}")
+            packet_format, year, _, _, _, header_id = struct.unpack_from('<HBBBBB', data)
+            self.assertEqual((packet_format, year, header_id), (2025, 25, packet_id))
+
+    def test_race_flow_without_loss(self):
+        """Test sessies, pitstops en flashbacks zonder vals verlies in de sequence tracker"""
+        generator = self._generator(rate=30, flashback_interval=25.0)
+        tracker = FrameSequenceTracker()
+        pit_statuses = set()
+
+        def handle(data):
+            tracker.observe_packet(data)
+            if data[6] == PacketID.LAP_DATA:
+                # pitStatus staat op +34 in elke LapData van 57 bytes
+                pit_statuses.update(data[29 + 34:29 + 57 * 20:57])
+
+        delivered = generator.feed(handle, duration=100)
+
+        stats = generator.get_stats()
+        tracked = tracker.get_stats()
+        self.assertEqual(delivered, stats['datagrams_generated'])
+        self.assertEqual(stats['datagrams_dropped'], 0)
+        self.assertEqual(set(stats['generated_by_packet_id']), set(PacketID))
+        self.assertGreaterEqual(stats['sessions'], 4)  # Beide rigs minstens één race uit
+        self.assertGreater(stats['flashbacks'], 0)
+        self.assertEqual(tracked['lost'], 0)
+        self.assertEqual(tracked['out_of_order'], 0)
+        self.assertGreater(tracked['flashbacks'], 0)
+        self.assertEqual(pit_statuses, {0, 1, 2})  # Op de baan, in de pitlane, in de box
+
+    def test_packet_loss_and_seed(self):
+        """Test dat het verlies de ingestelde kans volgt en een seed reproduceerbaar is"""
+        first = list(self._generator(loss_rate=0.1).datagrams(20))
+        second = list(self._generator(loss_rate=0.1).datagrams(20))
+        self.assertEqual(first, second)
+
+        generator = self._generator(loss_rate=0.1)
+        tracker = FrameSequenceTracker()
+        generator.feed(tracker.observe_packet, duration=20)
+        stats = generator.get_stats()
+        self.assertAlmostEqual(stats['datagrams_dropped'] / stats['datagrams_generated'], 0.1, delta=0.02)
+        self.assertGreater(tracker.get_stats()['lost'], 0)
+
+    def test_send_over_loopback(self):
+        """Test versturen over UDP met één bron poort per rig"""
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(('127.0.0.1', 0))
+        receiver.settimeout(2.0)
+        port = receiver.getsockname()[1]
+        try:
+            sent = self._generator(num_cars=2).send('127.0.0.1', port, duration=0.1, realtime=False)
+            sources = set()
+            for _ in range(sent):
+                data, addr = receiver.recvfrom(2048)
+                sources.add(addr[1])
+        finally:
+            receiver.close()
+        self.assertGreater(sent, 0)
+        self.assertEqual(len(sources), 2)
+
+
+class TestUDPListener(unittest.TestCase):
+    """Tests voor UDPListener over loopback"""
+
+    def setUp(self):
+        """Start een listener op een vrije poort"""
+        self.received = []
+        self.done = threading.Event()
+
+        def handler(data):
+            self.received.append(bytes(data))
+            if len(self.received) == 3:
+                self.done.set()
+
+        self.listener = UDPListener(packet_handler=handler)
+        self.listener.host = '127.0.0.1'
+        self.listener.port = 0
+        self.listener.timeout = 0.1
+        self.listener.start()
+        self.addr = self.listener.sock.getsockname()
+
+    def tearDown(self):
+        """Stop de listener"""
+        self.listener.stop()
+
+    def test_packets_reach_handler(self):
+        """Test dat datagrammen via de queue bij de handler aankomen"""
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            for i in range(3):
+                sender.sendto(bytes([i]) * 40, self.addr)
+        finally:
+            sender.close()
+
+        self.assertTrue(self.done.wait(timeout=2.0))
+        time.sleep(0.05)
+        stats = self.listener.get_stats()
+        self.assertEqual(stats['packets_received'], 3)
+        self.assertEqual(stats['packets_processed'], 3)
+        self.assertEqual(stats['packets_dropped'], 0)
+        self.assertEqual([pkt[0] for pkt in self.received], [0, 1, 2])
+
+    def test_recorder_tap(self):
+        """Test dat de recorder tap elk datagram (als kopie) krijgt"""
+        tapped = []
+        self.listener.recorder = SimpleNamespace(
+            record_batch=lambda items: tapped.extend(bytes(data) for data, addr in items),
+            get_stats=lambda: {"capture_records": len(tapped)}
+        )
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            for i in range(3):
+                sender.sendto(bytes([i]) * 40, self.addr)
+        finally:
+            sender.close()
+
+        self.assertTrue(self.done.wait(timeout=2.0))
+        self.assertEqual(tapped, self.received)
+        self.assertEqual(self.listener.get_stats()['capture_records'], 3)
+
+    @unittest.skipUnless(os.path.exists('/proc/net/udp'), "Alleen Linux")
+    def test_kernel_drops_reported(self):
+        """Test dat de kernel drop teller van de socket gelezen wordt"""
+        self.assertEqual(self.listener.get_stats()['kernel_drops'], 0)
+        self.assertGreater(self.listener.get_stats()['recv_buffer_size'], 0)
+
+
+class TestUDPListenerBatch(unittest.TestCase):
+    """Tests voor batched draining per wakeup"""
+
+    def test_drain_respects_max_batch(self):
+        """Test dat één drain alle leesbare datagrammen leest, tot max_batch"""
+        listener = UDPListener(packet_handler=lambda data: None)
+        listener.max_batch = 8
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            receiver.bind(('127.0.0.1', 0))
+            receiver.setblocking(False)
+            for i in range(10):
+                sender.sendto(bytes([i]) * 40, receiver.getsockname())
+            time.sleep(0.05)
+
+            items, packet_ids = listener._drain_copy(receiver)
+            self.assertEqual([data[0] for data, _ in items], list(range(8)))
+            self.assertEqual(packet_ids, list(range(8)))
+
+            items, _ = listener._drain_copy(receiver)
+            self.assertEqual([data[0] for data, _ in items], [8, 9])
+            self.assertEqual(listener._drain_copy(receiver), ([], []))
+        finally:
+            sender.close()
+            receiver.close()
+
+    def test_pool_exhausted_counts_as_drop(self):
+        """Test dat datagrammen bij een lege buffer pool als drop geteld worden"""
+        from services.buffer_pool import BufferPool
+        listener = UDPListener(packet_handler=lambda data: None)
+        listener.buffer_pool = BufferPool(1, listener.buffer_size)
+        listener.queue = PacketRingBuffer(capacity=8)
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            receiver.bind(('127.0.0.1', 0))
+            receiver.setblocking(False)
+            for packet_id in (2, 6, 6):
+                sender.sendto(bytes([packet_id]) * 40, receiver.getsockname())
+            time.sleep(0.05)
+
+            items, packet_ids = listener._drain_zero_copy(receiver)
+        finally:
+            sender.close()
+            receiver.close()
+
+        self.assertEqual(packet_ids, [2])
+        stats = listener.get_stats()
+        # Het geaccepteerde datagram telt de run loop; de drain telt de twee weggelezen
+        self.assertEqual(stats['packets_received'], 2)
+        self.assertEqual(stats['packets_dropped'], 2)
+        self.assertEqual(stats['dropped_by_packet_id'], {6: 2})
+        self.assertGreaterEqual(stats['buffer_pool_exhausted'], 2)
+
+    def test_wakeup_counted_when_pool_exhausted(self):
+        """Test dat een wakeup met alleen door een lege pool gedropte datagrammen meetelt"""
+        from services.buffer_pool import BufferPool
+        listener = UDPListener(packet_handler=lambda data: None)
+        listener.zero_copy = True
+        listener.timeout = 0.05
+        listener.buffer_pool = BufferPool(0, listener.buffer_size)
+        listener.queue = PacketRingBuffer(capacity=8)
+        listener.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            listener.sock.bind(('127.0.0.1', 0))
+            listener.sock.setblocking(False)
+            for _ in range(3):
+                sender.sendto(bytes([6]) * 40, listener.sock.getsockname())
+            time.sleep(0.05)
+            listener.running = True
+            thread = threading.Thread(target=listener.run, daemon=True)
+            thread.start()
+            time.sleep(0.2)
+        finally:
+            listener.running = False
+            thread.join(timeout=2.0)
+            sender.close()
+            listener.sock.close()
+
+        stats = listener.get_stats()
+        self.assertEqual(stats['packets_received'], 3)
+        self.assertEqual(stats['packets_dropped'], 3)
+        self.assertGreaterEqual(stats['wakeups'], 1)
+        self.assertEqual(stats['packets_per_wakeup'], 3 / stats['wakeups'])
+
+    def test_pool_exhausted_still_recorded(self):
+        """Test dat een datagram in de scratch buffer wel naar de recorder gaat"""
+        from services.buffer_pool import BufferPool
+        recorded = []
+        listener = UDPListener(packet_handler=lambda data: None)
+        listener.buffer_pool = BufferPool(0, listener.buffer_size)
+        listener.queue = PacketRingBuffer(capacity=8)
+        listener.recorder = SimpleNamespace(record=lambda data, addr: recorded.append(bytes(data)))
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            receiver.bind(('127.0.0.1', 0))
+            receiver.setblocking(False)
+            for packet_id in (2, 6):
+                sender.sendto(bytes([packet_id]) * 40, receiver.getsockname())
+            time.sleep(0.05)
+
+            items, _ = listener._drain_zero_copy(receiver)
+        finally:
+            sender.close()
+            receiver.close()
+
+        self.assertEqual(items, [])
+        self.assertEqual(recorded, [bytes([2]) * 40, bytes([6]) * 40])
+
+    def test_batch_handler(self):
+        """Test dat de batch handler (data, addr) tuples krijgt"""
+        received = []
+        done = threading.Event()
+
+        def batch_handler(packets):
+            received.extend(bytes(data) for data, addr in packets)
+            if len(received) == 10:
+                done.set()
+
+        listener = UDPListener(packet_handler=lambda data: None, batch_handler=batch_handler)
+        listener.host = '127.0.0.1'
+        listener.port = 0
+        listener.timeout = 0.1
+        listener.start()
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            for i in range(10):
+                sender.sendto(bytes([i]) * 40, listener.sock.getsockname())
+            self.assertTrue(done.wait(timeout=2.0))
+            time.sleep(0.05)
+        finally:
+            sender.close()
+            listener.stop()
+
+        self.assertEqual([pkt[0] for pkt in received], list(range(10)))
+        stats = listener.get_stats()
+        self.assertEqual(stats['packets_processed'], 10)
+        self.assertGreaterEqual(stats['wakeups'], 1)
+        self.assertGreaterEqual(stats['max_batch'], 1)
+        self.assertAlmostEqual(stats['packets_per_wakeup'], 10 / stats['wakeups'])
+
+class TestAsyncUDPListener(unittest.TestCase):
+    """Tests voor AsyncUDPListener met twee poorten in één loop"""
+
+    def test_multiple_ports_async_handler(self):
+        """Test dat datagrammen van beide poorten bij een async handler komen"""
+        received = []
+        done = threading.Event()
+
+        async def handler(data):
+            await asyncio.sleep(0)
+            received.append(bytes(data))
+            if len(received) == 4:
+                done.set()
+
+        listener = AsyncUDPListener(packet_handler=handler, ports=[0, 0])
+        listener.host = '127.0.0.1'
+        listener.start()
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self.assertTrue(listener.is_running())
+            addresses = listener.get_bound_addresses()
+            self.assertEqual(len(addresses), 2)
+            for i in range(4):
+                sender.sendto(bytes([i]) * 40, addresses[i % 2])
+            self.assertTrue(done.wait(timeout=2.0))
+        finally:
+            sender.close()
+            listener.stop()
+
+        self.assertFalse(listener.is_running())
+        self.assertEqual(sorted(pkt[0] for pkt in received), [0, 1, 2, 3])
+        stats = listener.get_stats()
+        self.assertEqual(stats['packets_received'], 4)
+        self.assertEqual(stats['packets_processed'], 4)
+        self.assertEqual(stats['packets_dropped'], 0)
+        self.assertEqual(stats['packets_per_wakeup'], stats['packets_received'] / stats['wakeups'])
+
+    def test_sync_handler_does_not_block_loop(self):
+        """Test dat een blokkerende gewone handler de ontvangst op de loop niet ophoudt"""
+        release = threading.Event()
+        threads = []
+
+        def handler(packets):
+            threads.append(threading.current_thread().name)
+            release.wait(timeout=2.0)
+
+        listener = AsyncUDPListener(packet_handler=lambda data: None, batch_handler=handler, ports=[0])
+        listener.host = '127.0.0.1'
+        listener.start()
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            address = listener.get_bound_addresses()[0]
+            sender.sendto(b'a' * 40, address)
+            deadline = time.monotonic() + 2.0
+            while not threads and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # Handler blokkeert nu; de loop moet nog steeds ontvangen
+            for _ in range(3):
+                sender.sendto(b'b' * 40, address)
+            while listener.get_stats()['packets_received'] < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(listener.get_stats()['packets_received'], 4)
+            self.assertEqual(listener.get_stats()['packets_processed'], 0)
+        finally:
+            release.set()
+            sender.close()
+            listener.stop()
+
+        self.assertEqual(listener.get_stats()['packets_processed'], 4)
+        self.assertTrue(threads[0].startswith('UDPAsyncHandler'))
+
+    def test_submit_coroutine(self):
+        """Test dat andere coroutines op de listener loop kunnen draaien"""
+        async def answer():
+            return 42
+
+        listener = AsyncUDPListener(packet_handler=lambda data: None, ports=[0])
+        listener.host = '127.0.0.1'
+        listener.start()
+        try:
+            self.assertEqual(listener.submit(answer()).result(timeout=2.0), 42)
+        finally:
+            listener.stop()
+
+    def test_bind_error_raised(self):
+        """Test dat een bind fout bij start() wordt doorgegeven"""
+        blocker = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        blocker.bind(('127.0.0.1', 0))
+        try:
+            listener = AsyncUDPListener(packet_handler=lambda data: None,
+                                        ports=[blocker.getsockname()[1]])
+            listener.host = '127.0.0.1'
+            with self.assertRaises(OSError):
+                listener.start()
+            self.assertFalse(listener.is_running())
+        finally:
+            blocker.close()
+
+class TestSocketStats(unittest.TestCase):
+    """Tests voor socket buffer tuning en kernel drops"""
+
+    @unittest.skipUnless(os.path.exists('/proc/net/udp'), "Alleen Linux")
+    def test_kernel_drops_on_full_buffer(self):
+        """Test dat drops door een volle socket buffer geteld worden"""
+        from services.socket_stats import set_receive_buffer, get_kernel_drops
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            set_receive_buffer(receiver, 4096)
+            receiver.bind(('127.0.0.1', 0))
+            self.assertEqual(get_kernel_drops(receiver), 0)
+            # Nooit gelezen: de kleine buffer loopt vol
+            for _ in range(200):
+                sender.sendto(bytes(1200), receiver.getsockname())
+            time.sleep(0.05)
+            self.assertGreater(get_kernel_drops(receiver), 0)
+        finally:
+            sender.close()
+            receiver.close()
+
+    def test_closed_socket(self):
+        """Test dat een gesloten socket None geeft i.p.v. een fout"""
+        from services.socket_stats import get_kernel_drops
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.close()
+        self.assertIsNone(get_kernel_drops(sock))
+
+
+class _CountingProcessor:
+    """Processor voor de supervisor test (module niveau, dus picklable)"""
+
+    def process_packet(self, data):
+        pass
+
+
+# Staat voor de Database pool: wordt bij het importeren van deze module gemaakt
+_POOL_OWNER_PID = os.getpid()
+
+
+class _FreshPoolProcessor(_CountingProcessor):
+    """Processor die weigert te starten met module state van een ander proces"""
+
+    def __init__(self):
+        if _POOL_OWNER_PID != os.getpid():
+            raise RuntimeError(f"Pool geërfd van proces {_POOL_OWNER_PID}")
+
+
+@unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'), "SO_REUSEPORT niet beschikbaar")
+class TestReusePortSupervisor(unittest.TestCase):
+    """Tests voor ReusePortSupervisor met twee worker processen"""
+
+    def test_workers_share_port(self):
+        """Test dat beide workers binden en de stats opgeteld worden"""
+        probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+        probe.close()
+
+        supervisor = ReusePortSupervisor(2, _CountingProcessor, '127.0.0.1', port, stats_interval=0.05)
+        supervisor.start()
+        senders = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for _ in range(8)]
+        try:
+            self.assertTrue(supervisor.is_running())
+            for sender in senders:
+                for i in range(5):
+                    sender.sendto(bytes([i]) * 40, ('127.0.0.1', port))
+
+            deadline = time.monotonic() + 3.0
+            while time.monotonic() < deadline and supervisor.get_stats()['packets_processed'] < 40:
+                time.sleep(0.05)
+        finally:
+            for sender in senders:
+                sender.close()
+            supervisor.stop()
+
+        stats = supervisor.get_stats()
+        self.assertEqual(stats['workers'], 2)
+        self.assertEqual(stats['packets_received'], 40)
+        self.assertEqual(stats['packets_processed'], 40)
+        self.assertEqual(sum(stats['packets_received_per_worker']), 40)
+        self.assertFalse(supervisor.is_running())
+
+    def test_workers_have_own_pool(self):
+        """Test dat elke worker zijn module state (en dus Database pool) zelf opbouwt"""
+        supervisor = ReusePortSupervisor(2, _FreshPoolProcessor, '127.0.0.1', 0, stats_interval=0.05)
+        supervisor.start()
+        try:
+            pids = {process.pid for process in supervisor.processes}
+        finally:
+            supervisor.stop()
+        self.assertEqual(len(pids), 2)
+        self.assertNotIn(_POOL_OWNER_PID, pids)
+
+    def test_invalid_worker_count(self):
+        """Test dat minimaal één worker nodig is"""
+        with self.assertRaises(ValueError):
+            ReusePortSupervisor(0, _CountingProcessor, '127.0.0.1', 20777)
+
+
+if __name__ == '__main__':
+    unittest.main()
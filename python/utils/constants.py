@@ -107,6 +107,34 @@ TYRE_COMPOUNDS = {
     8: "Wet"
 }
 
+# Visuele band compounds (zoals in de game getoond)
+VISUAL_TYRE_COMPOUNDS = {
+    16: "Soft",
+    17: "Medium",
+    18: "Hard",
+    7: "Inter",
+    8: "Wet"
+}
+
+# Fuel mix (Car Status)
+FUEL_MIX = {
+    0: "Lean",
+    1: "Standard",
+    2: "Rich",
+    3: "Max"
+}
+
+# ERS deploy modes (Car Status)
+ERS_DEPLOY_MODES = {
+    0: "None",
+    1: "Medium",
+    2: "Hotlap",
+    3: "Overtake"
+}
+
+# Maximale ERS energie in de batterij (Joule)
+ERS_MAX_ENERGY = 4_000_000
+
 # Surface types
 SURFACE_TYPES = {
     0: "Tarmac",
@@ -21,6 +21,7 @@ class StatusBar:
         packets_received = udp_stats.get('packets_received', 0)
         packets_processed = udp_stats.get('packets_processed', 0)
         packets_errors = udp_stats.get('packets_errors', 0)
+        kernel_drops = udp_stats.get('kernel_drops')
         
         status_text = "ACTIEF" if running else "GESTOPT"
         status_symbol = "●" if running else "○"
@@ -28,6 +29,10 @@ class StatusBar:
         print("\n" + "─" * width)
         print(f"  UDP Status: {status_symbol} {status_text}")
         print(f"  Packets: {packets_received} ontvangen | {packets_processed} verwerkt | {packets_errors} errors")
+        if kernel_drops is not None:
+            # Drops in de socket buffer: niet bij ons aangekomen
+            drop_symbol = "⚠" if kernel_drops > 0 else "✓"
+            print(f"  Kernel drops: {drop_symbol} {kernel_drops} (socket buffer vol)")
         print("─" * width)
     
     @staticmethod
@@ -119,21 +119,58 @@ class MenuView:
 
         return input(prompt).strip()
 
-    def show_status(self, udp_listener: UDPListener):
+    def show_status(self, udp_listener: UDPListener, session_router=None, sequence_stats=None,
+                    payload_cache=None):
         """
         Toon status informatie
 
         Args:
             udp_listener: UDP listener instance
+            session_router: Optioneel, SessionRouter bij multi-rig ingest
+            sequence_stats: Optioneel, (samengevoegde) FrameSequenceTracker stats voor frame verlies
+            payload_cache: Optioneel, PayloadCache van de DataProcessor
         """
         stats = udp_listener.get_stats()
 
         print("\n[ STATUS ]")
         print(f"  UDP Listener: {'ACTIEF' if stats['running'] else 'GESTOPT'}")
-        print(f"  Packets ontvangen: {stats['packets_received']}")
+        if stats.get('engine') == 'asyncio':
+            print(f"  Engine: asyncio (poorten: {', '.join(str(port) for port in stats['ports'])})")
+        elif stats.get('engine') == 'replay':
+            speed = stats['replay_speed']
+            print(f"  Replay: {'max' if speed is None else f'{speed:g}x'} tempo, "
+                  f"{stats['replay_progress']:.0%}{' (klaar)' if stats['replay_finished'] else ''} "
+                  f"({stats['replay_rate']:,.0f} pkt/s)")
+        kernel_drops = stats.get('kernel_drops')
+        print(f"  Packets ontvangen: {stats['packets_received']} "
+              f"(kernel drops: {'n.v.t.' if kernel_drops is None else kernel_drops})")
         print(f"  Packets verwerkt: {stats['packets_processed']}")
         if stats['packets_errors'] > 0:
             print(f"  Errors: {stats['packets_errors']}")
+        print(f"  Queue: {stats.get('queue_depth', 0)}/{stats.get('queue_capacity', 0)} "
+              f"(piek: {stats.get('queue_high_water', 0)})")
+        print(f"  Packets per wakeup: {stats.get('packets_per_wakeup', 0.0):.1f} "
+              f"(max batch: {stats.get('max_batch', 0)})")
+        if stats.get('packets_dropped', 0) > 0:
+            dropped_per_id = ", ".join(
+                f"ID {packet_id}: {count}"
+                for packet_id, count in sorted(stats.get('dropped_by_packet_id', {}).items())
+            )
+            print(f"  Gedropt (queue vol): {stats['packets_dropped']} ({dropped_per_id})")
+        if sequence_stats is not None:
+            print(f"  Frames verloren: {sequence_stats['lost']} ({sequence_stats['loss_rate']:.2%}) | "
+                  f"out-of-order: {sequence_stats['out_of_order']} | dubbel: {sequence_stats['duplicates']} | "
+                  f"flashbacks: {sequence_stats['flashbacks']}")
+        if payload_cache is not None:
+            cache_stats = payload_cache.get_stats()
+            print(f"  Payload cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.0%})")
+        if session_router is not None:
+            router_stats = session_router.get_stats()
+            print(f"  Rigs actief: {router_stats['rigs_active']} "
+                  f"(aangemaakt: {router_stats['rigs_created']}, verwijderd: {router_stats['rigs_evicted']})")
+            for rig in router_stats['rigs']:
+                print(f"    - {rig['host']} sessie {rig['session_uid']}: {rig['packets']} packets")
 
         # Toon huidige navigatie status
         current_screen = self.menu_controller.get_current_screen()
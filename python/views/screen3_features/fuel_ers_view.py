@@ -0,0 +1,84 @@
+"""
+F1 25 Telemetry System - View voor Scherm 3.2: Fuel & ERS
+Live brandstof, ERS, banden en schade van de speler (Packet 7 en 10)
+"""
+import os
+from controllers import TelemetryController
+from views.components import Header, DataTable
+from utils.constants import VISUAL_TYRE_COMPOUNDS, FUEL_MIX, ERS_DEPLOY_MODES, ERS_MAX_ENERGY
+
+# Volgorde van de wielen in de F1 25 arrays
+WHEELS = ("RL", "RR", "FL", "FR")
+
+
+class FuelErsView:
+    def __init__(self, telemetry_controller: TelemetryController):
+        self.controller = telemetry_controller
+        self.header = Header()
+        self.data_table = DataTable()
+
+    def clear_screen(self):
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+    @staticmethod
+    def _bar(fraction: float, width: int = 40) -> str:
+        """Balk van 'width' blokken voor een waarde tussen 0.0 en 1.0"""
+        blocks = int(max(0.0, min(1.0, fraction)) * width)
+        return "█" * blocks + "░" * (width - blocks)
+
+    def render(self):
+        self.clear_screen()
+        self.header.render_box_header("FUEL & ERS - SPELER")
+
+        status, damage = self.controller.get_player_car_state()
+        if status is None:
+            print("\n  Wachten op data (Packet 7 - Car Status)...")
+            return
+
+        self._render_fuel(status)
+        self._render_ers(status)
+        self._render_tyres(status, damage)
+
+    def _render_fuel(self, status):
+        """Brandstof blok"""
+        capacity = status.fuel_capacity or 1.0
+        print("\n  BRANDSTOF")
+        print("  " + "-" * 50)
+        print(f"  In tank:         {status.fuel_in_tank:6.2f} / {status.fuel_capacity:.0f} kg")
+        print(f"  [{self._bar(status.fuel_in_tank / capacity)}]")
+        print(f"  Marge (ronden):  {status.fuel_remaining_laps:+6.2f}")
+        print(f"  Mix:             {FUEL_MIX.get(status.fuel_mix, status.fuel_mix)}")
+
+    def _render_ers(self, status):
+        """ERS blok (energie in Joule, getoond in MJ en kJ)"""
+        print("\n  ERS")
+        print("  " + "-" * 50)
+        store = status.ers_store_energy
+        print(f"  Batterij:        {store / 1e6:5.2f} MJ ({store / ERS_MAX_ENERGY:4.0%})")
+        print(f"  [{self._bar(store / ERS_MAX_ENERGY)}]")
+        print(f"  Deploy mode:     {ERS_DEPLOY_MODES.get(status.ers_deploy_mode, status.ers_deploy_mode)}")
+        self.data_table.render_key_value_table({
+            "Deployed (ronde):": f"{status.ers_deployed_this_lap / 1000:7.0f} kJ",
+            "Harvest MGU-K:": f"{status.ers_harvested_this_lap_mguk / 1000:7.0f} kJ",
+            "Harvest MGU-H:": f"{status.ers_harvested_this_lap_mguh / 1000:7.0f} kJ",
+        }, label_width=16)
+
+    def _render_tyres(self, status, damage):
+        """Banden blok: compound, leeftijd en slijtage/schade per wiel"""
+        compound = VISUAL_TYRE_COMPOUNDS.get(status.visual_tyre_compound, status.visual_tyre_compound)
+        print(f"\n  BANDEN: {compound}, {status.tyres_age_laps} ronden oud")
+        print("  " + "-" * 50)
+        if damage is None:
+            print("  Wachten op data (Packet 10 - Car Damage)...")
+            return
+
+        headers = ["Wiel", "Slijtage", "Schade", "Remmen"]
+        rows = [
+            [wheel, f"{damage.tyres_wear[i]:5.1f}%", f"{damage.tyres_damage[i]}%", f"{damage.brakes_damage[i]}%"]
+            for i, wheel in enumerate(WHEELS)
+        ]
+        self.data_table.render_table(headers, rows)
+        print(f"  Voorvleugel L/R: {damage.front_left_wing_damage}% / {damage.front_right_wing_damage}%   "
+              f"Achtervleugel: {damage.rear_wing_damage}%   Vloer: {damage.floor_damage}%")
+        if damage.drs_fault or damage.ers_fault:
+            print(f"  STORING: {'DRS ' if damage.drs_fault else ''}{'ERS' if damage.ers_fault else ''}")